@@ -18,6 +18,15 @@ from textual.binding import Binding
 from textual.containers import Vertical
 from textual.widgets import DataTable, Footer, Header, RichLog, Static
 
+# State journal and tail helpers live in lib/wt_orch (optional when run standalone)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "lib"))
+try:
+    from wt_orch.state import StateCorruptionError, compact_state, read_state_data
+    from wt_orch.tail import decode_lines, read_tail
+except ImportError:
+    StateCorruptionError = compact_state = read_state_data = None
+    decode_lines = read_tail = None
+
 
 # ─── Status colors and icons ─────────────────────────────────────────
 
@@ -189,7 +198,12 @@ class StateReader:
         self._first_log_read = True
 
     def read_state(self):
-        """Load orchestration-state.json. Returns dict or None."""
+        """Load orchestration-state.json (plus pending journal). Returns dict or None."""
+        if read_state_data is not None:
+            try:
+                return read_state_data(str(self.state_path))
+            except StateCorruptionError:
+                return None
         try:
             with open(self.state_path) as f:
                 return json.load(f)
@@ -227,6 +241,10 @@ class StateReader:
         # On first read, get last 200 lines
         if self._first_log_read:
             self._first_log_read = False
+            if read_tail is not None:
+                # A torn last line is left for the next read, as below
+                lines, self._log_offset = read_tail(self.log_path, 200, complete=True)
+                return decode_lines(lines, keepends=True)
             try:
                 with open(self.log_path) as f:
                     lines = f.readlines()
@@ -245,11 +263,13 @@ class StateReader:
         try:
             with open(self.log_path, "rb") as f:
                 f.seek(self._log_offset)
-                new_bytes = f.read()
-            self._log_offset = file_size
-            return new_bytes.decode("utf-8", errors="replace").splitlines(keepends=True)
+                new_bytes = f.read(file_size - self._log_offset)
         except OSError:
             return []
+        # Hold back a torn trailing line until its newline arrives
+        complete = new_bytes.rfind(b"\n") + 1
+        self._log_offset += complete
+        return new_bytes[:complete].decode("utf-8", errors="replace").splitlines(keepends=True)
 
     def is_stale(self):
         """Check if state file is stale (>120s since last modification)."""
@@ -608,6 +628,10 @@ class OrchestratorTUI(App):
             return
 
         try:
+            # Fold journaled updates into the file before rewriting it
+            if compact_state is not None:
+                compact_state(str(self.reader.state_path))
+
             # Read current state
             with open(self.reader.state_path) as f:
                 data = json.load(f)
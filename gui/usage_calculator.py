@@ -3,6 +3,11 @@ Usage Calculator - Parse local Claude JSONL files to calculate token usage
 
 This module provides cross-platform local usage calculation without requiring
 authentication by parsing the JSONL files Claude Code writes to ~/.claude/projects/
+
+Parsed usage is kept in an on-disk index (~/.cache/wt-tools/usage-index-*.json):
+per-file inode/size/offset watermarks plus per-model token buckets, so a
+refresh only parses bytes appended since the last one and window queries
+are summed from the buckets.
 """
 
 from collections import defaultdict
@@ -10,9 +15,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, Optional, Tuple
+import hashlib
 import json
+import os
+import tempfile
 
-__all__ = ["UsageCalculator", "UsageData", "MODEL_PRICES"]
+__all__ = ["UsageCalculator", "UsageData", "UsageIndex", "MODEL_PRICES"]
 
 # Per-model token prices in USD per million tokens (as of Feb 2026)
 MODEL_PRICES = {
@@ -33,6 +41,16 @@ MODEL_PRICES = {
 # Default prices for unknown models (use sonnet pricing as conservative middle)
 _DEFAULT_PRICES = MODEL_PRICES["claude-sonnet-4"]
 
+# Usage index: bucket width (5 minutes keeps the rolling 5h window edge
+# accurate without storing per-message rows) and on-disk format version
+BUCKET_SECONDS = 300
+INDEX_VERSION = 1
+# Buckets older than the weekly window are folded into one per file on save,
+# so the index stays bounded; only all-time totals still need them
+RETAIN_SECONDS = 7 * 24 * 3600 + BUCKET_SECONDS
+_FOLDED_BUCKET = "0"
+_TOKEN_KEYS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_creation_tokens")
+
 
 def _normalize_model(model: str) -> str:
     """Normalize model name to match MODEL_PRICES keys."""
@@ -111,10 +129,161 @@ class UsageData:
         return total
 
 
+class UsageIndex:
+    """Incremental on-disk index of token usage per file and time bucket.
+
+    files: {path: {"ino", "size", "offset", "buckets": {bucket: {model: [4 counts]}}}}
+    Counts are ordered as _TOKEN_KEYS. offset is the end of the last complete
+    line parsed; a file whose inode changed or that shrank is re-parsed from
+    the start, and files that disappeared drop out (same result as a rescan).
+    Buckets older than RETAIN_SECONDS are merged into bucket "0" (prune()),
+    which only a query without a start time counts.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.files: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            self.files = data.get("files", {})
+
+    def prune(self, now: Optional[float] = None) -> None:
+        """Fold buckets older than RETAIN_SECONDS into each file's bucket "0"."""
+        if now is None:
+            now = datetime.now(timezone.utc).timestamp()
+        cutoff = int(now) - RETAIN_SECONDS
+        for entry in self.files.values():
+            buckets = entry["buckets"]
+            old = [b for b in buckets if b != _FOLDED_BUCKET and int(b) < cutoff]
+            if not old:
+                continue
+            folded = buckets.setdefault(_FOLDED_BUCKET, {})
+            for bucket in old:
+                for model, counts in buckets.pop(bucket).items():
+                    acc = folded.setdefault(model, [0, 0, 0, 0])
+                    for i in range(4):
+                        acc[i] += counts[i]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Prune, then persist the index if it changed (best effort, atomic replace)."""
+        self.prune()
+        if self.path is None or not self._dirty:
+            return
+        tmp = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": self.files}, f,
+                          separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def refresh(self, jsonl_files, parse_line) -> None:
+        """Parse new bytes of every file; forget files that no longer exist."""
+        seen = set()
+        for jsonl_file in jsonl_files:
+            key = str(jsonl_file)
+            seen.add(key)
+            try:
+                st = os.stat(jsonl_file)
+            except OSError:
+                continue
+            entry = self.files.get(key)
+            if entry is not None and entry["ino"] == st.st_ino and entry["size"] == st.st_size:
+                continue  # unchanged — no open, no parse
+            if entry is None or entry["ino"] != st.st_ino or st.st_size < entry["offset"]:
+                entry = {"ino": st.st_ino, "size": 0, "offset": 0, "buckets": {}}
+                self.files[key] = entry
+            self._parse_appended(jsonl_file, entry, st.st_size, parse_line)
+            self._dirty = True
+
+        for key in [k for k in self.files if k not in seen]:
+            del self.files[key]
+            self._dirty = True
+
+    @staticmethod
+    def _parse_appended(jsonl_file, entry: dict, size: int, parse_line) -> None:
+        try:
+            with open(jsonl_file, "rb") as f:
+                f.seek(entry["offset"])
+                chunk = f.read(size - entry["offset"])
+        except OSError:
+            return
+        complete = chunk.rfind(b"\n") + 1  # leave a torn last line for next time
+        buckets = entry["buckets"]
+        for raw in chunk[:complete].split(b"\n"):
+            if b'"usage"' not in raw:
+                continue  # cheap pre-filter: most transcript lines carry no usage
+            usage, timestamp, model = parse_line(raw.decode("utf-8", errors="replace"))
+            if usage is None or timestamp is None:
+                continue
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            bucket = str(int(timestamp.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS)
+            counts = buckets.setdefault(bucket, {}).setdefault(model, [0, 0, 0, 0])
+            counts[0] += usage.input_tokens
+            counts[1] += usage.output_tokens
+            counts[2] += usage.cache_read_tokens
+            counts[3] += usage.cache_creation_tokens
+        entry["offset"] += complete
+        entry["size"] = size
+
+    def usage_since(self, since: Optional[datetime]) -> "UsageData":
+        """Sum buckets starting at or after the bucket containing `since`."""
+        start = None
+        if since is not None:
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            start = int(since.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS
+
+        per_model: Dict[str, list] = {}
+        for entry in self.files.values():
+            for bucket, models in entry["buckets"].items():
+                if start is not None and int(bucket) < start:
+                    continue
+                for model, counts in models.items():
+                    acc = per_model.setdefault(model, [0, 0, 0, 0])
+                    for i in range(4):
+                        acc[i] += counts[i]
+
+        totals = [sum(c[i] for c in per_model.values()) for i in range(4)]
+        return UsageData(
+            input_tokens=totals[0],
+            output_tokens=totals[1],
+            cache_read_tokens=totals[2],
+            cache_creation_tokens=totals[3],
+            per_model={m: dict(zip(_TOKEN_KEYS, c)) for m, c in per_model.items()},
+        )
+
+
 class UsageCalculator:
     """Calculate token usage from local Claude JSONL files"""
 
-    def __init__(self, claude_dir: Optional[Path] = None, project_dir: Optional[str] = None):
+    def __init__(
+        self,
+        claude_dir: Optional[Path] = None,
+        project_dir: Optional[str] = None,
+        index_path: Optional[Path] = None,
+        persist_index: bool = True,
+    ):
         """
         Initialize calculator.
 
@@ -122,9 +291,26 @@ class UsageCalculator:
             claude_dir: Path to Claude config directory. Defaults to ~/.claude/
             project_dir: Optional project directory name to filter by.
                 When set, only JSONL files from ~/.claude/projects/<project_dir>/ are scanned.
+            index_path: Where to keep the usage index. Defaults to
+                ~/.cache/wt-tools/usage-index-<scope hash>.json
+            persist_index: Set False to keep the index in memory only.
         """
         self.claude_dir = claude_dir or Path.home() / ".claude"
         self.project_dir = project_dir
+        if persist_index and index_path is None:
+            index_path = self._default_index_path()
+        self._index = UsageIndex(index_path if persist_index else None)
+
+    def _default_index_path(self) -> Path:
+        scope = str(self.get_projects_dir().resolve() / (self.project_dir or ""))
+        digest = hashlib.sha1(scope.encode()).hexdigest()[:12]
+        cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        return Path(cache_home) / "wt-tools" / f"usage-index-{digest}.json"
+
+    def refresh_index(self) -> None:
+        """Parse newly appended transcript bytes into the usage index."""
+        self._index.refresh(self.iter_jsonl_files(), self.parse_usage_line)
+        self._index.save()
 
     def get_projects_dir(self) -> Path:
         """Get the projects directory path"""
@@ -217,37 +403,8 @@ class UsageCalculator:
         if since is None and window_hours is not None:
             since = datetime.now(timezone.utc) - timedelta(hours=window_hours)
 
-        total = UsageData()
-
-        for jsonl_file in self.iter_jsonl_files():
-            try:
-                with open(jsonl_file, encoding="utf-8") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-
-                        usage, timestamp, _model = self.parse_usage_line(line)
-                        if usage is None or timestamp is None:
-                            continue
-
-                        # Filter by time window (handle naive/aware mismatch)
-                        if since is not None:
-                            cmp_ts = timestamp
-                            cmp_since = since
-                            if cmp_ts.tzinfo is not None and cmp_since.tzinfo is None:
-                                cmp_ts = cmp_ts.replace(tzinfo=None)
-                            elif cmp_ts.tzinfo is None and cmp_since.tzinfo is not None:
-                                cmp_since = cmp_since.replace(tzinfo=None)
-                            if cmp_ts < cmp_since:
-                                continue
-
-                        total = total + usage
-
-            except (IOError, OSError):
-                continue  # Skip files we can't read
-
-        return total
+        self.refresh_index()
+        return self._index.usage_since(since)
 
     def calculate_5h_usage(self) -> UsageData:
         """Calculate usage in the last 5 hours"""
@@ -291,8 +448,11 @@ class UsageCalculator:
         Returns:
             Dictionary with usage data in API-compatible format
         """
-        usage_5h = self.calculate_5h_usage()
-        usage_weekly = self.calculate_weekly_usage()
+        # One refresh, then both windows come from the index buckets
+        self.refresh_index()
+        now = datetime.now(timezone.utc)
+        usage_5h = self._index.usage_since(now - timedelta(hours=5))
+        usage_weekly = self._index.usage_since(now - timedelta(hours=7 * 24))
 
         session_pct = self.estimate_percentage(usage_5h, limit_5h)
         weekly_pct = self.estimate_percentage(usage_weekly, limit_weekly)
@@ -31,6 +31,18 @@ sys.path.insert(0, '$_wt_memory_bin_dir/..')
 from lib.metrics import disable
 disable()
 print('Metrics collection disabled.')
+"
+                return 0
+                ;;
+            --rebuild-rollups)
+                local py
+                py=$(find_python)
+                "$py" -c "
+import sys
+sys.path.insert(0, '$_wt_memory_bin_dir/..')
+from lib.metrics import rebuild_rollups
+count = rebuild_rollups()
+print('No metrics data yet.' if count is None else f'Report rollups rebuilt from {count} sessions.')
 "
                 return 0
                 ;;
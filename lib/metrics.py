@@ -6,9 +6,12 @@ SQLite-backed storage for hook injection metrics. Data flows:
 3. CLI commands query SQLite for reports and dashboards
 """
 
+import fcntl
 import json
 import os
 import sqlite3
+import subprocess
+import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -93,6 +96,52 @@ CREATE INDEX IF NOT EXISTS idx_injections_ts ON injections(ts);
 CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project);
 CREATE INDEX IF NOT EXISTS idx_sessions_ended ON sessions(ended_at);
 CREATE INDEX IF NOT EXISTS idx_mem_matches_session ON mem_matches(session_id);
+
+-- Rollups keyed by the session's ended_at bucket: grain 'd' = YYYY-MM-DD,
+-- 'h' = YYYY-MM-DDTHH. Maintained by _write_session(), rebuilt by
+-- rebuild_rollups().
+CREATE TABLE IF NOT EXISTS rollup_injections (
+    grain TEXT,
+    bucket TEXT,
+    project TEXT,
+    layer TEXT,
+    event TEXT,
+    cnt INTEGER,
+    tok INTEGER,
+    tok_n INTEGER,
+    rel_sum REAL,
+    rel_n INTEGER,
+    rel_nd_sum REAL,
+    rel_nd_n INTEGER,
+    strong INTEGER,
+    partial INTEGER,
+    weak INTEGER,
+    dedup_hits INTEGER,
+    empty INTEGER,
+    PRIMARY KEY (grain, bucket, project, layer, event)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_sessions (
+    grain TEXT,
+    bucket TEXT,
+    project TEXT,
+    cnt INTEGER,
+    injections INTEGER,
+    tok INTEGER,
+    citations INTEGER,
+    injected_ids INTEGER,
+    matched_ids INTEGER,
+    PRIMARY KEY (grain, bucket, project)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_citations (
+    grain TEXT,
+    bucket TEXT,
+    project TEXT,
+    citation_text TEXT,
+    cnt INTEGER,
+    PRIMARY KEY (grain, bucket, project, citation_text)
+);
 """
 
 # Columns added after initial schema — migration for existing DBs
@@ -103,11 +152,24 @@ _MIGRATIONS = [
 ]
 
 
-def _get_db():
-    """Get a SQLite connection, creating schema if needed."""
-    os.makedirs(METRICS_DIR, exist_ok=True)
-    conn = sqlite3.connect(METRICS_DB, timeout=5)
-    conn.row_factory = sqlite3.Row
+# Bump when SCHEMA_SQL/_MIGRATIONS change; stored in PRAGMA user_version
+SCHEMA_VERSION = 2
+
+# First schema version with rollup tables (older DBs get them backfilled)
+_ROLLUP_SCHEMA_VERSION = 2
+
+
+def _init_schema(conn):
+    """Create tables/indexes, run column migrations, switch to WAL.
+
+    Backfills the rollup tables when upgrading from a pre-rollup schema.
+    """
+    old_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    try:
+        # Persistent per DB file: readers no longer block the Stop-hook writer
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError:
+        pass
     conn.executescript(SCHEMA_SQL)
     # Run column migrations for existing DBs
     for table, column, sql in _MIGRATIONS:
@@ -118,9 +180,124 @@ def _get_db():
                 conn.commit()
         except Exception:
             pass
+    if old_version < _ROLLUP_SCHEMA_VERSION:
+        _rebuild_rollups(conn)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+
+
+def _get_db():
+    """Get a SQLite connection, creating schema if needed.
+
+    The DDL only runs when the file's user_version is behind SCHEMA_VERSION,
+    so opening an up-to-date DB is a single PRAGMA read.
+    """
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    conn = sqlite3.connect(METRICS_DB, timeout=5)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _init_schema(conn)
+    conn.execute("PRAGMA synchronous=NORMAL")
     return conn
 
 
+# --- Rollups ---
+#
+# Per-row contributions of raw rows to the rollup columns. The same SELECTs
+# feed incremental maintenance (one session), backfill (everything) and the
+# report's boundary hour (rows newer than the cutoff inside its hour).
+
+_ROLLUP_GRAINS = (("d", 10), ("h", 13))  # grain, ended_at prefix length
+
+_INJ_CONTRIB = """
+    SELECT s.ended_at AS ended_at, COALESCE(s.project, '') AS project,
+           COALESCE(i.layer, '') AS layer, COALESCE(i.event, '') AS event,
+           1 AS cnt,
+           COALESCE(i.token_estimate, 0) AS tok,
+           i.token_estimate IS NOT NULL AS tok_n,
+           COALESCE(i.avg_relevance, 0) AS rel_sum,
+           i.avg_relevance IS NOT NULL AS rel_n,
+           CASE WHEN i.dedup_hit = 0 THEN COALESCE(i.avg_relevance, 0) ELSE 0 END AS rel_nd_sum,
+           COALESCE(i.dedup_hit = 0 AND i.avg_relevance IS NOT NULL, 0) AS rel_nd_n,
+           COALESCE(i.avg_relevance >= 0.7 AND i.dedup_hit = 0, 0) AS strong,
+           COALESCE(i.avg_relevance >= 0.3 AND i.avg_relevance < 0.7 AND i.dedup_hit = 0, 0) AS partial,
+           COALESCE(i.avg_relevance < 0.3 AND i.dedup_hit = 0, 0) AS weak,
+           COALESCE(i.dedup_hit = 1, 0) AS dedup_hits,
+           COALESCE(i.filtered_count = 0 AND i.dedup_hit = 0, 0) AS empty
+    FROM injections i JOIN sessions s ON i.session_id = s.id
+"""
+_INJ_SUMS = ("cnt", "tok", "tok_n", "rel_sum", "rel_n", "rel_nd_sum", "rel_nd_n",
+             "strong", "partial", "weak", "dedup_hits", "empty")
+
+_SESS_CONTRIB = """
+    SELECT s.ended_at AS ended_at, COALESCE(s.project, '') AS project,
+           1 AS cnt,
+           COALESCE(s.total_injections, 0) AS injections,
+           COALESCE(s.total_tokens, 0) AS tok,
+           COALESCE(s.citation_count, 0) AS citations,
+           COALESCE(s.injected_id_count, 0) AS injected_ids,
+           COALESCE(s.matched_id_count, 0) AS matched_ids
+    FROM sessions s
+"""
+_SESS_SUMS = ("cnt", "injections", "tok", "citations", "injected_ids", "matched_ids")
+
+_CIT_CONTRIB = """
+    SELECT s.ended_at AS ended_at, COALESCE(s.project, '') AS project,
+           COALESCE(c.citation_text, '') AS citation_text, 1 AS cnt
+    FROM citations c JOIN sessions s ON c.session_id = s.id
+"""
+
+_ROLLUPS = (
+    # table, contribution select, key columns (after grain/bucket), summed columns
+    ("rollup_injections", _INJ_CONTRIB, ("project", "layer", "event"), _INJ_SUMS),
+    ("rollup_sessions", _SESS_CONTRIB, ("project",), _SESS_SUMS),
+    ("rollup_citations", _CIT_CONTRIB, ("project", "citation_text"), ("cnt",)),
+)
+
+
+def _apply_rollups(conn, where, params=(), sign=1):
+    """Add (sign=1) or remove (sign=-1) the contribution of matching sessions."""
+    for table, contrib, keys, sums in _ROLLUPS:
+        key_cols = ", ".join(keys)
+        for grain, prefix_len in _ROLLUP_GRAINS:
+            conn.execute(
+                f"""INSERT INTO {table} (grain, bucket, {key_cols}, {", ".join(sums)})
+                    SELECT ?, substr(ended_at, 1, {prefix_len}), {key_cols},
+                           {", ".join(f"? * SUM({c})" for c in sums)}
+                    FROM ({contrib} WHERE {where})
+                    WHERE true
+                    GROUP BY 2, {key_cols}
+                    ON CONFLICT (grain, bucket, {key_cols}) DO UPDATE SET
+                    {", ".join(f"{c} = {c} + excluded.{c}" for c in sums)}""",
+                (grain, *([sign] * len(sums)), *params),
+            )
+        conn.execute(f"DELETE FROM {table} WHERE cnt = 0")
+
+
+def _rebuild_rollups(conn):
+    for table, _contrib, _keys, _sums in _ROLLUPS:
+        conn.execute(f"DELETE FROM {table}")
+    _apply_rollups(conn, "s.ended_at IS NOT NULL")
+
+
+def rebuild_rollups():
+    """Recompute all rollup tables from the raw tables (backfill).
+
+    Needed only for DBs written by something other than flush_session()
+    (upgrades from pre-rollup schemas backfill automatically).
+    Returns the number of sessions covered, or None without a DB.
+    """
+    if not os.path.exists(METRICS_DB):
+        return None
+    conn = _get_db()
+    try:
+        _rebuild_rollups(conn)
+        conn.commit()
+        return conn.execute("SELECT COUNT(*) FROM sessions WHERE ended_at IS NOT NULL").fetchone()[0]
+    finally:
+        conn.close()
+
+
 # --- Write Operations (called from Stop hook) ---
 
 def flush_session(session_id, project, metrics_records, citations_list=None, mem_matches=None):
@@ -142,108 +319,262 @@ def flush_session(session_id, project, metrics_records, citations_list=None, mem
         return
 
     try:
-        # Insert injection records
-        for rec in metrics_records:
-            conn.execute(
-                """INSERT INTO injections
-                   (session_id, ts, layer, event, query, result_count, filtered_count,
-                    avg_relevance, max_relevance, min_relevance,
-                    duration_ms, token_estimate, dedup_hit, context_ids)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    session_id,
-                    rec.get("ts", ""),
-                    rec.get("layer", ""),
-                    rec.get("event", ""),
-                    rec.get("query", "")[:500],
-                    rec.get("result_count", 0),
-                    rec.get("filtered_count", 0),
-                    rec.get("avg_relevance"),
-                    rec.get("max_relevance"),
-                    rec.get("min_relevance"),
-                    rec.get("duration_ms", 0),
-                    rec.get("token_estimate", 0),
-                    rec.get("dedup_hit", 0),
-                    json.dumps(rec.get("context_ids", [])),
-                ),
-            )
+        _write_session(conn, session_id, project, metrics_records, citations_list, mem_matches)
+        conn.commit()
+    except Exception:
+        pass
+    finally:
+        conn.close()
 
-        # Insert legacy citations
-        if citations_list:
-            for cit in citations_list:
-                match_type = cit.get("match_type", cit.get("type", "explicit"))
-                conn.execute(
-                    "INSERT INTO citations (session_id, citation_text, citation_type) VALUES (?, ?, ?)",
-                    (session_id, cit.get("text", "")[:500], match_type),
-                )
 
-        # Insert mem_matches (passive + explicit with context_id)
-        matched_id_count = 0
-        if mem_matches:
-            for m in mem_matches:
-                cid = m.get("context_id", "")
-                if not cid:
-                    continue
-                try:
-                    conn.execute(
-                        "INSERT OR IGNORE INTO mem_matches (session_id, context_id, match_type) VALUES (?, ?, ?)",
-                        (session_id, cid, m.get("match_type", "passive")),
-                    )
-                    matched_id_count += 1
-                except Exception:
-                    pass
-
-        # Compute injected_id_count from metrics records
-        all_injected_ids = set()
-        for rec in metrics_records:
-            for cid in rec.get("context_ids", []):
-                all_injected_ids.add(cid)
-        injected_id_count = len(all_injected_ids)
-
-        # Compute session summary
-        timestamps = [r.get("ts", "") for r in metrics_records if r.get("ts")]
-        started_at = min(timestamps) if timestamps else ""
-        ended_at = datetime.utcnow().isoformat() + "Z"
-        total_tokens = sum(r.get("token_estimate", 0) for r in metrics_records)
-        citation_count = len(citations_list) if citations_list else 0
-
-        # Per-layer summary
-        layers = {}
-        for rec in metrics_records:
-            layer = rec.get("layer", "unknown")
-            if layer not in layers:
-                layers[layer] = {"count": 0, "tokens": 0, "relevance_sum": 0.0, "relevance_n": 0}
-            layers[layer]["count"] += 1
-            layers[layer]["tokens"] += rec.get("token_estimate", 0)
-            avg_rel = rec.get("avg_relevance")
-            if avg_rel is not None:
-                layers[layer]["relevance_sum"] += avg_rel
-                layers[layer]["relevance_n"] += 1
-
-        conn.execute(
-            """INSERT OR REPLACE INTO sessions
-               (id, project, started_at, ended_at, total_injections, total_tokens,
-                citation_count, layers_json, injected_id_count, matched_id_count)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+def _write_session(conn, session_id, project, metrics_records, citations_list=None,
+                   mem_matches=None, ended_at=None):
+    """Insert one session's rows and update the rollups (no commit)."""
+    # A re-flushed session replaces its sessions row (and moves its
+    # injections to the new ended_at bucket): take its old share out first
+    _apply_rollups(conn, "s.id = ?", (session_id,), sign=-1)
+
+    # Insert injection records
+    conn.executemany(
+        """INSERT INTO injections
+           (session_id, ts, layer, event, query, result_count, filtered_count,
+            avg_relevance, max_relevance, min_relevance,
+            duration_ms, token_estimate, dedup_hit, context_ids)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [
             (
                 session_id,
-                project,
-                started_at,
-                ended_at,
-                len(metrics_records),
-                total_tokens,
-                citation_count,
-                json.dumps(layers),
-                injected_id_count,
-                matched_id_count,
-            ),
+                rec.get("ts", ""),
+                rec.get("layer", ""),
+                rec.get("event", ""),
+                rec.get("query", "")[:500],
+                rec.get("result_count", 0),
+                rec.get("filtered_count", 0),
+                rec.get("avg_relevance"),
+                rec.get("max_relevance"),
+                rec.get("min_relevance"),
+                rec.get("duration_ms", 0),
+                rec.get("token_estimate", 0),
+                rec.get("dedup_hit", 0),
+                json.dumps(rec.get("context_ids", [])),
+            )
+            for rec in metrics_records
+        ],
+    )
+
+    # Insert legacy citations
+    if citations_list:
+        conn.executemany(
+            "INSERT INTO citations (session_id, citation_text, citation_type) VALUES (?, ?, ?)",
+            [
+                (session_id, cit.get("text", "")[:500], cit.get("match_type", cit.get("type", "explicit")))
+                for cit in citations_list
+            ],
         )
 
-        conn.commit()
-    except Exception:
+    # Insert mem_matches (passive + explicit with context_id)
+    match_rows = [
+        (session_id, m.get("context_id", ""), m.get("match_type", "passive"))
+        for m in mem_matches or []
+        if m.get("context_id", "")
+    ]
+    if match_rows:
+        conn.executemany(
+            "INSERT OR IGNORE INTO mem_matches (session_id, context_id, match_type) VALUES (?, ?, ?)",
+            match_rows,
+        )
+    matched_id_count = len(match_rows)
+
+    # Compute injected_id_count from metrics records
+    all_injected_ids = set()
+    for rec in metrics_records:
+        for cid in rec.get("context_ids", []):
+            all_injected_ids.add(cid)
+    injected_id_count = len(all_injected_ids)
+
+    # Compute session summary
+    timestamps = [r.get("ts", "") for r in metrics_records if r.get("ts")]
+    started_at = min(timestamps) if timestamps else ""
+    if ended_at is None:
+        ended_at = datetime.utcnow().isoformat() + "Z"
+    total_tokens = sum(r.get("token_estimate", 0) for r in metrics_records)
+    citation_count = len(citations_list) if citations_list else 0
+
+    # Per-layer summary
+    layers = {}
+    for rec in metrics_records:
+        layer = rec.get("layer", "unknown")
+        if layer not in layers:
+            layers[layer] = {"count": 0, "tokens": 0, "relevance_sum": 0.0, "relevance_n": 0}
+        layers[layer]["count"] += 1
+        layers[layer]["tokens"] += rec.get("token_estimate", 0)
+        avg_rel = rec.get("avg_relevance")
+        if avg_rel is not None:
+            layers[layer]["relevance_sum"] += avg_rel
+            layers[layer]["relevance_n"] += 1
+
+    conn.execute(
+        """INSERT OR REPLACE INTO sessions
+           (id, project, started_at, ended_at, total_injections, total_tokens,
+            citation_count, layers_json, injected_id_count, matched_id_count)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            session_id,
+            project,
+            started_at,
+            ended_at,
+            len(metrics_records),
+            total_tokens,
+            citation_count,
+            json.dumps(layers),
+            injected_id_count,
+            matched_id_count,
+        ),
+    )
+    _apply_rollups(conn, "s.id = ?", (session_id,))
+
+
+# --- Background flush queue (Stop hook) ---
+#
+# Stop hooks of many worktree sessions often end at once; writing SQLite
+# inline made each wait on the others' locks. queue_flush() instead drops
+# the session as a JSON file into a spool directory and starts a detached
+# drainer, which writes all pending sessions over one connection.
+
+
+def _spool_dir():
+    return os.path.join(METRICS_DIR, "spool")
+
+
+def background_flush_enabled():
+    """WT_METRICS_BACKGROUND=0 makes queue_flush() write synchronously."""
+    return os.environ.get("WT_METRICS_BACKGROUND", "1") != "0"
+
+
+def queue_flush(session_id, project, metrics_records, citations_list=None, mem_matches=None):
+    """Queue a session flush (see flush_session) and return immediately.
+
+    Falls back to a synchronous flush_session() if background flushing is
+    disabled or the spool can't be written.
+    """
+    if not metrics_records:
+        return
+    if not background_flush_enabled():
+        flush_session(session_id, project, metrics_records, citations_list, mem_matches)
+        return
+
+    payload = {
+        "session_id": session_id,
+        "project": project,
+        "metrics_records": metrics_records,
+        "citations_list": citations_list,
+        "mem_matches": mem_matches,
+        "ended_at": datetime.utcnow().isoformat() + "Z",
+    }
+    spool = _spool_dir()
+    name = f"{time.time_ns()}-{os.getpid()}.json"
+    tmp = os.path.join(spool, f".{name}.tmp")
+    try:
+        os.makedirs(spool, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, os.path.join(spool, name))
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        flush_session(session_id, project, metrics_records, citations_list, mem_matches)
+        return
+    _spawn_drainer()
+
+
+def _spawn_drainer():
+    """Start `python -m lib.metrics drain` detached (no wait)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "lib.metrics", "drain", "--dir", METRICS_DIR],
+            cwd=root,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
         pass
+
+
+def drain_spool(wait=False):
+    """Write queued sessions to SQLite. Returns the number written.
+
+    One drainer at a time (flock on the spool dir); without `wait`, returns
+    at once if another drainer holds the lock, since it will pick up our
+    files too. Sessions that can't be written stay queued.
+    """
+    spool = _spool_dir()
+    drained = 0
+    while True:
+        try:
+            pending = sorted(n for n in os.listdir(spool) if n.endswith(".json"))
+        except OSError:
+            return drained
+        if not pending:
+            return drained
+
+        lock = open(os.path.join(spool, ".lock"), "w")
+        try:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return drained
+            written = _drain_locked(spool)
+        finally:
+            lock.close()
+        if written is None:
+            return drained
+        drained += written
+        # Loop: files queued while we held the lock may have seen it taken
+
+
+def _drain_locked(spool):
+    """Drain all spool files; None if the DB could not be written."""
+    names = sorted(n for n in os.listdir(spool) if n.endswith(".json"))
+    written = 0
+    try:
+        conn = _get_db()
+    except Exception:
+        return None
+    try:
+        for name in names:
+            path = os.path.join(spool, name)
+            try:
+                with open(path) as f:
+                    payload = json.load(f)
+                _write_session(
+                    conn,
+                    payload["session_id"],
+                    payload.get("project", "unknown"),
+                    payload.get("metrics_records") or [],
+                    payload.get("citations_list"),
+                    payload.get("mem_matches"),
+                    ended_at=payload.get("ended_at"),
+                )
+            except FileNotFoundError:
+                continue  # taken by a concurrent drainer before we locked
+            except (ValueError, KeyError, TypeError, AttributeError):
+                conn.rollback()
+                os.unlink(path)  # malformed: drop it
+                continue
+            except sqlite3.Error:
+                conn.rollback()
+                return None
+            conn.commit()
+            os.unlink(path)
+            written += 1
     finally:
         conn.close()
+    return written
 
 
 # --- Read Operations (called from CLI) ---
@@ -264,6 +595,7 @@ def query_report(since_days=7, project=None):
 
     Returns dict with all data needed for TUI and HTML reports.
     """
+    drain_spool()
     if not os.path.exists(METRICS_DB):
         return None
 
@@ -275,16 +607,27 @@ def query_report(since_days=7, project=None):
     try:
         cutoff = _since_clause(since_days)
 
+        # Aggregates come from the rollups: whole days after the cutoff's
+        # day, whole hours after the cutoff's hour on that day, and raw rows
+        # only for the remainder of the cutoff's own hour
+        cutoff_day, cutoff_hour = cutoff[:10], cutoff[:13]
+        bucket_where = (
+            "((grain = 'd' AND bucket > ?) OR "
+            "(grain = 'h' AND bucket > ? AND substr(bucket, 1, 10) = ?))"
+        )
+        bucket_params = (cutoff_day, cutoff_hour, cutoff_day)
+        boundary_where = "s.ended_at >= ? AND substr(s.ended_at, 1, 13) = ?"
+        boundary_params = (cutoff, cutoff_hour)
+
         # Build project filter clause and params
         if project:
             proj_clause = " AND s.project LIKE ?"
             proj_param = project + "%"
-            # For queries on sessions table directly (no alias)
-            sess_clause = " AND project LIKE ?"
+            roll_clause = " AND project LIKE ?"
         else:
             proj_clause = ""
             proj_param = None
-            sess_clause = ""
+            roll_clause = ""
 
         def _params(*base):
             """Append project param to base params if filtering."""
@@ -292,12 +635,31 @@ def query_report(since_days=7, project=None):
                 return base + (proj_param,)
             return base
 
+        def _source(table, contrib, cols):
+            """CTE body: rollup rows in range + boundary raw rows, as cols."""
+            col_list = ", ".join(cols)
+            sql = (
+                f"SELECT substr(bucket, 1, 10) AS day, {col_list} FROM {table} "
+                f"WHERE {bucket_where}{roll_clause} "
+                f"UNION ALL "
+                f"SELECT substr(ended_at, 1, 10) AS day, {col_list} FROM ({contrib} "
+                f"WHERE {boundary_where}{proj_clause})"
+            )
+            return sql, _params(*bucket_params) + _params(*boundary_params)
+
+        inj_sql, inj_params = _source("rollup_injections", _INJ_CONTRIB, ("layer",) + _INJ_SUMS)
+        sess_sql, sess_params = _source("rollup_sessions", _SESS_CONTRIB, _SESS_SUMS)
+        cit_sql, cit_params = _source("rollup_citations", _CIT_CONTRIB, ("citation_text", "cnt"))
+
         # Session summary
         row = conn.execute(
-            f"""SELECT COUNT(*) as cnt, COALESCE(SUM(total_injections),0) as inj,
-                      COALESCE(SUM(total_tokens),0) as tok, COALESCE(SUM(citation_count),0) as cit
-               FROM sessions s WHERE ended_at >= ?{proj_clause}""",
-            _params(cutoff),
+            f"""WITH src AS ({sess_sql})
+               SELECT COALESCE(SUM(cnt),0) as cnt, COALESCE(SUM(injections),0) as inj,
+                      COALESCE(SUM(tok),0) as tok, COALESCE(SUM(citations),0) as cit,
+                      COALESCE(SUM(injected_ids),0) as injected_ids,
+                      COALESCE(SUM(matched_ids),0) as matched_ids
+               FROM src""",
+            sess_params,
         ).fetchone()
         session_count = row["cnt"]
         total_injections = row["inj"]
@@ -310,67 +672,43 @@ def query_report(since_days=7, project=None):
 
         # Per-layer breakdown
         layers = conn.execute(
-            f"""SELECT layer, COUNT(*) as cnt,
-                      COALESCE(AVG(token_estimate),0) as avg_tok,
-                      COALESCE(AVG(avg_relevance),0) as avg_rel
-               FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ?{proj_clause}
-               GROUP BY layer ORDER BY layer""",
-            _params(cutoff),
+            f"""WITH src AS ({inj_sql})
+               SELECT layer, SUM(cnt) as cnt,
+                      COALESCE(SUM(tok) * 1.0 / NULLIF(SUM(tok_n), 0), 0) as avg_tok,
+                      COALESCE(SUM(rel_sum) / NULLIF(SUM(rel_n), 0), 0) as avg_rel
+               FROM src GROUP BY layer ORDER BY layer""",
+            inj_params,
         ).fetchall()
 
-        # Relevance distribution
-        rel_strong = conn.execute(
-            f"""SELECT COUNT(*) FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ? AND avg_relevance >= 0.7 AND dedup_hit = 0{proj_clause}""",
-            _params(cutoff),
-        ).fetchone()[0]
-        rel_partial = conn.execute(
-            f"""SELECT COUNT(*) FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ? AND avg_relevance >= 0.3 AND avg_relevance < 0.7 AND dedup_hit = 0{proj_clause}""",
-            _params(cutoff),
-        ).fetchone()[0]
-        rel_weak = conn.execute(
-            f"""SELECT COUNT(*) FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ? AND avg_relevance < 0.3 AND avg_relevance IS NOT NULL AND dedup_hit = 0{proj_clause}""",
-            _params(cutoff),
-        ).fetchone()[0]
-
-        # Dedup stats
-        dedup_total = conn.execute(
-            f"""SELECT COUNT(*) FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ?{proj_clause}""",
-            _params(cutoff),
-        ).fetchone()[0]
-        dedup_hits = conn.execute(
-            f"""SELECT COUNT(*) FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ? AND dedup_hit = 1{proj_clause}""",
-            _params(cutoff),
-        ).fetchone()[0]
-
-        # Empty injections (no results, not dedup)
-        empty_count = conn.execute(
-            f"""SELECT COUNT(*) FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ? AND filtered_count = 0 AND dedup_hit = 0{proj_clause}""",
-            _params(cutoff),
-        ).fetchone()[0]
+        # Relevance distribution, dedup stats, empty injections (no results, not dedup)
+        totals = conn.execute(
+            f"""WITH src AS ({inj_sql})
+               SELECT COALESCE(SUM(strong),0) as strong, COALESCE(SUM(partial),0) as partial,
+                      COALESCE(SUM(weak),0) as weak, COALESCE(SUM(cnt),0) as total,
+                      COALESCE(SUM(dedup_hits),0) as dedup_hits, COALESCE(SUM(empty),0) as empty
+               FROM src""",
+            inj_params,
+        ).fetchone()
+        rel_strong = totals["strong"]
+        rel_partial = totals["partial"]
+        rel_weak = totals["weak"]
+        dedup_total = totals["total"]
+        dedup_hits = totals["dedup_hits"]
+        empty_count = totals["empty"]
 
         # Top cited texts
         top_citations = conn.execute(
-            f"""SELECT citation_text, COUNT(*) as cnt
-               FROM citations c JOIN sessions s ON c.session_id = s.id
-               WHERE s.ended_at >= ?{proj_clause}
-               GROUP BY citation_text ORDER BY cnt DESC LIMIT 5""",
-            _params(cutoff),
+            f"""WITH src AS ({cit_sql})
+               SELECT citation_text, SUM(cnt) as cnt
+               FROM src GROUP BY citation_text ORDER BY cnt DESC LIMIT 5""",
+            cit_params,
         ).fetchall()
 
         # Daily token burn
         daily_tokens = conn.execute(
-            f"""SELECT DATE(s.ended_at) as day, SUM(i.token_estimate) as tok
-               FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ?{proj_clause}
-               GROUP BY DATE(s.ended_at) ORDER BY day""",
-            _params(cutoff),
+            f"""WITH src AS ({inj_sql})
+               SELECT day, SUM(tok) as tok FROM src GROUP BY day ORDER BY day""",
+            inj_params,
         ).fetchall()
 
         # Per-session detail
@@ -382,29 +720,22 @@ def query_report(since_days=7, project=None):
 
         # Daily relevance trend
         daily_relevance = conn.execute(
-            f"""SELECT DATE(s.ended_at) as day, AVG(i.avg_relevance) as avg_rel
-               FROM injections i JOIN sessions s ON i.session_id = s.id
-               WHERE s.ended_at >= ? AND i.avg_relevance IS NOT NULL AND i.dedup_hit = 0{proj_clause}
-               GROUP BY DATE(s.ended_at) ORDER BY day""",
-            _params(cutoff),
+            f"""WITH src AS ({inj_sql})
+               SELECT day, SUM(rel_nd_sum) / SUM(rel_nd_n) as avg_rel
+               FROM src GROUP BY day HAVING SUM(rel_nd_n) > 0 ORDER BY day""",
+            inj_params,
         ).fetchall()
 
         # Usage rate from context_id tracking
-        usage_row = conn.execute(
-            f"""SELECT COALESCE(SUM(injected_id_count),0) as inj,
-                      COALESCE(SUM(matched_id_count),0) as mat
-               FROM sessions s WHERE ended_at >= ?{proj_clause}""",
-            _params(cutoff),
-        ).fetchone()
-        total_injected_ids = usage_row["inj"]
-        total_matched_ids = usage_row["mat"]
+        total_injected_ids = row["injected_ids"]
+        total_matched_ids = row["matched_ids"]
 
         # Daily session activity (count + tokens per day)
         daily_sessions = conn.execute(
-            f"""SELECT DATE(ended_at) as day, COUNT(*) as cnt, COALESCE(SUM(total_tokens),0) as tok
-               FROM sessions s WHERE ended_at >= ?{proj_clause}
-               GROUP BY DATE(ended_at) ORDER BY day DESC""",
-            _params(cutoff),
+            f"""WITH src AS ({sess_sql})
+               SELECT day, SUM(cnt) as cnt, COALESCE(SUM(tok),0) as tok
+               FROM src GROUP BY day ORDER BY day DESC""",
+            sess_params,
         ).fetchall()
 
         conn.close()
@@ -450,6 +781,7 @@ def query_report(since_days=7, project=None):
 
 def query_session_injections(session_id):
     """Get all injections for a specific session (for drill-down)."""
+    drain_spool()
     if not os.path.exists(METRICS_DB):
         return []
     try:
@@ -510,18 +842,54 @@ def extract_keywords(text, max_keywords=5):
     return ranked[:max_keywords]
 
 
-def passive_match(injected_content, transcript_path, turn_window=5):
+def read_assistant_messages(transcript_path):
+    """Parse assistant text blocks from a transcript JSONL.
+
+    Returns list of {"turn": int, "texts": [str, ...]} in file order, where
+    turn counts user+assistant entries. This is the `messages` format
+    accepted by passive_match() and scan_transcript_citations(), so a
+    caller that already walked the transcript can pass it in instead.
+    """
+    messages = []
+    with open(transcript_path) as f:
+        turn_idx = 0
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except (json.JSONDecodeError, ValueError):
+                continue
+            if obj.get("type") in ("user", "assistant"):
+                turn_idx += 1
+            if obj.get("type") != "assistant":
+                continue
+            content = obj.get("message", {}).get("content", [])
+            if not isinstance(content, list):
+                continue
+            texts = []
+            for block in content:
+                if isinstance(block, dict) and block.get("type") == "text":
+                    texts.append(block.get("text", ""))
+            if texts:
+                messages.append({"turn": turn_idx, "texts": texts})
+    return messages
+
+
+def passive_match(injected_content, transcript_path, turn_window=5, messages=None):
     """Match injected memories against assistant responses via keyword overlap.
 
     Args:
         injected_content: dict of {context_id: memory_text}
         transcript_path: path to JSONL transcript
         turn_window: max turns after injection to check for matches
+        messages: pre-parsed assistant messages (see read_assistant_messages);
+            when given, transcript_path is not read
 
     Returns:
         list of {"context_id": str, "match_type": "passive"} dicts
     """
-    if not injected_content or not transcript_path or not os.path.exists(transcript_path):
+    if not injected_content:
+        return []
+    if messages is None and (not transcript_path or not os.path.exists(transcript_path)):
         return []
 
     # Pre-compute keywords for each injected memory
@@ -534,91 +902,69 @@ def passive_match(injected_content, transcript_path, turn_window=5):
     if not mem_keywords:
         return []
 
-    # Read assistant messages from transcript
-    assistant_messages = []
-    try:
-        with open(transcript_path) as f:
-            turn_idx = 0
-            for line in f:
-                try:
-                    obj = json.loads(line)
-                except (json.JSONDecodeError, ValueError):
-                    continue
-                if obj.get("type") in ("user", "assistant"):
-                    turn_idx += 1
-                if obj.get("type") != "assistant":
-                    continue
-                content = obj.get("message", {}).get("content", [])
-                if not isinstance(content, list):
-                    continue
-                texts = []
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        texts.append(block.get("text", ""))
-                if texts:
-                    assistant_messages.append({
-                        "turn": turn_idx,
-                        "text": " ".join(texts).lower(),
-                    })
-    except Exception:
-        return []
+    if messages is None:
+        try:
+            messages = read_assistant_messages(transcript_path)
+        except Exception:
+            return []
+
+    # One matcher over all memories' keywords: each message is scanned once
+    # and hits are mapped back to the memories owning them
+    from lib.wt_hooks.matcher import KeywordMatcher
+
+    owners = {}
+    for cid, kws in mem_keywords.items():
+        for kw in kws:
+            owners.setdefault(kw, []).append(cid)
+    matcher = KeywordMatcher(owners)
 
     # Match: check if 2+ keywords from a memory appear in any assistant message
     # We don't have per-injection turn numbers in the cache, so we check all messages
     # (the turn_window would require injection timestamps which we don't track yet)
     matched = set()
-    for cid, kws in mem_keywords.items():
-        for msg in assistant_messages:
-            overlap = sum(1 for kw in kws if kw in msg["text"])
-            if overlap >= 2:
-                matched.add(cid)
-                break
+    for msg in messages:
+        overlap = {}
+        for kw in matcher.find(" ".join(msg["texts"])):
+            for cid in owners[kw]:
+                overlap[cid] = overlap.get(cid, 0) + 1
+        matched.update(cid for cid, n in overlap.items() if n >= 2)
+        if len(matched) == len(mem_keywords):
+            break
 
     return [{"context_id": cid, "match_type": "passive"} for cid in sorted(matched)]
 
 
-def scan_transcript_citations(transcript_path, session_id=None, injected_content=None):
+def scan_transcript_citations(transcript_path, session_id=None, injected_content=None,
+                              messages=None):
     """Scan a transcript JSONL for memory citations in assistant messages.
 
     Returns list of dicts. Legacy explicit citations have {text, match_type: "explicit"}.
     Passive matches (when injected_content provided) have {context_id, match_type: "passive"}.
+    The transcript is read once for both; pass `messages` (see
+    read_assistant_messages) to skip reading it at all.
     """
     results = []
-    if not transcript_path or not os.path.exists(transcript_path):
-        return results
+    if messages is None:
+        if not transcript_path or not os.path.exists(transcript_path):
+            return results
+        try:
+            messages = read_assistant_messages(transcript_path)
+        except Exception:
+            messages = []
 
     # Legacy explicit citation scanning
-    try:
-        with open(transcript_path) as f:
-            for line in f:
-                try:
-                    obj = json.loads(line)
-                except (json.JSONDecodeError, ValueError):
-                    continue
-
-                if obj.get("type") != "assistant":
-                    continue
-
-                content = obj.get("message", {}).get("content", [])
-                if not isinstance(content, list):
-                    continue
-
-                for block in content:
-                    if not isinstance(block, dict) or block.get("type") != "text":
-                        continue
-                    text = block.get("text", "")
-                    for pattern in CITATION_PATTERNS:
-                        if pattern in text:
-                            idx = text.find(pattern)
-                            snippet = text[max(0, idx - 20) : idx + len(pattern) + 80].strip()
-                            results.append({"text": snippet, "match_type": "explicit"})
-                            break
-    except Exception:
-        pass
+    for msg in messages:
+        for text in msg["texts"]:
+            for pattern in CITATION_PATTERNS:
+                if pattern in text:
+                    idx = text.find(pattern)
+                    snippet = text[max(0, idx - 20) : idx + len(pattern) + 80].strip()
+                    results.append({"text": snippet, "match_type": "explicit"})
+                    break
 
     # Passive matching (when injected content is available)
     if injected_content:
-        passive_results = passive_match(injected_content, transcript_path)
+        passive_results = passive_match(injected_content, transcript_path, messages=messages)
         results.extend(passive_results)
 
     return results
@@ -692,3 +1038,36 @@ def format_tui_report(data):
         lines.append("")
 
     return "\n".join(lines)
+
+
+def main(argv=None):
+    """CLI: python -m lib.metrics {drain,rebuild-rollups} [--dir METRICS_DIR]"""
+    import argparse
+
+    global METRICS_DIR, METRICS_DB, ENABLED_FLAG
+
+    parser = argparse.ArgumentParser(prog="lib.metrics")
+    sub = parser.add_subparsers(dest="command", required=True)
+    drain = sub.add_parser("drain", help="write queued Stop-hook sessions to SQLite")
+    rebuild = sub.add_parser("rebuild-rollups", help="backfill report rollup tables from raw rows")
+    for p in (drain, rebuild):
+        p.add_argument("--dir", default="", help="metrics directory (default: ~/.local/share/wt-tools/metrics)")
+    args = parser.parse_args(argv)
+
+    if args.dir:
+        METRICS_DIR = args.dir
+        METRICS_DB = os.path.join(METRICS_DIR, "metrics.db")
+        ENABLED_FLAG = os.path.join(METRICS_DIR, ".enabled")
+    if args.command == "drain":
+        drain_spool(wait=True)
+    elif args.command == "rebuild-rollups":
+        count = rebuild_rollups()
+        if count is None:
+            print("No metrics database.")
+        else:
+            print(f"Rollups rebuilt from {count} sessions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
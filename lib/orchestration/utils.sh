@@ -39,6 +39,10 @@ with_state_lock() {
             log_error "with_state_lock: timeout acquiring lock on $STATE_FILENAME"
             return 1
         }
+        # Fold any journaled Python updates into the file before jq rewrites it
+        if [[ -f "${STATE_FILENAME}.journal" ]]; then
+            wt-orch-core state compact --file "$STATE_FILENAME" --lock-held || return 1
+        fi
         "$@"
     ) 200>"$lock_file"
 }
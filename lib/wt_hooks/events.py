@@ -18,6 +18,7 @@ from .util import (
     metrics_timer_start,
     metrics_timer_elapsed,
     metrics_append,
+    session_cache,
     extract_scores,
     METRICS_ENABLED,
     CHECKPOINT_INTERVAL,
@@ -44,6 +45,7 @@ from .stop import (
     save_commit_memories,
     save_checkpoint,
 )
+from .transcript import ChangeNameCollector, analyze, analyze_for_stop
 
 
 def handle_event(event: str, input_data: dict, cache_file: str, **kwargs) -> Optional[str]:
@@ -64,7 +66,9 @@ def handle_event(event: str, input_data: dict, cache_file: str, **kwargs) -> Opt
         _dbg(event, f"unknown event: {event}")
         return None
 
-    return handler(input_data, cache_file, **kwargs)
+    # One cache load and one (merged) write for the whole invocation
+    with session_cache(cache_file):
+        return handler(input_data, cache_file, **kwargs)
 
 
 def handle_session_start(
@@ -161,7 +165,7 @@ def handle_user_prompt(
     formatted = proactive_context(query, cache_file, limit=5)
 
     # Load mandatory rules
-    rules_block = load_matching_rules(prompt)
+    rules_block = load_matching_rules(prompt, cache_file=cache_file)
 
     # Build output
     parts = []
@@ -343,11 +347,13 @@ def handle_stop(
             if marker_epoch > 0 and age < 3600:
                 _log("Stop", f"Skipping memory save — no-op iteration (age: {age}s)")
                 os.remove(noop_marker)
+                noop_transcript = kwargs.get("transcript_path", "")
                 flush_metrics(
                     cache_file,
                     input_data.get("session_id", "unknown"),
-                    kwargs.get("transcript_path", ""),
+                    noop_transcript,
                     kwargs.get("wt_tools_root", ""),
+                    analysis=analyze_for_stop(noop_transcript, cache_file),
                 )
                 dedup_clear(cache_file)
                 return None
@@ -360,12 +366,17 @@ def handle_stop(
     if transcript_path:
         transcript_path = os.path.expanduser(transcript_path)
 
+    # One pass over the transcript (only the part new since the last Stop)
+    # feeds metrics, change detection and insight extraction
+    analysis = analyze_for_stop(transcript_path, cache_file) if transcript_path else None
+
     # Flush metrics
     flush_metrics(
         cache_file,
         session_id,
         transcript_path,
         kwargs.get("wt_tools_root", ""),
+        analysis=analysis,
     )
 
     # Clear metrics from cache
@@ -377,9 +388,8 @@ def handle_stop(
     dedup_clear(cache_file)
 
     # Background transcript extraction
-    if transcript_path and os.path.isfile(transcript_path):
-        change_name = _extract_change_from_transcript(transcript_path)
-        extract_insights(transcript_path, change_name)
+    if analysis is not None:
+        extract_insights(transcript_path, analysis.change_name, entries=analysis.insights.entries)
 
     # Commit extraction
     save_commit_memories()
@@ -604,32 +614,6 @@ def _extract_agent_summary(agent_path: str) -> str:
 
 def _extract_change_from_transcript(transcript_path: str) -> str:
     """Extract change names from transcript."""
-    names = set()
-    try:
-        with open(transcript_path, "r", errors="replace") as f:
-            for line in f:
-                try:
-                    obj = json.loads(line)
-                    if obj.get("type") != "assistant":
-                        continue
-                    for block in obj.get("message", {}).get("content", []) or []:
-                        if not isinstance(block, dict):
-                            continue
-                        if (
-                            block.get("type") == "tool_use"
-                            and block.get("name") == "Skill"
-                        ):
-                            inp = block.get("input", {})
-                            skill = inp.get("skill", "")
-                            if "opsx:" in skill or "openspec-" in skill:
-                                args = inp.get("args", "").strip()
-                                if args:
-                                    names.add(args.split()[0])
-                except json.JSONDecodeError:
-                    pass
-    except OSError:
-        pass
-
-    if names:
-        return sorted(names)[0]
-    return "unknown"
+    collector = ChangeNameCollector()
+    analyze(transcript_path, [collector], final=True)
+    return collector.change_name
@@ -0,0 +1,75 @@
+"""Compiled multi-keyword matcher (case-insensitive substring hits).
+
+Answers "which of these keywords occur anywhere in this text" in one pass
+over the text, independent of the number of keywords. Used for passive
+memory-citation matching (lib.metrics.passive_match) and rules.yaml topic
+matching (memory_ops.load_matching_rules), which used to run one
+`kw in text` scan per keyword per text.
+
+A keyword made of word characters [a-z0-9_-] can only occur inside a
+maximal run of such characters, so the text is split into runs with one
+regex pass and each distinct run is looked up against the keyword set by
+its substrings (memoized: transcripts repeat the same words constantly;
+positions not starting a keyword prefix are skipped with one lookup).
+Keywords containing other characters (spaces, punctuation) are few in
+practice and fall back to a plain substring test.
+"""
+
+import re
+from typing import Iterable
+
+_WORD_RUN = re.compile(r"[a-z0-9_-]+")
+
+# Distinct runs remembered per matcher before the memo is reset
+MAX_MEMO_RUNS = 50_000
+
+
+class KeywordMatcher:
+    """Keyword set compiled once, matched against many texts."""
+
+    def __init__(self, keywords: Iterable[str]):
+        kws = {str(k).lower() for k in keywords if str(k)}
+        self.keywords = frozenset(kws)
+        self._words = frozenset(k for k in kws if _WORD_RUN.fullmatch(k))
+        self._others = sorted(kws - self._words)
+        lengths = [len(k) for k in self._words]
+        self._min_len = min(lengths, default=0)
+        self._max_len = max(lengths, default=0)
+        # Leading min_len chars of every keyword: most positions of a run
+        # are rejected by one set lookup
+        self._heads = frozenset(k[: self._min_len] for k in self._words)
+        self._memo: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find(self, text: str) -> set:
+        """Return the (lowercased) keywords occurring in text."""
+        text = text.lower()
+        hits = set()
+        if self._words:
+            for run in set(_WORD_RUN.findall(text)):
+                found = self._memo.get(run)
+                if found is None:
+                    found = self._run_hits(run)
+                hits.update(found)
+        for kw in self._others:
+            if kw in text:
+                hits.add(kw)
+        return hits
+
+    def _run_hits(self, run: str) -> frozenset:
+        words, heads, lo, hi = self._words, self._heads, self._min_len, self._max_len
+        n = len(run)
+        found = set()
+        for i in range(n - lo + 1):
+            if run[i : i + lo] not in heads:
+                continue
+            for j in range(i + lo, min(i + hi, n) + 1):
+                if run[i:j] in words:
+                    found.add(run[i:j])
+        found = frozenset(found)
+        if len(self._memo) >= MAX_MEMO_RUNS:
+            self._memo.clear()
+        self._memo[run] = found
+        return found
@@ -11,9 +11,10 @@ import subprocess
 from typing import Optional
 
 from .util import (
-    _log, _dbg, read_cache, write_cache, METRICS_ENABLED,
+    _log, _dbg, read_cache, write_cache, _load_cache, _store_cache, METRICS_ENABLED,
     get_daemon_client, daemon_is_running, HEURISTIC_RE,
 )
+from .matcher import KeywordMatcher
 from .session import gen_context_id, store_injected_content
 
 # Minimum relevance score threshold
@@ -116,58 +117,159 @@ def proactive_context(
     return _format_memories(memories, cache_file, "proactive")
 
 
-def load_matching_rules(prompt_text: str, project_root: str = "") -> str:
-    """Read .claude/rules.yaml, match against prompt patterns. Returns rules block or empty."""
-    if not project_root:
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--show-toplevel"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            project_root = result.stdout.strip() if result.returncode == 0 else os.getcwd()
-        except (subprocess.TimeoutExpired, OSError):
-            project_root = os.getcwd()
+# rules.yaml path -> ((mtime_ns, size), compiled rules or None)
+_compiled_rules_cache: dict = {}
+
+# Bump when the persisted rules index layout changes
+RULES_INDEX_VERSION = 1
 
-    rules_file = os.path.join(project_root, ".claude", "rules.yaml")
-    if not os.path.isfile(rules_file):
-        _dbg("rules", "no file")
-        return ""
+
+def resolve_project_root(cache_file: str = "") -> str:
+    """git toplevel of the cwd (cwd if not a repo).
+
+    With a session cache the answer is remembered per cwd, so the git
+    subprocess runs once per session rather than once per prompt.
+    """
+    cwd = os.getcwd()
+    if cache_file:
+        cached = read_cache(cache_file).get("_project_root")
+        if isinstance(cached, dict) and cached.get("cwd") == cwd and cached.get("root"):
+            return cached["root"]
 
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        project_root = result.stdout.strip() if result.returncode == 0 else cwd
+    except (subprocess.TimeoutExpired, OSError):
+        project_root = cwd
+
+    if cache_file:
+        cache = read_cache(cache_file)
+        cache["_project_root"] = {"cwd": cwd, "root": project_root}
+        write_cache(cache_file, cache)
+    return project_root
+
+
+def rules_index_path(cache_file: str) -> str:
+    """Persisted compiled rules index, next to the session cache file."""
+    base = cache_file[:-5] if cache_file.endswith(".json") else cache_file
+    return f"{base}-rules.json"
+
+
+def _parse_rules(rules_file: str) -> Optional[tuple]:
+    """Parse rules.yaml into (entries, topic -> entry indices).
+
+    entries are [id, content] in file order. Returns None if the file
+    can't be read or parsed.
+    """
     try:
         import yaml
     except ImportError:
         _dbg("rules", "yaml not available")
-        return ""
+        return None
 
     try:
         with open(rules_file, "r") as f:
             data = yaml.safe_load(f)
     except Exception:
-        return ""
+        return None
 
     if not isinstance(data, dict):
-        return ""
+        return None
     rules = data.get("rules")
     if not isinstance(rules, list):
-        return ""
-
-    prompt_lower = prompt_text.lower()
-    matched = []
+        return None
 
+    entries = []
+    topics = {}
     for rule in rules:
         if not isinstance(rule, dict):
             continue
-        topics = rule.get("topics") or []
+        rule_topics = rule.get("topics") or []
         content = (rule.get("content") or "").strip()
         rid = rule.get("id") or ""
-        if not topics or not content:
+        if not rule_topics or not content:
             continue
+        for t in rule_topics:
+            idx = topics.setdefault(str(t).lower(), [])
+            if not idx or idx[-1] != len(entries):
+                idx.append(len(entries))
+        entries.append([rid, content])
+
+    return entries, topics
+
+
+def _compiled_rules(rules_file: str, stamp: tuple, cache_file: str = "") -> Optional[tuple]:
+    """(entries, topic matcher, topic -> entry indices) for rules_file.
+
+    Looked up in this process first, then in the persisted index next to
+    the session cache (plain JSON: no YAML parse), and only then parsed
+    from rules.yaml. All levels are keyed by (mtime_ns, size).
+    """
+    compiled = _compiled_rules_cache.get(rules_file)
+    if compiled is not None and compiled[0] == stamp:
+        return compiled[1]
+
+    parsed = None
+    index_file = rules_index_path(cache_file) if cache_file else ""
+    if index_file:
+        index = _load_cache(index_file)
+        if (
+            index.get("version") == RULES_INDEX_VERSION
+            and index.get("rules_file") == rules_file
+            and index.get("stamp") == list(stamp)
+        ):
+            parsed = index["entries"], index["topics"]
+            _dbg("rules", "index hit")
+
+    if parsed is None:
+        parsed = _parse_rules(rules_file)
+        if parsed is not None and index_file:
+            _store_cache(index_file, {
+                "version": RULES_INDEX_VERSION,
+                "rules_file": rules_file,
+                "stamp": list(stamp),
+                "entries": parsed[0],
+                "topics": parsed[1],
+            })
+
+    rules = None
+    if parsed is not None:
+        entries, topics = parsed
+        rules = entries, KeywordMatcher(topics), topics
+    _compiled_rules_cache[rules_file] = (stamp, rules)
+    return rules
+
+
+def load_matching_rules(prompt_text: str, project_root: str = "", cache_file: str = "") -> str:
+    """Read .claude/rules.yaml, match against prompt patterns. Returns rules block or empty.
+
+    Pass the session cache_file to reuse the resolved project root and the
+    compiled rules index across prompts.
+    """
+    if not project_root:
+        project_root = resolve_project_root(cache_file)
+
+    rules_file = os.path.join(project_root, ".claude", "rules.yaml")
+    try:
+        st = os.stat(rules_file)
+    except OSError:
+        _dbg("rules", "no file")
+        return ""
+
+    rules = _compiled_rules(rules_file, (st.st_mtime_ns, st.st_size), cache_file)
+    if rules is None:
+        return ""
+    entries, matcher, topic_rules = rules
 
-        hit = any(str(t).lower() in prompt_lower for t in topics)
-        if hit:
-            matched.append((rid, content))
+    hit_rules = set()
+    for topic in matcher.find(prompt_text):
+        hit_rules.update(topic_rules[topic])
+    matched = [entries[i] for i in sorted(hit_rules)]
 
     if not matched:
         _dbg("rules", "no matches")
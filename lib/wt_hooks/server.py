@@ -0,0 +1,388 @@
+"""Resident hook server: runs hook events in a warm, pre-imported process.
+
+bin/wt-hook-memory used to start a fresh interpreter per hook event and
+import the whole wt_hooks tree each time (hundreds of ms on every Read/Bash
+tool call). The hook server imports everything once and forks a child per
+event; the child adopts the caller's cwd and environment, runs
+handle_event() and exits, so handlers keep their per-process semantics
+(module globals, cwd, env) while skipping interpreter start-up and imports.
+
+The tiny client is wt_hooks.shim. Protocol is the wt-memoryd JSON-lines
+style over a per-user Unix socket, in $XDG_RUNTIME_DIR/wt-hook-server/ or
+a private (0700) /tmp/wt-hook-server-<uid>/ directory. Both ends check
+ownership: the shim only talks to a socket owned by its user, the server
+only serves peers running as its user (SO_PEERCRED).
+
+    {"id": "...", "method": "event", "params": {"event": "PostToolUse",
+     "input": {...}, "cache_file": "...", "cwd": "...", "env": {...},
+     "wt_tools_root": "..."}}
+    -> {"id": "...", "result": {"output": "<hook JSON or null>"}}
+
+The server exits after IDLE_TIMEOUT without events, and as soon as its own
+source files change (the request that noticed is refused, so the shim runs
+it in-process and starts a fresh server).
+
+Usage:
+    python3 -m wt_hooks.server [--socket PATH] [--idle-timeout SECONDS]
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import time
+from typing import Optional
+
+from wt_memoryd.protocol import Request, make_error, make_result
+
+# Default idle timeout: 30 minutes (same as wt-memoryd)
+IDLE_TIMEOUT = 30 * 60
+
+
+def socket_dir() -> str:
+    """Per-user directory holding the socket, its lock and log."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isabs(runtime) and os.path.isdir(runtime):
+        return os.path.join(runtime, "wt-hook-server")
+    return f"/tmp/wt-hook-server-{os.getuid()}"
+
+
+def socket_path() -> str:
+    """Per-user socket path (WT_HOOK_SERVER_SOCKET overrides)."""
+    return os.environ.get("WT_HOOK_SERVER_SOCKET") or os.path.join(socket_dir(), "server.sock")
+
+
+def ensure_private_dir(sock_path: str) -> None:
+    """Create the default socket directory 0700, or verify it is ours and private.
+
+    Raises PermissionError for a directory another user created (or made
+    accessible to others) — e.g. pre-created in /tmp to hijack the socket.
+    An explicit WT_HOOK_SERVER_SOCKET location is the caller's business.
+    """
+    path = os.path.dirname(sock_path)
+    if path != socket_dir():
+        return
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"hook server directory is not private to this user: {path}")
+
+
+def peer_uid(conn) -> Optional[int]:
+    """uid of the process on the other end of a Unix socket (None if unknown)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+def log_path_for(sock_path: str) -> str:
+    return os.path.splitext(sock_path)[0] + ".log"
+
+
+def source_fingerprint() -> tuple:
+    """mtimes of the hook/daemon-client sources this server has imported."""
+    lib_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    stamps = []
+    for pkg in ("wt_hooks", "wt_memoryd"):
+        pkg_dir = os.path.join(lib_dir, pkg)
+        try:
+            names = sorted(n for n in os.listdir(pkg_dir) if n.endswith(".py"))
+        except OSError:
+            continue
+        for name in names:
+            try:
+                stamps.append((pkg, name, os.stat(os.path.join(pkg_dir, name)).st_mtime_ns))
+            except OSError:
+                pass
+    return tuple(stamps)
+
+
+# ─── Event execution (shared with the in-process fallback) ───
+
+
+def memory_available() -> bool:
+    """Same gate as bin/wt-hook-memory: daemon started, or CLI healthy."""
+    if shutil.which("wt-memoryd"):
+        try:
+            from wt_memoryd.lifecycle import ensure_running, resolve_project
+            if ensure_running(resolve_project()):
+                return True
+        except Exception:
+            pass
+    try:
+        result = subprocess.run(
+            ["wt-memory", "health"],
+            capture_output=True,
+            timeout=10,
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, OSError):
+        return False
+
+
+def run_event(
+    event: str, input_data: dict, cache_file: str, wt_tools_root: str = "",
+) -> Optional[str]:
+    """Gate on memory availability, then dispatch to handle_event()."""
+    if not memory_available():
+        return None
+    from .events import handle_event
+
+    return handle_event(
+        event,
+        input_data,
+        cache_file,
+        wt_tools_root=wt_tools_root,
+        transcript_path=input_data.get("transcript_path", ""),
+    )
+
+
+def adopt_env(env: dict) -> None:
+    """Replace os.environ with a caller's environment."""
+    os.environ.clear()
+    os.environ.update(env)
+    _refresh_flags()
+
+
+def _refresh_flags() -> None:
+    """Recompute import-time flags from the adopted environment."""
+    from . import events, memory_ops, util
+
+    util._debug_enabled = (
+        os.path.exists("/tmp/wt-hook-memory.debug") or os.environ.get("WT_HOOK_DEBUG") == "1"
+    )
+    util.METRICS_ENABLED_FLAG = os.path.join(
+        os.environ.get("HOME", ""), ".local", "share", "wt-tools", "metrics", ".enabled"
+    )
+    enabled = os.path.exists(util.METRICS_ENABLED_FLAG)
+    for mod in (util, events, memory_ops):
+        mod.METRICS_ENABLED = enabled
+
+
+def _preload(wt_tools_root: str) -> None:
+    """Import everything a hook event may touch, so forked children don't."""
+    from wt_memoryd import client, lifecycle  # noqa: F401
+
+    from . import events, memory_ops, session, stop, util  # noqa: F401
+
+    if wt_tools_root and wt_tools_root not in sys.path:
+        sys.path.insert(0, wt_tools_root)
+    for optional in ("yaml", "lib.frustration", "lib.metrics", "wt_orch.loop_state"):
+        try:
+            __import__(optional)
+        except Exception:
+            pass
+
+
+# ─── Server ──────────────────────────────────────────────────
+
+
+class _EventHandler(socketserver.StreamRequestHandler):
+    """Runs in the forked child: one connection, one or more requests."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = Request.from_json(line.decode("utf-8", errors="replace"))
+            except (json.JSONDecodeError, AttributeError) as e:
+                response = make_error("", f"invalid request: {e}")
+            else:
+                response = self._dispatch(request)
+            self.wfile.write((response.to_json() + "\n").encode())
+            self.wfile.flush()
+
+    def _dispatch(self, request: Request):
+        if request.method == "ping":
+            return make_result(request.id, {"pid": os.getppid(), "status": "ok"})
+        if request.method != "event":
+            return make_error(request.id, f"unknown method: {request.method}")
+
+        p = request.params
+        try:
+            cwd = p.get("cwd")
+            if cwd:
+                os.chdir(cwd)
+            env = p.get("env")
+            if isinstance(env, dict):
+                adopt_env(env)
+            else:
+                _refresh_flags()
+            output = run_event(
+                p.get("event", ""),
+                p.get("input") or {},
+                p.get("cache_file", ""),
+                p.get("wt_tools_root", ""),
+            )
+        except Exception as e:
+            return make_error(request.id, f"{type(e).__name__}: {e}")
+        return make_result(request.id, {"output": output})
+
+
+class HookServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Forking Unix socket server; the parent never runs handlers itself."""
+
+    block_on_close = False
+
+    def __init__(self, sock_path: str, idle_timeout: int = IDLE_TIMEOUT):
+        self.sock_path = sock_path
+        self.idle_timeout = idle_timeout
+        self.fingerprint = source_fingerprint()
+        self.timeout = 1.0  # handle_request() wake-up for idle/stop checks
+        self.last_activity = time.monotonic()
+        self.events_served = 0
+        self._stop = False
+        try:
+            st = os.lstat(sock_path)
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+                raise PermissionError(f"refusing to replace foreign file: {sock_path}")
+            os.unlink(sock_path)
+        # No window in which the fresh socket is accessible to others
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(sock_path, _EventHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(sock_path, 0o600)
+        self._sock_ino = os.stat(sock_path).st_ino
+
+    def verify_request(self, request, client_address) -> bool:
+        """Refuse (close) requests from other users, or once our sources changed."""
+        self.last_activity = time.monotonic()
+        uid = peer_uid(request)
+        if uid is not None and uid != os.getuid():
+            print(f"hook server: refused peer uid {uid}", file=sys.stderr, flush=True)
+            return False
+        if source_fingerprint() != self.fingerprint:
+            print("hook server: sources changed, exiting", file=sys.stderr, flush=True)
+            self._stop = True
+            return False
+        self.events_served += 1
+        return True
+
+    def process_request(self, request, client_address) -> None:
+        self.collect_children()
+        pid = os.fork()
+        if pid:
+            if self.active_children is None:
+                self.active_children = set()
+            self.active_children.add(pid)
+            self.close_request(request)
+            return
+        # Child: fresh random state so context IDs differ between events
+        random.seed()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        status = 1
+        try:
+            self.finish_request(request, client_address)
+            status = 0
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            try:
+                self.shutdown_request(request)
+            finally:
+                os._exit(status)
+
+    def stop(self, *_args) -> None:
+        self._stop = True
+
+    def run(self) -> None:
+        while not self._stop:
+            self.handle_request()
+            if time.monotonic() - self.last_activity >= self.idle_timeout:
+                print("hook server: idle timeout, exiting", file=sys.stderr, flush=True)
+                break
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Only remove the socket if a newer server has not replaced it
+        try:
+            if os.stat(self.sock_path).st_ino == self._sock_ino:
+                os.unlink(self.sock_path)
+        except OSError:
+            pass
+
+
+def serve(sock_path: str, idle_timeout: int = IDLE_TIMEOUT, wt_tools_root: str = "") -> int:
+    """Run the hook server until idle/stale/SIGTERM. Returns exit code.
+
+    A lock file next to the socket makes concurrent start attempts exit
+    quietly instead of fighting over the socket.
+    """
+    try:
+        ensure_private_dir(sock_path)
+    except OSError as e:
+        print(f"hook server: {e}", file=sys.stderr, flush=True)
+        return 1
+    lock = open(sock_path + ".lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return 0  # another server is starting or running
+
+    _preload(wt_tools_root)
+    server = HookServer(sock_path, idle_timeout=idle_timeout)
+    signal.signal(signal.SIGTERM, server.stop)
+    signal.signal(signal.SIGINT, server.stop)
+    print(f"hook server: pid={os.getpid()} socket={sock_path}", file=sys.stderr, flush=True)
+    try:
+        server.run()
+    finally:
+        server.server_close()
+        print(f"hook server: stopped after {server.events_served} events", file=sys.stderr, flush=True)
+    return 0
+
+
+def spawn(sock_path: str, wt_tools_root: str = "") -> None:
+    """Start a detached hook server in the background (no wait)."""
+    lib_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = os.environ.copy()
+    env["PYTHONPATH"] = lib_dir + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    cmd = [sys.executable, "-m", "wt_hooks.server", "--socket", sock_path]
+    if wt_tools_root:
+        cmd += ["--wt-tools-root", wt_tools_root]
+    try:
+        ensure_private_dir(sock_path)
+        with open(log_path_for(sock_path), "a") as log:
+            subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                start_new_session=True,
+                env=env,
+                cwd="/",
+            )
+    except OSError:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="wt-hook-server", description=__doc__.split("\n")[0])
+    parser.add_argument("--socket", default="")
+    parser.add_argument("--idle-timeout", type=int, default=IDLE_TIMEOUT)
+    parser.add_argument("--wt-tools-root", default="")
+    args = parser.parse_args()
+    sys.exit(serve(args.socket or socket_path(), args.idle_timeout, args.wt_tools_root))
+
+
+if __name__ == "__main__":
+    main()
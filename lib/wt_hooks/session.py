@@ -13,13 +13,15 @@ from .util import read_cache, write_cache, _dbg
 
 
 def dedup_clear(cache_file: str) -> None:
-    """Clear dedup keys (preserving turn_count, metrics, frustration_history)."""
+    """Clear dedup keys (preserving turn_count, metrics, frustration_history,
+    transcript resume state, resolved project root)."""
     _dbg("session", "dedup_clear: clearing dedup keys")
     cache = read_cache(cache_file)
     if not cache:
         return
     keep = {}
-    for k in ("turn_count", "last_checkpoint_turn", "_metrics", "frustration_history"):
+    for k in ("turn_count", "last_checkpoint_turn", "_metrics", "frustration_history",
+              "_transcript", "_project_root"):
         if k in cache:
             keep[k] = cache[k]
     write_cache(cache_file, keep)
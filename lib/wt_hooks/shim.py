@@ -0,0 +1,163 @@
+"""Thin hook client: forward one hook event to the resident hook server.
+
+Called by bin/wt-hook-memory (with `python3 -S`, so start-up stays in the
+low milliseconds):
+    python3 -S -m wt_hooks.shim <EventName> [--wt-tools-root DIR]
+
+Reads the hook input from stdin and sends it, together with the cwd and
+the environment minus secret-marked variables (forwarded_env()), to
+wt_hooks.server. If no server is listening (or it refuses the request
+because its sources changed), a server is started in the background and
+this event is handled in-process, in that same environment, exactly like
+`python3 -m wt_hooks` would.
+
+Only stdlib modules that are already loaded at interpreter start are
+imported on the fast path; keep it that way.
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+
+# Hook events may legitimately run long (Stop extracts insights)
+READ_TIMEOUT = 300.0
+
+# Variables named like secrets (a "_"-separated word of the name is in
+# _SECRET_WORDS: API keys, tokens) are not forwarded to the server — hooks
+# have no use for them. Everything else is, and the in-process fallback
+# drops the same names (run_local), so an event runs in the same
+# environment whether or not the server is up.
+_SECRET_WORDS = frozenset((
+    "TOKEN", "SECRET", "PASSWORD", "PASSWD", "KEY", "APIKEY", "CREDENTIAL", "CREDENTIALS",
+))
+
+
+def socket_dir() -> str:
+    # Must match wt_hooks.server.socket_dir() (not imported: too heavy here)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isabs(runtime) and os.path.isdir(runtime):
+        return os.path.join(runtime, "wt-hook-server")
+    return f"/tmp/wt-hook-server-{os.getuid()}"
+
+
+def socket_path() -> str:
+    return os.environ.get("WT_HOOK_SERVER_SOCKET") or os.path.join(socket_dir(), "server.sock")
+
+
+def forwarded_env() -> dict:
+    """os.environ without the secret-marked variables, as sent with an event."""
+    return {
+        k: v for k, v in os.environ.items()
+        if _SECRET_WORDS.isdisjoint(k.upper().split("_"))
+    }
+
+
+def check_socket(sock_path: str) -> None:
+    """Refuse a socket (or, by default, its directory) not owned by us.
+
+    Raises OSError (FileNotFoundError if absent, PermissionError if foreign),
+    which makes the caller fall back to running the event in-process.
+    """
+    st = os.lstat(sock_path)
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise PermissionError(f"untrusted hook server socket: {sock_path}")
+    if not os.environ.get("WT_HOOK_SERVER_SOCKET"):
+        dst = os.lstat(os.path.dirname(sock_path))
+        if not stat.S_ISDIR(dst.st_mode) or dst.st_uid != os.getuid() or dst.st_mode & 0o077:
+            raise PermissionError(f"untrusted hook server directory: {os.path.dirname(sock_path)}")
+
+
+def cache_file_for(input_data: dict) -> str:
+    session_id = input_data.get("session_id") or "unknown"
+    return f"/tmp/wt-memory-session-{session_id}.json"
+
+
+def call_server(sock_path: str, params: dict) -> dict:
+    """Send one event request, return the decoded response.
+
+    Raises OSError if the socket is missing or not ours, the server is
+    unreachable, or it closed the connection without answering.
+    """
+    check_socket(sock_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(READ_TIMEOUT)
+        sock.connect(sock_path)
+        request = {"id": str(os.getpid()), "method": "event", "params": params}
+        sock.sendall((json.dumps(request) + "\n").encode())
+        buf = bytearray()
+        while b"\n" not in buf:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf.extend(chunk)
+    finally:
+        sock.close()
+    if not buf.strip():
+        raise ConnectionResetError("hook server closed the connection")
+    return json.loads(buf.split(b"\n", 1)[0])
+
+
+def run_local(event: str, input_data: dict, cache_file: str, wt_tools_root: str) -> str:
+    """In-process fallback; also starts a server for the next event."""
+    if sys.flags.no_site:
+        import site
+        site.main()  # handlers may need site-packages (yaml)
+    from wt_hooks import server
+
+    # Same environment the server would run the event in
+    server.adopt_env(forwarded_env())
+    server.spawn(socket_path(), wt_tools_root)
+    return server.run_event(event, input_data, cache_file, wt_tools_root) or ""
+
+
+def main(argv: list) -> int:
+    if len(argv) < 2:
+        print(f"Usage: {argv[0]} <EventName> [--wt-tools-root DIR]", file=sys.stderr)
+        return 1
+    event = argv[1]
+    wt_tools_root = ""
+    if "--wt-tools-root" in argv:
+        idx = argv.index("--wt-tools-root")
+        if idx + 1 < len(argv):
+            wt_tools_root = argv[idx + 1]
+
+    try:
+        input_data = json.loads(sys.stdin.buffer.read() or b"{}")
+        if not isinstance(input_data, dict):
+            input_data = {}
+    except (json.JSONDecodeError, OSError):
+        input_data = {}
+    cache_file = cache_file_for(input_data)
+
+    params = {
+        "event": event,
+        "input": input_data,
+        "cache_file": cache_file,
+        "cwd": os.getcwd(),
+        "env": forwarded_env(),
+        "wt_tools_root": wt_tools_root,
+    }
+    try:
+        response = call_server(socket_path(), params)
+    except socket.timeout:
+        # The server is still running the event; don't run it twice
+        print("wt-hook-server: timed out waiting for hook result", file=sys.stderr)
+        return 1
+    except (OSError, ValueError):
+        output = run_local(event, input_data, cache_file, wt_tools_root)
+    else:
+        if response.get("error") is not None:
+            print(f"wt-hook-server: {response['error']}", file=sys.stderr)
+            return 1
+        output = (response.get("result") or {}).get("output") or ""
+
+    if output:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
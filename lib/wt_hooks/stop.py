@@ -5,9 +5,7 @@ Uses wt-memoryd daemon client for fast remember (bypass CLI subprocess overhead)
 Falls back to CLI subprocess if daemon is unavailable.
 """
 
-import json
 import os
-import re
 import subprocess
 from typing import Optional
 
@@ -16,6 +14,9 @@ from .util import (
     get_daemon_client, daemon_is_running, HEURISTIC_RE,
 )
 from .session import dedup_clear
+from .transcript import (
+    INSIGHT_PATTERNS, MAX_INSIGHT_ENTRIES, InsightCollector, StopAnalysis, analyze,
+)
 
 
 def _remember_via_daemon_or_cli(
@@ -54,8 +55,14 @@ def flush_metrics(
     session_id: str,
     transcript_path: str = "",
     wt_tools_root: str = "",
+    analysis: Optional[StopAnalysis] = None,
 ) -> None:
-    """Collect session metrics, call lib.metrics.flush_session()."""
+    """Collect session metrics, hand them to lib.metrics.queue_flush().
+
+    With `analysis` (from transcript.analyze_for_stop) the citation scan
+    uses its pre-parsed assistant messages instead of re-reading the
+    transcript.
+    """
     cache = read_cache(cache_file)
     metrics = cache.get("_metrics", [])
     if not metrics:
@@ -85,41 +92,53 @@ def flush_metrics(
         sys.path.insert(0, wt_tools_root)
 
     try:
-        from lib.metrics import flush_session, scan_transcript_citations
+        from lib.metrics import queue_flush, scan_transcript_citations
 
         # Scan transcript for citations + passive matches
         citations = []
         mem_matches = []
-        if transcript_path and os.path.exists(transcript_path):
+        results = []
+        if analysis is not None:
+            results = scan_transcript_citations(
+                transcript_path, session_id, injected_content,
+                messages=analysis.messages,
+            )
+        elif transcript_path and os.path.exists(transcript_path):
             results = scan_transcript_citations(
                 transcript_path, session_id, injected_content
             )
-            for r in results:
-                if r.get("context_id"):
-                    mem_matches.append(r)
-                else:
-                    citations.append(r)
-
-        flush_session(session_id, project, metrics, citations, mem_matches)
-        _log("stop", f"metrics: flushed {len(metrics)} records")
+        for r in results:
+            if r.get("context_id"):
+                mem_matches.append(r)
+            else:
+                citations.append(r)
+
+        queue_flush(session_id, project, metrics, citations, mem_matches)
+        _log("stop", f"metrics: queued {len(metrics)} records")
     except ImportError:
         _dbg("stop", "metrics: lib.metrics not available")
     except Exception as e:
         _dbg("stop", f"metrics: error: {e}")
 
 
-def extract_insights(transcript_path: str, change_name: str = "unknown") -> int:
+def extract_insights(
+    transcript_path: str,
+    change_name: str = "unknown",
+    entries: Optional[list] = None,
+) -> int:
     """Scan JSONL transcript, extract HIGH-VALUE entries only as memories.
 
     Only saves: errors/failures, decisions/summaries, and key outcomes.
     Skips: routine tool calls, short user messages, incremental progress updates.
+    `entries` are already-filtered entries (StopAnalysis.insights.entries);
+    when given, the transcript is not read.
 
     Returns number of entries saved.
     """
-    if not transcript_path or not os.path.exists(transcript_path):
-        return 0
-
-    entries = _filter_transcript(transcript_path)
+    if entries is None:
+        if not transcript_path or not os.path.exists(transcript_path):
+            return 0
+        entries = _filter_transcript(transcript_path)
     if not entries:
         return 0
 
@@ -309,17 +328,9 @@ def save_checkpoint(
 
 
 
-# Patterns that indicate high-value assistant content worth saving
-_INSIGHT_PATTERNS = re.compile(
-    r"(?i)"
-    r"(?:summary|conclusion|decision|architecture|root cause|bug|fix|lesson|"
-    r"implementation complete|all.*(?:tasks?|tests?).*(?:pass|complet|done)|"
-    r"key (?:finding|takeaway|insight)|"
-    r"## )"
-)
-
-# Max entries to extract per transcript (hard cap)
-_MAX_EXTRACT_ENTRIES = 30
+# Insight filter lives in .transcript (shared single-pass analyzer)
+_INSIGHT_PATTERNS = INSIGHT_PATTERNS
+_MAX_EXTRACT_ENTRIES = MAX_INSIGHT_ENTRIES
 
 
 def _filter_transcript(transcript_path: str) -> list:
@@ -329,60 +340,9 @@ def _filter_transcript(transcript_path: str) -> list:
     Skips: routine tool calls, short messages, incremental progress.
     Hard-capped at _MAX_EXTRACT_ENTRIES.
     """
-    entries = []
-
-    try:
-        with open(transcript_path, "r", errors="replace") as f:
-            for line in f:
-                if len(entries) >= _MAX_EXTRACT_ENTRIES:
-                    break
-                try:
-                    obj = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                t = obj.get("type", "")
-
-                # Skip user messages entirely — they're ephemeral prompts,
-                # not insights worth persisting
-                if t == "user":
-                    continue
-
-                elif t == "assistant":
-                    msg = obj.get("message", {})
-                    for block in msg.get("content", []) or []:
-                        if len(entries) >= _MAX_EXTRACT_ENTRIES:
-                            break
-                        if not isinstance(block, dict):
-                            continue
-                        if block.get("type") == "text":
-                            text = block.get("text", "").strip()
-                            # Only save substantial text that looks like
-                            # a summary, decision, or conclusion
-                            if len(text) >= 200 and _INSIGHT_PATTERNS.search(text):
-                                entries.append(
-                                    {"role": "assistant", "content": text[:1500]}
-                                )
-                        # Skip tool_use — routine operations, not insights
-
-                elif t == "tool_result":
-                    content = obj.get("content", "")
-                    if isinstance(content, str):
-                        cl = content.lower()
-                        if (
-                            "error" in cl
-                            or "traceback" in cl
-                        ) and len(content) >= 50:
-                            entries.append(
-                                {
-                                    "role": "assistant",
-                                    "content": f"[Error] {content[:500]}",
-                                }
-                            )
-    except OSError:
-        pass
-
-    return entries
+    collector = InsightCollector(_MAX_EXTRACT_ENTRIES)
+    analyze(transcript_path, [collector], final=True)
+    return collector.entries
 
 
 def _save_design_choices(change_name: str, design_marker: str) -> None:
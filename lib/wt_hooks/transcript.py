@@ -0,0 +1,243 @@
+"""Single-pass transcript analysis for the Stop hook.
+
+Stop used to parse the session transcript JSONL four times (insight
+extraction, change-name detection, citation scan, passive matching). Here
+the file is walked once and every parsed entry is fed to a set of
+visitors. The byte offset reached (plus the turn counter and change names
+seen so far) is kept in the session cache, so the next Stop of the same
+session only reads what was appended since.
+"""
+
+import json
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+from .util import read_cache, write_cache
+
+# Session cache key holding the resume state
+STATE_KEY = "_transcript"
+
+# Leading bytes fingerprinted to detect a transcript rewritten in place
+HEAD_BYTES = 256
+
+# Entry types any visitor cares about; other lines are skipped unparsed
+_RELEVANT = (b'"assistant"', b'"user"', b'"tool_result"')
+
+# Patterns that indicate high-value assistant content worth saving
+INSIGHT_PATTERNS = re.compile(
+    r"(?i)"
+    r"(?:summary|conclusion|decision|architecture|root cause|bug|fix|lesson|"
+    r"implementation complete|all.*(?:tasks?|tests?).*(?:pass|complet|done)|"
+    r"key (?:finding|takeaway|insight)|"
+    r"## )"
+)
+
+# Max insight entries extracted per analysis (hard cap)
+MAX_INSIGHT_ENTRIES = 30
+
+
+# ─── Visitors ─────────────────────────────────────────────────
+
+
+class TranscriptVisitor(ABC):
+    """Receives every relevant transcript entry in file order."""
+
+    @abstractmethod
+    def visit(self, obj: dict, turn: int) -> None:
+        ...
+
+
+class InsightCollector(TranscriptVisitor):
+    """High-value entries: substantial summaries/decisions and errors."""
+
+    def __init__(self, max_entries: int = MAX_INSIGHT_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: list = []
+
+    def visit(self, obj: dict, turn: int) -> None:
+        if len(self.entries) >= self.max_entries:
+            return
+        t = obj.get("type", "")
+        # User messages are ephemeral prompts, not insights worth persisting
+        if t == "assistant":
+            for block in obj.get("message", {}).get("content", []) or []:
+                if len(self.entries) >= self.max_entries:
+                    break
+                if not isinstance(block, dict) or block.get("type") != "text":
+                    continue  # tool_use: routine operations, not insights
+                text = block.get("text", "").strip()
+                # Only substantial text that looks like a summary, decision
+                # or conclusion
+                if len(text) >= 200 and INSIGHT_PATTERNS.search(text):
+                    self.entries.append({"role": "assistant", "content": text[:1500]})
+        elif t == "tool_result":
+            content = obj.get("content", "")
+            if isinstance(content, str) and len(content) >= 50:
+                cl = content.lower()
+                if "error" in cl or "traceback" in cl:
+                    self.entries.append(
+                        {"role": "assistant", "content": f"[Error] {content[:500]}"}
+                    )
+
+
+class ChangeNameCollector(TranscriptVisitor):
+    """openspec change names from Skill tool calls (opsx:* / openspec-*)."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names = set(names)
+
+    def visit(self, obj: dict, turn: int) -> None:
+        if obj.get("type") != "assistant":
+            return
+        for block in obj.get("message", {}).get("content", []) or []:
+            if not isinstance(block, dict):
+                continue
+            if block.get("type") == "tool_use" and block.get("name") == "Skill":
+                inp = block.get("input", {})
+                skill = inp.get("skill", "")
+                if "opsx:" in skill or "openspec-" in skill:
+                    args = inp.get("args", "").strip()
+                    if args:
+                        self.names.add(args.split()[0])
+
+    @property
+    def change_name(self) -> str:
+        return sorted(self.names)[0] if self.names else "unknown"
+
+
+class AssistantTextCollector(TranscriptVisitor):
+    """Assistant text blocks per message, in lib.metrics' message format."""
+
+    def __init__(self):
+        self.messages: list = []
+
+    def visit(self, obj: dict, turn: int) -> None:
+        if obj.get("type") != "assistant":
+            return
+        content = obj.get("message", {}).get("content", [])
+        if not isinstance(content, list):
+            return
+        texts = [
+            block.get("text", "")
+            for block in content
+            if isinstance(block, dict) and block.get("type") == "text"
+        ]
+        if texts:
+            self.messages.append({"turn": turn, "texts": texts})
+
+
+# ─── Streaming walk ───────────────────────────────────────────
+
+
+def analyze(
+    transcript_path: str,
+    visitors: list,
+    offset: int = 0,
+    turn: int = 0,
+    final: bool = False,
+) -> tuple:
+    """Feed entries from byte `offset` on to the visitors, parsing each once.
+
+    `turn` counts user/assistant entries before `offset`. A trailing line
+    without newline (possibly still being written) is left for the next
+    call unless `final` is set. Returns (end_offset, turn).
+    """
+    try:
+        f = open(transcript_path, "rb")
+    except OSError:
+        return offset, turn
+    with f:
+        f.seek(offset)
+        pos = offset
+        for raw in f:
+            if not raw.endswith(b"\n") and not final:
+                break
+            pos += len(raw)
+            if not any(marker in raw for marker in _RELEVANT):
+                continue
+            try:
+                obj = json.loads(raw.decode("utf-8", errors="replace"))
+            except ValueError:
+                continue
+            if not isinstance(obj, dict):
+                continue
+            if obj.get("type") in ("user", "assistant"):
+                turn += 1
+            for visitor in visitors:
+                visitor.visit(obj, turn)
+    return pos, turn
+
+
+class StopAnalysis:
+    """What the Stop hook needs from the transcript, from one pass."""
+
+    def __init__(self):
+        self.insights = InsightCollector()
+        self.changes = ChangeNameCollector()
+        self.assistant = AssistantTextCollector()
+
+    @property
+    def visitors(self) -> list:
+        return [self.insights, self.changes, self.assistant]
+
+    @property
+    def change_name(self) -> str:
+        return self.changes.change_name
+
+    @property
+    def messages(self) -> list:
+        return self.assistant.messages
+
+
+def _head_crc(transcript_path: str, length: int) -> Optional[int]:
+    try:
+        with open(transcript_path, "rb") as f:
+            return zlib.crc32(f.read(length))
+    except OSError:
+        return None
+
+
+def analyze_for_stop(transcript_path: str, cache_file: str = "") -> Optional[StopAnalysis]:
+    """Analyze the transcript part not yet seen by a previous Stop.
+
+    Resume state lives in the session cache under STATE_KEY; it is reset
+    when the transcript path or inode changes, the file shrank, or its
+    first bytes differ from what was seen (replaced or rewritten).
+    Returns None if the transcript does not exist.
+    """
+    try:
+        st = os.stat(transcript_path)
+    except (OSError, TypeError, ValueError):
+        return None
+
+    cache = read_cache(cache_file) if cache_file else {}
+    state = cache.get(STATE_KEY) or {}
+    if (
+        state.get("path") != transcript_path
+        or state.get("ino") != st.st_ino
+        or state.get("offset", 0) > st.st_size
+        or state.get("head") != _head_crc(transcript_path, min(HEAD_BYTES, state.get("offset", 0)))
+    ):
+        state = {}
+
+    analysis = StopAnalysis()
+    analysis.changes.names.update(state.get("changes", []))
+    offset, turn = analyze(
+        transcript_path, analysis.visitors,
+        offset=state.get("offset", 0), turn=state.get("turn", 0),
+    )
+
+    if cache_file:
+        cache[STATE_KEY] = {
+            "path": transcript_path,
+            "ino": st.st_ino,
+            "offset": offset,
+            "head": _head_crc(transcript_path, min(HEAD_BYTES, offset)),
+            "turn": turn,
+            "changes": sorted(analysis.changes.names),
+        }
+        write_cache(cache_file, cache)
+    return analysis
@@ -3,10 +3,12 @@
 1:1 migration of lib/hooks/util.sh.
 """
 
+import fcntl
 import json
 import os
 import re
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Optional
 
@@ -60,23 +62,33 @@ def metrics_timer_elapsed() -> int:
 
 
 # ─── Cache I/O ────────────────────────────────────────────────
+#
+# Inside session_cache(cache_file) — opened once per hook invocation by
+# handle_event() — read_cache/write_cache work on one in-memory dict: the
+# file is loaded once and written once at the end. The commit merges
+# against the file as it is then (under a lock), so hooks fired in parallel
+# by subagents don't lose each other's updates.
 
+# Entries kept in the session _metrics array
+METRICS_CAP = 500
 
-def read_cache(cache_file: str) -> dict:
-    """Read JSON cache file. Returns empty dict on error."""
+_active_sessions: dict = {}
+
+
+def _load_cache(cache_file: str) -> dict:
     if not os.path.exists(cache_file):
         return {}
     try:
         with open(cache_file, "r") as f:
-            return json.load(f)
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
     except (json.JSONDecodeError, OSError):
         return {}
 
 
-def write_cache(cache_file: str, data: dict) -> bool:
-    """Atomic write of JSON cache file."""
+def _store_cache(cache_file: str, data: dict) -> bool:
     try:
-        tmp = cache_file + ".tmp"
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
         with open(tmp, "w") as f:
             json.dump(data, f)
         os.replace(tmp, cache_file)
@@ -85,6 +97,112 @@ def write_cache(cache_file: str, data: dict) -> bool:
         return False
 
 
+def read_cache(cache_file: str) -> dict:
+    """Read JSON cache file. Returns empty dict on error."""
+    session = _active_sessions.get(cache_file)
+    if session is not None:
+        return session.data
+    return _load_cache(cache_file)
+
+
+def write_cache(cache_file: str, data: dict) -> bool:
+    """Atomic write of JSON cache file (deferred to commit inside a session)."""
+    session = _active_sessions.get(cache_file)
+    if session is not None:
+        session.data = data
+        return True
+    return _store_cache(cache_file, data)
+
+
+def _merge(disk: Any, base: Any, current: Any) -> Any:
+    """Three-way merge of our changes (base -> current) onto disk.
+
+    Dicts merge per key; lists that we only appended to get our tail
+    appended to whatever is on disk; anything else we changed wins.
+    """
+    if current == base:
+        return disk
+    if isinstance(current, dict) and isinstance(base, dict) and isinstance(disk, dict):
+        merged = dict(disk)
+        for key in base.keys() - current.keys():
+            if key not in merged:
+                continue
+            old, now = base[key], merged[key]
+            if now == old:
+                del merged[key]
+            elif isinstance(old, list) and isinstance(now, list) and now[:len(old)] == old:
+                merged[key] = now[len(old):]  # keep what others appended since
+        for key, value in current.items():
+            if key not in base:
+                # New to us; someone else may have created it meanwhile
+                existing = merged.get(key)
+                if isinstance(value, list) and isinstance(existing, list):
+                    merged[key] = existing + value
+                elif isinstance(value, dict) and isinstance(existing, dict):
+                    merged[key] = _merge(existing, {}, value)
+                else:
+                    merged[key] = value
+            else:
+                merged[key] = _merge(merged.get(key), base[key], value)
+        return merged
+    if (
+        isinstance(current, list) and isinstance(base, list) and isinstance(disk, list)
+        and current[:len(base)] == base
+    ):
+        return disk + current[len(base):]
+    return current
+
+
+class SessionCache:
+    """One hook invocation's view of the session cache file."""
+
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self._base = _load_cache(cache_file)
+        self.data = json.loads(json.dumps(self._base))  # private deep copy
+
+    @property
+    def dirty(self) -> bool:
+        return self.data != self._base
+
+    def commit(self) -> bool:
+        """Merge and write our changes (no-op if nothing changed)."""
+        if not self.dirty:
+            return True
+        try:
+            lock = open(self.cache_file + ".lock", "a")
+        except OSError:
+            return _store_cache(self.cache_file, self.data)
+        with lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = _merge(_load_cache(self.cache_file), self._base, self.data)
+            metrics = merged.get("_metrics")
+            if isinstance(metrics, list) and len(metrics) > METRICS_CAP:
+                merged["_metrics"] = metrics[:METRICS_CAP]
+            ok = _store_cache(self.cache_file, merged)
+        self._base = merged
+        self.data = json.loads(json.dumps(merged))
+        return ok
+
+
+@contextmanager
+def session_cache(cache_file: str):
+    """Load the session cache once, commit once on exit.
+
+    Nested use for the same file shares the outer session.
+    """
+    if not cache_file or cache_file in _active_sessions:
+        yield _active_sessions.get(cache_file)
+        return
+    session = SessionCache(cache_file)
+    _active_sessions[cache_file] = session
+    try:
+        yield session
+    finally:
+        del _active_sessions[cache_file]
+        session.commit()
+
+
 # ─── Metrics append ───────────────────────────────────────────
 
 
@@ -106,7 +224,7 @@ def metrics_append(
         return
     cache = read_cache(cache_file)
     metrics = cache.get("_metrics", [])
-    if len(metrics) >= 500:
+    if len(metrics) >= METRICS_CAP:
         return
 
     scores = scores or []
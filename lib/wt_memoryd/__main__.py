@@ -5,6 +5,9 @@ Usage:
     python -m wt_memoryd stop  [--project NAME]
     python -m wt_memoryd status [--project NAME]
     python -m wt_memoryd run   [--project NAME] [--storage PATH]  (foreground)
+
+start/run accept --no-warmup to load MemorySystem on the first request
+instead of at startup.
 """
 
 from __future__ import annotations
@@ -28,6 +31,7 @@ def main() -> None:
     p_start = sub.add_parser("start", help="Start daemon (background)")
     p_start.add_argument("--project", default="")
     p_start.add_argument("--storage", default="")
+    p_start.add_argument("--no-warmup", action="store_false", dest="warmup")
 
     # stop
     p_stop = sub.add_parser("stop", help="Stop daemon")
@@ -42,6 +46,7 @@ def main() -> None:
     p_run = sub.add_parser("run", help="Run daemon in foreground")
     p_run.add_argument("--project", default="")
     p_run.add_argument("--storage", default="")
+    p_run.add_argument("--no-warmup", action="store_false", dest="warmup")
 
     args = parser.parse_args()
 
@@ -53,7 +58,7 @@ def main() -> None:
 
     if args.command == "start":
         storage = args.storage or lifecycle.storage_path_for(project)
-        pid = lifecycle.start(project, storage_path=storage)
+        pid = lifecycle.start(project, storage_path=storage, warmup=args.warmup)
         if pid:
             print(f"wt-memoryd started: project={project} pid={pid}")
         else:
@@ -84,7 +89,7 @@ def main() -> None:
             stream=sys.stderr,
         )
         storage = args.storage or lifecycle.storage_path_for(project)
-        lifecycle.start(project, storage_path=storage, foreground=True)
+        lifecycle.start(project, storage_path=storage, foreground=True, warmup=args.warmup)
 
 
 if __name__ == "__main__":
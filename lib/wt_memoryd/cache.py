@@ -0,0 +1,135 @@
+"""Recall result cache for wt-memoryd.
+
+Hooks and parallel agents repeat the same recall queries (cheat sheet,
+rules, dispatch memory) against one daemon. Results are cached in an LRU
+keyed on (method, query, limit, mode, tags) with a TTL.
+
+Writes do not touch entries: they bump a generation counter, and an entry
+is only served if it was stored under the current generation. A read that
+overlaps a write captures the generation before it runs, so its result is
+stored as already stale and never served.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Methods whose results are cached
+CACHEABLE_METHODS = frozenset({"recall", "proactive_context"})
+# Methods that invalidate the cache
+INVALIDATING_METHODS = frozenset({"remember", "forget", "forget_by_tags"})
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_TTL = 300.0  # seconds
+
+
+def cache_options_from_env() -> dict[str, Any]:
+    """RecallCache kwargs from WT_MEMORYD_CACHE_SIZE / WT_MEMORYD_CACHE_TTL.
+
+    Size 0 disables the cache. Unset or invalid values keep the defaults.
+    """
+    opts: dict[str, Any] = {}
+    try:
+        opts["max_entries"] = max(0, int(os.environ["WT_MEMORYD_CACHE_SIZE"]))
+    except (KeyError, ValueError):
+        pass
+    try:
+        opts["ttl"] = max(0.0, float(os.environ["WT_MEMORYD_CACHE_TTL"]))
+    except (KeyError, ValueError):
+        pass
+    return opts
+
+
+def cache_key(method: str, params: dict[str, Any]) -> Hashable | None:
+    """Cache key for a request, or None if the method is not cacheable."""
+    if method not in CACHEABLE_METHODS:
+        return None
+    if method == "proactive_context":
+        query = params.get("context", "")
+        mode = ""
+    else:
+        query = params.get("query", "")
+        mode = params.get("mode", "hybrid")
+    tags = params.get("tags") or ""
+    if isinstance(tags, str):
+        tags = tuple(sorted(t.strip() for t in tags.split(",") if t.strip()))
+    else:
+        tags = tuple(sorted(str(t) for t in tags))
+    try:
+        limit = int(params.get("limit", 5))
+    except (TypeError, ValueError):
+        return None
+    return (method, str(query), limit, mode, tags)
+
+
+class RecallCache:
+    """Thread-safe LRU + TTL cache invalidated by a generation counter."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[int, float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return (hit, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, stored_at, value = entry
+                if generation == self.generation and time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store a result computed while `generation` was current."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return  # a write landed while this was computed
+            self._entries[key] = (generation, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop everything (called after every write)."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "generation": self.generation,
+            }
@@ -2,14 +2,21 @@
 
 Connects to the daemon, sends JSON-lines requests, reads responses.
 Auto-starts daemon if not running (max 1 retry).
+
+Connections are kept open and reused across calls (persistent=True), so a
+hook issuing several requests pays for connect() once. request_many()
+pipelines a list of requests over one connection: all lines are written in
+a single send and responses are matched back to requests by id.
 """
 
 from __future__ import annotations
 
 import json
+import select
 import socket
+import threading
 import time
-from typing import Any
+from typing import Any, Iterable
 
 from .protocol import Request, Response
 from .lifecycle import (
@@ -17,14 +24,16 @@ from .lifecycle import (
     storage_path_for,
     resolve_project,
     ensure_running,
-    is_running,
-    STARTUP_TIMEOUT,
 )
 
 # Connection timeout
 CONNECT_TIMEOUT = 2.0
 # Read timeout (some operations like remember can be slow)
 READ_TIMEOUT = 15.0
+# Idle connections kept per client in persistent mode
+POOL_SIZE = 4
+# How long wait_ready() waits for a warming daemon (model load can be slow)
+READY_TIMEOUT = 15.0
 
 
 class DaemonError(Exception):
@@ -37,15 +46,98 @@ class DaemonUnavailable(DaemonError):
     pass
 
 
+class _ConnectionClosedError(DaemonError):
+    """The daemon closed the connection before a response arrived."""
+    pass
+
+
+# A pooled connection the daemon dropped while idle fails with one of these
+# on first use. Timeouts are not among them: the daemon may still be working.
+_DROPPED = (_ConnectionClosedError, BrokenPipeError, ConnectionResetError)
+
+
+class _Connection:
+    """One daemon socket plus its read buffer.
+
+    Responses are matched to requests by id; a response that arrives for a
+    different in-flight request is parked in _stash until asked for.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._buf = bytearray()
+        self._stash: dict[str, Response] = {}
+        # Any response bytes read yet: the daemon got (some) requests
+        self.received = False
+
+    def send(self, requests: list[Request]) -> None:
+        payload = "".join(req.to_json() + "\n" for req in requests)
+        self.sock.sendall(payload.encode())
+
+    def receive(self, request_id: str) -> Response:
+        """Read responses until the one for request_id arrives."""
+        while request_id not in self._stash:
+            resp = Response.from_json(self._read_line())
+            if not resp.id:
+                # Server could not parse a request line, so it has no id
+                raise DaemonError(resp.error or "response without id")
+            self._stash[resp.id] = resp
+        return self._stash.pop(request_id)
+
+    def _read_line(self) -> str:
+        while True:
+            nl = self._buf.find(b"\n")
+            if nl >= 0:
+                line = bytes(self._buf[:nl])
+                del self._buf[:nl + 1]
+                if line.strip():
+                    return line.decode("utf-8", errors="replace")
+                continue
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                if self._buf.strip():
+                    line = bytes(self._buf)
+                    self._buf.clear()
+                    return line.decode("utf-8", errors="replace").strip()
+                raise _ConnectionClosedError("connection closed before response")
+            self.received = True
+            self._buf.extend(chunk)
+
+    def is_stale(self) -> bool:
+        """True if the daemon closed this idle connection (EOF is readable)."""
+        if self._buf or self._stash:
+            return True  # leftovers from an aborted exchange, don't trust it
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            if not readable:
+                return False
+            return self.sock.recv(1, socket.MSG_PEEK) == b""
+        except (OSError, ValueError):
+            return True
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
 class MemoryClient:
     """Sync client for per-project memory daemon."""
 
-    def __init__(self, project: str | None = None, project_dir: str | None = None):
+    def __init__(
+        self,
+        project: str | None = None,
+        project_dir: str | None = None,
+        persistent: bool = True,
+    ):
         """Initialize client for a project.
 
         Args:
             project: Project name (e.g., "wt-tools"). Auto-detected if None.
             project_dir: Working directory for project resolution.
+            persistent: Keep connections open between requests (pooled,
+                up to POOL_SIZE idle). False reconnects for every request.
         """
         if project is None:
             import os
@@ -61,15 +153,54 @@ class MemoryClient:
 
         self.project = project
         self.socket_path = socket_path_for(project)
-        self._sock: socket.socket | None = None
+        self.persistent = persistent
+        self._pool: list[_Connection] = []
+        self._pool_lock = threading.Lock()
+
+    def __enter__(self) -> MemoryClient:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for conn in pool:
+            conn.close()
 
     @classmethod
     def for_project(cls, project_dir: str | None = None) -> MemoryClient:
-        """Create client with auto-detected project. Auto-starts daemon."""
+        """Create client with auto-detected project. Auto-starts daemon.
+
+        Waits (up to READY_TIMEOUT) for a warming daemon to become ready.
+        """
         client = cls(project_dir=project_dir)
         client._ensure_daemon()
+        client.wait_ready()
         return client
 
+    def wait_ready(self, timeout: float = READY_TIMEOUT) -> bool:
+        """Poll health until the daemon reports state "ready".
+
+        Returns False on timeout, if the daemon cannot be reached, or if its
+        warm-up failed. Daemons that predate readiness states count as ready
+        once they answer.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                health = self._exchange([Request(method="health")])[0].result or {}
+            except (DaemonError, OSError, json.JSONDecodeError):
+                return False
+            state = health.get("state", "ready")
+            if state == "ready":
+                return True
+            if state == "failed" or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
     def _ensure_daemon(self) -> None:
         """Ensure daemon is running, start if needed."""
         if not ensure_running(self.project, storage_path_for(self.project)):
@@ -87,64 +218,131 @@ class MemoryClient:
         sock.settimeout(READ_TIMEOUT)
         return sock
 
-    def request(self, method: str, params: dict[str, Any] | None = None) -> Any:
-        """Send a request and return the result.
+    def _acquire(self) -> tuple[_Connection, bool]:
+        """Take an idle pooled connection or open a new one.
 
-        Raises DaemonError on communication failure.
-        Returns the result value from the response.
+        Returns (connection, reused).
         """
-        req = Request(method=method, params=params or {})
-        line = req.to_json() + "\n"
-
-        # Try with auto-start on first failure
+        if self.persistent:
+            while True:
+                with self._pool_lock:
+                    conn = self._pool.pop() if self._pool else None
+                if conn is None:
+                    break
+                if not conn.is_stale():
+                    return conn, True
+                conn.close()
+        return _Connection(self._connect()), False
+
+    def _release(self, conn: _Connection) -> None:
+        if self.persistent and not conn.is_stale():
+            with self._pool_lock:
+                if len(self._pool) < POOL_SIZE:
+                    self._pool.append(conn)
+                    return
+        conn.close()
+
+    def _exchange(self, requests: list[Request]) -> list[Response]:
+        """Send requests pipelined on one connection, return their responses.
+
+        A reused connection that the daemon closed while idle (EOF, EPIPE
+        or ECONNRESET before any response bytes) is retried once on a fresh
+        connection. Nothing else is resent: after a timeout or a partial
+        response the daemon may have applied the requests, and writes such
+        as remember are not idempotent.
+        """
+        conn, reused = self._acquire()
+        try:
+            try:
+                conn.send(requests)
+                first = conn.receive(requests[0].id)
+            except _DROPPED:
+                if not reused or conn.received:
+                    raise
+                conn.close()
+                conn = _Connection(self._connect())
+                conn.send(requests)
+                first = conn.receive(requests[0].id)
+            responses = [first] + [conn.receive(req.id) for req in requests[1:]]
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn)
+        return responses
+
+    def _exchange_with_autostart(self, requests: list[Request]) -> list[Response]:
+        # Auto-start only when nothing could be sent: a connected exchange
+        # that fails may already have been applied, so it is not retried
         for attempt in range(2):
             try:
-                sock = self._connect()
-                try:
-                    sock.sendall(line.encode())
-                    resp_line = self._read_line(sock)
-                finally:
-                    sock.close()
-
-                resp = Response.from_json(resp_line)
-                if not resp.ok:
-                    raise DaemonError(resp.error)
-                return resp.result
-
+                return self._exchange(requests)
             except DaemonUnavailable:
                 if attempt == 0:
                     # Auto-start and retry
                     self._ensure_daemon()
-                    # Wait for socket
-                    deadline = time.monotonic() + STARTUP_TIMEOUT
-                    while time.monotonic() < deadline:
-                        if is_running(self.project):
-                            break
-                        time.sleep(0.05)
+                    self.wait_ready()
                     continue
                 raise
             except (OSError, json.JSONDecodeError) as e:
-                if attempt == 0:
-                    self._ensure_daemon()
-                    continue
-                raise DaemonError(f"communication error: {e}")
+                raise DaemonError(f"communication error: {e}") from e
 
         raise DaemonUnavailable("failed after retry")
 
-    def _read_line(self, sock: socket.socket) -> str:
-        """Read a single newline-terminated line from socket."""
-        buf = bytearray()
-        while True:
-            chunk = sock.recv(65536)
-            if not chunk:
-                if buf:
-                    return buf.decode("utf-8", errors="replace").strip()
-                raise DaemonError("connection closed before response")
-            buf.extend(chunk)
-            if b"\n" in buf:
-                # Return first complete line
-                line, _ = buf.split(b"\n", 1)
-                return line.decode("utf-8", errors="replace")
+    def request(self, method: str, params: dict[str, Any] | None = None) -> Any:
+        """Send a request and return the result.
+
+        Raises DaemonError on communication failure.
+        Returns the result value from the response.
+        """
+        req = Request(method=method, params=params or {})
+        resp = self._exchange_with_autostart([req])[0]
+        if not resp.ok:
+            raise DaemonError(resp.error)
+        return resp.result
+
+    def request_many(
+        self,
+        calls: Iterable[tuple[str, dict[str, Any] | None]],
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """Pipeline several requests in one round trip.
+
+        calls is a sequence of (method, params). Results come back in the
+        same order. A failed call raises its DaemonError, or with
+        return_exceptions=True is returned in place as a DaemonError so the
+        other results are still usable.
+        """
+        reqs = [Request(method=method, params=params or {}) for method, params in calls]
+        if not reqs:
+            return []
+        results: list[Any] = []
+        for resp in self._exchange_with_autostart(reqs):
+            if resp.ok:
+                results.append(resp.result)
+            elif return_exceptions:
+                results.append(DaemonError(resp.error))
+            else:
+                raise DaemonError(resp.error)
+        return results
+
+    def batch(self, calls: Iterable[tuple[str, dict[str, Any] | None]]) -> list[Any]:
+        """Run several calls through the daemon's batch method in one request.
+
+        Unlike request_many() the daemon executes the reads concurrently
+        (writes act as ordering barriers). Results are in call order; a
+        failed call is returned in place as a DaemonError.
+        """
+        subs = [
+            {"id": str(i), "method": method, "params": params or {}}
+            for i, (method, params) in enumerate(calls)
+        ]
+        if not subs:
+            return []
+        results = []
+        for item in self.request("batch", {"requests": subs}):
+            resp = Response.from_dict(item)
+            results.append(resp.result if resp.ok else DaemonError(resp.error))
+        return results
 
     # ─── Convenience methods (1:1 with MemorySystem) ─────────
 
@@ -131,11 +131,14 @@ def status(project: str) -> dict:
     }
 
 
-def start(project: str, storage_path: str = "", foreground: bool = False) -> int:
+def start(
+    project: str, storage_path: str = "", foreground: bool = False, warmup: bool = True,
+) -> int:
     """Start daemon for project. Returns PID (0 on failure).
 
     If foreground=True, runs in current process (blocking).
     Otherwise daemonizes via subprocess.
+    warmup=False skips the eager MemorySystem load (loaded on first request).
     """
     if is_running(project):
         info = _check_daemon(project)
@@ -152,7 +155,7 @@ def start(project: str, storage_path: str = "", foreground: bool = False) -> int
 
     if foreground:
         # Run directly (blocking) — used by `wt-memoryd run`
-        _run_server(project, storage_path, sock, pidfile)
+        _run_server(project, storage_path, sock, pidfile, warmup=warmup)
         return os.getpid()
 
     # Daemonize: spawn detached subprocess
@@ -167,6 +170,8 @@ def start(project: str, storage_path: str = "", foreground: bool = False) -> int
         "run", "--project", project,
         "--storage", storage_path,
     ]
+    if not warmup:
+        cmd.append("--no-warmup")
 
     with open(logfile, "a") as log:
         proc = subprocess.Popen(
@@ -233,7 +238,7 @@ def ensure_running(project: str, storage_path: str = "") -> bool:
 
 
 def _run_server(
-    project: str, storage_path: str, socket_path: str, pid_path: str
+    project: str, storage_path: str, socket_path: str, pid_path: str, warmup: bool = True,
 ) -> None:
     """Run the daemon server (blocking). Used for foreground mode."""
     import asyncio
@@ -244,6 +249,8 @@ def _run_server(
         storage_path=storage_path,
         socket_path=socket_path,
         pid_path=pid_path,
+        # None lets WT_MEMORYD_WARMUP decide; --no-warmup always wins
+        warmup=None if warmup else False,
     )
     asyncio.run(daemon.run())
 
@@ -4,6 +4,12 @@ Request:  {"id": "abc", "method": "recall", "params": {"query": "...", "limit":
 Response: {"id": "abc", "result": [...]}
 Error:    {"id": "abc", "error": "message"}
 
+Batch:    {"id": "b1", "method": "batch", "params": {"requests": [
+              {"id": "r1", "method": "recall", "params": {...}}, ...]}}
+          -> {"id": "b1", "result": [{"id": "r1", "result": [...]}, ...]}
+          Sub-results are in request order; a failed sub-request carries
+          "error" instead of "result" without failing the batch.
+
 Each message is a single JSON line terminated by newline.
 """
 
@@ -27,8 +33,16 @@ SUPPORTED_METHODS = frozenset({
     "flush", "consolidation_report", "graph_stats",
     # Daemon lifecycle
     "health", "shutdown",
+    # Several sub-requests in one call
+    "batch",
 })
 
+# Methods that mutate storage; the daemon runs these one at a time
+WRITE_METHODS = frozenset({"remember", "forget", "forget_by_tags", "flush"})
+
+# Methods allowed inside a batch (everything that reaches MemorySystem)
+BATCH_METHODS = SUPPORTED_METHODS - {"health", "shutdown", "batch"}
+
 
 @dataclass
 class Request:
@@ -59,17 +73,23 @@ class Response:
     result: Any = None
     error: str | None = None
 
-    def to_json(self) -> str:
+    def to_dict(self) -> dict[str, Any]:
         d: dict[str, Any] = {"id": self.id}
         if self.error is not None:
             d["error"] = self.error
         else:
             d["result"] = self.result
-        return json.dumps(d)
+        return d
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
 
     @classmethod
     def from_json(cls, line: str) -> Response:
-        data = json.loads(line)
+        return cls.from_dict(json.loads(line))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Response:
         return cls(
             id=data.get("id", ""),
             result=data.get("result"),
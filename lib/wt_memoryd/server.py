@@ -1,6 +1,19 @@
 """asyncio Unix socket server wrapping shodh-memory MemorySystem.
 
 Handles JSON-lines requests, idle timeout (30 min), graceful shutdown via SIGTERM.
+
+Reads (recall, proactive_context, ...) run on a pool of read_concurrency
+threads; writes (WRITE_METHODS) go through a single-thread executor so they
+never overlap each other. The "batch" method runs a list of sub-requests in
+one call: consecutive reads run concurrently, a write waits for the reads
+before it and the reads after it wait for the write, so a batch sees its own
+writes.
+
+With warmup (the default) MemorySystem is loaded and one dummy embedding is
+computed right after the socket is bound, so the first hook of a session
+does not pay the RocksDB/model load. health reports the readiness state:
+"warming" -> "ready" (or "failed"); requests arriving while warming wait
+for it to finish.
 """
 
 from __future__ import annotations
@@ -11,12 +24,17 @@ import logging
 import os
 import signal
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+from .cache import INVALIDATING_METHODS, RecallCache, cache_key, cache_options_from_env
 from .protocol import (
+    BATCH_METHODS,
     SUPPORTED_METHODS,
+    WRITE_METHODS,
     Request,
     Response,
     make_error,
@@ -27,6 +45,32 @@ logger = logging.getLogger("wt-memoryd")
 
 # Default idle timeout: 30 minutes
 DEFAULT_IDLE_TIMEOUT = 30 * 60
+# Read requests executed in parallel (override: WT_MEMORYD_READ_CONCURRENCY)
+DEFAULT_READ_CONCURRENCY = 4
+# Upper bound on sub-requests in one batch
+MAX_BATCH_SIZE = 64
+# Query used to force the embedding model to load during warm-up
+WARMUP_QUERY = "wt-memoryd warmup"
+
+# Readiness states reported by health
+STATE_STARTING = "starting"
+STATE_WARMING = "warming"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+
+def warmup_from_env() -> bool:
+    """False if WT_MEMORYD_WARMUP is set to 0/false/no/off."""
+    return os.environ.get("WT_MEMORYD_WARMUP", "1").lower() not in ("0", "false", "no", "off")
+
+
+def read_concurrency_from_env() -> int:
+    """WT_MEMORYD_READ_CONCURRENCY, or the default if unset/invalid."""
+    try:
+        value = int(os.environ.get("WT_MEMORYD_READ_CONCURRENCY", ""))
+    except ValueError:
+        return DEFAULT_READ_CONCURRENCY
+    return value if value > 0 else DEFAULT_READ_CONCURRENCY
 
 
 class MemoryDaemon:
@@ -39,32 +83,102 @@ class MemoryDaemon:
         socket_path: str,
         pid_path: str,
         idle_timeout: int = DEFAULT_IDLE_TIMEOUT,
+        read_concurrency: int | None = None,
+        cache: RecallCache | None = None,
+        warmup: bool | None = None,
     ):
         self.project = project
         self.storage_path = storage_path
         self.socket_path = socket_path
         self.pid_path = pid_path
         self.idle_timeout = idle_timeout
-
-        self._memory = None  # lazy-loaded MemorySystem
+        self.read_concurrency = read_concurrency or read_concurrency_from_env()
+        self._read_pool = ThreadPoolExecutor(
+            max_workers=self.read_concurrency, thread_name_prefix="memoryd-read",
+        )
+        self._write_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="memoryd-write",
+        )
+        self.cache = cache if cache is not None else RecallCache(**cache_options_from_env())
+        self.warmup = warmup_from_env() if warmup is None else warmup
+
+        self._memory = None  # MemorySystem, loaded by warm-up or first request
+        self._memory_lock = threading.Lock()
+        self._state = STATE_STARTING
+        self._state_error = ""
+        self._warmup_task: asyncio.Task | None = None
+        self._warmup_ms: dict[str, int] = {}
+        self._first_request_logged = False
         self._server: asyncio.Server | None = None
         self._last_activity = time.monotonic()
         self._shutdown_event = asyncio.Event()
         self._request_count = 0
+        self._batch_count = 0
         self._active_connections = 0
 
     def _init_memory(self) -> None:
-        """Initialize shodh MemorySystem (one-time, lazy)."""
+        """Initialize shodh MemorySystem (one-time; safe from any thread)."""
         if self._memory is not None:
             return
+        with self._memory_lock:
+            if self._memory is not None:
+                return
+
+            try:
+                from shodh.memory import Memory
+            except ImportError:
+                from shodh_memory import Memory
+
+            t0 = time.monotonic()
+            memory = Memory(storage_path=self.storage_path)
+            self._warmup_ms["init"] = int((time.monotonic() - t0) * 1000)
+            self._memory = memory
+        logger.info(
+            "MemorySystem initialized for project=%s storage=%s (%dms)",
+            self.project, self.storage_path, self._warmup_ms["init"],
+        )
+
+    def _warm_up_sync(self) -> None:
+        """Load storage and compute one embedding (runs in an executor)."""
+        self._init_memory()
+        t0 = time.monotonic()
+        self._memory.recall(query=WARMUP_QUERY, limit=1)
+        self._warmup_ms["embed"] = int((time.monotonic() - t0) * 1000)
 
+    async def _warm_up(self) -> None:
+        self._state = STATE_WARMING
+        t0 = time.monotonic()
         try:
-            from shodh.memory import Memory
-        except ImportError:
-            from shodh_memory import Memory
+            await asyncio.get_running_loop().run_in_executor(self._write_pool, self._warm_up_sync)
+        except Exception as e:
+            self._state = STATE_FAILED
+            self._state_error = str(e)
+            logger.error("warm-up failed: %s", e)
+            return
+        self._warmup_ms["total"] = int((time.monotonic() - t0) * 1000)
+        self._state = STATE_READY
+        logger.info(
+            "warm-up complete: init=%dms first_embedding=%dms total=%dms",
+            self._warmup_ms.get("init", 0), self._warmup_ms.get("embed", 0),
+            self._warmup_ms["total"],
+        )
 
-        self._memory = Memory(storage_path=self.storage_path)
-        logger.info("MemorySystem initialized for project=%s storage=%s", self.project, self.storage_path)
+    async def _ensure_memory(self) -> None:
+        """Make MemorySystem available, waiting for an in-progress warm-up."""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            await asyncio.shield(self._warmup_task)
+        if self._memory is None:
+            await asyncio.get_running_loop().run_in_executor(self._write_pool, self._init_memory)
+
+    def _log_first_request(self, method: str, elapsed: float) -> None:
+        """Log the first MemorySystem call's latency next to the cold-load cost."""
+        self._first_request_logged = True
+        cold = self._warmup_ms.get("init", 0) + self._warmup_ms.get("embed", 0)
+        logger.info(
+            "first request: method=%s %dms (%s; cold load %dms)",
+            method, int(elapsed * 1000),
+            "warm" if self._warmup_ms.get("total") else "cold", cold,
+        )
 
     def _touch_activity(self) -> None:
         self._last_activity = time.monotonic()
@@ -84,10 +198,17 @@ class MemoryDaemon:
         if method == "health":
             return make_result(request.id, {
                 "status": "ok",
+                "state": self._state,
+                "error": self._state_error or None,
+                "memory_loaded": self._memory is not None,
+                "warmup_ms": dict(self._warmup_ms),
                 "project": self.project,
                 "uptime_s": int(time.monotonic() - self._start_time),
                 "requests": self._request_count,
+                "batches": self._batch_count,
                 "connections": self._active_connections,
+                "read_concurrency": self.read_concurrency,
+                "cache": self.cache.stats(),
             })
 
         if method == "shutdown":
@@ -95,19 +216,87 @@ class MemoryDaemon:
             return make_result(request.id, {"status": "shutting_down"})
 
         # All other methods need MemorySystem
+        started = time.monotonic()
         try:
-            self._init_memory()
+            await self._ensure_memory()
         except Exception as e:
             return make_error(request.id, f"MemorySystem init failed: {e}")
 
+        if method == "batch":
+            response = await self._handle_batch(request)
+        else:
+            response = await self._execute(request.id, method, params)
+        if not self._first_request_logged:
+            self._log_first_request(method, time.monotonic() - started)
+        return response
+
+    async def _execute(self, request_id: str, method: str, params: dict[str, Any]) -> Response:
+        """Run one MemorySystem call on the read pool or the write executor.
+
+        Cacheable reads are answered from the recall cache when possible;
+        invalidating writes bump its generation once they finish.
+        """
+        key = cache_key(method, params) if self.cache.enabled else None
+        if key is not None:
+            hit, cached = self.cache.get(key)
+            if hit:
+                return make_result(request_id, cached)
+        generation = self.cache.generation
+
+        pool = self._write_pool if method in WRITE_METHODS else self._read_pool
         try:
-            result = await asyncio.get_event_loop().run_in_executor(
-                None, self._dispatch, method, params
+            result = await asyncio.get_running_loop().run_in_executor(
+                pool, self._dispatch, method, params
             )
-            return make_result(request.id, result)
         except Exception as e:
             logger.error("method=%s error: %s", method, e)
-            return make_error(request.id, str(e))
+            return make_error(request_id, str(e))
+        finally:
+            if method in INVALIDATING_METHODS:
+                self.cache.invalidate()
+
+        if key is not None:
+            self.cache.put(key, result, generation)
+        elif method == "stats" and isinstance(result, dict):
+            result["daemon_cache"] = self.cache.stats()
+        return make_result(request_id, result)
+
+    async def _handle_batch(self, request: Request) -> Response:
+        """Execute params["requests"] and return their responses in order."""
+        subs = request.params.get("requests")
+        if not isinstance(subs, list):
+            return make_error(request.id, "batch: 'requests' must be a list")
+        if len(subs) > MAX_BATCH_SIZE:
+            return make_error(request.id, f"batch: too many requests (max {MAX_BATCH_SIZE})")
+        self._batch_count += 1
+        self._request_count += len(subs)
+
+        responses: list[Response | None] = [None] * len(subs)
+        reads: list[tuple[int, Any]] = []
+
+        async def run_reads() -> None:
+            results = await asyncio.gather(*(coro for _, coro in reads))
+            for (i, _), resp in zip(reads, results):
+                responses[i] = resp
+            reads.clear()
+
+        for i, sub in enumerate(subs):
+            if not isinstance(sub, dict):
+                responses[i] = make_error("", "batch: sub-request must be an object")
+                continue
+            sub_id = str(sub.get("id", i))
+            method = sub.get("method", "")
+            params = sub.get("params") or {}
+            if method not in BATCH_METHODS:
+                responses[i] = make_error(sub_id, f"method not allowed in batch: {method}")
+            elif method in WRITE_METHODS:
+                await run_reads()
+                responses[i] = await self._execute(sub_id, method, params)
+            else:
+                reads.append((i, self._execute(sub_id, method, params)))
+        await run_reads()
+
+        return make_result(request.id, [r.to_dict() for r in responses])
 
     def _dispatch(self, method: str, params: dict[str, Any]) -> Any:
         """Synchronous dispatch to MemorySystem (runs in executor)."""
@@ -296,16 +485,26 @@ class MemoryDaemon:
         os.chmod(self.socket_path, 0o600)
 
         logger.info(
-            "wt-memoryd started: project=%s socket=%s pid=%d",
-            self.project, self.socket_path, os.getpid(),
+            "wt-memoryd started: project=%s socket=%s pid=%d warmup=%s",
+            self.project, self.socket_path, os.getpid(), self.warmup,
         )
 
+        # Warm up in the background so health can already answer "warming";
+        # without warm-up MemorySystem loads lazily on the first request
+        if self.warmup:
+            self._state = STATE_WARMING
+            self._warmup_task = asyncio.create_task(self._warm_up())
+        else:
+            self._state = STATE_READY
+
         # Run until shutdown
         watchdog = asyncio.create_task(self._idle_watchdog())
         try:
             await self._shutdown_event.wait()
         finally:
             watchdog.cancel()
+            if self._warmup_task is not None and not self._warmup_task.done():
+                await asyncio.wait([self._warmup_task])
             await self._graceful_shutdown()
 
     async def _graceful_shutdown(self) -> None:
@@ -323,6 +522,9 @@ class MemoryDaemon:
             except Exception as e:
                 logger.error("flush error: %s", e)
 
+        self._read_pool.shutdown(wait=False)
+        self._write_pool.shutdown(wait=False)
+
         # Cleanup files
         for path in (self.socket_path, self.pid_path):
             try:
@@ -330,7 +532,11 @@ class MemoryDaemon:
             except FileNotFoundError:
                 pass
 
-        logger.info("shutdown complete (served %d requests)", self._request_count)
+        cache = self.cache.stats()
+        logger.info(
+            "shutdown complete (served %d requests, recall cache %d hits / %d misses)",
+            self._request_count, cache["hits"], cache["misses"],
+        )
 
 
 def _serialize(obj: Any) -> Any:
@@ -7,6 +7,7 @@ Write endpoints for approve, stop, skip.
 from __future__ import annotations
 
 import fcntl
+import functools
 import json
 import os
 import subprocess
@@ -15,10 +16,17 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
 
+from .enrichment import claude_sessions_dir, dir_index, enrich_changes
+from .events import EventBus
+from .http_cache import response_cache
+from .io_pool import io_pool, loop_lag
 from .process import check_pid, safe_kill
-from .state import load_state, save_state, StateCorruptionError
+from .state import JOURNAL_SUFFIX, load_state, read_state_data, save_state, StateCorruptionError
+from .tail import tail_lines
 
 router = APIRouter()
 
@@ -125,6 +133,13 @@ def _log_path(project_path: Path) -> Path:
     return new
 
 
+def _read_log_tail(log_file: Path, n: int = 2000) -> list[str]:
+    """Last n lines of a log file, read backwards from EOF."""
+    if not os.access(log_file, os.R_OK):
+        raise HTTPException(500, "Failed to read log")
+    return tail_lines(log_file, n)
+
+
 def _quick_status(project_path: Path) -> str:
     """Get quick orchestration status without full state parse."""
     sp = _state_path(project_path)
@@ -150,16 +165,10 @@ def _quick_status(project_path: Path) -> str:
                 pass
         return "idle"
     try:
-        with open(sp) as f:
-            raw = f.read()
-        if "<<<<<<" in raw:
-            return "corrupt"
-        data = json.loads(raw)
-        return data.get("status", "idle")
-    except json.JSONDecodeError:
-        return "corrupt"
-    except OSError:
-        return "error"
+        data = read_state_data(str(sp))
+    except StateCorruptionError as e:
+        return "error" if e.detail.startswith("cannot read") else "corrupt"
+    return data.get("status", "idle")
 
 
 # ─── Worktree & activity helpers ──────────────────────────────────────
@@ -300,6 +309,117 @@ def _with_state_lock(state_file: Path, fn):
 # ─── READ endpoints ──────────────────────────────────────────────────
 
 
+def _offload(fn):
+    """Run a blocking read route on the shared I/O pool instead of the event loop.
+
+    Calls are limited per project (the route's `project` argument), so one
+    project with a slow filesystem cannot occupy every worker.
+    """
+
+    @functools.wraps(fn)
+    async def route(*args, **kwargs):
+        return await io_pool.run(kwargs.get("project", ""), fn, *args, **kwargs)
+
+    return route
+
+
+def _validated(deps):
+    """Serve a read route from response_cache while its input files are unchanged.
+
+    deps(project_path, result, **kwargs) lists the files and directories the
+    result was built from. Later requests only stat() them; the body is
+    rebuilt once one changed. Responses carry a content-hash ETag.
+    """
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def route(*args, **kwargs):
+            project_path = _resolve_project(kwargs["project"])
+            key = (fn.__name__, str(project_path), *sorted(kwargs.items()))
+            cached = response_cache.lookup(key)
+            if cached is not None:
+                return _json_response(cached.body, cached.etag)
+            built_at = time.time()
+            result = fn(*args, **kwargs)
+            body = JSONResponse(jsonable_encoder(result)).body
+            etag = response_cache.store(key, deps(project_path, result, **kwargs), body, built_at)
+            return _json_response(body, etag)
+
+        return route
+
+    return decorate
+
+
+def _json_response(body: bytes, etag: str) -> Response:
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def _state_files(project_path: Path) -> list[Path]:
+    """Both state file locations and their journals."""
+    paths = []
+    for sp in (project_path / "wt" / "orchestration" / "orchestration-state.json",
+               project_path / "orchestration-state.json"):
+        paths += [sp, Path(str(sp) + JOURNAL_SUFFIX)]
+    return paths
+
+
+def _worktrees_of(changes) -> list[str]:
+    return [c["worktree_path"] for c in changes if isinstance(c, dict) and c.get("worktree_path")]
+
+
+def _state_deps(project_path: Path, result: dict, **_) -> list[Path]:
+    paths = _state_files(project_path)
+    paths += [project_path / "wt" / "orchestration" / "state-archive.jsonl", claude_sessions_dir(project_path)]
+    for wt in _worktrees_of(result.get("changes", [])):
+        paths += [Path(wt) / ".claude" / "logs", claude_sessions_dir(wt)]
+    return paths
+
+
+def _changes_deps(project_path: Path, result: list, **_) -> list[Path]:
+    paths = _state_files(project_path)
+    for wt in _worktrees_of(result):
+        paths += [Path(wt) / ".claude" / "loop-state.json", Path(wt) / ".claude" / "logs"]
+    return paths
+
+
+def _digest_deps(project_path: Path, result: dict, **_) -> list[Path]:
+    digest_dir = project_path / "wt" / "orchestration" / "digest"
+    paths = [digest_dir, digest_dir / "domains", digest_dir / "triage.md", digest_dir / "data-definitions.md"]
+    paths += [digest_dir / f"{name}.json" for name in (
+        "index", "requirements", "coverage", "dependencies", "ambiguities", "conventions", "coverage-merged",
+    )]
+    paths += [digest_dir / "domains" / f"{name}.md" for name in result.get("domains", {})]
+    return paths
+
+
+def _requirements_deps(project_path: Path, result: dict, **_) -> list[Path]:
+    plans_dir = project_path / "wt" / "orchestration" / "plans"
+    paths = [plans_dir, *_state_files(project_path)]
+    try:
+        paths += sorted(f for f in plans_dir.iterdir() if f.suffix == ".json")
+    except OSError:
+        pass
+    return paths
+
+
+def _events_deps(project_path: Path, result: dict, **_) -> list[Path]:
+    return [
+        project_path / "orchestration-state-events.jsonl",
+        project_path / "wt" / "orchestration" / "orchestration-state-events.jsonl",
+    ]
+
+
+@router.get("/api/runtime")
+async def get_runtime():
+    """Event-loop lag samples, I/O pool usage per project, cache counters."""
+    return {
+        "loop": loop_lag.as_dict(),
+        "io": io_pool.stats(),
+        "dir_index": dir_index.stats(),
+        "responses": response_cache.stats(),
+    }
+
+
 @router.get("/api/projects")
 def list_projects():
     """List all registered projects with quick status and last_updated."""
@@ -333,44 +453,13 @@ def list_projects():
 
 
 def _enrich_changes(data: dict, project_path: Path):
-    """Add session_count and log file lists to change dicts."""
-    for c in data.get("changes", []):
-        wt_path = c.get("worktree_path")
-        # Session count (only for changes that have/had a worktree)
-        sessions_dir = None
-        if wt_path:
-            mangled = wt_path.lstrip("/").replace("/", "-")
-            d = Path.home() / ".claude" / "projects" / f"-{mangled}"
-            if d.is_dir():
-                sessions_dir = d
-            elif c.get("status") in ("done", "merged", "failed", "verify-failed"):
-                # Worktree cleaned up, fall back to project path
-                mangled = str(project_path).lstrip("/").replace("/", "-")
-                d = Path.home() / ".claude" / "projects" / f"-{mangled}"
-                if d.is_dir():
-                    sessions_dir = d
-        if sessions_dir:
-            try:
-                c["session_count"] = sum(
-                    1 for f in sessions_dir.iterdir()
-                    if f.is_file() and f.suffix == ".jsonl"
-                )
-            except OSError:
-                pass
-        # Log files
-        if wt_path:
-            logs_dir = Path(wt_path) / ".claude" / "logs"
-            if logs_dir.is_dir():
-                try:
-                    c["logs"] = sorted(
-                        f.name for f in logs_dir.iterdir()
-                        if f.is_file() and f.suffix == ".log"
-                    )
-                except OSError:
-                    pass
+    """Add session_count and log file lists to change dicts (cached listings)."""
+    enrich_changes(data.get("changes", []), project_path)
 
 
 @router.get("/api/{project}/state")
+@_offload
+@_validated(_state_deps)
 def get_state(project: str):
     """Get full orchestration state for a project."""
     project_path = _resolve_project(project)
@@ -394,6 +483,8 @@ def get_state(project: str):
 
 
 @router.get("/api/{project}/changes")
+@_offload
+@_validated(_changes_deps)
 def list_changes(project: str, status: Optional[str] = Query(None)):
     """List orchestration changes, optionally filtered by status."""
     project_path = _resolve_project(project)
@@ -425,17 +516,15 @@ def list_changes(project: str, status: Optional[str] = Query(None)):
                 except (json.JSONDecodeError, OSError):
                     pass
             # Enrich with available log files
-            logs_dir = wt_path / ".claude" / "logs"
-            if logs_dir.is_dir():
-                d["logs"] = sorted(
-                    f.name for f in logs_dir.iterdir()
-                    if f.is_file() and f.suffix == ".log"
-                )
+            logs = dir_index.names(wt_path / ".claude" / "logs", ".log")
+            if logs is not None:
+                d["logs"] = logs
         result.append(d)
     return result
 
 
 @router.get("/api/{project}/changes/{name}")
+@_offload
 def get_change(project: str, name: str):
     """Get a single change by name."""
     project_path = _resolve_project(project)
@@ -466,6 +555,7 @@ def get_change(project: str, name: str):
 
 
 @router.get("/api/{project}/worktrees")
+@_offload
 def list_worktrees_endpoint(project: str):
     """List git worktrees with loop-state and activity data."""
     project_path = _resolve_project(project)
@@ -487,11 +577,7 @@ def get_worktree_log(project: str, branch: str, filename: str):
             log_file = Path(wt["path"]) / ".claude" / "logs" / filename
             if not log_file.exists():
                 raise HTTPException(404, f"Log file not found: {filename}")
-            try:
-                content = log_file.read_text(errors="replace")
-                return {"filename": filename, "lines": content.splitlines()[-2000:]}
-            except OSError:
-                raise HTTPException(500, "Failed to read log")
+            return {"filename": filename, "lines": _read_log_tail(log_file)}
     raise HTTPException(404, f"Worktree not found: {branch}")
 
 
@@ -509,6 +595,7 @@ def get_worktree_reflection(project: str, branch: str):
 
 
 @router.get("/api/{project}/changes/{name}/logs")
+@_offload
 def get_change_logs(project: str, name: str):
     """List available log files for a change (from its worktree)."""
     project_path = _resolve_project(project)
@@ -525,21 +612,11 @@ def get_change_logs(project: str, name: str):
             logs = []
             # Try worktree first
             if c.worktree_path:
-                wt_path = Path(c.worktree_path)
-                logs_dir = wt_path / ".claude" / "logs"
-                if logs_dir.is_dir():
-                    logs = sorted(
-                        f.name for f in logs_dir.iterdir()
-                        if f.is_file() and f.suffix == ".log"
-                    )
+                logs = dir_index.names(Path(c.worktree_path) / ".claude" / "logs", ".log") or []
             # Fallback: archived logs
             if not logs:
                 archive_dir = project_path / "wt" / "orchestration" / "logs" / name
-                if archive_dir.is_dir():
-                    logs = sorted(
-                        f.name for f in archive_dir.iterdir()
-                        if f.is_file() and f.suffix == ".log"
-                    )
+                logs = dir_index.names(archive_dir, ".log") or []
             result: dict = {"logs": logs}
             # Include iteration info
             if c.worktree_path:
@@ -587,11 +664,7 @@ def get_change_log(project: str, name: str, filename: str):
                     log_file = candidate
             if not log_file:
                 raise HTTPException(404, f"Log file not found: {filename}")
-            try:
-                content = log_file.read_text(errors="replace")
-                return {"filename": filename, "lines": content.splitlines()[-2000:]}
-            except OSError:
-                raise HTTPException(500, "Failed to read log")
+            return {"filename": filename, "lines": _read_log_tail(log_file)}
     raise HTTPException(404, f"Change not found: {name}")
 
 
@@ -605,14 +678,12 @@ def _sessions_dir_for_change(state, name: str, project_path: Path | None = None)
         if c.name == name:
             # Try worktree path first
             if c.worktree_path:
-                mangled = c.worktree_path.lstrip("/").replace("/", "-")
-                d = Path.home() / ".claude" / "projects" / f"-{mangled}"
+                d = claude_sessions_dir(c.worktree_path)
                 if d.is_dir():
                     return c, d
             # Fallback: project path
             if project_path:
-                mangled = str(project_path).lstrip("/").replace("/", "-")
-                d = Path.home() / ".claude" / "projects" / f"-{mangled}"
+                d = claude_sessions_dir(project_path)
                 if d.is_dir():
                     return c, d
             return c, None
@@ -711,6 +782,7 @@ def _list_session_files(sessions_dir: Path) -> list[dict]:
 
 
 @router.get("/api/{project}/changes/{name}/sessions")
+@_offload
 def list_change_sessions(project: str, name: str):
     """List all Claude session files for a change."""
     project_path = _resolve_project(project)
@@ -731,6 +803,7 @@ def list_change_sessions(project: str, name: str):
 
 
 @router.get("/api/{project}/changes/{name}/session")
+@_offload
 def get_change_session_log(
     project: str, name: str,
     session_id: Optional[str] = Query(None),
@@ -866,26 +939,25 @@ def _parse_session_jsonl(path: Path, tail: int) -> list[str]:
 
 
 @router.get("/api/{project}/sessions")
+@_offload
 def list_project_sessions(project: str):
     """List all Claude session files for the project itself (not change-specific)."""
     project_path = _resolve_project(project)
-    mangled = str(project_path).lstrip("/").replace("/", "-")
-    sessions_dir = Path.home() / ".claude" / "projects" / f"-{mangled}"
+    sessions_dir = claude_sessions_dir(project_path)
     if not sessions_dir.is_dir():
         return {"sessions": []}
     return {"sessions": _list_session_files(sessions_dir)}
 
 
 @router.get("/api/{project}/sessions/{session_id}")
+@_offload
 def get_project_session(
     project: str, session_id: str,
     tail: int = Query(200, ge=1, le=2000),
 ):
     """Read a Claude session log for the project (parsed from JSONL)."""
     project_path = _resolve_project(project)
-    mangled = str(project_path).lstrip("/").replace("/", "-")
-    sessions_dir = Path.home() / ".claude" / "projects" / f"-{mangled}"
-    target = sessions_dir / f"{session_id}.jsonl"
+    target = claude_sessions_dir(project_path) / f"{session_id}.jsonl"
     if not target.is_file():
         raise HTTPException(404, f"Session not found: {session_id}")
     lines = _parse_session_jsonl(target, tail)
@@ -893,6 +965,7 @@ def get_project_session(
 
 
 @router.get("/api/{project}/activity")
+@_offload
 def get_activity(project: str):
     """Get agent activity from all worktrees."""
     project_path = _resolve_project(project)
@@ -900,6 +973,7 @@ def get_activity(project: str):
 
 
 @router.get("/api/{project}/log")
+@_offload
 def get_log(project: str, lines: int = Query(500, ge=1, le=10000)):
     """Get the last N lines of the orchestration log."""
     project_path = _resolve_project(project)
@@ -907,23 +981,7 @@ def get_log(project: str, lines: int = Query(500, ge=1, le=10000)):
     if not lp.exists():
         return {"lines": []}
 
-    try:
-        with open(lp, "rb") as f:
-            # Efficient tail read: seek to end, read backwards
-            f.seek(0, 2)
-            file_size = f.tell()
-            if file_size == 0:
-                return {"lines": []}
-
-            # Read in chunks from the end
-            chunk_size = min(file_size, lines * 200)  # estimate ~200 bytes/line
-            f.seek(max(0, file_size - chunk_size))
-            content = f.read().decode("utf-8", errors="replace")
-
-        all_lines = content.splitlines()
-        return {"lines": all_lines[-lines:]}
-    except OSError:
-        return {"lines": []}
+    return {"lines": tail_lines(lp, lines)}
 
 
 # ─── Screenshots, Plans, Events ──────────────────────────────────────
@@ -1021,6 +1079,8 @@ def get_plan(project: str, filename: str):
 
 
 @router.get("/api/{project}/digest")
+@_offload
+@_validated(_digest_deps)
 def get_digest(project: str):
     """Return digest data: index, requirements, coverage, domains, dependencies, ambiguities."""
     project_path = _resolve_project(project)
@@ -1072,6 +1132,8 @@ def get_digest(project: str):
 
 
 @router.get("/api/{project}/requirements")
+@_offload
+@_validated(_requirements_deps)
 def get_requirements(project: str):
     """Aggregate requirements across all plan versions with live status from state.
 
@@ -1227,6 +1289,8 @@ def get_requirements(project: str):
 
 
 @router.get("/api/{project}/events")
+@_offload
+@_validated(_events_deps)
 def get_events(project: str, type: Optional[str] = Query(None), limit: int = Query(500, ge=1, le=5000)):
     """Read orchestration state events, optionally filtered by type."""
     project_path = _resolve_project(project)
@@ -1236,23 +1300,20 @@ def get_events(project: str, type: Optional[str] = Query(None), limit: int = Que
         events_file = project_path / "wt" / "orchestration" / "orchestration-state-events.jsonl"
     if not events_file.exists():
         return {"events": []}
-    events = []
-    try:
-        with open(events_file) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    ev = json.loads(line)
-                    if type and ev.get("type") != type:
-                        continue
-                    events.append(ev)
-                except json.JSONDecodeError:
-                    continue
-    except OSError:
-        return {"events": []}
-    return {"events": events[-limit:]}
+    # Indexed lookup: seeks to the matching lines instead of parsing the log
+    bus = EventBus(log_path=events_file, enabled=False)
+    return {"events": bus.query(event_type=type or None, limit=limit)}
+
+
+@router.get("/api/{project}/watcher")
+def get_watcher_stats(project: str, request: Request):
+    """File watcher counters for a project: events, coalescing, CPU time, watch set."""
+    _resolve_project(project)
+    manager = getattr(request.app.state, "watcher_manager", None)
+    watcher = manager.get_watcher(project) if manager else None
+    if watcher is None:
+        return {"active": False}
+    return {"active": True, **watcher.stats_snapshot()}
 
 
 @router.get("/api/{project}/settings")
@@ -1386,6 +1447,7 @@ def _run_wt_memory(project_path: Path, args: list[str], timeout: int = 10) -> di
 
 
 @router.get("/api/{project}/memory")
+@_offload
 def get_memory_overview(project: str):
     """Aggregate memory stats, health, and sync status in a single call."""
     project_path = _resolve_project(project)
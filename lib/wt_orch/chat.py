@@ -18,6 +18,8 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from .api import _resolve_project
 from .chat_context import build_chat_context
+from .http_cache import stat_signature
+from .state import JOURNAL_SUFFIX, read_state_data
 
 logger = logging.getLogger("wt-web.chat")
 
@@ -40,7 +42,8 @@ class ChatSession:
         self._clients: set[WebSocket] = set()
         self._generation: int = 0  # Incremented on stop/new_session to invalidate stale tasks
         self._state_watcher: asyncio.Task | None = None
-        self._last_state_mtime: float = 0.0
+        # Stat signature of the state file and its journal as last pushed
+        self._last_state_sig: tuple = ()
 
     async def send_message(self, text: str) -> None:
         """Send a user message — spawns a claude subprocess.
@@ -280,7 +283,7 @@ class ChatSession:
             self._state_watcher = None
 
     async def _watch_state(self) -> None:
-        """Poll orchestration-state.json for changes, push updates to clients."""
+        """Poll orchestration-state.json (and its journal) for changes, push updates to clients."""
         state_paths = [
             self.project_path / "wt" / "orchestration" / "orchestration-state.json",
             self.project_path / "orchestration-state.json",
@@ -291,14 +294,14 @@ class ChatSession:
                 if not self._clients:
                     break
                 for sp in state_paths:
-                    try:
-                        mtime = sp.stat().st_mtime
-                    except OSError:
+                    if not sp.is_file():
                         continue
-                    if mtime > self._last_state_mtime:
-                        self._last_state_mtime = mtime
+                    # Journaled updates only touch the journal file
+                    sig = stat_signature([sp, f"{sp}{JOURNAL_SUFFIX}"])
+                    if sig != self._last_state_sig:
+                        self._last_state_sig = sig
                         try:
-                            data = json.loads(sp.read_text())
+                            data = read_state_data(str(sp))
                             summary = self._summarize_state(data)
                             await self._broadcast({"type": "state_update", **summary})
                         except Exception as e:
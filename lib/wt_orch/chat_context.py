@@ -7,11 +7,12 @@ the latest state alongside the project's CLAUDE.md.
 
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import Any
 
+from .state import StateCorruptionError, read_state_data
+
 logger = logging.getLogger("wt-web.chat-context")
 
 
@@ -166,8 +167,8 @@ def _read_state(project_path: Path) -> dict[str, Any] | str | None:
         path = project_path / rel
         if path.is_file():
             try:
-                return json.loads(path.read_text())
-            except (json.JSONDecodeError, OSError) as e:
+                return read_state_data(str(path))
+            except StateCorruptionError as e:
                 logger.warning(f"Failed to read state: {e}")
                 return "State fájl olvashatatlan."
     return None
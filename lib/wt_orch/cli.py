@@ -44,6 +44,7 @@ def cmd_state(args):
     from .state import (
         advance_phase,
         cascade_failed_deps,
+        compact_state,
         count_changes_by_status,
         deps_satisfied,
         get_change_status,
@@ -153,15 +154,19 @@ def cmd_state(args):
         )
         sys.exit(0 if success else 1)
 
+    elif args.state_cmd == "compact":
+        compact_state(args.file, lock=not args.lock_held)
+        sys.exit(0)
+
 
 def _make_event_bus(state_file: str):
     """Create an EventBus from a state file path."""
     from pathlib import Path
-    from .events import EventBus
+    from .events import EventBus, buffer_options_from_env
 
     stem = Path(state_file).stem.replace("-state", "")
     log_path = str(Path(state_file).parent / f"{stem}-events.jsonl")
-    return EventBus(log_path=log_path)
+    return EventBus(log_path=log_path, **buffer_options_from_env())
 
 
 def cmd_template(args):
@@ -330,6 +335,7 @@ def cmd_events(args):
         change=args.change,
         since=args.since,
         last_n=args.last,
+        include_archives=args.archives,
     )
 
     if args.json:
@@ -1402,6 +1408,11 @@ def main():
     s_rc.add_argument("--file", required=True, help="State file path")
     s_rc.add_argument("--events", default=None, help="Events JSONL file path")
 
+    s_cp = state_sub.add_parser("compact", help="Fold the state journal into the state file")
+    s_cp.add_argument("--file", required=True, help="State file path")
+    s_cp.add_argument("--lock-held", action="store_true",
+                      help="Caller already holds the state lock (bash with_state_lock)")
+
     # --- template ---
     tmpl_parser = subparsers.add_parser("template", help="Safe structured text generation")
     tmpl_sub = tmpl_parser.add_subparsers(dest="template_cmd", required=True)
@@ -1524,6 +1535,7 @@ def main():
     evt_parser.add_argument("--change", default=None, help="Filter by change name")
     evt_parser.add_argument("--since", default=None, help="Filter by timestamp (ISO 8601)")
     evt_parser.add_argument("--last", type=int, default=None, help="Only last N events")
+    evt_parser.add_argument("--archives", action="store_true", help="Also search rotated archives")
     evt_parser.add_argument("--json", action="store_true", help="Output as JSON array")
 
     # --- dispatch ---
@@ -22,6 +22,7 @@ logger = logging.getLogger(__name__)
 
 DIRECTIVE_DEFAULTS: dict[str, Any] = {
     "max_parallel": 3,
+    "max_verify_gates": 1,
     "merge_policy": "checkpoint",
     "checkpoint_every": 3,
     "test_command": "",
@@ -81,6 +82,7 @@ DIRECTIVE_DEFAULTS: dict[str, Any] = {
 _VALIDATORS: dict[str, tuple[str, str | None]] = {
     # key: (type, regex_pattern_or_None)
     "max_parallel": ("int_pos", None),
+    "max_verify_gates": ("int_pos", None),
     "merge_policy": ("enum", r"^(eager|checkpoint|manual)$"),
     "checkpoint_every": ("int_pos", None),
     "test_command": ("str", None),
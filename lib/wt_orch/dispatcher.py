@@ -21,6 +21,7 @@ from pathlib import Path
 from typing import Any
 
 from .events import EventBus
+from .git_utils import RefSnapshot, behind_ahead
 from .notifications import send_notification
 from .process import check_pid, safe_kill
 from .root import WT_TOOLS_ROOT
@@ -97,42 +98,35 @@ class DispatchContext:
 # ─── Worktree Preparation ────────────────────────────────────────────
 
 
-def sync_worktree_with_main(wt_path: str, change_name: str) -> SyncResult:
+def sync_worktree_with_main(
+    wt_path: str, change_name: str, refs: RefSnapshot | None = None,
+) -> SyncResult:
     """Merge main branch into worktree branch.
 
     Migrated from: dispatcher.sh sync_worktree_with_main() L5-80
 
     Auto-resolves conflicts in generated files (lockfiles, .tsbuildinfo).
-    Aborts merge on real conflicts.
+    Aborts merge on real conflicts. ``refs`` lets callers syncing several
+    worktrees share one RefSnapshot; one is read here otherwise.
     """
-    # Determine main branch
-    main_branch = ""
-    for branch in ("main", "master"):
-        r = run_git("show-ref", "--verify", "--quiet", f"refs/heads/{branch}", cwd=wt_path)
-        if r.exit_code == 0:
-            main_branch = branch
-            break
+    if refs is None or refs.worktree_head(wt_path) is None:
+        refs = RefSnapshot.read(wt_path)
 
+    # Determine main branch
+    main_branch, main_head = refs.main_branch()
     if not main_branch:
         logger.warning("sync: could not find main/master branch for %s", change_name)
         return SyncResult(ok=False, message="no main branch found")
 
     # Check if already up to date
-    wt_branch_r = run_git("rev-parse", "--abbrev-ref", "HEAD", cwd=wt_path)
-    wt_branch = wt_branch_r.stdout.strip()
-
-    main_head_r = run_git("rev-parse", main_branch, cwd=wt_path)
-    main_head = main_head_r.stdout.strip()
-
-    merge_base_r = run_git("merge-base", wt_branch, main_branch, cwd=wt_path)
-    merge_base = merge_base_r.stdout.strip()
+    wt_head, wt_branch = refs.worktree_head(wt_path) or ("", "HEAD")
+    counts = behind_ahead(main_head, wt_head, cwd=wt_path) if wt_head else None
 
-    if main_head == merge_base:
+    if counts is not None and counts[0] == 0:
         logger.info("sync: %s already up to date with %s", change_name, main_branch)
         return SyncResult(ok=True, message="already up to date")
 
-    behind_r = run_git("rev-list", "--count", f"{merge_base}..{main_head}", cwd=wt_path)
-    behind_count = int(behind_r.stdout.strip()) if behind_r.exit_code == 0 else 0
+    behind_count = counts[0] if counts is not None else 0
     logger.info("sync: %s is %d commit(s) behind %s — merging", change_name, behind_count, main_branch)
 
     # Attempt merge
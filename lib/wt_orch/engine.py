@@ -13,6 +13,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -22,7 +23,9 @@ from .root import WT_TOOLS_ROOT
 from .state import (
     OrchestratorState,
     load_state,
+    StateTransaction,
     locked_state,
+    state_transaction,
     update_change_field,
     update_state_field,
 )
@@ -38,6 +41,10 @@ DEFAULT_TOKEN_HARD_LIMIT = 50_000_000
 DEFAULT_MONITOR_IDLE_TIMEOUT = 600
 DEFAULT_MAX_REPLAN_RETRIES = 3
 MAX_REPLAN_CYCLES = 5
+DEFAULT_MAX_VERIFY_GATES = 1
+# Poll workers on top of the verify gate cap, so quick polls of running
+# changes never wait behind gates
+POLL_SPARE_WORKERS = 4
 
 
 # ─── Directives ────────────────────────────────────────────────────
@@ -50,6 +57,7 @@ class Directives:
     """
 
     max_parallel: int = 3
+    max_verify_gates: int = DEFAULT_MAX_VERIFY_GATES
     checkpoint_every: int = 0
     test_command: str = ""
     merge_policy: str = "eager"
@@ -108,6 +116,7 @@ def parse_directives(raw: dict) -> Directives:
     """
     d = Directives()
     d.max_parallel = _int(raw, "max_parallel", d.max_parallel)
+    d.max_verify_gates = max(1, _int(raw, "max_verify_gates", d.max_verify_gates))
     d.checkpoint_every = _int(raw, "checkpoint_every", d.checkpoint_every)
     d.test_command = _str(raw, "test_command", d.test_command)
     d.merge_policy = _str(raw, "merge_policy", d.merge_policy)
@@ -261,25 +270,26 @@ def monitor_loop(
 
     # Persist timing info and orchestrator PID
     start_epoch = int(time.time())
-    update_state_field(state_file, "started_epoch", start_epoch)
-    update_state_field(state_file, "time_limit_secs", d.time_limit_secs)
-    update_state_field(state_file, "orchestrator_pid", os.getpid())
-
-    # Restore active_seconds from state (cumulative across restarts)
-    state = load_state(state_file)
-    active_seconds = state.extras.get("active_seconds", 0)
+    with state_transaction(state_file) as txn:
+        txn.set_field("started_epoch", start_epoch)
+        txn.set_field("time_limit_secs", d.time_limit_secs)
+        txn.set_field("orchestrator_pid", os.getpid())
+
+        # Restore active_seconds from state (cumulative across restarts)
+        state = txn.state
+        active_seconds = state.extras.get("active_seconds", 0)
+
+        # Ensure state is "running" — the bash layer may have set "stopped"
+        # via EXIT trap before exec'ing to us
+        if state.status == "stopped":
+            logger.info("Resuming orchestration (was: stopped)")
+            txn.set_field("status", "running")
+        elif state.status == "checkpoint":
+            logger.info("Stale checkpoint cleared on restart — resuming")
+            txn.set_field("status", "running")
     token_wait = False
     replan_retry_count = 0
 
-    # Ensure state is "running" — the bash layer may have set "stopped"
-    # via EXIT trap before exec'ing to us
-    if state.status == "stopped":
-        logger.info("Resuming orchestration (was: stopped)")
-        update_state_field(state_file, "status", "running")
-    elif state.status == "checkpoint":
-        logger.info("Stale checkpoint cleared on restart — resuming")
-        update_state_field(state_file, "status", "running")
-
     # Clear checkpoint-specific transient state on restart
     _clear_checkpoint_state(state_file)
 
@@ -290,192 +300,317 @@ def monitor_loop(
     idle_escalation_count = 0
 
     poll_count = 0
+    last_poll_io: dict[str, int] = {}
+    from .verifier import ChangePollTracker
+    change_polls = ChangePollTracker()
+    poller = ChangePoller(d.max_verify_gates)
 
     while True:
         time.sleep(poll_interval)
         poll_count += 1
 
-        # Track active time
-        if not token_wait and _any_loop_active(state_file):
-            active_seconds += poll_interval
-            update_state_field(state_file, "active_seconds", active_seconds)
-
-        # Check time limit
-        if d.time_limit_secs > 0 and active_seconds >= d.time_limit_secs:
-            wall_elapsed = int(time.time()) - start_epoch
-            logger.warning(
-                "Time limit reached (%ds active, %ds wall clock)",
-                active_seconds, wall_elapsed,
-            )
-            update_state_field(state_file, "status", "time_limit")
-            _send_terminal_notifications(state_file, "time_limit", event_bus)
-            _generate_report_safe(state_file)
-            break
+        # One state snapshot per poll: reads are served from it until another
+        # writer touches the file, buffered writes are committed once
+        txn = StateTransaction(state_file, event_bus=event_bus)
+        try:
 
-        # Check external stop
-        state = load_state(state_file)
-        if state.status in ("stopped", "done"):
-            _generate_report_safe(state_file)
-            break
-        if state.status == "paused":
-            continue
+            # Track active time
+            if not token_wait and _any_loop_active(txn):
+                active_seconds += poll_interval
+                txn.set_field("active_seconds", active_seconds)
+
+            # Check time limit
+            if d.time_limit_secs > 0 and active_seconds >= d.time_limit_secs:
+                wall_elapsed = int(time.time()) - start_epoch
+                logger.warning(
+                    "Time limit reached (%ds active, %ds wall clock)",
+                    active_seconds, wall_elapsed,
+                )
+                txn.set_field("status", "time_limit")
+                txn.commit()
+                _send_terminal_notifications(state_file, "time_limit", event_bus)
+                _generate_report_safe(state_file)
+                break
 
-        # Poll active changes (running + verifying) — must run even
-        # during checkpoint so dead Ralph processes are detected and
-        # verify/merge can complete.
-        poll_e2e_cmd = d.e2e_command if d.e2e_mode != "phase_end" else ""
-        _poll_active_changes(state_file, d, poll_e2e_cmd, event_bus)
+            # Check external stop
+            state = txn.state
+            if state.status in ("stopped", "done"):
+                _generate_report_safe(state_file)
+                break
+            if state.status == "paused":
+                continue
 
-        # Safety net: check suspended changes
-        _poll_suspended_changes(state_file, d, poll_e2e_cmd, event_bus)
+            # Poll active changes (running + verifying) — must run even
+            # during checkpoint so dead Ralph processes are detected and
+            # verify/merge can complete.
+            poll_e2e_cmd = d.e2e_command if d.e2e_mode != "phase_end" else ""
+            _poll_active_changes(state_file, d, poll_e2e_cmd, event_bus, change_polls, poller)
 
-        # During checkpoint, skip dispatch and advancement but still
-        # allow completion detection and merge queue retries.
-        if state.status == "checkpoint":
-            _retry_merge_queue_safe(state_file, event_bus)
-            if _check_completion(state_file, d, event_bus):
-                break
-            if d.checkpoint_auto_approve:
-                logger.info("Checkpoint auto-approved — resuming")
-                update_state_field(state_file, "status", "running")
-            elif _checkpoint_approved(state):
-                logger.info("Checkpoint approved via API — resuming")
-                update_state_field(state_file, "status", "running")
-            elif d.checkpoint_timeout > 0:
-                started = state.extras.get("checkpoint_started_at", 0)
-                if started and (int(time.time()) - started) >= d.checkpoint_timeout:
-                    elapsed = int(time.time()) - started
-                    logger.warning(
-                        "Checkpoint timed out after %ds — auto-resuming",
-                        elapsed,
-                    )
-                    update_state_field(state_file, "status", "running")
-                    if event_bus:
-                        event_bus.emit(
-                            "CHECKPOINT_TIMEOUT",
-                            data={"elapsed": elapsed},
+            # Safety net: check suspended changes
+            _poll_suspended_changes(state_file, d, poll_e2e_cmd, event_bus, poller)
+
+            # During checkpoint, skip dispatch and advancement but still
+            # allow completion detection and merge queue retries.
+            if state.status == "checkpoint":
+                _retry_merge_queue_safe(state_file, event_bus)
+                if _check_completion(state_file, d, event_bus):
+                    break
+                if d.checkpoint_auto_approve:
+                    logger.info("Checkpoint auto-approved — resuming")
+                    txn.set_field("status", "running")
+                elif _checkpoint_approved(state):
+                    logger.info("Checkpoint approved via API — resuming")
+                    txn.set_field("status", "running")
+                elif d.checkpoint_timeout > 0:
+                    started = state.extras.get("checkpoint_started_at", 0)
+                    if started and (int(time.time()) - started) >= d.checkpoint_timeout:
+                        elapsed = int(time.time()) - started
+                        logger.warning(
+                            "Checkpoint timed out after %ds — auto-resuming",
+                            elapsed,
                         )
+                        txn.set_field("status", "running")
+                        if event_bus:
+                            event_bus.emit(
+                                "CHECKPOINT_TIMEOUT",
+                                data={"elapsed": elapsed},
+                            )
+                    else:
+                        continue
                 else:
                     continue
-            else:
-                continue
 
-        # Token budget enforcement
-        if d.token_budget > 0:
-            total_tokens = sum(c.tokens_used for c in load_state(state_file).changes)
-            if total_tokens > d.token_budget:
-                if not token_wait:
-                    logger.warning("Token budget exceeded (%d > %d) — waiting", total_tokens, d.token_budget)
-                    token_wait = True
-                _retry_merge_queue_safe(state_file, event_bus)
-                continue
-            elif token_wait:
-                logger.info("Token budget available — resuming dispatch")
-                token_wait = False
+            # Token budget enforcement
+            if d.token_budget > 0:
+                total_tokens = sum(c.tokens_used for c in txn.state.changes)
+                if total_tokens > d.token_budget:
+                    if not token_wait:
+                        logger.warning("Token budget exceeded (%d > %d) — waiting", total_tokens, d.token_budget)
+                        token_wait = True
+                    _retry_merge_queue_safe(state_file, event_bus)
+                    continue
+                elif token_wait:
+                    logger.info("Token budget available — resuming dispatch")
+                    token_wait = False
 
-        # Verify-failed recovery
-        _recover_verify_failed(state_file, d, event_bus)
+            # Flush buffered writes before handing off to helpers that
+            # load and save the state file themselves
+            txn.commit()
 
-        # Note: no cascade_failed_deps() — pending changes with failed deps
-        # simply stay pending (never dispatched because deps_met() returns False).
-        # _check_all_done() and _check_phase_milestone() treat them as terminal.
+            # Verify-failed recovery
+            _recover_verify_failed(state_file, d, event_bus)
 
-        # Dispatch ready changes
-        pre_running = _count_by_status(state_file, "running")
-        _dispatch_ready_safe(state_file, d, event_bus)
-        post_running = _count_by_status(state_file, "running")
-        if post_running > pre_running:
-            last_progress_ts = int(time.time())
+            # Note: no cascade_failed_deps() — pending changes with failed deps
+            # simply stay pending (never dispatched because deps_met() returns False).
+            # _check_all_done() and _check_phase_milestone() treat them as terminal.
 
-        # Phase advancement (always) + optional milestone check
-        _check_phase_completion(state_file, d, event_bus)
+            # Dispatch ready changes
+            pre_running = _count_by_status(txn, "running")
+            _dispatch_ready_safe(state_file, d, event_bus)
+            post_running = _count_by_status(txn, "running")
+            if post_running > pre_running:
+                last_progress_ts = int(time.time())
 
-        # Retry merge queue
-        pre_merged = _count_by_status(state_file, "merged")
-        _retry_merge_queue_safe(state_file, event_bus)
-        post_merged = _count_by_status(state_file, "merged")
-        if post_merged > pre_merged:
-            last_progress_ts = int(time.time())
+            # Phase advancement (always) + optional milestone check
+            _check_phase_completion(state_file, d, event_bus)
 
-        # Resume stalled changes
-        _resume_stalled_safe(state_file, event_bus)
+            # Retry merge queue
+            pre_merged = _count_by_status(txn, "merged")
+            _retry_merge_queue_safe(state_file, event_bus)
+            post_merged = _count_by_status(txn, "merged")
+            if post_merged > pre_merged:
+                last_progress_ts = int(time.time())
 
-        # Retry failed builds
-        _retry_failed_builds_safe(state_file, d, event_bus)
+            # Resume stalled changes
+            _resume_stalled_safe(state_file, event_bus)
 
-        # Token hard limit
-        if d.token_hard_limit > 0:
-            _check_token_hard_limit(state_file, d, event_bus)
+            # Retry failed builds
+            _retry_failed_builds_safe(state_file, d, event_bus)
 
-        # Self-watchdog
-        _self_watchdog(
-            state_file, d, last_progress_ts,
-            idle_escalation_count, event_bus,
-        )
-        idle_elapsed = int(time.time()) - last_progress_ts
-        if idle_elapsed > d.monitor_idle_timeout:
-            idle_escalation_count += 1
-            last_progress_ts = int(time.time())
-        else:
-            idle_escalation_count = 0
+            # Token hard limit
+            if d.token_hard_limit > 0:
+                _check_token_hard_limit(state_file, d, event_bus, txn)
 
-        # Generate report
-        _generate_report_safe(state_file)
+            # Self-watchdog
+            _self_watchdog(
+                state_file, d, last_progress_ts,
+                idle_escalation_count, event_bus,
+            )
+            idle_elapsed = int(time.time()) - last_progress_ts
+            if idle_elapsed > d.monitor_idle_timeout:
+                idle_escalation_count += 1
+                last_progress_ts = int(time.time())
+            else:
+                idle_escalation_count = 0
 
-        # Periodic memory operations (every ~10 polls ≈ 2.5 minutes)
-        if poll_count % 10 == 0:
-            _periodic_memory_ops_safe(state_file)
+            # Generate report
+            _generate_report_safe(state_file)
 
-        # Watchdog heartbeat (throttled: emit every 20th poll ≈ 5 min)
-        if event_bus and poll_count % 20 == 0:
-            event_bus.emit("WATCHDOG_HEARTBEAT")
+            # Periodic memory operations (every ~10 polls ≈ 2.5 minutes)
+            if poll_count % 10 == 0:
+                _periodic_memory_ops_safe(state_file)
+
+            # Watchdog heartbeat (throttled: emit every 20th poll ≈ 5 min)
+            if event_bus and poll_count % 20 == 0:
+                event_bus.emit("WATCHDOG_HEARTBEAT", data={
+                    "state_io": last_poll_io,
+                    "change_polls": dict(change_polls.counts(), in_flight=poller.in_flight),
+                })
+
+            # Checkpoint check
+            if d.checkpoint_every > 0:
+                if txn.state.changes_since_checkpoint >= d.checkpoint_every:
+                    _trigger_checkpoint_safe(state_file, "periodic", event_bus)
+                    continue
 
-        # Checkpoint check
-        if d.checkpoint_every > 0:
-            state = load_state(state_file)
-            if state.changes_since_checkpoint >= d.checkpoint_every:
-                _trigger_checkpoint_safe(state_file, "periodic", event_bus)
-                continue
+            # Completion detection
+            if _check_completion(state_file, d, event_bus, txn):
+                break
+        finally:
+            txn.commit()
+            last_poll_io = txn.io_counts()
+            logger.debug(
+                "Poll %d state I/O: %d loads, %d saves, %d journal appends",
+                poll_count, last_poll_io["loads"], last_poll_io["saves"],
+                last_poll_io["appends"],
+            )
+            if poll_count % 10 == 0:
+                logger.info(
+                    "Change polls so far: %d processed, %d skipped (loop-state unchanged), %d in flight",
+                    change_polls.processed, change_polls.skipped, poller.in_flight,
+                )
 
-        # Completion detection
-        if _check_completion(state_file, d, event_bus):
-            break
+    # Let verify gates still running on the pool finish before returning
+    poller.shutdown()
 
 
 # ─── Poll Helpers ──────────────────────────────────────────────────
 
+class ChangePoller:
+    """Runs poll_change for changes on a bounded thread pool.
+
+    A slow verify gate (build, tests, review, smoke) inside one change's
+    poll no longer holds up polling, dispatch and merge for the others.
+    Each change has at most one poll in flight — later ticks leave it alone
+    until it finishes — and verify_slots caps how many gates run at once.
+    Results are collected on the monitor thread by reap().
+    """
+
+    def __init__(self, max_verify_gates: int = DEFAULT_MAX_VERIFY_GATES):
+        from concurrent.futures import ThreadPoolExecutor
+
+        max_verify_gates = max(1, max_verify_gates)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_verify_gates + POLL_SPARE_WORKERS,
+            thread_name_prefix="change-poll",
+        )
+        self._in_flight: dict[str, tuple[Any, Any, tuple | None]] = {}
+        self.verify_slots = threading.BoundedSemaphore(max_verify_gates)
+
+    def busy(self, change_name: str) -> bool:
+        return change_name in self._in_flight
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def submit(
+        self, change: Any, fp: tuple | None, state_file: str, **poll_kwargs: Any,
+    ) -> None:
+        """Start poll_change for a change; fp is its tracker fingerprint."""
+        from .verifier import poll_change
+
+        future = self._pool.submit(
+            poll_change, change.name, state_file,
+            verify_slots=self.verify_slots, **poll_kwargs,
+        )
+        self._in_flight[change.name] = (future, change, fp)
+
+    def reap(self) -> list[tuple[Any, tuple | None, str | None]]:
+        """Collect finished polls as (change, fingerprint, ralph_status)."""
+        finished = []
+        for name, (future, change, fp) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+            del self._in_flight[name]
+            ralph_status = None
+            exc = future.exception()
+            if exc is not None:
+                logger.warning("Poll failed for %s", name, exc_info=exc)
+            else:
+                ralph_status = future.result()
+            finished.append((change, fp, ralph_status))
+        return finished
+
+    def shutdown(self) -> None:
+        """Wait for in-flight polls (and their gates) to finish."""
+        self._pool.shutdown(wait=True)
+
+
+def _poll_kwargs(d: Directives, poll_e2e_cmd: str, event_bus: Any) -> dict:
+    """poll_change keyword arguments derived from the directives."""
+    return dict(
+        test_command=d.test_command,
+        merge_policy=d.merge_policy,
+        test_timeout=d.test_timeout,
+        max_verify_retries=d.max_verify_retries,
+        review_before_merge=d.review_before_merge,
+        review_model=d.review_model,
+        smoke_command=d.smoke_command,
+        smoke_timeout=d.smoke_timeout,
+        e2e_command=poll_e2e_cmd,
+        e2e_timeout=d.e2e_timeout,
+        event_bus=event_bus,
+        design_snapshot_dir=os.getcwd(),
+    )
+
+
 def _poll_active_changes(
-    state_file: str, d: Directives, poll_e2e_cmd: str, event_bus: Any
+    state_file: str, d: Directives, poll_e2e_cmd: str, event_bus: Any,
+    tracker: Any = None, poller: ChangePoller | None = None,
 ) -> None:
-    """Poll all running + verifying changes."""
+    """Poll all running + verifying changes.
+
+    With a ChangePollTracker, changes whose loop-state has not moved since
+    a steady poll are skipped. With a ChangePoller, polls run on its pool
+    and this returns without waiting for them.
+    """
     from .verifier import poll_change
 
+    if poller is not None:
+        for change, fp, ralph_status in poller.reap():
+            if tracker is not None:
+                tracker.record(change, fp, ralph_status)
+
     state = load_state(state_file)
-    for change in state.changes:
-        if change.status not in ("running", "verifying"):
+    active = [c for c in state.changes if c.status in ("running", "verifying")]
+    if tracker is not None:
+        tracker.retain({c.name for c in active})
+    for change in active:
+        if poller is not None and poller.busy(change.name):
             continue
+        fp = None
+        if tracker is not None:
+            fp = tracker.fingerprint(change)
+            if not tracker.should_poll(change, fp):
+                tracker.skip()
+                continue
+        kwargs = _poll_kwargs(d, poll_e2e_cmd, event_bus)
+        if poller is not None:
+            poller.submit(change, fp, state_file, **kwargs)
+            continue
+        ralph_status = None
         try:
-            poll_change(
-                change.name, state_file,
-                test_command=d.test_command,
-                merge_policy=d.merge_policy,
-                test_timeout=d.test_timeout,
-                max_verify_retries=d.max_verify_retries,
-                review_before_merge=d.review_before_merge,
-                review_model=d.review_model,
-                smoke_command=d.smoke_command,
-                smoke_timeout=d.smoke_timeout,
-                e2e_command=poll_e2e_cmd,
-                e2e_timeout=d.e2e_timeout,
-                event_bus=event_bus,
-                design_snapshot_dir=os.getcwd(),
-            )
+            ralph_status = poll_change(change.name, state_file, **kwargs)
         except Exception:
             logger.warning("Poll failed for %s", change.name, exc_info=True)
+        if tracker is not None:
+            tracker.record(change, fp, ralph_status)
 
 
 def _poll_suspended_changes(
-    state_file: str, d: Directives, poll_e2e_cmd: str, event_bus: Any
+    state_file: str, d: Directives, poll_e2e_cmd: str, event_bus: Any,
+    poller: ChangePoller | None = None,
 ) -> None:
     """Check paused/waiting/done changes for completed loop-state."""
     # Source: monitor.sh L211-249
@@ -500,6 +635,8 @@ def _poll_suspended_changes(
         # Check loop-state for suspended changes
         if not wt_path:
             continue
+        if poller is not None and poller.busy(change.name):
+            continue
         loop_state_path = os.path.join(wt_path, ".claude", "loop-state.json")
         if not os.path.isfile(loop_state_path):
             continue
@@ -510,21 +647,11 @@ def _poll_suspended_changes(
             if ls.get("status") == "done":
                 logger.info("Monitor: suspended change %s has loop-state=done — processing", change.name)
                 update_change_field(state_file, change.name, "status", "running")
-                poll_change(
-                    change.name, state_file,
-                    test_command=d.test_command,
-                    merge_policy=d.merge_policy,
-                    test_timeout=d.test_timeout,
-                    max_verify_retries=d.max_verify_retries,
-                    review_before_merge=d.review_before_merge,
-                    review_model=d.review_model,
-                    smoke_command=d.smoke_command,
-                    smoke_timeout=d.smoke_timeout,
-                    e2e_command=poll_e2e_cmd,
-                    e2e_timeout=d.e2e_timeout,
-                    event_bus=event_bus,
-                    design_snapshot_dir=os.getcwd(),
-                )
+                kwargs = _poll_kwargs(d, poll_e2e_cmd, event_bus)
+                if poller is not None:
+                    poller.submit(change, None, state_file, **kwargs)
+                else:
+                    poll_change(change.name, state_file, **kwargs)
         except Exception:
             pass
 
@@ -569,11 +696,12 @@ def _recover_verify_failed(
 # ─── Completion Detection ──────────────────────────────────────────
 
 def _check_completion(
-    state_file: str, d: Directives, event_bus: Any
+    state_file: str, d: Directives, event_bus: Any,
+    txn: StateTransaction | None = None,
 ) -> bool:
     """Check if all changes are terminal. Returns True if loop should exit."""
     # Source: monitor.sh L428-583
-    state = load_state(state_file)
+    state = txn.state if txn is not None else load_state(state_file)
     total = len(state.changes)
     if total == 0:
         return False
@@ -616,9 +744,10 @@ def _check_completion(
             "%d changes blocked by failed dependencies — stopping (not done)",
             blocked_pending,
         )
-        update_state_field(state_file, "status", "stopped")
-        update_state_field(state_file, "stop_reason", "dep_blocked")
-        update_state_field(state_file, "dep_blocked_count", blocked_pending)
+        with state_transaction(state_file) as stop_txn:
+            stop_txn.set_field("status", "stopped")
+            stop_txn.set_field("stop_reason", "dep_blocked")
+            stop_txn.set_field("dep_blocked_count", blocked_pending)
         _send_terminal_notifications(state_file, "dep_blocked", event_bus)
         _generate_report_safe(state_file)
         return True
@@ -630,8 +759,9 @@ def _check_completion(
             "Total failure: 0/%d succeeded — skipping replan, marking done",
             total,
         )
-        update_state_field(state_file, "status", "done")
-        update_state_field(state_file, "all_failed", True)
+        with state_transaction(state_file) as done_txn:
+            done_txn.set_field("status", "done")
+            done_txn.set_field("all_failed", True)
         from .merger import cleanup_all_worktrees
         cleanup_all_worktrees(state_file)
         _send_terminal_notifications(state_file, "total_failure", event_bus)
@@ -893,16 +1023,14 @@ def _archive_completed_to_jsonl(state_file: str) -> None:
 
 # ─── Utility Helpers ───────────────────────────────────────────────
 
-def _any_loop_active(state_file: str) -> bool:
+def _any_loop_active(txn: StateTransaction) -> bool:
     """Check if any change has an active loop (running status)."""
-    state = load_state(state_file)
-    return any(c.status == "running" for c in state.changes)
+    return any(c.status == "running" for c in txn.state.changes)
 
 
-def _count_by_status(state_file: str, status: str) -> int:
+def _count_by_status(txn: StateTransaction, status: str) -> int:
     """Count changes with a specific status."""
-    state = load_state(state_file)
-    return sum(1 for c in state.changes if c.status == status)
+    return sum(1 for c in txn.state.changes if c.status == status)
 
 
 def _dispatch_ready_safe(state_file: str, d: Directives, event_bus: Any) -> None:
@@ -949,10 +1077,13 @@ def _retry_failed_builds_safe(state_file: str, d: Directives, event_bus: Any) ->
         logger.warning("Retry failed builds failed", exc_info=True)
 
 
-def _check_token_hard_limit(state_file: str, d: Directives, event_bus: Any = None) -> None:
+def _check_token_hard_limit(
+    state_file: str, d: Directives, event_bus: Any = None,
+    txn: StateTransaction | None = None,
+) -> None:
     """Check token hard limit and trigger checkpoint if exceeded."""
     # Source: monitor.sh L354-377
-    state = load_state(state_file)
+    state = txn.state if txn is not None else load_state(state_file)
     total_tokens = sum(c.tokens_used for c in state.changes)
     prev_tokens = state.extras.get("prev_total_tokens", 0)
     cumulative = total_tokens + prev_tokens
@@ -1157,23 +1288,21 @@ def trigger_checkpoint(state_file: str, reason: str, event_bus: Any = None) -> N
         reason: Reason for checkpoint (e.g., "periodic", "token_hard_limit").
         event_bus: Optional EventBus for CHECKPOINT event emission.
     """
-    update_state_field(state_file, "status", "checkpoint")
-    update_state_field(state_file, "checkpoint_reason", reason)
-    update_state_field(state_file, "changes_since_checkpoint", 0)
-    update_state_field(state_file, "checkpoint_started_at", int(time.time()))
-    # Append checkpoint record to state.checkpoints
-    state = load_state(state_file)
-    completed_count = sum(
-        1 for c in state.changes if c.status in ("merged", "done", "skipped", "failed")
-    )
-    checkpoint_record = {
-        "reason": reason,
-        "triggered_at": datetime.now().astimezone().isoformat(),
-        "changes_completed": completed_count,
-        "approved": False,
-    }
+    # Single locked read-modify-write: status, counters and checkpoint record
     with locked_state(state_file) as st:
-        st.checkpoints.append(checkpoint_record)
+        st.status = "checkpoint"
+        st.extras["checkpoint_reason"] = reason
+        st.changes_since_checkpoint = 0
+        st.extras["checkpoint_started_at"] = int(time.time())
+        completed_count = sum(
+            1 for c in st.changes if c.status in ("merged", "done", "skipped", "failed")
+        )
+        st.checkpoints.append({
+            "reason": reason,
+            "triggered_at": datetime.now().astimezone().isoformat(),
+            "changes_completed": completed_count,
+            "approved": False,
+        })
     logger.info("Checkpoint triggered: %s", reason)
     if event_bus:
         event_bus.emit("CHECKPOINT", data={"reason": reason})
@@ -0,0 +1,150 @@
+"""Per-change enrichment shared by the web API and the file watcher.
+
+Each change in the dashboard state carries the worktree's `.claude/logs`
+file list and the number of Claude sessions (`.jsonl` files in the
+mangled ~/.claude/projects/-<path> directory). Listing those directories
+on every /state request and every state write is O(changes x files), so
+listings are kept in a DirIndex keyed by the directory's mtime: adding,
+removing or renaming an entry bumps it, so a cached listing is reused
+until the directory actually changes — one stat() instead of a scan.
+
+A directory modified within RACY_SECS of being listed is not cached, since
+a second change inside the same mtime tick would go unnoticed (the
+"racy clean" problem git's index has). The watcher also drops the entries
+of changes whose status or worktree moved, so removed worktrees do not
+linger in the index.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# Directory listings kept before the least recently used is dropped
+MAX_ENTRIES = 4096
+
+# Listings of directories modified more recently than this are not cached
+RACY_SECS = 2.0
+
+# Statuses whose worktree may be gone; sessions fall back to the project dir
+_FINISHED = ("done", "merged", "failed", "verify-failed")
+
+
+def claude_sessions_dir(path: str | Path) -> Path:
+    """~/.claude/projects/-<path with / replaced by -> for a working directory."""
+    mangled = str(path).lstrip("/").replace("/", "-")
+    return Path.home() / ".claude" / "projects" / f"-{mangled}"
+
+
+class DirIndex:
+    """Listings of files by suffix per directory, cached by directory mtime."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[int, tuple[str, ...]]] = OrderedDict()
+        # Used from the I/O pool's threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def names(self, directory: str | Path, suffix: str) -> list[str] | None:
+        """Sorted names of the regular files with `suffix`; None if not a directory."""
+        directory = str(directory)
+        try:
+            st = os.stat(directory)
+        except OSError:
+            return None
+        if not stat.S_ISDIR(st.st_mode):
+            return None
+        key = (directory, suffix)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == st.st_mtime_ns:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[1])
+        try:
+            with os.scandir(directory) as it:
+                names = sorted(
+                    e.name for e in it
+                    if os.path.splitext(e.name)[1] == suffix and e.is_file()
+                )
+        except OSError:
+            return None
+        with self._lock:
+            self.misses += 1
+            if time.time() - st.st_mtime >= RACY_SECS:
+                self._entries[key] = (st.st_mtime_ns, tuple(names))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return names
+
+    def count(self, directory: str | Path, suffix: str) -> int | None:
+        names = self.names(directory, suffix)
+        return None if names is None else len(names)
+
+    def invalidate(self, directory: str | Path | None = None):
+        """Drop the listings of `directory` and everything below it (all if None)."""
+        with self._lock:
+            if directory is None:
+                self._entries.clear()
+                return
+            prefix = str(directory).rstrip("/")
+            for key in [k for k in self._entries if k[0] == prefix or k[0].startswith(prefix + "/")]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by api routes and the watchers
+dir_index = DirIndex()
+
+
+def sessions_dir_for(change: dict, project_path: Path, index: DirIndex = dir_index) -> Path | None:
+    """Sessions directory of a change: its worktree's, else the project's once finished."""
+    wt_path = change.get("worktree_path")
+    if not wt_path:
+        return None
+    d = claude_sessions_dir(wt_path)
+    if index.names(d, ".jsonl") is not None:
+        return d
+    if change.get("status") in _FINISHED:
+        d = claude_sessions_dir(project_path)
+        if index.names(d, ".jsonl") is not None:
+            return d
+    return None
+
+
+def enrich_changes(changes: list[dict], project_path: Path, index: DirIndex = dir_index) -> None:
+    """Add `logs` (worktree .claude/logs/*.log) and `session_count` to change dicts."""
+    for c in changes:
+        wt_path = c.get("worktree_path")
+        if not wt_path:
+            continue
+        logs = index.names(Path(wt_path) / ".claude" / "logs", ".log")
+        if logs is not None:
+            c["logs"] = logs
+        sessions_dir = sessions_dir_for(c, project_path, index)
+        if sessions_dir is not None:
+            count = index.count(sessions_dir, ".jsonl")
+            if count is not None:
+                c["session_count"] = count
+
+
+def invalidate_moved(old_changes: list[dict], new_changes: list[dict], index: DirIndex = dir_index):
+    """Drop listings under worktrees whose change changed status or worktree."""
+    old = {c.get("name"): (c.get("status"), c.get("worktree_path")) for c in old_changes}
+    for c in new_changes:
+        before = old.get(c.get("name"))
+        if before is None or before == (c.get("status"), c.get("worktree_path")):
+            continue
+        for wt_path in {before[1], c.get("worktree_path")} - {None, ""}:
+            index.invalidate(Path(wt_path) / ".claude")
+            index.invalidate(claude_sessions_dir(wt_path))
@@ -5,15 +5,36 @@ Migrated from: lib/orchestration/events.sh (emit_event, rotate_events_log, query
 Combines two concerns:
 1. JSONL file writer — append-only event log (backward-compatible format)
 2. In-process event bus — subscribe(type, handler) for Python consumers
+
+Queries go through a sidecar index (<log>.idx) holding the byte offset,
+type, change and timestamp of every event, so filtered queries seek straight
+to matching lines instead of parsing the whole log.
+
+Buffered mode (buffered=True, or WT_EVENTS_BUFFERED=1 via
+buffer_options_from_env) queues encoded lines in memory and group-commits
+them with one write when the batch fills or the flush interval elapses.
+Pending lines are flushed at exit, on SIGTERM/SIGHUP, and before queries
+and rotation.
 """
 
+import atexit
+import fcntl
 import json
 import logging
 import os
+import re
+import signal
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_left
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable
 
+from .tail import read_tail
+
 logger = logging.getLogger(__name__)
 
 # Default rotation threshold
@@ -21,6 +42,26 @@ DEFAULT_MAX_SIZE = 1048576  # 1MB
 DEFAULT_MAX_ARCHIVES = 3
 ROTATION_CHECK_INTERVAL = 100  # check every N emissions
 
+# Buffered writer
+BUFFER_ENV = "WT_EVENTS_BUFFERED"
+FSYNC_ENV = "WT_EVENTS_FSYNC"
+DEFAULT_FLUSH_INTERVAL = 0.2  # seconds
+DEFAULT_FLUSH_BATCH = 256  # lines per group commit
+DEFAULT_MAX_PENDING = 8192  # lines kept while the log is unwritable
+FSYNC_POLICIES = ("never", "commit", "interval")
+DEFAULT_FSYNC_INTERVAL = 1.0  # seconds, for fsync="interval"
+
+# Query index
+INDEX_SUFFIX = ".idx"
+TS_CHECKPOINT_EVERY = 64  # keep the timestamp of every Nth event in memory
+_READ_CHUNK = 1024 * 1024
+# json.dumps() builds a new encoder per call when separators are given
+_encode_compact = json.JSONEncoder(separators=(",", ":")).encode
+# Fast path for the writer's fixed field order (EventBus.emit and events.sh)
+_LINE_PREFIX_RE = re.compile(
+    rb'\{"ts":"([^"\\]*)","type":"([^"\\]*)"(?:,"change":"([^"\\]*)")?,"data":'
+)
+
 
 class EventBus:
     """Event bus with JSONL file persistence.
@@ -30,6 +71,10 @@ class EventBus:
         bus.emit("STATE_CHANGE", change="add-auth", data={"status": "running"})
         bus.subscribe("STATE_CHANGE", handler_fn)
         events = bus.query(type="STATE_CHANGE", last_n=20)
+
+    fsync policy: "never" leaves durability to the OS, "commit" fsyncs every
+    write (every group commit when buffered), "interval" fsyncs at most once
+    per fsync_interval seconds.
     """
 
     def __init__(
@@ -37,12 +82,39 @@ class EventBus:
         log_path: str | Path | None = None,
         max_size: int = DEFAULT_MAX_SIZE,
         enabled: bool = True,
+        *,
+        buffered: bool = False,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_batch: int = DEFAULT_FLUSH_BATCH,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        fsync: str = "never",
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
     ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
         self._log_path: Path | None = Path(log_path) if log_path else None
         self._max_size = max_size
         self._enabled = enabled
         self._emit_count = 0
         self._subscribers: dict[str, list[Callable]] = {}
+        self._dir_ready = False
+
+        self._fsync = fsync
+        self._fsync_interval = fsync_interval
+        self._last_fsync = 0.0
+
+        self._buffered = buffered
+        self._flush_interval = flush_interval
+        self._flush_batch = max(1, flush_batch)
+        self._max_pending = max(self._flush_batch, max_pending)
+        self._pending: list[str] = []
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._closed = False
+        if buffered:
+            _register_buffered(self)
 
     @property
     def log_path(self) -> Path | None:
@@ -86,29 +158,129 @@ class EventBus:
             event["change"] = change
         event["data"] = event_data
 
-        # Write to JSONL file
-        path = self.log_path
-        if path:
-            try:
-                path.parent.mkdir(parents=True, exist_ok=True)
-                with open(path, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(event, separators=(",", ":")) + "\n")
-            except (OSError, IOError) as e:
-                logger.error("Failed to write event: %s", e)
+        # Write to JSONL file (or queue it for the next group commit)
+        if self.log_path:
+            line = _encode_compact(event) + "\n"
+            if self._buffered and not self._closed:
+                self._enqueue(line)
+            else:
+                self._write_lines([line])
 
         # Notify subscribers
         self._notify(event_type, event)
 
-        # Periodic rotation check
+        # Periodic index catch-up and rotation check (buffered: once per
+        # group commit instead). Queries catch the index up themselves, so
+        # batching this only defers work, never loses it.
         self._emit_count += 1
-        if self._emit_count % ROTATION_CHECK_INTERVAL == 0:
+        if not self._buffered and self._emit_count % ROTATION_CHECK_INTERVAL == 0:
+            if self.log_path:
+                _refresh_index(self.log_path)
             self.rotate_log()
 
+    def flush(self, blocking: bool = True) -> bool:
+        """Write all queued events now (no-op when unbuffered).
+
+        With blocking=False (signal handlers) nothing waits for a lock: if a
+        flush or enqueue is in progress — possibly in the very frame the
+        signal interrupted — the call returns False without writing.
+        """
+        if not self._write_lock.acquire(blocking):
+            return False
+        try:
+            if not self._pending_lock.acquire(blocking):
+                return False
+            try:
+                lines, self._pending = self._pending, []
+            finally:
+                self._pending_lock.release()
+            if lines and self._write_lines(lines):
+                self._rotate_locked()
+            elif lines:
+                # Keep them for the next attempt, bounded to max_pending
+                with self._pending_lock:
+                    self._pending[:0] = lines
+                    dropped = len(self._pending) - self._max_pending
+                    if dropped > 0:
+                        del self._pending[:dropped]
+                        logger.error("Event buffer full — dropped %d oldest events", dropped)
+            return True
+        finally:
+            self._write_lock.release()
+
+    def close(self) -> None:
+        """Flush pending events and stop the background flusher."""
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=5)
+        self.flush()
+
+    @property
+    def pending(self) -> int:
+        """Number of queued events not yet written."""
+        return len(self._pending)
+
+    def _enqueue(self, line: str) -> None:
+        with self._pending_lock:
+            self._pending.append(line)
+            full = len(self._pending) >= self._flush_batch
+        if full:
+            self.flush()
+        elif self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="event-flusher", daemon=True,
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            if self._pending:
+                self.flush()
+
+    def _write_lines(self, lines: list[str]) -> bool:
+        """Append lines with a single write. Returns success."""
+        path = self.log_path
+        try:
+            if not self._dir_ready:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._dir_ready = True
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+                if self._should_fsync():
+                    f.flush()
+                    os.fsync(f.fileno())
+        except (OSError, IOError) as e:
+            # Directory may have been removed under us — recreate next time
+            self._dir_ready = False
+            logger.error("Failed to write event: %s", e)
+            return False
+        if self._buffered:
+            _refresh_index(path)
+        return True
+
+    def _should_fsync(self) -> bool:
+        if self._fsync == "never":
+            return False
+        if self._fsync == "interval":
+            now = time.monotonic()
+            if now - self._last_fsync < self._fsync_interval:
+                return False
+            self._last_fsync = now
+        return True
+
     def rotate_log(self) -> None:
         """Archive events log when it exceeds max_size. Keep last N archives.
 
         Migrated from: events.sh:rotate_events_log() L66-86
         """
+        self.flush()
+        with self._write_lock:
+            self._rotate_locked()
+
+    def _rotate_locked(self) -> None:
+        """Rotate if oversized (write lock held, so no group commit interleaves)."""
         path = self.log_path
         if not path or not path.is_file():
             return
@@ -132,14 +304,29 @@ class EventBus:
             logger.error("Failed to rotate events log: %s", e)
             return
 
+        # The index follows its log (it is keyed by inode, so a stale one
+        # would be rebuilt anyway — this just saves the rebuild)
+        try:
+            _index_path(path).rename(_index_path(archive))
+        except OSError:
+            pass
+
         # Keep only last N archives
+        archives = self._archives()
+        for old in archives[:-DEFAULT_MAX_ARCHIVES]:
+            for victim in (old, _index_path(old)):
+                try:
+                    victim.unlink()
+                except OSError:
+                    pass
+
+    def _archives(self) -> list[Path]:
+        """Rotated archives of the log, oldest first."""
+        path = self.log_path
+        if not path:
+            return []
         pattern = f"{path.stem}-*{path.suffix}"
-        archives = sorted(path.parent.glob(pattern), reverse=True)
-        for old in archives[DEFAULT_MAX_ARCHIVES:]:
-            try:
-                old.unlink()
-            except OSError:
-                pass
+        return sorted(path.parent.glob(pattern))
 
     def query(
         self,
@@ -148,6 +335,8 @@ class EventBus:
         change: str | None = None,
         since: str | None = None,
         last_n: int | None = None,
+        limit: int | None = None,
+        include_archives: bool = False,
     ) -> list[dict[str, Any]]:
         """Query events from the JSONL log.
 
@@ -157,41 +346,58 @@ class EventBus:
             event_type: Filter by event type.
             change: Filter by change name.
             since: Filter by timestamp (ISO 8601, >= comparison).
-            last_n: Only scan last N lines.
+            last_n: Only scan last N events.
+            limit: Only return the last N matching events.
+            include_archives: Also search rotated archives (oldest first).
 
         Returns:
-            List of matching event dicts.
+            List of matching event dicts, oldest first.
         """
+        self.flush()
         path = self.log_path
-        if not path or not path.is_file():
+        if not path:
             return []
+        files = [*self._archives(), path] if include_archives else [path]
 
-        try:
-            lines = path.read_text(encoding="utf-8").splitlines()
-        except (OSError, IOError):
-            return []
+        if last_n is not None and last_n > 0 and not (event_type or change or since):
+            # Plain tail: no index needed, read backwards from EOF
+            if limit is not None and limit > 0:
+                last_n = min(last_n, limit)
+            return _tail_events(files, last_n)
 
-        if last_n is not None and last_n > 0:
-            lines = lines[-last_n:]
+        scan_budget = last_n if last_n is not None and last_n > 0 else None
+        want = limit if limit is not None and limit > 0 else None
 
+        # Walk newest file first so last_n / limit can stop early
         results: list[dict[str, Any]] = []
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            if event_type and event.get("type") != event_type:
-                continue
-            if change and event.get("change") != change:
-                continue
-            if since and event.get("ts", "") < since:
+        for file_path in reversed(files):
+            if not file_path.is_file():
                 continue
-
-            results.append(event)
+            index = _get_index(file_path)
+            with index.lock:
+                index.refresh()
+                total = len(index.offsets)
+                lo = 0 if scan_budget is None else max(0, total - scan_budget)
+                remaining = None if want is None else want - len(results)
+                positions = index.select(event_type, change, since, lo, remaining)
+                offsets = [index.offsets[i] for i in positions]
+
+            events = [
+                e for e in _read_events_at(file_path, offsets)
+                if (not event_type or e.get("type") == event_type)
+                and (not change or e.get("change") == change)
+                and (not since or e.get("ts", "") >= since)
+            ]
+            if remaining is not None:
+                events = events[-remaining:] if remaining > 0 else []
+            results[:0] = events
+
+            if scan_budget is not None:
+                scan_budget -= total - lo
+                if scan_budget <= 0:
+                    break
+            if want is not None and len(results) >= want:
+                break
 
         return results
 
@@ -248,6 +454,360 @@ class EventBus:
                     logger.error("Wildcard event handler error: %s", e)
 
 
+
+# ─── Query Index ─────────────────────────────────────────────────────
+# <log>.idx is JSONL: a header line {"ino": <log inode>}, then one line per
+# event: [offset, length, type, change, ts]. It is append-only and covers the
+# log up to the end of its last entry; lines appended by other writers
+# (bash emit_event, other processes) are indexed on the next refresh. A
+# header that does not match the log's inode (log rotated or replaced
+# outside EventBus) makes the index rebuild from scratch.
+
+
+class _EventIndex:
+    """In-memory view of one log's sidecar index, refreshed incrementally."""
+
+    def __init__(self, log_path: Path):
+        self.log_path = log_path
+        self.idx_path = _index_path(log_path)
+        self.lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, ino: int | None) -> None:
+        self.ino = ino
+        self.offsets = array("q")
+        self.by_type: dict[str, array] = {}
+        self.by_change: dict[str, array] = {}
+        self.ts_marks: list[str] = []
+        self.covered = 0      # log bytes covered by the index
+        self.idx_offset = 0   # sidecar bytes consumed
+
+    def _add(self, entry: list) -> None:
+        offset, length, etype, change, ts = entry
+        i = len(self.offsets)
+        self.offsets.append(offset)
+        self.by_type.setdefault(etype, array("q")).append(i)
+        if change:
+            self.by_change.setdefault(change, array("q")).append(i)
+        if i % TS_CHECKPOINT_EVERY == 0:
+            self.ts_marks.append(ts)
+        self.covered = offset + length
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the log (self.lock held)."""
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            self._reset(None)
+            return
+        if st.st_ino != self.ino or st.st_size < self.covered:
+            self._reset(st.st_ino)
+        if st.st_size == self.covered:
+            return
+
+        try:
+            idx = open(self.idx_path, "a+b")
+        except OSError:
+            # Read-only directory: index in memory only
+            for entry in self._scan_log(st.st_size):
+                self._add(entry)
+            return
+
+        with idx:
+            fcntl.flock(idx, fcntl.LOCK_EX)
+            try:
+                self._load_sidecar(idx, st.st_ino)
+                new_entries = self._scan_log(st.st_size)
+                if new_entries:
+                    idx.seek(0, os.SEEK_END)
+                    idx.write(b"".join(
+                        _encode_compact(e).encode() + b"\n"
+                        for e in new_entries
+                    ))
+                    idx.flush()
+                    self.idx_offset = idx.tell()
+                    for entry in new_entries:
+                        self._add(entry)
+            finally:
+                fcntl.flock(idx, fcntl.LOCK_UN)
+
+    def _load_sidecar(self, idx, ino: int) -> None:
+        """Consume sidecar lines written since the last refresh (flock held)."""
+        idx.seek(0, os.SEEK_END)
+        size = idx.tell()
+        if size < self.idx_offset:
+            self._reset(ino)
+        if size > self.idx_offset:
+            idx.seek(self.idx_offset)
+            chunk = idx.read()
+            end = chunk.rfind(b"\n") + 1
+            lines = chunk[:end].splitlines()
+            if self.idx_offset == 0 and lines:
+                try:
+                    header_ino = json.loads(lines[0]).get("ino")
+                except (json.JSONDecodeError, AttributeError):
+                    header_ino = None
+                if header_ino != ino:
+                    size = 0
+                    lines = []
+                else:
+                    lines = lines[1:]
+            for entry in _parse_sidecar_lines(lines):
+                if isinstance(entry, list) and len(entry) == 5 and entry[0] >= self.covered:
+                    self._add(entry)
+            if size:
+                self.idx_offset += end
+
+        if size == 0:
+            # Empty or stale sidecar: start a new one for this log inode
+            idx.truncate(0)
+            idx.write(json.dumps({"ino": ino}).encode() + b"\n")
+            idx.flush()
+            self.idx_offset = idx.tell()
+
+    def _scan_log(self, size: int) -> list[list]:
+        """Parse log lines past the covered offset into index entries."""
+        entries: list[list] = []
+        pos = self.covered
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(pos)
+                while pos < size:
+                    chunk = f.read(min(_READ_CHUNK, size - pos))
+                    if not chunk:
+                        break
+                    end = chunk.rfind(b"\n") + 1
+                    if end == 0:
+                        if len(chunk) < _READ_CHUNK:
+                            break  # torn trailing line, writer mid-append
+                        # One oversized line: extend until its newline
+                        rest = f.readline()
+                        if not rest.endswith(b"\n"):
+                            break
+                        chunk += rest
+                        end = len(chunk)
+                    else:
+                        f.seek(pos + end)
+                    line_start = pos
+                    for line in chunk[:end].split(b"\n")[:-1]:
+                        length = len(line) + 1
+                        entry = _index_entry(line)
+                        if entry is not None:
+                            entries.append([line_start, length, *entry])
+                        line_start += length
+                    pos += end
+        except OSError as e:
+            logger.debug("Cannot index %s: %s", self.log_path, e)
+        return entries
+
+    def select(
+        self, event_type: str | None, change: str | None, since: str | None, lo: int,
+        want: int | None = None,
+    ) -> list[int]:
+        """Positions of candidate events at or after position lo.
+
+        With want set, only the last `want` candidates are returned. The
+        since bound is approximate (timestamp checkpoints over a log whose
+        timestamps only grow); callers re-check every filter on the parsed
+        events.
+        """
+        if since:
+            mark = bisect_left(self.ts_marks, since)
+            lo = max(lo, (mark - 1) * TS_CHECKPOINT_EVERY)
+        postings = []
+        if event_type:
+            postings.append(self.by_type.get(event_type, array("q")))
+        if change:
+            postings.append(self.by_change.get(change, array("q")))
+        if not postings:
+            start = lo if want is None else max(lo, len(self.offsets) - want)
+            return list(range(start, len(self.offsets)))
+
+        postings.sort(key=len)
+        base, others = postings[0], postings[1:]
+        start = bisect_left(base, lo)
+        if not others:
+            if want is not None:
+                start = max(start, len(base) - want)
+            return list(base[start:])
+        # Intersect newest-first so a small `want` stops early
+        result = []
+        for j in range(len(base) - 1, start - 1, -1):
+            i = base[j]
+            if all(_contains(other, i) for other in others):
+                result.append(i)
+                if want is not None and len(result) >= want:
+                    break
+        result.reverse()
+        return result
+
+
+_indexes: dict[str, _EventIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + INDEX_SUFFIX)
+
+
+def _get_index(log_path: Path) -> _EventIndex:
+    key = os.path.abspath(log_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = _EventIndex(Path(key))
+        return index
+
+
+def _refresh_index(log_path: Path) -> None:
+    index = _get_index(log_path)
+    with index.lock:
+        index.refresh()
+
+
+def _index_entry(line: bytes) -> list | None:
+    """[type, change, ts] for one log line, or None if it is not an event."""
+    m = _LINE_PREFIX_RE.match(line)
+    if m:
+        etype, change, ts = m.group(2), m.group(3), m.group(1)
+        return [etype.decode(), change.decode() if change else "", ts.decode()]
+    try:
+        event = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(event, dict):
+        return None
+    return [str(event.get("type", "")), str(event.get("change", "")), str(event.get("ts", ""))]
+
+
+def _parse_sidecar_lines(lines: list[bytes]) -> list:
+    """Decode sidecar entry lines, in one json call when none are torn."""
+    if not lines:
+        return []
+    try:
+        return json.loads(b"[" + b",".join(lines) + b"]")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    return entries
+
+
+def _contains(sorted_arr: array, value: int) -> bool:
+    i = bisect_left(sorted_arr, value)
+    return i < len(sorted_arr) and sorted_arr[i] == value
+
+
+def _read_events_at(path: Path, offsets: list[int]) -> list[dict[str, Any]]:
+    """Parse the log lines starting at the given byte offsets."""
+    events = []
+    try:
+        with open(path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                try:
+                    event = json.loads(f.readline())
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict):
+                    events.append(event)
+    except OSError:
+        pass
+    return events
+
+
+def _tail_events(files: list[Path], n: int) -> list[dict[str, Any]]:
+    """Last n events across files (oldest file first), newest file read first."""
+    results: list[dict[str, Any]] = []
+    for file_path in reversed(files):
+        remaining = n - len(results)
+        if remaining <= 0:
+            break
+        events = []
+        lines, _ = read_tail(file_path, remaining, skip_blank=True)
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(event, dict):
+                events.append(event)
+        results[:0] = events
+    return results
+
+
+# ─── Buffered Writer Lifecycle ───────────────────────────────────────
+
+_buffered_buses: "weakref.WeakSet[EventBus]" = weakref.WeakSet()
+_previous_handlers: dict[int, Any] = {}
+
+
+def buffer_options_from_env() -> dict[str, Any]:
+    """EventBus keyword arguments from WT_EVENTS_BUFFERED / WT_EVENTS_FSYNC."""
+    opts: dict[str, Any] = {}
+    if os.environ.get(BUFFER_ENV, "").lower() in ("1", "true", "yes"):
+        opts["buffered"] = True
+    fsync = os.environ.get(FSYNC_ENV, "")
+    if fsync in FSYNC_POLICIES:
+        opts["fsync"] = fsync
+    return opts
+
+
+def flush_all(blocking: bool = True) -> bool:
+    """Flush every live buffered EventBus in this process.
+
+    Returns False if some bus was skipped (blocking=False, lock busy).
+    """
+    done = True
+    for bus in list(_buffered_buses):
+        try:
+            done = bus.flush(blocking=blocking) and done
+        except Exception:
+            logger.error("Failed to flush event buffer", exc_info=True)
+    return done
+
+
+def _register_buffered(bus: EventBus) -> None:
+    if not _buffered_buses:
+        _install_signal_flush()
+    _buffered_buses.add(bus)
+
+
+def _install_signal_flush() -> None:
+    """Flush buffers before SIGTERM/SIGHUP take the process down.
+
+    Only signals still at their default disposition are hooked; a handler
+    installed later (e.g. cmd_engine's sys.exit) reaches flush_all() via
+    atexit instead.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in (signal.SIGTERM, signal.SIGHUP):
+        if signal.getsignal(signum) is signal.SIG_DFL:
+            _previous_handlers[signum] = signal.SIG_DFL
+            signal.signal(signum, _flush_and_reraise)
+
+
+def _flush_and_reraise(signum: int, frame: Any) -> None:
+    """Flush what can be flushed without waiting, then die by the signal.
+
+    The handler runs on the main thread between bytecodes, possibly inside
+    flush()/_enqueue() holding a bus lock; waiting for it would deadlock.
+    If a bus is busy, unwind with SystemExit instead, so the interrupted
+    code releases its locks and atexit's flush_all() writes the rest.
+    """
+    signal.signal(signum, _previous_handlers.get(signum, signal.SIG_DFL))
+    if not flush_all(blocking=False):
+        raise SystemExit(128 + signum)
+    os.kill(os.getpid(), signum)
+
+
+atexit.register(flush_all)
+
 def _resolve_log_path() -> Path | None:
     """Resolve events log path from STATE_FILENAME env var.
 
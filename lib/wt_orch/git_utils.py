@@ -1,6 +1,12 @@
 """Git utilities shared across orchestration modules."""
 
+from __future__ import annotations
+
+import os
 import subprocess
+from dataclasses import dataclass, field
+
+from .subprocess_utils import run_command
 
 # Paths that are always dirty during agent execution (framework-internal).
 # These are written by Ralph loop, Claude Code session, wt-tools hooks, and
@@ -66,3 +72,148 @@ def git_has_uncommitted_work(wt_path: str) -> tuple[bool, str]:
     summary = ", ".join(parts)
 
     return (True, summary)
+
+
+# ─── Ref Queries ─────────────────────────────────────────────────────
+# Worktree sync, merge pre-checks and scope checks used to fork one git
+# process per show-ref / rev-parse / merge-base / rev-list. Ref lookups are
+# batched (one for-each-ref + worktree list per sync cycle, one
+# cat-file --batch-check per lookup set) and graph queries are cached by
+# the commit ids involved — their answers never change for the same ids.
+
+# Cached graph query results kept before the caches are reset
+GRAPH_CACHE_MAX = 4096
+
+_behind_ahead_cache: dict[tuple[str, str], tuple[int, int]] = {}
+_merge_base_cache: dict[tuple[str, str], str] = {}
+_ancestor_cache: dict[tuple[str, str], bool] = {}
+
+
+def _cache_put(cache: dict, key: tuple, value) -> None:
+    if len(cache) >= GRAPH_CACHE_MAX:
+        cache.clear()
+    cache[key] = value
+
+
+@dataclass
+class RefSnapshot:
+    """Branch tips and worktree HEADs of one repository.
+
+    Read with two git processes however many worktrees there are; callers
+    syncing several worktrees share one snapshot. Refs moved after read()
+    (e.g. a worktree branch advanced by its own sync) are not reflected.
+    """
+
+    branches: dict[str, str] = field(default_factory=dict)  # "main" -> sha
+    worktrees: dict[str, tuple[str, str]] = field(default_factory=dict)  # realpath -> (sha, branch)
+
+    @classmethod
+    def read(cls, cwd: str | None = None) -> "RefSnapshot":
+        snap = cls()
+        r = run_command(
+            ["git", "for-each-ref", "--format=%(objectname) %(refname:short)", "refs/heads"],
+            timeout=10, cwd=cwd,
+        )
+        if r.exit_code == 0:
+            for line in r.stdout.splitlines():
+                sha, _, name = line.partition(" ")
+                if name:
+                    snap.branches[name] = sha
+        r = run_command(["git", "worktree", "list", "--porcelain"], timeout=10, cwd=cwd)
+        if r.exit_code == 0:
+            path = sha = ""
+            branch = "HEAD"
+            for line in r.stdout.splitlines() + [""]:
+                if line.startswith("worktree "):
+                    path = line[len("worktree "):]
+                elif line.startswith("HEAD "):
+                    sha = line[len("HEAD "):]
+                elif line.startswith("branch "):
+                    branch = line[len("branch "):].removeprefix("refs/heads/")
+                elif not line:
+                    if path and sha:
+                        snap.worktrees[os.path.realpath(path)] = (sha, branch)
+                    path = sha = ""
+                    branch = "HEAD"
+        return snap
+
+    def main_branch(self) -> tuple[str, str]:
+        """(name, sha) of main, else master; ("", "") if neither exists."""
+        for name in ("main", "master"):
+            if name in self.branches:
+                return name, self.branches[name]
+        return "", ""
+
+    def worktree_head(self, wt_path: str) -> tuple[str, str] | None:
+        """(sha, branch) checked out in a worktree; branch is "HEAD" if detached."""
+        return self.worktrees.get(os.path.realpath(wt_path))
+
+
+def resolve_refs(names: list[str], cwd: str | None = None) -> dict[str, str]:
+    """Resolve revisions (refs, HEAD, short names) with one git process.
+
+    Unresolvable names map to "".
+    """
+    if not names:
+        return {}
+    r = run_command(
+        ["git", "cat-file", "--batch-check=%(objectname)"],
+        timeout=10, cwd=cwd, stdin_data="".join(n + "\n" for n in names),
+    )
+    lines = r.stdout.splitlines() if r.exit_code == 0 else []
+    resolved = {}
+    for i, name in enumerate(names):
+        line = lines[i].strip() if i < len(lines) else ""
+        # Missing objects come back as "<name> missing" / "<name> ambiguous"
+        resolved[name] = "" if (not line or " " in line) else line
+    return resolved
+
+
+def behind_ahead(base: str, head: str, cwd: str | None = None) -> tuple[int, int] | None:
+    """Commits (base has that head lacks, head has that base lacks).
+
+    behind == 0 means base is already merged into head. Cached by the two
+    commit ids; None if git fails.
+    """
+    key = (base, head)
+    cached = _behind_ahead_cache.get(key)
+    if cached is not None:
+        return cached
+    r = run_command(
+        ["git", "rev-list", "--left-right", "--count", f"{base}...{head}"],
+        timeout=30, cwd=cwd,
+    )
+    try:
+        behind, ahead = (int(x) for x in r.stdout.split())
+    except ValueError:
+        return None
+    if r.exit_code != 0:
+        return None
+    _cache_put(_behind_ahead_cache, key, (behind, ahead))
+    return behind, ahead
+
+
+def merge_base(a: str, b: str, cwd: str | None = None) -> str:
+    """merge-base of two commit ids, cached; "" if none or git fails."""
+    key = (a, b)
+    cached = _merge_base_cache.get(key)
+    if cached is not None:
+        return cached
+    r = run_command(["git", "merge-base", a, b], timeout=30, cwd=cwd)
+    base = r.stdout.strip() if r.exit_code == 0 else ""
+    if base:
+        _cache_put(_merge_base_cache, key, base)
+    return base
+
+
+def is_ancestor(commit: str, of: str, cwd: str | None = None) -> bool:
+    """True if commit is reachable from `of` (both commit ids), cached."""
+    key = (commit, of)
+    cached = _ancestor_cache.get(key)
+    if cached is not None:
+        return cached
+    r = run_command(["git", "merge-base", "--is-ancestor", commit, of], timeout=10, cwd=cwd)
+    if r.exit_code not in (0, 1):
+        return False
+    _cache_put(_ancestor_cache, key, r.exit_code == 0)
+    return r.exit_code == 0
@@ -0,0 +1,298 @@
+"""Conditional GET support for the wt-web read API.
+
+The dashboard polls its read routes on timers; most polls return exactly
+what the previous one did. Two layers keep that cheap:
+
+- ETagMiddleware hashes every JSON body under /api/ into a weak ETag and
+  answers a matching If-None-Match with 304 — no body on the wire.
+- ResponseCache remembers, per route and arguments, the serialized body
+  together with the stat signature (inode, size, mtime) of the files it
+  was built from. While the signature holds, the route's result is
+  served without re-reading or re-serializing anything (see
+  api._validated). Files modified within RACY_SECS of the build are not
+  trusted (see enrichment.py).
+
+Compression is negotiated outside both: BrotliMiddleware answers clients
+that accept `br` when the optional brotli module is installed, and
+GZipMiddleware (server.py) handles the rest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, NamedTuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from .enrichment import RACY_SECS
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Cached route responses kept before the least recently used is dropped
+MAX_RESPONSES = 256
+
+# Brotli level for dynamic responses: 11 is several times slower for a
+# few percent smaller output
+BROTLI_QUALITY = 5
+
+# Media types worth compressing besides text/* (event streams never are)
+_COMPRESSIBLE = ("application/json", "application/javascript", "image/svg+xml")
+
+
+def stat_signature(paths: Iterable[str | os.PathLike]) -> tuple:
+    """(inode, size, mtime_ns) per path, None for missing ones."""
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            sig.append(None)
+            continue
+        sig.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(sig)
+
+
+def newest_mtime(signature: tuple) -> float:
+    return max((s[2] for s in signature if s is not None), default=0) / 1e9
+
+
+def etag_for(body: bytes) -> str:
+    return 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == bare for t in if_none_match.split(","))
+
+
+class CachedResponse(NamedTuple):
+    paths: tuple
+    signature: tuple
+    etag: str
+    body: bytes
+
+
+class ResponseCache:
+    """Serialized route results keyed by (route, arguments), LRU-bounded."""
+
+    def __init__(self, max_entries: int = MAX_RESPONSES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        # Routes run on the I/O pool's threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: tuple) -> CachedResponse | None:
+        """The cached response if the files it was built from are unchanged."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or stat_signature(entry.paths) != entry.signature:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: tuple, paths: Iterable, body: bytes, built_at: float) -> str:
+        """Remember a body built at `built_at` from `paths`; returns its ETag."""
+        etag = etag_for(body)
+        paths = tuple(str(p) for p in paths)
+        signature = stat_signature(paths)
+        with self._lock:
+            if newest_mtime(signature) < built_at - RACY_SECS:
+                self._entries[key] = CachedResponse(paths, signature, etag, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.pop(key, None)
+        return etag
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by the api routes
+response_cache = ResponseCache()
+
+
+class ETagMiddleware:
+    """ETag + 304 for 200 JSON responses to GETs under `prefix` (pure ASGI).
+
+    A response that already carries an ETag keeps it; others get a hash of
+    their body. Cache-Control: no-cache makes browsers revalidate each poll.
+    """
+
+    def __init__(self, app, prefix: str = "/api/"):
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = ""
+        for name, value in scope.get("headers", []):
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+        start: dict | None = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def buffered_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if message["status"] != 200 or not headers.get("content-type", "").startswith("application/json"):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = MutableHeaders(scope=start)
+            etag = headers.get("etag")
+            if etag is None:
+                etag = etag_for(body)
+                headers["ETag"] = etag
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = "no-cache"
+            if if_none_match and etag_matches(if_none_match, etag):
+                start["status"] = 304
+                for name in ("content-length", "content-type"):
+                    if name in headers:
+                        del headers[name]
+                body = b""
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, buffered_send)
+
+
+def accepts_br(accept_encoding: str) -> bool:
+    """True if an Accept-Encoding header allows br (q > 0)."""
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() != "br":
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _compressible(media_type: str) -> bool:
+    media_type = media_type.partition(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return media_type.startswith("text/") or media_type in _COMPRESSIBLE
+
+
+class BrotliMiddleware:
+    """Brotli Content-Encoding for clients that accept br (pure ASGI).
+
+    Without the brotli module, or for clients that do not accept br, the
+    request passes through untouched. Otherwise the inner app sees no
+    Accept-Encoding (so the GZipMiddleware inside stays out of the way),
+    and bodies of at least minimum_size are compressed; streamed bodies
+    are flushed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size: int = 500, quality: int = BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.quality = quality
+
+    async def __call__(self, scope, receive, send):
+        if (
+            brotli is None
+            or scope["type"] != "http"
+            or not accepts_br(Headers(scope=scope).get("accept-encoding", ""))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        inner_scope = dict(scope)
+        inner_scope["headers"] = [(k, v) for k, v in scope["headers"] if k != b"accept-encoding"]
+        start: dict | None = None
+        compressor = None
+        passthrough = False
+
+        async def br_send(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 206, 304)
+                    or not _compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                    passthrough = True
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            first = compressor is None
+            if first:
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = brotli.Compressor(quality=self.quality)
+            data = compressor.process(body)
+            data += compressor.flush() if more_body else compressor.finish()
+            if first:
+                headers["Content-Encoding"] = "br"
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(data))
+                await send(start)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(inner_scope, receive, br_send)
@@ -0,0 +1,164 @@
+"""Blocking I/O off the wt-web event loop, and loop-lag instrumentation.
+
+State reads, log tails and directory scans are synchronous. Run on the
+event loop they stall every project's WebSocket stream; run on the
+default thread pool one project with a slow filesystem can occupy all of
+it. BlockingPool runs them on a bounded executor with a per-project
+concurrency limit. LoopLagMonitor measures how late the loop wakes up
+from a fixed sleep, so stalls that still slip through are visible
+(GET /api/runtime).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("wt-web.io")
+
+# Worker threads shared by all projects
+IO_WORKERS = 16
+
+# Blocking calls of one project running at once; the rest wait their turn
+PER_PROJECT_LIMIT = 4
+
+# Loop-lag sampling period, and the lag logged as a stall
+LAG_INTERVAL = 0.5
+LAG_WARN_SECS = 0.25
+
+
+class BlockingPool:
+    """Bounded executor with a per-project concurrency limit."""
+
+    def __init__(self, workers: int = IO_WORKERS, per_project: int = PER_PROJECT_LIMIT):
+        self.workers = workers
+        self.per_project = per_project
+        self._executor: ThreadPoolExecutor | None = None
+        # Semaphores belong to the loop they were created on
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._limits: dict[str, asyncio.Semaphore] = {}
+        self._stats: dict[str, dict] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="wt-web-io",
+            )
+        return self._executor
+
+    def _limit(self, project: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._limits = {}
+        sem = self._limits.get(project)
+        if sem is None:
+            sem = self._limits[project] = asyncio.Semaphore(self.per_project)
+        return sem
+
+    async def run(self, project: str, fn, /, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the pool once a slot of `project` is free."""
+        st = self._stats.setdefault(project, {
+            "calls": 0, "running": 0, "waiting": 0,
+            "wait_max_ms": 0.0, "busy_ms": 0.0,
+        })
+        sem = self._limit(project)
+        queued = time.monotonic()
+        st["waiting"] += 1
+        try:
+            await sem.acquire()
+        finally:
+            st["waiting"] -= 1
+        started = time.monotonic()
+        st["wait_max_ms"] = max(st["wait_max_ms"], (started - queued) * 1000)
+        st["running"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(fn, *args, **kwargs)
+            return await loop.run_in_executor(self._get_executor(), call)
+        finally:
+            sem.release()
+            st["running"] -= 1
+            st["calls"] += 1
+            st["busy_ms"] += (time.monotonic() - started) * 1000
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "per_project": self.per_project,
+            "projects": {
+                name: {k: round(v, 1) if isinstance(v, float) else v for k, v in st.items()}
+                for name, st in self._stats.items()
+            },
+        }
+
+    def shutdown(self):
+        """Stop the workers; the next run() starts a fresh executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class LoopLagMonitor:
+    """Sample event-loop scheduling lag: how late a fixed sleep returns."""
+
+    def __init__(self, interval: float = LAG_INTERVAL, warn_secs: float = LAG_WARN_SECS):
+        self.interval = interval
+        self.warn_secs = warn_secs
+        self.samples = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+        self.stalls = 0
+        self.last_stall: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def record(self, lag: float):
+        ms = lag * 1000
+        self.samples += 1
+        self.last_ms = ms
+        self.max_ms = max(self.max_ms, ms)
+        self.total_ms += ms
+        if lag >= self.warn_secs:
+            self.stalls += 1
+            self.last_stall = time.time()
+            logger.warning(f"Event loop stalled for {ms:.0f} ms")
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - start - self.interval))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="loop-lag")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def as_dict(self) -> dict:
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "last_ms": round(self.last_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "mean_ms": round(self.total_ms / self.samples, 1) if self.samples else 0.0,
+            "stalls": self.stalls,
+            "last_stall": self.last_stall,
+        }
+
+
+# Singletons — shared by server.py lifespan, api routes and the watchers
+io_pool = BlockingPool()
+loop_lag = LoopLagMonitor()
@@ -0,0 +1,119 @@
+"""Minimal RFC 6902 JSON Patch: diff two JSON documents and apply patches.
+
+Used by the watcher to stream state deltas over the WebSocket instead of
+the whole (enriched) state on every write. Only the operations a diff
+needs are produced: "add", "remove" and "replace". Lists are diffed by
+index — element-wise over the common prefix, then appends or removals at
+the tail — which keeps the patch small for the state file's append-mostly
+lists (changes, merge_queue, checkpoints) without an LCS pass.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+
+class PatchError(ValueError):
+    """A patch does not apply to the document."""
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> list[dict]:
+    """Operations turning `old` into `new` (both plain JSON values)."""
+    ops: list[dict] = []
+    _diff(old, new, path, ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str, ops: list[dict]) -> None:
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(str(key))}"})
+        for key, value in new.items():
+            sub = f"{path}/{_escape(str(key))}"
+            if key not in old:
+                ops.append({"op": "add", "path": sub, "value": value})
+            else:
+                _diff(old[key], value, sub, ops)
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            _diff(old[i], new[i], f"{path}/{i}", ops)
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        # Remove from the end so earlier indices stay valid
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        return
+    # Scalars: True == 1 in Python but not in JSON
+    if type(old) is type(new) and old == new:
+        return
+    ops.append({"op": "replace", "path": path, "value": new})
+
+
+def apply_patch(doc: Any, ops: list[dict]) -> Any:
+    """Apply operations to a deep copy of `doc` and return it."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        doc = _apply_one(doc, op)
+    return doc
+
+
+def _apply_one(doc: Any, op: dict) -> Any:
+    kind, path = op.get("op"), op.get("path", "")
+    if path == "":
+        if kind in ("add", "replace"):
+            return copy.deepcopy(op["value"])
+        raise PatchError(f"cannot {kind} the document root")
+    tokens = [_unescape(t) for t in path.split("/")[1:]]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = _child(parent, token, path)
+    last = tokens[-1]
+    if isinstance(parent, dict):
+        if kind == "add" or (kind == "replace" and last in parent):
+            parent[last] = copy.deepcopy(op["value"])
+        elif kind == "remove" and last in parent:
+            del parent[last]
+        else:
+            raise PatchError(f"{kind} {path}: no such member")
+    elif isinstance(parent, list):
+        index = len(parent) if last == "-" else _index(last, path)
+        if kind == "add" and index <= len(parent):
+            parent.insert(index, copy.deepcopy(op["value"]))
+        elif kind == "replace" and index < len(parent):
+            parent[index] = copy.deepcopy(op["value"])
+        elif kind == "remove" and index < len(parent):
+            del parent[index]
+        else:
+            raise PatchError(f"{kind} {path}: index out of range")
+    else:
+        raise PatchError(f"{kind} {path}: parent is not a container")
+    return doc
+
+
+def _child(node: Any, token: str, path: str) -> Any:
+    try:
+        if isinstance(node, list):
+            return node[_index(token, path)]
+        return node[token]
+    except (KeyError, IndexError, TypeError):
+        raise PatchError(f"{path}: no such location") from None
+
+
+def _index(token: str, path: str) -> int:
+    if not token.isdigit():
+        raise PatchError(f"{path}: bad array index {token!r}")
+    return int(token)
@@ -27,6 +27,7 @@ import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
+from .git_utils import is_ancestor, resolve_refs
 from .state import (
     Change,
     OrchestratorState,
@@ -207,9 +208,12 @@ def cleanup_all_worktrees(state_file: str) -> int:
 def _sync_running_worktrees(merged_change: str, state_file: str) -> int:
     """Sync all running worktrees with main after merge. Returns count synced."""
     from .dispatcher import sync_worktree_with_main
+    from .git_utils import RefSnapshot
 
     state = load_state(state_file)
     synced = 0
+    # One ref snapshot (main tip + every worktree HEAD) for the whole fan-out
+    refs = None
 
     for change in state.changes:
         if change.status != "running":
@@ -218,7 +222,9 @@ def _sync_running_worktrees(merged_change: str, state_file: str) -> int:
         if not wt_path or not os.path.isdir(wt_path):
             continue
         try:
-            result = sync_worktree_with_main(wt_path, change.name)
+            if refs is None:
+                refs = RefSnapshot.read(wt_path)
+            result = sync_worktree_with_main(wt_path, change.name, refs=refs)
             if result.ok:
                 logger.info(
                     "Post-merge sync: %s synced with main (after %s merge)",
@@ -272,12 +278,10 @@ def merge_change(
 
     source_branch = f"change/{change_name}"
 
-    # Check branch existence
-    branch_check = run_command(
-        ["git", "show-ref", "--verify", "--quiet", f"refs/heads/{source_branch}"],
-        timeout=10,
-    )
-    branch_exists = branch_check.exit_code == 0
+    # Branch tip and HEAD in one lookup
+    resolved = resolve_refs([f"refs/heads/{source_branch}", "HEAD"])
+    source_sha = resolved[f"refs/heads/{source_branch}"]
+    branch_exists = bool(source_sha)
 
     # Case 1: Branch no longer exists (already merged and deleted)
     if not branch_exists:
@@ -291,16 +295,9 @@ def merge_change(
         return MergeResult(success=True, status="merged", smoke_result="skip_merged")
 
     # Case 2: Branch is ancestor of HEAD (already merged, branch not deleted)
-    source_sha_result = run_command(
-        ["git", "rev-parse", source_branch], timeout=10,
-    )
-    source_sha = source_sha_result.stdout.strip()
-    if source_sha:
-        ancestor_check = run_command(
-            ["git", "merge-base", "--is-ancestor", source_sha, "HEAD"],
-            timeout=10,
-        )
-        if ancestor_check.exit_code == 0:
+    pre_merge_sha = resolved["HEAD"]
+    if pre_merge_sha:
+        if is_ancestor(source_sha, pre_merge_sha):
             logger.info("Skipping merge for %s — already merged", change_name)
             update_change_field(state_file, change_name, "status", "merged")
             update_change_field(state_file, change_name, "smoke_result", "skip_merged")
@@ -311,7 +308,6 @@ def merge_change(
             return MergeResult(success=True, status="merged", smoke_result="skip_merged")
 
     # Case 3: Normal merge
-    pre_merge_sha = run_command(["git", "rev-parse", "HEAD"], timeout=10).stdout.strip()
     merge_result = run_command(
         ["wt-merge", change_name, "--no-push", "--llm-resolve"],
         timeout=600,
@@ -480,9 +480,10 @@ def check_scope_overlap(
 
     # Also check against active worktrees (if state file exists)
     if state_path and os.path.exists(state_path):
+        from .state import StateCorruptionError, read_state_data
+
         try:
-            with open(state_path, "r") as f:
-                state = json.load(f)
+            state = read_state_data(state_path)
 
             active_statuses = {"running", "dispatched", "done"}
             for sc in state.get("changes", []):
@@ -510,7 +511,7 @@ def check_scope_overlap(
                                 "Overlap with active: %s ↔ %s = %d%%",
                                 name, active_name, similarity,
                             )
-        except (json.JSONDecodeError, OSError):
+        except StateCorruptionError:
             logger.warning("Could not read state file for overlap check")
 
     # Check cross-cutting file mentions if project-knowledge.yaml exists
@@ -890,9 +891,10 @@ def enrich_plan_metadata(
 
     # During replan, strip depends_on references to completed changes
     if replan_cycle is not None and state_path and os.path.exists(state_path):
+        from .state import StateCorruptionError, read_state_data
+
         try:
-            with open(state_path, "r") as f:
-                state = json.load(f)
+            state = read_state_data(state_path)
 
             completed_names = {
                 c["name"]
@@ -905,7 +907,7 @@ def enrich_plan_metadata(
                 deps = c.get("depends_on", [])
                 # Keep only deps that are in the current plan
                 c["depends_on"] = [d for d in deps if d in plan_names]
-        except (json.JSONDecodeError, OSError):
+        except StateCorruptionError:
             logger.warning("Could not read state for replan depends_on stripping")
 
     return plan_data
@@ -934,10 +936,11 @@ def collect_replan_context(state_path: str) -> dict:
         "e2e_failures": "",
     }
 
+    from .state import StateCorruptionError, read_state_data
+
     try:
-        with open(state_path, "r") as f:
-            state = json.load(f)
-    except (json.JSONDecodeError, OSError):
+        state = read_state_data(state_path)
+    except StateCorruptionError:
         return result
 
     completed_statuses = {"done", "merged", "merge-blocked"}
@@ -12,23 +12,32 @@ from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from .api import router as api_router
 from .chat import router as chat_router, session_manager
+from .http_cache import BrotliMiddleware, ETagMiddleware
+from .io_pool import io_pool, loop_lag
 from .watcher import WatcherManager
 from .websocket import router as ws_router, connection_manager
 
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = 2048
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start file watchers on startup, stop on shutdown."""
+    """Start file watchers and loop-lag sampling on startup, stop on shutdown."""
     watcher = app.state.watcher_manager
+    loop_lag.start()
     await watcher.start(connection_manager)
     yield
     await session_manager.stop_all()
     await watcher.stop()
+    await loop_lag.stop()
+    io_pool.shutdown()
 
 
 def create_app(web_dist_dir: str | None = None) -> FastAPI:
@@ -52,6 +61,13 @@ def create_app(web_dist_dir: str | None = None) -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Conditional GETs for the polled read API; compression outside it, so
+    # ETags hash the uncompressed body: brotli when the client accepts it
+    # and the module is installed, else gzip
+    app.add_middleware(ETagMiddleware)
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_BYTES)
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESS_MIN_BYTES)
+
     # State
     app.state.watcher_manager = WatcherManager()
 
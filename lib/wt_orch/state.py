@@ -3,6 +3,12 @@
 Replaces complex jq pipelines with Python dataclasses. Provides atomic file
 operations and validation on read/write. Phase 2 adds mutations, locking,
 dependency graph, phase management, and crash recovery.
+
+Single-field updates can optionally be journaled (WT_STATE_JOURNAL=1): each
+update appends a small patch line to ``<state>.journal`` instead of rewriting
+the whole file, and the journal is folded back into the state file once it
+grows past a size/entry limit. load_state() always replays a pending journal,
+so readers see the same dataclasses either way.
 """
 
 from __future__ import annotations
@@ -13,6 +19,7 @@ import logging
 import os
 import subprocess
 import tempfile
+import time
 from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass, field, fields
@@ -237,17 +244,8 @@ class OrchestratorState:
         return cls(**kwargs, extras=extras)
 
 
-def load_state(path: str) -> OrchestratorState:
-    """Load and validate orchestration state from JSON file.
-
-    Raises StateCorruptionError on invalid/corrupt JSON or missing required fields.
-    """
-    try:
-        with open(path, "r") as f:
-            raw = f.read()
-    except OSError as e:
-        raise StateCorruptionError(path, f"cannot read file: {e}")
-
+def _parse_state(path: str, raw: str) -> dict:
+    """Parse and structurally validate raw state JSON."""
     if not raw.strip():
         raise StateCorruptionError(path, "file is empty")
 
@@ -265,7 +263,68 @@ def load_state(path: str) -> OrchestratorState:
     if not isinstance(data["changes"], list):
         raise StateCorruptionError(path, "changes must be an array")
 
-    return OrchestratorState.from_dict(data)
+    return data
+
+
+def load_state(path: str) -> OrchestratorState:
+    """Load and validate orchestration state from JSON file.
+
+    Pending journal patches are replayed on top of the file contents.
+
+    Raises StateCorruptionError on invalid/corrupt JSON or missing required fields.
+    """
+    return OrchestratorState.from_dict(read_state_data(path))
+
+
+# Process-wide state I/O counters (see state_io_counters)
+_io_counters = {"loads": 0, "saves": 0, "appends": 0}
+
+
+def state_io_counters() -> dict[str, int]:
+    """Return a copy of the process-wide state I/O counters.
+
+    loads: full parses of the state file; saves: full state file writes;
+    appends: journal patch appends. Callers diff two snapshots to measure
+    the cost of a unit of work (e.g. one monitor poll).
+    """
+    return dict(_io_counters)
+
+
+def read_state_data(path: str) -> dict:
+    """Load state as a plain dict, with pending journal patches applied.
+
+    Lightweight alternative to load_state() for readers that only need the
+    JSON shape (web watcher, TUI). Lock-free: a compaction racing with the
+    read is detected via the journal's base signature and retried.
+
+    Raises StateCorruptionError on invalid/corrupt JSON or missing required fields.
+    """
+    journal = _journal_path(path)
+    data: dict = {}
+    for _ in range(_READ_RETRIES):
+        try:
+            with open(path, "r") as f:
+                raw = f.read()
+                sig = _base_signature(os.fstat(f.fileno()))
+        except OSError as e:
+            raise StateCorruptionError(path, f"cannot read file: {e}")
+
+        data = _parse_state(path, raw)
+        _io_counters["loads"] += 1
+        entries, _, header = _read_journal(journal)
+        if header is None:
+            # No journal — unless a compaction replaced the base meanwhile
+            if not _base_replaced(path, sig):
+                return data
+        elif header == sig:
+            for entry in entries:
+                _apply_patch(data, entry)
+            return data
+        time.sleep(0.01)
+
+    # Journal keeps disagreeing with the base: the base was rewritten by a
+    # writer that bypassed the journal (jq, TUI). The base wins.
+    return data
 
 
 def _lock_path(state_path: str) -> str:
@@ -273,35 +332,53 @@ def _lock_path(state_path: str) -> str:
     return os.path.abspath(state_path) + ".lock"
 
 
+def _serialize_state(state: OrchestratorState, caller: str) -> str:
+    content = json.dumps(state.to_dict(), indent=2) + "\n"
+    if len(content.strip()) < 2:  # at minimum "{}"
+        raise ValueError(f"{caller}: serialized state is empty")
+    return content
+
+
+def _write_state_file(path: str, content: str) -> None:
+    """Atomically replace the state file and drop any pending journal.
+
+    Caller must hold the state lock. The content is the complete state, so
+    journaled patches (already folded in by the caller's load) are obsolete.
+    """
+    dir_path = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.rename(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _io_counters["saves"] += 1
+    _discard_journal(path)
+
+
 def save_state(state: OrchestratorState, path: str) -> None:
     """Serialize state to JSON and write atomically under flock.
 
     Migrated from: state.sh save via with_state_lock + safe_jq_update.
     Uses fcntl.flock advisory lock + tempfile/rename for atomic writes.
     """
-    data = state.to_dict()
-    content = json.dumps(data, indent=2) + "\n"
+    content = _serialize_state(state, "save_state")
+    with _state_lock(path):
+        _write_state_file(path, content)
 
-    if len(content.strip()) < 2:  # at minimum "{}"
-        raise ValueError("save_state: serialized state is empty")
-
-    dir_path = os.path.dirname(os.path.abspath(path))
-    lock_file = _lock_path(path)
 
-    lock_fd = open(lock_file, "w")
+@contextmanager
+def _state_lock(path: str) -> Generator[None, None, None]:
+    """Hold the exclusive advisory lock for a state file."""
+    lock_fd = open(_lock_path(path), "w")
     try:
         fcntl.flock(lock_fd, fcntl.LOCK_EX)
-        fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp")
-        try:
-            with os.fdopen(fd, "w") as f:
-                f.write(content)
-            os.rename(tmp_path, path)
-        except Exception:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-            raise
+        yield
     finally:
         fcntl.flock(lock_fd, fcntl.LOCK_UN)
         lock_fd.close()
@@ -318,32 +395,222 @@ def locked_state(path: str) -> Generator[OrchestratorState, None, None]:
 
     Migrated from: state.sh with_state_lock pattern.
     """
-    lock_file = _lock_path(path)
-    lock_fd = open(lock_file, "w")
-    try:
-        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+    with _state_lock(path):
         state = load_state(path)
         yield state
         # Save without re-acquiring lock (we already hold it)
-        data = state.to_dict()
-        content = json.dumps(data, indent=2) + "\n"
-        if len(content.strip()) < 2:
-            raise ValueError("locked_state: serialized state is empty")
-        dir_path = os.path.dirname(os.path.abspath(path))
-        fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp")
+        _write_state_file(path, _serialize_state(state, "locked_state"))
+
+
+# ─── State Journal ───────────────────────────────────────────────────
+# <state>.journal is JSONL: a header line {"base": [ino, size, mtime_ns]}
+# binding it to one version of the state file, then one patch per line:
+# {"f": field, "v": value} for top-level fields, {"c": name, "f", "v"} for
+# change fields. Any full write of the state file discards the journal.
+
+JOURNAL_ENV = "WT_STATE_JOURNAL"
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_MAX_ENTRIES = 500
+JOURNAL_MAX_BYTES = 512 * 1024
+
+_READ_RETRIES = 5
+
+
+@dataclass
+class _JournalCursor:
+    """Writer-side view of base state + journal, kept across updates."""
+
+    base_sig: list[int]
+    offset: int
+    entries: int
+    data: dict
+
+
+# Keyed by absolute state path; only touched while holding the state lock
+_journal_cursors: dict[str, _JournalCursor] = {}
+
+
+def journal_enabled() -> bool:
+    """Whether single-field updates are journaled instead of rewriting the file."""
+    return os.environ.get(JOURNAL_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _journal_path(state_path: str) -> str:
+    return os.path.abspath(state_path) + JOURNAL_SUFFIX
+
+
+def _base_signature(st: os.stat_result) -> list[int]:
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _base_replaced(path: str, sig: list[int]) -> bool:
+    try:
+        return _base_signature(os.stat(path)) != sig
+    except OSError:
+        return True
+
+
+def _read_journal(
+    journal: str, offset: int = 0
+) -> tuple[list[dict], int, list[int] | None]:
+    """Read journal patches starting at a byte offset.
+
+    Returns (entries, end_offset, header_base_sig). The header is only parsed
+    when reading from offset 0; a torn trailing line (writer mid-append) is
+    left for the next read.
+    """
+    try:
+        with open(journal, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except OSError:
+        return [], offset, None
+
+    end = chunk.rfind(b"\n") + 1
+    header = None
+    entries = []
+    for i, line in enumerate(chunk[:end].splitlines()):
         try:
-            with os.fdopen(fd, "w") as f:
-                f.write(content)
-            os.rename(tmp_path, path)
-        except Exception:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-            raise
-    finally:
-        fcntl.flock(lock_fd, fcntl.LOCK_UN)
-        lock_fd.close()
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if offset == 0 and i == 0:
+            header = obj.get("base") if isinstance(obj, dict) else None
+            continue
+        if isinstance(obj, dict) and "f" in obj:
+            entries.append(obj)
+    return entries, offset + end, header
+
+
+def _apply_patch(data: dict, entry: dict) -> None:
+    name = entry.get("c")
+    if name is None:
+        data[entry["f"]] = entry.get("v")
+        return
+    for c in data.get("changes", []):
+        if c.get("name") == name:
+            c[entry["f"]] = entry.get("v")
+            return
+
+
+def _discard_journal(path: str) -> None:
+    """Remove the journal and forget the cursor (state lock held)."""
+    try:
+        os.unlink(_journal_path(path))
+    except FileNotFoundError:
+        pass
+    _journal_cursors.pop(os.path.abspath(path), None)
+
+
+def _journal_cursor(path: str) -> _JournalCursor:
+    """Return an up-to-date cursor (state lock held).
+
+    While the base file is unchanged only journal bytes appended since the
+    last call (possibly by other processes) are read and applied.
+    """
+    key = os.path.abspath(path)
+    journal = _journal_path(path)
+    try:
+        sig = _base_signature(os.stat(path))
+    except OSError as e:
+        raise StateCorruptionError(path, f"cannot read file: {e}")
+
+    cursor = _journal_cursors.get(key)
+    if cursor is not None and cursor.base_sig == sig:
+        try:
+            size = os.path.getsize(journal)
+        except OSError:
+            size = 0
+        if size == cursor.offset:
+            return cursor
+        if 0 < cursor.offset < size:
+            entries, cursor.offset, _ = _read_journal(journal, cursor.offset)
+            for entry in entries:
+                _apply_patch(cursor.data, entry)
+            cursor.entries += len(entries)
+            return cursor
+
+    # Full reload: base file changed, or first use in this process
+    try:
+        with open(path, "r") as f:
+            raw = f.read()
+            sig = _base_signature(os.fstat(f.fileno()))
+    except OSError as e:
+        raise StateCorruptionError(path, f"cannot read file: {e}")
+    data = _parse_state(path, raw)
+    _io_counters["loads"] += 1
+
+    entries, offset, header = _read_journal(journal)
+    if header is not None and header != sig:
+        logger.warning(
+            "Discarding stale state journal %s (state file rewritten outside the journal)",
+            journal,
+        )
+        os.unlink(journal)
+        entries, offset = [], 0
+    for entry in entries:
+        _apply_patch(data, entry)
+
+    cursor = _JournalCursor(base_sig=sig, offset=offset, entries=len(entries), data=data)
+    _journal_cursors[key] = cursor
+    return cursor
+
+
+def _journal_append(path: str, cursor: _JournalCursor, entry: dict) -> _JournalCursor:
+    """Append one patch to the journal and the cursor (state lock held).
+
+    Returns the cursor to append to next: a fresh one if this append
+    compacted the journal, since compaction drops the old cursor.
+    """
+    line = json.dumps(entry, default=_json_default, separators=(",", ":")) + "\n"
+    with open(_journal_path(path), "a") as f:
+        if cursor.offset == 0:
+            header = json.dumps({"base": cursor.base_sig}) + "\n"
+            f.write(header)
+            cursor.offset = len(header.encode())
+        f.write(line)
+    cursor.offset += len(line.encode())
+    cursor.entries += 1
+    _io_counters["appends"] += 1
+    # Apply the round-tripped value so the cursor matches what readers replay
+    _apply_patch(cursor.data, json.loads(line))
+
+    if cursor.entries >= JOURNAL_MAX_ENTRIES or cursor.offset >= JOURNAL_MAX_BYTES:
+        _compact_locked(path, cursor)
+        return _journal_cursor(path)
+    return cursor
+
+
+def _json_default(obj: Any) -> Any:
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _compact_locked(path: str, cursor: _JournalCursor | None = None) -> bool:
+    """Fold the journal into the state file (state lock held)."""
+    if cursor is None:
+        if not os.path.exists(_journal_path(path)):
+            return False
+        cursor = _journal_cursor(path)
+    entries = cursor.entries
+    state = OrchestratorState.from_dict(cursor.data)
+    _write_state_file(path, _serialize_state(state, "compact_state"))
+    logger.debug("Compacted %d journal entries into %s", entries, path)
+    return True
+
+
+def compact_state(path: str, lock: bool = True) -> bool:
+    """Fold a pending journal back into the state file.
+
+    Call before handing the state file to tools that rewrite the raw JSON
+    (jq). Pass lock=False when the caller already holds the state lock, e.g.
+    from inside bash with_state_lock. Returns True if a journal was compacted.
+    """
+    if not lock:
+        return _compact_locked(path)
+    with _state_lock(path):
+        return _compact_locked(path)
 
 
 def init_state(plan_file: str, output_path: str) -> None:
@@ -425,13 +692,19 @@ def update_state_field(
 ) -> None:
     """Update a top-level field in state (locked + validated).
 
+    In journal mode the update is appended to the state journal instead of
+    rewriting the file.
+
     Migrated from: state.sh update_state_field() L73-77
     """
+    if journal_enabled():
+        with _state_lock(path):
+            cursor = _journal_cursor(path)
+            _journal_append(path, cursor, {"f": field_name, "v": value})
+        return
+
     with locked_state(path) as state:
-        if field_name in {f.name for f in fields(OrchestratorState) if f.name != "extras"}:
-            setattr(state, field_name, value)
-        else:
-            state.extras[field_name] = value
+        _set_state_field(state, field_name, value)
 
 
 def update_change_field(
@@ -446,56 +719,263 @@ def update_change_field(
 
     Automatically emits STATE_CHANGE event when status transitions,
     TOKENS event on significant deltas (>10K), and triggers on_fail hook.
+    In journal mode the update is appended to the state journal instead of
+    rewriting the file.
 
     Migrated from: state.sh update_change_field() L80-131
     """
+    if journal_enabled():
+        with _state_lock(path):
+            cursor = _journal_cursor(path)
+            change_data = next(
+                (c for c in cursor.data["changes"] if c.get("name") == change_name), None
+            )
+            if change_data is None:
+                raise ValueError(f"Change not found: {change_name}")
+            old_value = change_data.get(field_name)
+            _journal_append(path, cursor, {"c": change_name, "f": field_name, "v": value})
+            _emit_change_field_events(
+                change_name, field_name, old_value, value,
+                change_data.get("worktree_path") or "", event_bus, hook_scripts,
+            )
+        return
+
     with locked_state(path) as state:
         change = _find_change(state, change_name)
         if change is None:
             raise ValueError(f"Change not found: {change_name}")
 
-        old_status = change.status if field_name == "status" else None
-        old_tokens = change.tokens_used if field_name == "tokens_used" else None
+        old_value = getattr(change, field_name, None) if field_name in (
+            "status", "tokens_used"
+        ) else None
 
-        # Set the field
-        known = {f.name for f in fields(Change) if f.name != "extras"}
-        if field_name in known:
-            setattr(change, field_name, value)
-        else:
-            change.extras[field_name] = value
+        _set_change_field(change, field_name, value)
 
-        # Emit STATE_CHANGE event on status transitions
-        if field_name == "status" and event_bus and old_status is not None:
-            new_status = value
-            if old_status != new_status:
-                event_bus.emit(
-                    "STATE_CHANGE",
-                    change=change_name,
-                    data={"from": old_status, "to": new_status},
-                )
-                # Trigger on_fail hook when transitioning to failed
-                if new_status == "failed" and hook_scripts:
-                    hook_script = hook_scripts.get("on_fail")
-                    if hook_script:
-                        run_hook(
-                            "on_fail",
-                            hook_script,
-                            change_name,
-                            new_status,
-                            change.worktree_path or "",
-                            event_bus=event_bus,
-                        )
-
-        # Emit TOKENS event on significant token updates
-        if field_name == "tokens_used" and event_bus and old_tokens is not None:
-            delta = value - old_tokens
-            if abs(delta) > 10000:
-                event_bus.emit(
-                    "TOKENS",
-                    change=change_name,
-                    data={"delta": delta, "total": value},
+        _emit_change_field_events(
+            change_name, field_name, old_value, value,
+            change.worktree_path or "", event_bus, hook_scripts,
+        )
+
+
+def _emit_change_field_events(
+    change_name: str,
+    field_name: str,
+    old_value: Any,
+    value: Any,
+    wt_path: str,
+    event_bus: EventBus | None,
+    hook_scripts: dict[str, str] | None,
+) -> None:
+    """Emit STATE_CHANGE / TOKENS events (and on_fail hook) for a field update."""
+    if not event_bus or old_value is None:
+        return
+
+    # Emit STATE_CHANGE event on status transitions
+    if field_name == "status" and old_value != value:
+        event_bus.emit(
+            "STATE_CHANGE",
+            change=change_name,
+            data={"from": old_value, "to": value},
+        )
+        # Trigger on_fail hook when transitioning to failed
+        if value == "failed" and hook_scripts:
+            hook_script = hook_scripts.get("on_fail")
+            if hook_script:
+                run_hook(
+                    "on_fail",
+                    hook_script,
+                    change_name,
+                    value,
+                    wt_path,
+                    event_bus=event_bus,
                 )
 
+    # Emit TOKENS event on significant token updates
+    if field_name == "tokens_used":
+        delta = value - old_value
+        if abs(delta) > 10000:
+            event_bus.emit(
+                "TOKENS",
+                change=change_name,
+                data={"delta": delta, "total": value},
+            )
+
+
+def _set_state_field(state: OrchestratorState, field_name: str, value: Any) -> None:
+    if field_name in _STATE_FIELDS:
+        setattr(state, field_name, value)
+    else:
+        state.extras[field_name] = value
+
+
+def _set_change_field(change: Change, field_name: str, value: Any) -> None:
+    if field_name in _CHANGE_FIELDS:
+        setattr(change, field_name, value)
+    else:
+        change.extras[field_name] = value
+
+
+_STATE_FIELDS = frozenset(f.name for f in fields(OrchestratorState) if f.name != "extras")
+_CHANGE_FIELDS = frozenset(f.name for f in fields(Change) if f.name != "extras")
+
+
+# ─── Poll Transactions ───────────────────────────────────────────────
+
+
+class StateTransaction:
+    """Read-once / commit-once view of the state file for one unit of work.
+
+    Reads go through ``txn.state``, a snapshot that is only re-parsed when
+    the state file (or its journal) changed on disk since the last read —
+    e.g. because dispatch or merge wrote it. Writes via set_field() /
+    set_change_field() are applied to the snapshot immediately and buffered;
+    commit() applies them as field patches on top of the latest on-disk
+    state in a single locked write, so concurrent writers are not clobbered.
+
+    Usage:
+        txn = StateTransaction(state_file)
+        if txn.state.status == "running":
+            txn.set_field("active_seconds", 42)
+        txn.commit()
+    """
+
+    def __init__(self, path: str, event_bus: EventBus | None = None):
+        self.path = path
+        self.event_bus = event_bus
+        self._state: OrchestratorState | None = None
+        self._sig: tuple | None = None
+        self._pending: list[tuple[str | None, str, Any]] = []
+        self._counters_start = state_io_counters()
+
+    @property
+    def state(self) -> OrchestratorState:
+        """Current state snapshot with buffered writes applied."""
+        sig = self._disk_signature()
+        if self._state is None or sig != self._sig:
+            # Stat before reading: a write racing the read only causes an
+            # extra reload next time, never a stale snapshot
+            self._state = load_state(self.path)
+            self._sig = sig
+            for change_name, field_name, value in self._pending:
+                self._apply(self._state, change_name, field_name, value)
+        return self._state
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered field writes."""
+        return len(self._pending)
+
+    def set_field(self, field_name: str, value: Any) -> None:
+        """Buffer a top-level field write."""
+        self._pending.append((None, field_name, value))
+        if self._state is not None:
+            _set_state_field(self._state, field_name, value)
+
+    def set_change_field(self, change_name: str, field_name: str, value: Any) -> None:
+        """Buffer a change field write (events are emitted on commit)."""
+        if _find_change(self.state, change_name) is None:
+            raise ValueError(f"Change not found: {change_name}")
+        self._pending.append((change_name, field_name, value))
+        _set_change_field(_find_change(self._state, change_name), field_name, value)
+
+    def commit(self) -> None:
+        """Write all buffered field updates under a single lock acquisition."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        with _state_lock(self.path):
+            if journal_enabled():
+                cursor = _journal_cursor(self.path)
+                by_name = {c.get("name"): c for c in cursor.data["changes"]}
+                for change_name, field_name, value in pending:
+                    entry: dict[str, Any] = {"f": field_name, "v": value}
+                    old_value = None
+                    if change_name is not None:
+                        change_data = by_name.get(change_name)
+                        if change_data is None:
+                            logger.warning("Dropping update for removed change %s", change_name)
+                            continue
+                        old_value = change_data.get(field_name)
+                        entry = {"c": change_name, **entry}
+                    next_cursor = _journal_append(self.path, cursor, entry)
+                    if next_cursor is not cursor:
+                        cursor = next_cursor
+                        by_name = {c.get("name"): c for c in cursor.data["changes"]}
+                    if change_name is not None:
+                        self._emit(change_name, field_name, old_value, value,
+                                   change_data.get("worktree_path") or "")
+                self._state = None
+                return
+
+            state = load_state(self.path)
+            for change_name, field_name, value in pending:
+                if change_name is None:
+                    _set_state_field(state, field_name, value)
+                    continue
+                change = _find_change(state, change_name)
+                if change is None:
+                    logger.warning("Dropping update for removed change %s", change_name)
+                    continue
+                old_value = getattr(change, field_name, None)
+                _set_change_field(change, field_name, value)
+                self._emit(change_name, field_name, old_value, value,
+                           change.worktree_path or "")
+            _write_state_file(self.path, _serialize_state(state, "StateTransaction.commit"))
+            # What we just wrote is the freshest snapshot — no need to re-read
+            self._state = state
+            self._sig = self._disk_signature()
+
+    def io_counts(self) -> dict[str, int]:
+        """State I/O performed by this process since the transaction began."""
+        now = state_io_counters()
+        return {k: now[k] - self._counters_start.get(k, 0) for k in now}
+
+    def _emit(self, change_name: str, field_name: str, old_value: Any, value: Any,
+              wt_path: str) -> None:
+        if field_name in ("status", "tokens_used"):
+            _emit_change_field_events(
+                change_name, field_name, old_value, value, wt_path, self.event_bus, None,
+            )
+
+    def _disk_signature(self) -> tuple:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return ()
+        try:
+            journal_size = os.path.getsize(_journal_path(self.path))
+        except OSError:
+            journal_size = -1
+        return (st.st_ino, st.st_size, st.st_mtime_ns, journal_size)
+
+    @staticmethod
+    def _apply(state: OrchestratorState, change_name: str | None, field_name: str,
+               value: Any) -> None:
+        if change_name is None:
+            _set_state_field(state, field_name, value)
+            return
+        change = _find_change(state, change_name)
+        if change is not None:
+            _set_change_field(change, field_name, value)
+
+
+@contextmanager
+def state_transaction(
+    path: str, event_bus: EventBus | None = None
+) -> Generator[StateTransaction, None, None]:
+    """Context manager: yield a StateTransaction, commit on normal exit.
+
+    Usage:
+        with state_transaction(state_file) as txn:
+            txn.set_field("started_epoch", now)
+            txn.set_field("orchestrator_pid", os.getpid())
+        # one locked write
+    """
+    txn = StateTransaction(path, event_bus=event_bus)
+    yield txn
+    txn.commit()
+
 
 def get_change_status(state: OrchestratorState, name: str) -> str:
     """Get a change's status. Returns empty string if not found.
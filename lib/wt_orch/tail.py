@@ -0,0 +1,123 @@
+"""Reverse-seeking tail reads for append-only logs.
+
+Reads fixed-size blocks backwards from EOF until enough newlines have been
+seen, so returning the last N lines of a multi-GB log costs O(N lines), not
+O(file size). Shared by the web watcher (LogTailer), the log API routes,
+the event log and the TUI.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+
+def read_tail(
+    path: str | Path,
+    n: int,
+    *,
+    skip_blank: bool = False,
+    complete: bool = False,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> tuple[list[bytes], int]:
+    """Return the last n lines of a file (without newlines) and the EOF offset.
+
+    The offset is the file size the lines were read against, so callers that
+    follow the file (tail -f) can continue from exactly there. A trailing
+    line without a newline counts as a line, unless complete is set: then
+    it is left out and the offset points just past the last newline, so a
+    line still being written is read whole on the next pass. With
+    skip_blank, whitespace-only lines are dropped and do not count towards n.
+
+    Returns ([], 0) if the file cannot be read.
+    """
+    if n <= 0:
+        return [], 0
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return [], 0
+    with f:
+        try:
+            end = os.fstat(f.fileno()).st_size
+        except OSError:
+            return [], 0
+        if complete:
+            end = _after_last_newline(f, end, block_size)
+        return _tail_from(f, end, n, skip_blank, block_size), end
+
+
+def tail_lines(
+    path: str | Path,
+    n: int,
+    *,
+    keepends: bool = False,
+    skip_blank: bool = False,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> list[str]:
+    """Decoded last n lines of a file (UTF-8, undecodable bytes replaced)."""
+    lines, _ = read_tail(path, n, skip_blank=skip_blank, block_size=block_size)
+    return decode_lines(lines, keepends=keepends)
+
+
+def decode_lines(lines: list[bytes], *, keepends: bool = False) -> list[str]:
+    """Decode raw lines from read_tail(), dropping any trailing CR."""
+    suffix = "\n" if keepends else ""
+    return [
+        line.rstrip(b"\r").decode("utf-8", errors="replace") + suffix
+        for line in lines
+    ]
+
+
+def _tail_from(f, end: int, n: int, skip_blank: bool, block_size: int) -> list[bytes]:
+    pos = end
+    blocks: list[bytes] = []
+    newlines = 0
+    # More newlines than wanted lines guarantees the first wanted line
+    # starts right after a newline we have read (the extra one may be the
+    # file's final newline)
+    wanted_newlines = n
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        blocks.append(block)
+        newlines += block.count(b"\n")
+        if newlines <= wanted_newlines:
+            continue
+        if not skip_blank:
+            break
+        found = len(_split(b"".join(reversed(blocks)), pos > 0, skip_blank))
+        if found >= n:
+            break
+        wanted_newlines = newlines + (n - found)
+
+    lines = _split(b"".join(reversed(blocks)), pos > 0, skip_blank)
+    return lines[-n:]
+
+
+def _after_last_newline(f, end: int, block_size: int) -> int:
+    """Offset just past the last newline before end (0 if there is none)."""
+    pos = end
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        i = f.read(step).rfind(b"\n")
+        if i >= 0:
+            return pos + i + 1
+    return 0
+
+
+def _split(data: bytes, partial_head: bool, skip_blank: bool) -> list[bytes]:
+    lines = data.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()  # final newline terminates, it does not start a line
+    if partial_head and lines:
+        lines = lines[1:]  # first line may begin before what we read
+    if skip_blank:
+        lines = [line for line in lines if line.strip()]
+    return lines
@@ -65,6 +65,10 @@ DEFAULT_REVIEW_MODEL = "sonnet"
 DEFAULT_E2E_TIMEOUT = 120
 E2E_PORT_BASE = 3100
 
+# Running loop whose loop-state.json is older than this (and whose PID is
+# dead) is considered stalled
+LOOP_STALE_SECS = 300
+
 
 # ─── Data Structures ────────────────────────────────────────────────
 
@@ -323,10 +327,17 @@ def verify_merge_scope(change_name: str, cwd: str | None = None) -> ScopeCheckRe
 
 def _get_merge_base(wt_path: str) -> str:
     """Get merge-base of worktree branch vs origin/HEAD, main, or master."""
-    for ref in ("origin/HEAD", "main", "master"):
-        result = run_git("merge-base", "HEAD", ref, cwd=wt_path)
-        if result.exit_code == 0 and result.stdout.strip():
-            return result.stdout.strip()
+    from .git_utils import merge_base, resolve_refs
+
+    refs = ("origin/HEAD", "main", "master")
+    resolved = resolve_refs(["HEAD", *refs], cwd=wt_path)
+    head = resolved["HEAD"]
+    if head:
+        for ref in refs:
+            if resolved[ref]:
+                base = merge_base(head, resolved[ref], cwd=wt_path)
+                if base:
+                    return base
     return "HEAD~5"
 
 
@@ -958,7 +969,11 @@ def poll_change(
 
     Source: verifier.sh poll_change (lines 597-778)
     Returns the detected ralph_status or None if skipped.
+
+    ``verify_slots`` (a semaphore, optional) caps concurrent verify gates:
+    when no slot is free a done change is left for the next poll.
     """
+    verify_slots = kwargs.pop("verify_slots", None)
     state = load_state(state_file)
     change = None
     for c in state.changes:
@@ -1045,7 +1060,7 @@ def poll_change(
     ralph_status = loop_state.get("status", "unknown")
 
     if ralph_status == "done":
-        handle_change_done(change_name, state_file, **kwargs)
+        _run_verify_gate(change_name, state_file, verify_slots, **kwargs)
 
     elif ralph_status == "running":
         # Stale detection: >300s mtime + dead PID → mark stalled
@@ -1053,7 +1068,7 @@ def poll_change(
         now_epoch = int(time.time())
         stale_secs = now_epoch - mtime
 
-        if stale_secs > 300:
+        if stale_secs > LOOP_STALE_SECS:
             terminal_pid = change.ralph_pid or 0
             if terminal_pid > 0:
                 pid_result = check_pid(terminal_pid, "wt-loop")
@@ -1106,7 +1121,7 @@ def poll_change(
         # Re-read loop-state: race window check
         recheck = _read_loop_state(wt_path)
         if recheck.get("status") == "done":
-            handle_change_done(change_name, state_file, **kwargs)
+            _run_verify_gate(change_name, state_file, verify_slots, **kwargs)
             return "done"
         logger.warning("Change %s %s — marking stalled for watchdog", change_name, ralph_status)
         update_change_field(state_file, change_name, "status", "stalled")
@@ -1115,6 +1130,96 @@ def poll_change(
     return ralph_status
 
 
+def _run_verify_gate(
+    change_name: str, state_file: str, verify_slots: Any = None, **kwargs: Any,
+) -> bool:
+    """Run handle_change_done in a free verify slot; False if none was free."""
+    if verify_slots is None:
+        handle_change_done(change_name, state_file, **kwargs)
+        return True
+    if not verify_slots.acquire(blocking=False):
+        logger.debug("Verify gates busy — deferring %s to the next poll", change_name)
+        return False
+    try:
+        handle_change_done(change_name, state_file, **kwargs)
+    finally:
+        verify_slots.release()
+    return True
+
+
+# ─── Change Poll Tracking ────────────────────────────────────────────
+
+# Loop statuses for which poll_change does nothing new while loop-state.json
+# and the change's own status are unchanged ("running" only until the
+# loop-state turns stale)
+_STEADY_LOOP_STATUSES = ("running", "waiting:human", "waiting:budget", "budget_exceeded")
+
+
+class ChangePollTracker:
+    """Decides which active changes need a poll_change call this tick.
+
+    Every poll_change reloads the state file, re-reads loop-state.json and
+    rewrites the token fields, even when the loop has not written anything
+    since the previous tick. The tracker fingerprints each worktree's
+    loop-state.json (mtime_ns, size) together with the change's status and
+    PID and skips a change whose fingerprint is unchanged and whose last
+    poll saw a steady loop status. Anything else — no loop-state yet, done,
+    stopped/stalled/stuck, a running loop about to turn stale — is polled
+    every tick exactly as before.
+    """
+
+    def __init__(self) -> None:
+        self._seen: dict[str, tuple[tuple, str]] = {}
+        self.processed = 0
+        self.skipped = 0
+
+    @staticmethod
+    def fingerprint(change: Change) -> tuple | None:
+        """(mtime_ns, size, status, ralph_pid) of a change, None without loop-state."""
+        if not change.worktree_path:
+            return None
+        loop_state_path = os.path.join(change.worktree_path, ".claude", "loop-state.json")
+        try:
+            st = os.stat(loop_state_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, change.status, change.ralph_pid or 0)
+
+    def should_poll(self, change: Change, fp: tuple | None) -> bool:
+        """True unless the change's loop state has not moved since a steady poll."""
+        seen = self._seen.get(change.name)
+        if fp is None or seen is None or seen[0] != fp:
+            return True
+        ralph_status = seen[1]
+        if ralph_status not in _STEADY_LOOP_STATUSES:
+            return True
+        if ralph_status == "running":
+            # Same arithmetic as poll_change's stale check
+            stale_secs = int(time.time()) - fp[0] // 1_000_000_000
+            return stale_secs > LOOP_STALE_SECS
+        return False
+
+    def record(self, change: Change, fp: tuple | None, ralph_status: str | None) -> None:
+        """Remember what poll_change saw for the fingerprint taken before it ran."""
+        self.processed += 1
+        if fp is None or ralph_status is None:
+            self._seen.pop(change.name, None)
+        else:
+            self._seen[change.name] = (fp, ralph_status)
+
+    def skip(self) -> None:
+        self.skipped += 1
+
+    def retain(self, names: set[str]) -> None:
+        """Forget changes that are no longer polled."""
+        for name in list(self._seen):
+            if name not in names:
+                del self._seen[name]
+
+    def counts(self) -> dict[str, int]:
+        return {"processed": self.processed, "skipped": self.skipped}
+
+
 # ─── Handle Change Done / Verify Gate Pipeline ──────────────────────
 # Source: verifier.sh handle_change_done (lines 782-1453)
 
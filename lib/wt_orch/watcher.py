@@ -9,66 +9,129 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+from .enrichment import enrich_changes, invalidate_moved
+from .io_pool import io_pool
+from .json_patch import make_patch
+from .state import JOURNAL_SUFFIX, StateCorruptionError, read_state_data
+from .tail import decode_lines, read_tail, tail_lines
+
 logger = logging.getLogger("wt-web.watcher")
 
+# LogTailer backlog beyond which it jumps to the tail instead of streaming
+MAX_CATCHUP_BYTES = 4 * 1024 * 1024
+
+# Every Nth state update goes out as a full snapshot instead of a patch
+SNAPSHOT_EVERY = 100
+
+# Patches with more operations than this are sent as a snapshot instead
+MAX_PATCH_OPS = 500
+
+# watchfiles batching: a batch closes after WATCH_STEP_MS without new
+# events, or WATCH_DEBOUNCE_MS after its first event; each handler then
+# runs once per batch however many writes it contained
+WATCH_STEP_MS = 100
+WATCH_DEBOUNCE_MS = 1600
+
+STATE_FILE = "orchestration-state.json"
+LOG_FILE = "orchestration.log"
+_STATE_NAMES = frozenset((STATE_FILE, STATE_FILE + JOURNAL_SUFFIX))
+_WATCH_NAMES = _STATE_NAMES | {LOG_FILE}
+
+
+class WatcherStats:
+    """Event and CPU counters of one project watcher (GET /api/{project}/watcher)."""
+
+    def __init__(self):
+        self.mode = "idle"  # "watch", "poll" or "idle"
+        self.batches = 0
+        self.events = 0  # file events delivered by watchfiles (after filtering)
+        self.ignored = 0  # events rejected by the watch filter
+        self.coalesced = 0  # events folded into another handler run of their batch
+        self.restarts = 0  # watch set rebuilt after a watched directory appeared
+        self.polls = 0
+        self.state_reads = 0
+        self.state_updates = 0
+        self.log_reads = 0
+        self.log_lines = 0
+        self.cpu_seconds = 0.0
+        self.last_event: float | None = None
+
+    @contextmanager
+    def timed(self):
+        """Add the thread CPU time of the block to cpu_seconds."""
+        start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.cpu_seconds += time.thread_time() - start
+
+    def as_dict(self) -> dict:
+        d = dict(vars(self))
+        d["cpu_seconds"] = round(self.cpu_seconds, 6)
+        return d
+
 
 class LogTailer:
     """Track file offset and yield only new lines (tail -f semantics)."""
 
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, initial_lines: int = 200):
         self.path = path
+        self.initial_lines = initial_lines
         self._offset = 0
+        self._ino: int | None = None
         self._initialized = False
 
     def get_tail(self, n: int = 200) -> list[str]:
         """Read last n lines independently (does not affect offset tracking)."""
-        if not self.path.exists():
-            return []
-        try:
-            with open(self.path) as f:
-                lines = f.readlines()
-            return [l.rstrip() for l in lines[-n:]]
-        except OSError:
-            return []
+        return [l.rstrip() for l in tail_lines(self.path, n)]
 
     def read_new_lines(self) -> list[str]:
-        """Read lines appended since last call. First call returns last 200 lines."""
-        if not self.path.exists():
-            return []
+        """Read lines appended since last call. First call returns the last 200 lines.
 
+        A truncated or replaced (rotated) file is re-read from the start; a
+        backlog larger than MAX_CATCHUP_BYTES is skipped down to its tail.
+        """
         try:
-            file_size = self.path.stat().st_size
+            st = self.path.stat()
         except OSError:
             return []
 
-        if not self._initialized:
+        if not self._initialized or st.st_size - self._offset > MAX_CATCHUP_BYTES:
+            if self._initialized:
+                logger.info(f"Log backlog too large, skipping to tail: {self.path}")
+            # A torn last line is left for the next read, as below
+            lines, end = read_tail(self.path, self.initial_lines, complete=True)
             self._initialized = True
-            try:
-                with open(self.path) as f:
-                    lines = f.readlines()
-                self._offset = file_size
-                return [l.rstrip() for l in lines[-200:]]
-            except OSError:
-                return []
-
-        # File truncated (log rotation)
-        if file_size < self._offset:
+            self._offset = end
+            self._ino = st.st_ino
+            return [l.rstrip() for l in decode_lines(lines)]
+
+        # File truncated or replaced (log rotation)
+        if st.st_ino != self._ino or st.st_size < self._offset:
             self._offset = 0
+            self._ino = st.st_ino
 
-        if file_size <= self._offset:
+        if st.st_size <= self._offset:
             return []
 
         try:
             with open(self.path, "rb") as f:
                 f.seek(self._offset)
-                new_bytes = f.read()
-            self._offset = file_size
-            text = new_bytes.decode("utf-8", errors="replace")
-            return [l.rstrip() for l in text.splitlines() if l.strip()]
+                new_bytes = f.read(st.st_size - self._offset)
         except OSError:
             return []
+        # Hold back a torn trailing line until its newline arrives
+        complete = new_bytes.rfind(b"\n") + 1
+        if complete == 0:
+            return []
+        self._offset += complete
+        text = new_bytes[:complete].decode("utf-8", errors="replace")
+        return [l.rstrip() for l in text.splitlines() if l.strip()]
 
 
 class ProjectWatcher:
@@ -78,7 +141,14 @@ class ProjectWatcher:
         self.project_name = project_name
         self.project_path = project_path
         self._last_state: dict | None = None
+        # Number of state updates emitted; clients use it to detect gaps
+        self.seq = 0
         self._task: asyncio.Task | None = None
+        self.stats = WatcherStats()
+        # Directories currently watched, and missing ones whose creation
+        # (seen from their nearest existing ancestor) triggers a re-watch
+        self._targets: set[Path] = set()
+        self._pending_dirs: set[str] = set()
         # Resolve paths (re-resolved dynamically when not found)
         self.state_path = self._find_state()
         self.log_path = self._find_log()
@@ -122,112 +192,218 @@ class ProjectWatcher:
         if not self.state_path.exists():
             return None
         try:
-            with open(self.state_path) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
+            return read_state_data(str(self.state_path))
+        except StateCorruptionError:
             return None
 
+    def _read_enriched_state(self) -> dict | None:
+        """Read and enrich the state file; touches no watcher state (I/O pool)."""
+        state = self._read_state()
+        if state is not None:
+            self._enrich_state(state)
+        return state
+
     def get_initial_state(self) -> dict | None:
-        """Read and cache the initial state."""
-        self._last_state = self._read_state()
+        """The enriched state as last emitted (at self.seq); read on first use.
+
+        Clients receiving it apply later patches on top, so it must be the
+        same document the next patch is diffed against.
+        """
+        if self._last_state is None:
+            self._last_state = self._read_enriched_state()
         return self._last_state
 
+    async def load_initial_state(self) -> tuple[dict | None, int]:
+        """(state, seq) as last emitted, reading on the I/O pool when not cached yet.
+
+        The pair is taken together on the event loop, so a state update
+        landing during the read cannot pair one state with another's seq.
+        """
+        if self._last_state is None:
+            state = await io_pool.run(self.project_name, self._read_enriched_state)
+            # An update emitted while we read is newer; keep it
+            if self._last_state is None:
+                self._last_state = state
+        return self._last_state, self.seq
+
     async def watch(self, callback):
         """Watch for file changes and invoke callback with events.
 
-        callback(project_name, event_type, data) is called for each change.
+        callback(project_name, event_type, data) is called for each change;
+        state updates also pass seq= and ops= (see _handle_state_change).
+
+        Only the directories that can hold the state and log files are
+        watched, non-recursively, with a filter on their file names — not
+        the whole project tree (node_modules, .git, worktrees).
         """
         try:
-            from watchfiles import awatch, Change
+            from watchfiles import awatch
         except ImportError:
             logger.warning("watchfiles not installed, falling back to polling")
             await self._poll_fallback(callback)
             return
 
-        # Collect directories to watch (state and log may be in different dirs)
-        watch_dirs: set[Path] = set()
-        state_dir = self.state_path.parent
-        log_dir = self.log_path.parent
-        if state_dir.exists():
-            watch_dirs.add(state_dir)
-        if log_dir.exists():
-            watch_dirs.add(log_dir)
-        # Always watch project root for legacy file creation
-        if self.project_path.exists():
-            watch_dirs.add(self.project_path)
-
-        if not watch_dirs:
-            logger.info(f"No orchestration dir for {self.project_name}, polling for creation")
-            await self._poll_fallback(callback)
-            return
+        restart = False
+        while True:
+            self._targets, self._pending_dirs = self._watch_targets()
+            if not self._targets:
+                logger.info(f"No project dir for {self.project_name}, polling for creation")
+                await self._poll_fallback(callback)
+                return
+            if restart:
+                # Catch up on anything written before the new watch set
+                await self._handle_state_change(callback)
+                await self._handle_log_change(callback)
+
+            self.stats.mode = "watch"
+            restart = False
+            try:
+                async for changes in awatch(
+                    *self._targets,
+                    watch_filter=self._watch_filter,
+                    recursive=False,
+                    debounce=WATCH_DEBOUNCE_MS,
+                    step=WATCH_STEP_MS,
+                    poll_delay_ms=500,
+                ):
+                    if await self._handle_batch(changes, callback):
+                        restart = True
+                        break
+            except Exception as e:
+                logger.error(f"Watcher error for {self.project_name}: {e}")
+                # Fall back to polling
+                await self._poll_fallback(callback)
+                return
+            if not restart:
+                self.stats.mode = "idle"
+                return
+
+            # A directory on the way to the state/log files appeared
+            self.stats.restarts += 1
+            self._refresh_paths()
 
-        try:
-            async for changes in awatch(*watch_dirs, poll_delay_ms=500):
-                for change_type, change_path in changes:
-                    path = Path(change_path)
-                    if path.name == "orchestration-state.json":
-                        await self._handle_state_change(callback)
-                    elif path.name == "orchestration.log":
-                        await self._handle_log_change(callback)
-        except Exception as e:
-            logger.error(f"Watcher error for {self.project_name}: {e}")
-            # Fall back to polling
-            await self._poll_fallback(callback)
+    def _watch_targets(self) -> tuple[set[Path], set[str]]:
+        """Directories to watch and the missing directories awaited in them.
+
+        The state and log directories (new layout and the resolved, possibly
+        legacy, locations) are watched directly when they exist; otherwise
+        their nearest existing ancestor is watched for the next path
+        component to be created.
+        """
+        if not self.project_path.is_dir():
+            return set(), set()
+        wanted = {
+            self.project_path,
+            self.project_path / "wt" / "orchestration",
+            self.state_path.parent,
+            self.log_path.parent,
+        }
+        targets: set[Path] = set()
+        pending: set[str] = set()
+        for d in wanted:
+            if d.is_dir():
+                targets.add(d)
+                continue
+            child = d
+            while not child.parent.is_dir():
+                child = child.parent
+            targets.add(child.parent)
+            pending.add(str(child))
+        return targets, pending
+
+    def _watch_filter(self, change, path: str) -> bool:
+        """watchfiles filter: the state, journal and log files, awaited dirs."""
+        if os.path.basename(path) in _WATCH_NAMES or path in self._pending_dirs:
+            return True
+        self.stats.ignored += 1
+        return False
+
+    async def _handle_batch(self, changes, callback) -> bool:
+        """Run each handler once for a batch of file events.
+
+        Returns True when an awaited directory appeared and the watch set
+        must be rebuilt.
+        """
+        self.stats.batches += 1
+        self.stats.events += len(changes)
+        self.stats.last_event = time.time()
+        paths = {path for _, path in changes}
+        if paths & self._pending_dirs:
+            return True
+        names = {os.path.basename(path) for path in paths}
+        state = bool(names & _STATE_NAMES)
+        log = LOG_FILE in names
+        self.stats.coalesced += max(0, len(changes) - state - log)
+        if state:
+            await self._handle_state_change(callback)
+        if log:
+            await self._handle_log_change(callback)
+        return False
+
+    def stats_snapshot(self) -> dict:
+        """Counters plus the current watch set, for the API."""
+        return {
+            **self.stats.as_dict(),
+            "seq": self.seq,
+            "state_path": str(self.state_path),
+            "log_path": str(self.log_path),
+            "watching": sorted(str(p) for p in self._targets),
+            "awaiting": sorted(self._pending_dirs),
+        }
 
     async def _poll_fallback(self, callback):
         """Simple polling fallback when watchfiles is unavailable."""
+        self.stats.mode = "poll"
         while True:
             await asyncio.sleep(3)
+            self.stats.polls += 1
             self._refresh_paths()
             await self._handle_state_change(callback)
             await self._handle_log_change(callback)
 
+    def _enrich_state(self, state: dict) -> None:
+        """Add worktree log file lists and session counts to each change."""
+        enrich_changes(state.get("changes", []), self.project_path)
+
+    def _load_state_patch(self, old_state: dict | None) -> tuple[dict, list | None] | None:
+        """Read and enrich the state, diff it against old_state (I/O pool)."""
+        self.stats.state_reads += 1
+        with self.stats.timed():
+            new_state = self._read_state()
+            if new_state is None:
+                return None
+            if old_state is not None:
+                invalidate_moved(old_state.get("changes", []), new_state.get("changes", []))
+            self._enrich_state(new_state)
+            ops = make_patch(old_state, new_state) if old_state is not None else None
+        return new_state, ops
+
     async def _handle_state_change(self, callback):
-        """Detect state changes and emit events."""
-        new_state = self._read_state()
-        if new_state is None:
+        """Detect state changes and emit events.
+
+        The state update carries the RFC 6902 patch from the previously
+        emitted state (ops=None for a full snapshot: the first update,
+        every SNAPSHOT_EVERY-th, or when the patch would be large). Reading,
+        enrichment and diffing run on the I/O pool, not the event loop.
+        """
+        old_state = self._last_state
+        loaded = await io_pool.run(self.project_name, self._load_state_patch, old_state)
+        if loaded is None:
+            return
+        new_state, ops = loaded
+        if ops == []:
             return
+        self.stats.state_updates += 1
+        self._last_state = new_state
+        self.seq += 1
+        if ops is not None and (len(ops) > MAX_PATCH_OPS or self.seq % SNAPSHOT_EVERY == 0):
+            ops = None
 
-        # Enrich changes with worktree log file lists and session count
-        for c in new_state.get("changes", []):
-            wt_path = c.get("worktree_path")
-            if wt_path:
-                logs_dir = Path(wt_path) / ".claude" / "logs"
-                if logs_dir.is_dir():
-                    try:
-                        c["logs"] = sorted(
-                            f.name for f in logs_dir.iterdir()
-                            if f.is_file() and f.suffix == ".log"
-                        )
-                    except OSError:
-                        pass
-
-            # Count Claude JSONL sessions for this change (only with worktree)
-            sessions_dir = None
-            if wt_path:
-                mangled = wt_path.lstrip("/").replace("/", "-")
-                d = Path.home() / ".claude" / "projects" / f"-{mangled}"
-                if d.is_dir():
-                    sessions_dir = d
-                elif c.get("status") in ("done", "merged", "failed", "verify-failed"):
-                    mangled = str(self.project_path).lstrip("/").replace("/", "-")
-                    d = Path.home() / ".claude" / "projects" / f"-{mangled}"
-                    if d.is_dir():
-                        sessions_dir = d
-            if sessions_dir:
-                try:
-                    c["session_count"] = sum(
-                        1 for f in sessions_dir.iterdir()
-                        if f.is_file() and f.suffix == ".jsonl"
-                    )
-                except OSError:
-                    pass
-
-        old_status = self._last_state.get("status") if self._last_state else None
+        old_status = old_state.get("status") if old_state else None
         new_status = new_state.get("status")
 
         # Emit state update
-        await callback(self.project_name, "state_update", new_state)
+        await callback(self.project_name, "state_update", new_state, seq=self.seq, ops=ops)
 
         # Detect checkpoint transition
         if old_status != "checkpoint" and new_status == "checkpoint":
@@ -243,8 +419,8 @@ class ProjectWatcher:
             })
 
         # Detect change completion
-        if self._last_state:
-            old_changes = {c["name"]: c.get("status") for c in self._last_state.get("changes", [])}
+        if old_state:
+            old_changes = {c["name"]: c.get("status") for c in old_state.get("changes", [])}
             for c in new_state.get("changes", []):
                 name = c.get("name", "")
                 new_st = c.get("status", "")
@@ -260,12 +436,16 @@ class ProjectWatcher:
                         "change": name,
                     })
 
-        self._last_state = new_state
+    def _read_log_lines(self) -> list[str]:
+        self.stats.log_reads += 1
+        with self.stats.timed():
+            return self.log_tailer.read_new_lines()
 
     async def _handle_log_change(self, callback):
         """Read new log lines and emit."""
-        new_lines = self.log_tailer.read_new_lines()
+        new_lines = await io_pool.run(self.project_name, self._read_log_lines)
         if new_lines:
+            self.stats.log_lines += len(new_lines)
             await callback(self.project_name, "log_lines", {"lines": new_lines})
 
 
@@ -317,9 +497,13 @@ class WatcherManager:
         )
         logger.info(f"Started watcher for project: {name}")
 
-    async def _on_event(self, project_name: str, event_type: str, data):
+    async def _on_event(self, project_name: str, event_type: str, data, seq=None, ops=None):
         """Forward watcher events to WebSocket clients."""
-        if self._connection_manager:
+        if not self._connection_manager:
+            return
+        if event_type == "state_update":
+            await self._connection_manager.broadcast_state(project_name, data, seq, ops)
+        else:
             await self._connection_manager.broadcast(
                 project_name,
                 {"event": event_type, "data": data},
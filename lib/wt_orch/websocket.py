@@ -1,6 +1,13 @@
 """WebSocket connection manager and endpoints for real-time streaming.
 
 Manages per-project client connections and broadcasts watcher events.
+
+State streaming: a client connecting with ``?delta=1`` receives the full
+state once ({"event": "state_update", "seq": n, "data": state}) and then
+{"event": "state_patch", "seq": n, "data": {"ops": [...]}} RFC 6902
+patches, interleaved with periodic full snapshots. On a sequence gap it
+sends {"type": "resync"} and gets a fresh snapshot. Other clients keep
+receiving the full state on every update.
 """
 
 from __future__ import annotations
@@ -11,6 +18,8 @@ from typing import Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from .io_pool import io_pool
+
 logger = logging.getLogger("wt-web.websocket")
 
 router = APIRouter()
@@ -22,13 +31,17 @@ class ConnectionManager:
     def __init__(self):
         # project_name -> set of active WebSocket connections
         self._connections: dict[str, set[WebSocket]] = {}
+        # Connections that asked for state patches (?delta=1)
+        self._delta: set[WebSocket] = set()
 
-    async def connect(self, project_name: str, websocket: WebSocket):
+    async def connect(self, project_name: str, websocket: WebSocket, delta: bool = False):
         """Accept and register a WebSocket connection."""
         await websocket.accept()
         if project_name not in self._connections:
             self._connections[project_name] = set()
         self._connections[project_name].add(websocket)
+        if delta:
+            self._delta.add(websocket)
         logger.info(f"WS connect: {project_name} (total: {len(self._connections[project_name])})")
 
     def disconnect(self, project_name: str, websocket: WebSocket):
@@ -38,6 +51,7 @@ class ConnectionManager:
             conns.discard(websocket)
             if not conns:
                 del self._connections[project_name]
+        self._delta.discard(websocket)
         logger.info(f"WS disconnect: {project_name}")
 
     async def broadcast(self, project_name: str, message: dict[str, Any]):
@@ -47,16 +61,46 @@ class ConnectionManager:
             return
 
         payload = json.dumps(message)
-        dead: list[WebSocket] = []
+        await self._send(project_name, [(ws, payload) for ws in conns])
+
+    async def broadcast_state(
+        self, project_name: str, state: dict, seq: int | None, ops: list | None = None,
+    ):
+        """Send a state update: the patch to delta clients, full state to the rest.
+
+        ops=None sends the full state (a snapshot) to everyone. Each payload
+        is serialized once, however many clients receive it.
+        """
+        conns = self._connections.get(project_name)
+        if not conns:
+            return
+
+        full = patch = None
+        targets: list[tuple[WebSocket, str]] = []
         for ws in conns:
+            if ops is not None and ws in self._delta:
+                if patch is None:
+                    patch = json.dumps({"event": "state_patch", "seq": seq, "data": {"ops": ops}})
+                targets.append((ws, patch))
+            else:
+                if full is None:
+                    full = json.dumps(state_message(state, seq))
+                targets.append((ws, full))
+        await self._send(project_name, targets)
+
+    async def _send(self, project_name: str, targets: list[tuple[WebSocket, str]]):
+        dead: list[WebSocket] = []
+        for ws, payload in targets:
             try:
                 await ws.send_text(payload)
             except Exception:
                 dead.append(ws)
 
         # Clean up dead connections
+        conns = self._connections.get(project_name, set())
         for ws in dead:
             conns.discard(ws)
+            self._delta.discard(ws)
         if not conns:
             self._connections.pop(project_name, None)
 
@@ -64,6 +108,19 @@ class ConnectionManager:
         return len(self._connections.get(project_name, set()))
 
 
+def state_message(state: dict, seq: int | None) -> dict[str, Any]:
+    """Full-state message; seq lets delta clients resume patching from it."""
+    return {"event": "state_update", "seq": seq, "data": state}
+
+
+def _is_resync(text: str) -> bool:
+    try:
+        msg = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(msg, dict) and msg.get("type") == "resync"
+
+
 # Singleton manager — shared between server.py lifespan and routes
 connection_manager = ConnectionManager()
 
@@ -73,24 +130,23 @@ async def websocket_stream(websocket: WebSocket, project: str):
     """WebSocket endpoint for real-time project updates.
 
     On connect: sends full current state.
-    After: receives push events from the watcher.
+    After: receives push events from the watcher (state patches with ?delta=1).
     """
-    await connection_manager.connect(project, websocket)
+    delta = websocket.query_params.get("delta") == "1"
+    await connection_manager.connect(project, websocket, delta=delta)
 
     # Send initial state
+    watcher = None
     try:
         watcher_mgr = websocket.app.state.watcher_manager
         watcher = watcher_mgr.get_watcher(project)
         if watcher:
-            initial_state = watcher.get_initial_state()
+            initial_state, seq = await watcher.load_initial_state()
             if initial_state:
-                await websocket.send_json({
-                    "event": "state_update",
-                    "data": initial_state,
-                })
+                await websocket.send_json(state_message(initial_state, seq))
 
             # Send initial log lines (get_tail is independent of offset tracking)
-            initial_lines = watcher.log_tailer.get_tail(500)
+            initial_lines = await io_pool.run(project, watcher.log_tailer.get_tail, 500)
             if initial_lines:
                 await websocket.send_json({
                     "event": "log_lines",
@@ -102,8 +158,12 @@ async def websocket_stream(websocket: WebSocket, project: str):
     # Keep connection alive — events are pushed by the watcher via broadcast
     try:
         while True:
-            # Wait for client messages (ping/pong or close)
-            await websocket.receive_text()
+            # Wait for client messages (ping/pong, resync or close)
+            text = await websocket.receive_text()
+            if delta and watcher and _is_resync(text):
+                state, seq = await watcher.load_initial_state()
+                if state:
+                    await websocket.send_json(state_message(state, seq))
     except WebSocketDisconnect:
         pass
     finally:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark EventBus emission throughput: unbuffered vs buffered.
+
+Dev tool — run manually when touching lib/wt_orch/events.py.
+
+Usage:
+    python3 scripts/bench-events.py [--events 20000] [--fsync never|commit|interval]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(SCRIPT_DIR), "lib"))
+
+from wt_orch.events import EventBus  # noqa: E402
+
+
+def run(label: str, n: int, **kwargs) -> float:
+    with tempfile.TemporaryDirectory() as d:
+        bus = EventBus(
+            log_path=os.path.join(d, "orchestration-events.jsonl"),
+            max_size=1 << 40,  # keep rotation out of the measurement
+            **kwargs,
+        )
+        start = time.perf_counter()
+        for i in range(n):
+            bus.emit("STATE_CHANGE", change=f"change-{i % 20}",
+                     data={"from": "running", "to": "verifying", "i": i})
+        bus.close()
+        elapsed = time.perf_counter() - start
+        with open(bus.log_path) as f:
+            written = sum(1 for _ in f)
+    rate = n / elapsed
+    print(f"{label:<28} {n:>7} events  {elapsed:7.3f}s  {rate:>10,.0f} events/s")
+    if written != n:
+        print(f"  !! expected {n} lines, found {written}")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--fsync", default="never", choices=("never", "commit", "interval"))
+    args = parser.parse_args()
+
+    before = run(f"unbuffered (fsync={args.fsync})", args.events, fsync=args.fsync)
+    after = run(f"buffered (fsync={args.fsync})", args.events, fsync=args.fsync, buffered=True)
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
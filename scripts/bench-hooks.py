@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark hook event latency: one process per event vs resident hook server.
+
+Dev tool — run manually when touching bin/wt-hook-memory or lib/wt_hooks.
+
+Runs each of the eight hook events through bin/wt-hook-memory with
+WT_HOOK_SERVER=0 (fresh interpreter + imports per event) and =1 (shim ->
+resident server), and also times the bare server round trip from a warm
+client. A stub wt-memory on PATH answers health/recall so the numbers
+measure hook overhead, not shodh.
+
+Usage:
+    python3 scripts/bench-hooks.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(ROOT, "lib"))
+
+from wt_hooks import shim  # noqa: E402
+
+HOOK = os.path.join(ROOT, "bin", "wt-hook-memory")
+
+STUB_WT_MEMORY = """#!/usr/bin/env bash
+case "$1" in
+    health) exit 0 ;;
+    *) echo '[]' ;;
+esac
+"""
+
+EVENTS = {
+    "SessionStart": {"source": "startup"},
+    "UserPromptSubmit": {"prompt": "why does the merge step fail on rebased branches?"},
+    "PreToolUse": {"tool_name": "Read", "tool_input": {"file_path": "/tmp/x.py"}},
+    "PostToolUse": {"tool_name": "Read", "tool_input": {"file_path": "/tmp/x.py"}},
+    "PostToolUseFailure": {"tool_name": "Bash", "tool_input": {"command": "make"},
+                           "error": "make: *** [all] Error 2"},
+    "SubagentStart": {"agent_type": "Explore", "prompt": "find the config loader"},
+    "SubagentStop": {"agent_type": "Explore"},
+    "Stop": {"stop_hook_active": False},
+}
+
+
+def time_hook(event: str, payload: dict, env: dict, cwd: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [HOOK, event], input=json.dumps(payload).encode(), env=env, cwd=cwd,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def time_round_trip(event: str, payload: dict, env: dict, cwd: str, sock: str) -> float:
+    params = {
+        "event": event, "input": payload, "cache_file": shim.cache_file_for(payload),
+        "cwd": cwd, "env": env, "wt_tools_root": ROOT,
+    }
+    start = time.perf_counter()
+    shim.call_server(sock, params)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        bin_dir = os.path.join(d, "bin")
+        home = os.path.join(d, "home")
+        project = os.path.join(d, "project")
+        for p in (bin_dir, home, project):
+            os.makedirs(p)
+        stub = os.path.join(bin_dir, "wt-memory")
+        with open(stub, "w") as f:
+            f.write(STUB_WT_MEMORY)
+        os.chmod(stub, 0o755)
+        sock = os.path.join(d, "hook-server.sock")
+        env = {
+            "PATH": bin_dir + os.pathsep + "/usr/local/bin:/usr/bin:/bin",
+            "HOME": home,
+            "WT_HOOK_SERVER_SOCKET": sock,
+        }
+        session = f"bench-hooks-{os.getpid()}"
+        payloads = {e: dict(p, session_id=session) for e, p in EVENTS.items()}
+
+        # Warm up: first call starts the server
+        time_hook("PreToolUse", payloads["PreToolUse"], dict(env, WT_HOOK_SERVER="1"), project)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(sock) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        print(f"{'event':<20} {'per-process':>12} {'server':>10} {'round-trip':>11}   (median ms, {args.runs} runs)")
+        try:
+            for event, payload in payloads.items():
+                cold = [time_hook(event, payload, dict(env, WT_HOOK_SERVER="0"), project)
+                        for _ in range(args.runs)]
+                warm = [time_hook(event, payload, dict(env, WT_HOOK_SERVER="1"), project)
+                        for _ in range(args.runs)]
+                rtt = [time_round_trip(event, payload, env, project, sock)
+                       for _ in range(args.runs)]
+                print(f"{event:<20} {statistics.median(cold):>12.1f} "
+                      f"{statistics.median(warm):>10.1f} {statistics.median(rtt):>11.1f}")
+        finally:
+            _stop_server(sock)
+            try:
+                os.unlink(f"/tmp/wt-memory-session-{session}.json")
+            except OSError:
+                pass
+
+
+def _stop_server(sock: str) -> None:
+    import socket as _socket
+    s = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        s.connect(sock)
+        s.sendall(b'{"id": "bench", "method": "ping", "params": {}}\n')
+        pid = json.loads(s.makefile().readline())["result"]["pid"]
+        os.kill(pid, signal.SIGTERM)
+    except (OSError, ValueError, KeyError):
+        pass
+    finally:
+        s.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark keyword matching: per-keyword substring scans vs KeywordMatcher.
+
+Dev tool — run manually when touching lib/wt_hooks/matcher.py, passive
+matching in lib/metrics.py or rules matching in lib/wt_hooks/memory_ops.py.
+
+Two workloads on synthetic data:
+  passive  — injected memories' keywords against a long transcript's
+             assistant messages (Stop hook citation scan)
+  rules    — hundreds of rules.yaml topics against a stream of prompts
+             (UserPromptSubmit)
+
+Usage:
+    python3 scripts/bench-keyword-match.py [--messages 2000] [--memories 100] [--rules 500]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(SCRIPT_DIR), "lib"))
+
+from wt_hooks.matcher import KeywordMatcher  # noqa: E402
+
+
+def _vocab(rng: random.Random, size: int) -> list:
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 11))) for _ in range(size)]
+
+
+def _timed(fn, runs: int) -> tuple:
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def bench_passive(rng, vocab, n_messages, n_memories, runs) -> None:
+    # Transcript prose draws on a common subset; most memories never match
+    common = vocab[: len(vocab) // 4]
+    messages = [" ".join(rng.choices(common, k=rng.randint(50, 400))) for _ in range(n_messages)]
+    memories = {f"m{i}": set(rng.sample(vocab, 5)) for i in range(n_memories)}
+
+    def naive():
+        matched = set()
+        for cid, kws in memories.items():
+            for text in messages:
+                if sum(1 for kw in kws if kw in text) >= 2:
+                    matched.add(cid)
+                    break
+        return matched
+
+    def compiled():
+        owners = {}
+        for cid, kws in memories.items():
+            for kw in kws:
+                owners.setdefault(kw, []).append(cid)
+        matcher = KeywordMatcher(owners)
+        matched = set()
+        for text in messages:
+            overlap = {}
+            for kw in matcher.find(text):
+                for cid in owners[kw]:
+                    overlap[cid] = overlap.get(cid, 0) + 1
+            matched.update(cid for cid, n in overlap.items() if n >= 2)
+            if len(matched) == len(memories):
+                break
+        return matched
+
+    t_naive, r_naive = _timed(naive, runs)
+    t_compiled, r_compiled = _timed(compiled, runs)
+    assert r_naive == r_compiled
+    print(f"passive  {n_messages} messages x {n_memories} memories: "
+          f"naive {t_naive:8.1f} ms   matcher {t_compiled:8.1f} ms   ({len(r_naive)} matched)")
+
+
+def bench_rules(rng, vocab, n_rules, runs) -> None:
+    topics = [[rng.choice(vocab) for _ in range(rng.randint(1, 4))] for _ in range(n_rules)]
+    prompts = [" ".join(rng.choices(vocab, k=rng.randint(5, 80))) for _ in range(200)]
+
+    def naive():
+        return [
+            [i for i, ts in enumerate(topics) if any(t in p for t in ts)]
+            for p in prompts
+        ]
+
+    topic_rules = {}
+    for i, ts in enumerate(topics):
+        for t in ts:
+            topic_rules.setdefault(t, set()).add(i)
+    matcher = KeywordMatcher(topic_rules)  # compiled once per rules.yaml mtime
+
+    def compiled():
+        out = []
+        for p in prompts:
+            hit = set()
+            for t in matcher.find(p):
+                hit.update(topic_rules[t])
+            out.append(sorted(hit))
+        return out
+
+    t_naive, r_naive = _timed(naive, runs)
+    t_compiled, r_compiled = _timed(compiled, runs)
+    assert r_naive == r_compiled
+    print(f"rules    200 prompts x {n_rules} rules:        "
+          f"naive {t_naive / 200:8.3f} ms   matcher {t_compiled / 200:8.3f} ms   (per prompt)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--memories", type=int, default=100)
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocab = _vocab(rng, 8000)
+    bench_passive(rng, vocab, args.messages, args.memories, args.runs)
+    bench_rules(rng, vocab, args.rules, args.runs)
+
+
+if __name__ == "__main__":
+    main()
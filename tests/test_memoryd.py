@@ -93,6 +93,7 @@ class TestProtocol(unittest.TestCase):
         self.assertIn("proactive_context", SUPPORTED_METHODS)
         self.assertIn("health", SUPPORTED_METHODS)
         self.assertIn("shutdown", SUPPORTED_METHODS)
+        self.assertIn("batch", SUPPORTED_METHODS)
         self.assertNotIn("invalid_method", SUPPORTED_METHODS)
 
     def test_request_empty_params(self):
@@ -261,5 +262,535 @@ class TestClientConnection(unittest.TestCase):
                     pass
 
 
+class _ThreadedServer:
+    """Run an asyncio unix server in a background thread for client tests."""
+
+    def __init__(self, handler, sock_path):
+        self.handler = handler
+        self.sock_path = sock_path
+        self.connections = 0
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+
+    async def _on_connect(self, reader, writer):
+        self.connections += 1
+        await self.handler(reader, writer)
+
+    async def _serve(self):
+        if os.path.exists(self.sock_path):
+            os.unlink(self.sock_path)
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_unix_server(self._on_connect, path=self.sock_path)
+        self._ready.set()
+        await self._stop.wait()
+        server.close()
+        await server.wait_closed()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=3)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout=3)
+        try:
+            os.unlink(self.sock_path)
+        except FileNotFoundError:
+            pass
+
+
+class TestClientPipelining(unittest.TestCase):
+    """Persistent connections and request_many()."""
+
+    def setUp(self):
+        self.sock_path = f"/tmp/wt-memoryd-pipetest-{os.getpid()}.sock"
+
+    def _client(self, **kwargs):
+        from wt_memoryd.client import MemoryClient
+        client = MemoryClient(project=f"pipetest-{os.getpid()}", **kwargs)
+        client.socket_path = self.sock_path
+        return client
+
+    async def _echo_forever(self, reader, writer):
+        """Answer every request on the connection until EOF."""
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            req = Request.from_json(line.decode())
+            if req.method == "forget":
+                resp = make_error(req.id, "nope")
+            else:
+                resp = make_result(req.id, {"method": req.method, "params": req.params})
+            writer.write((resp.to_json() + "\n").encode())
+            await writer.drain()
+        writer.close()
+
+    def test_connection_reused(self):
+        with _ThreadedServer(self._echo_forever, self.sock_path) as srv:
+            with self._client() as client:
+                for i in range(5):
+                    self.assertEqual(client.request("recall", {"query": str(i)})["params"]["query"], str(i))
+            self.assertEqual(srv.connections, 1)
+
+    def test_non_persistent_reconnects(self):
+        with _ThreadedServer(self._echo_forever, self.sock_path) as srv:
+            with self._client(persistent=False) as client:
+                client.request("health")
+                client.request("health")
+            self.assertEqual(srv.connections, 2)
+
+    def test_reconnects_after_server_closes(self):
+        async def one_shot(reader, writer):
+            line = await reader.readline()
+            req = Request.from_json(line.decode())
+            writer.write((make_result(req.id, req.method).to_json() + "\n").encode())
+            await writer.drain()
+            writer.close()
+
+        with _ThreadedServer(one_shot, self.sock_path) as srv:
+            with self._client() as client:
+                self.assertEqual(client.request("health"), "health")
+                time.sleep(0.05)
+                self.assertEqual(client.request("stats"), "stats")
+            self.assertEqual(srv.connections, 2)
+
+    def _slow_or_dropping_server(self, received, mode):
+        """Answer health; stall on a write ("slow") or close after answering one ("drop")."""
+        async def handler(reader, writer):
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                req = Request.from_json(line.decode())
+                received.append(req.method)
+                if req.method == "remember" and mode == "slow":
+                    await asyncio.sleep(1)
+                    break
+                if received.count("remember") == 2:
+                    break  # drop: the second write goes unanswered
+                writer.write((make_result(req.id, req.method).to_json() + "\n").encode())
+                await writer.drain()
+            writer.close()
+        return handler
+
+    def test_timed_out_write_not_resent(self):
+        from wt_memoryd.client import DaemonError, MemoryClient
+        received = []
+        handler = self._slow_or_dropping_server(received, "slow")
+        with patch("wt_memoryd.client.READ_TIMEOUT", 0.2), \
+                patch.object(MemoryClient, "_ensure_daemon"):
+            with _ThreadedServer(handler, self.sock_path) as srv:
+                with self._client() as client:
+                    client.request("health")
+                    with self.assertRaises(DaemonError):
+                        client.remember("slow write")
+                time.sleep(0.1)
+                self.assertEqual(received, ["health", "remember"])
+                self.assertEqual(srv.connections, 1)
+
+    def test_partially_answered_batch_not_resent(self):
+        from wt_memoryd.client import DaemonError, MemoryClient
+        received = []
+        handler = self._slow_or_dropping_server(received, "drop")
+        with patch.object(MemoryClient, "_ensure_daemon"):
+            with _ThreadedServer(handler, self.sock_path) as srv:
+                with self._client() as client:
+                    client.request("health")
+                    with self.assertRaises(DaemonError):
+                        client.request_many([("remember", {"content": "a"}),
+                                             ("remember", {"content": "b"})])
+                time.sleep(0.1)
+                self.assertEqual(received, ["health", "remember", "remember"])
+                self.assertEqual(srv.connections, 1)
+
+    def test_request_many_single_round_trip(self):
+        with _ThreadedServer(self._echo_forever, self.sock_path) as srv:
+            with self._client() as client:
+                results = client.request_many([
+                    ("recall", {"query": "a"}),
+                    ("proactive_context", {"context": "b"}),
+                    ("stats", None),
+                ])
+            self.assertEqual([r["method"] for r in results], ["recall", "proactive_context", "stats"])
+            self.assertEqual(results[1]["params"], {"context": "b"})
+            self.assertEqual(srv.connections, 1)
+
+    def test_request_many_matches_out_of_order_responses(self):
+        async def reversed_replies(reader, writer):
+            reqs = []
+            for _ in range(3):
+                reqs.append(Request.from_json((await reader.readline()).decode()))
+            for req in reversed(reqs):
+                writer.write((make_result(req.id, req.params["n"]).to_json() + "\n").encode())
+            await writer.drain()
+            await reader.read()
+            writer.close()
+
+        with _ThreadedServer(reversed_replies, self.sock_path):
+            with self._client() as client:
+                results = client.request_many([("recall", {"n": i}) for i in range(3)])
+        self.assertEqual(results, [0, 1, 2])
+
+    def test_request_many_errors(self):
+        from wt_memoryd.client import DaemonError
+        with _ThreadedServer(self._echo_forever, self.sock_path):
+            with self._client() as client:
+                with self.assertRaises(DaemonError):
+                    client.request_many([("recall", {}), ("forget", {"id": "x"})])
+                results = client.request_many(
+                    [("recall", {}), ("forget", {"id": "x"})], return_exceptions=True,
+                )
+                self.assertEqual(results[0]["method"], "recall")
+                self.assertIsInstance(results[1], DaemonError)
+                # Connection is still usable after error responses
+                self.assertEqual(client.request("health")["method"], "health")
+                self.assertEqual(client.request_many([]), [])
+
+
+class _FakeMemory:
+    """Stands in for shodh Memory; tracks how many calls overlap."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.contents = []
+        self.recall_calls = 0
+        self.active = {"read": 0, "write": 0}
+        self.peak = {"read": 0, "write": 0}
+        self._lock = threading.Lock()
+
+    def _enter(self, kind):
+        with self._lock:
+            self.active[kind] += 1
+            self.peak[kind] = max(self.peak[kind], self.active[kind])
+
+    def _exit(self, kind):
+        with self._lock:
+            self.active[kind] -= 1
+
+    def recall(self, query, limit=5, mode="hybrid", tags=None):
+        self.recall_calls += 1
+        self._enter("read")
+        try:
+            time.sleep(self.delay)
+            return [{"content": c} for c in self.contents if query in c][:limit]
+        finally:
+            self._exit("read")
+
+    def remember(self, content, memory_type, tags=None, metadata=None):
+        self._enter("write")
+        try:
+            time.sleep(self.delay)
+            self.contents.append(content)
+            return {"id": str(len(self.contents))}
+        finally:
+            self._exit("write")
+
+    def forget(self, memory_id):
+        self.contents = [c for i, c in enumerate(self.contents) if str(i + 1) != memory_id]
+        return {"deleted": memory_id}
+
+    def get_stats(self):
+        return {"total": len(self.contents)}
+
+    def flush(self):
+        pass
+
+
+class TestDaemonBatch(unittest.TestCase):
+    """MemoryDaemon batch method and read/write executors."""
+
+    def _daemon(self, **kwargs):
+        from wt_memoryd.server import MemoryDaemon
+        from wt_memoryd.cache import RecallCache
+        kwargs.setdefault("cache", RecallCache(max_entries=0))
+        daemon = MemoryDaemon(
+            project="batchtest", storage_path="/nonexistent",
+            socket_path=f"/tmp/wt-memoryd-batchtest-{os.getpid()}.sock",
+            pid_path=f"/tmp/wt-memoryd-batchtest-{os.getpid()}.pid",
+            **kwargs,
+        )
+        daemon._memory = _FakeMemory()
+        daemon._start_time = time.monotonic()
+        return daemon
+
+    def _batch(self, daemon, subs):
+        req = Request(method="batch", params={"requests": subs}, id="b")
+        return asyncio.run(daemon.handle_request(req))
+
+    def test_reads_run_concurrently(self):
+        daemon = self._daemon(read_concurrency=4)
+        resp = self._batch(daemon, [
+            {"id": f"r{i}", "method": "recall", "params": {"query": "x"}} for i in range(4)
+        ])
+        self.assertTrue(resp.ok)
+        self.assertEqual([r["id"] for r in resp.result], ["r0", "r1", "r2", "r3"])
+        self.assertGreater(daemon._memory.peak["read"], 1)
+
+    def test_read_concurrency_one_serializes(self):
+        daemon = self._daemon(read_concurrency=1)
+        self._batch(daemon, [{"method": "recall", "params": {"query": "x"}}] * 3)
+        self.assertEqual(daemon._memory.peak["read"], 1)
+
+    def test_write_is_ordering_barrier(self):
+        daemon = self._daemon()
+        resp = self._batch(daemon, [
+            {"id": "before", "method": "recall", "params": {"query": "fact"}},
+            {"id": "w", "method": "remember", "params": {"content": "a fact"}},
+            {"id": "after", "method": "recall", "params": {"query": "fact"}},
+        ])
+        by_id = {r["id"]: r for r in resp.result}
+        self.assertEqual(by_id["before"]["result"], [])
+        self.assertEqual(by_id["w"]["result"], {"id": "1"})
+        self.assertEqual(by_id["after"]["result"], [{"content": "a fact"}])
+
+    def test_writes_serialized_across_requests(self):
+        daemon = self._daemon(read_concurrency=8)
+
+        async def run():
+            await asyncio.gather(*(
+                daemon.handle_request(Request(method="remember", params={"content": f"m{i}"}))
+                for i in range(4)
+            ))
+
+        asyncio.run(run())
+        self.assertEqual(daemon._memory.peak["write"], 1)
+        self.assertEqual(len(daemon._memory.contents), 4)
+
+    def test_sub_request_errors_in_place(self):
+        daemon = self._daemon()
+        resp = self._batch(daemon, [
+            {"id": "a", "method": "recall", "params": {"query": "x"}},
+            {"id": "b", "method": "shutdown"},
+            "not an object",
+        ])
+        self.assertTrue(resp.ok)
+        self.assertIn("result", resp.result[0])
+        self.assertIn("not allowed", resp.result[1]["error"])
+        self.assertIn("error", resp.result[2])
+        self.assertFalse(daemon._shutdown_event.is_set())
+
+    def test_invalid_batch(self):
+        from wt_memoryd.server import MAX_BATCH_SIZE
+        daemon = self._daemon()
+        self.assertFalse(self._batch(daemon, "nope").ok)
+        too_many = [{"method": "recall"}] * (MAX_BATCH_SIZE + 1)
+        self.assertFalse(self._batch(daemon, too_many).ok)
+
+    def test_read_concurrency_from_env(self):
+        from wt_memoryd.server import DEFAULT_READ_CONCURRENCY
+        with patch.dict(os.environ, {"WT_MEMORYD_READ_CONCURRENCY": "7"}):
+            self.assertEqual(self._daemon().read_concurrency, 7)
+        with patch.dict(os.environ, {"WT_MEMORYD_READ_CONCURRENCY": "x"}):
+            self.assertEqual(self._daemon().read_concurrency, DEFAULT_READ_CONCURRENCY)
+        health = asyncio.run(self._daemon(read_concurrency=3).handle_request(Request(method="health")))
+        self.assertEqual(health.result["read_concurrency"], 3)
+
+    def test_client_batch_end_to_end(self):
+        from wt_memoryd.client import MemoryClient, DaemonError
+        daemon = self._daemon()
+        sock_path = f"/tmp/wt-memoryd-batche2e-{os.getpid()}.sock"
+        with _ThreadedServer(daemon._handle_connection, sock_path):
+            with MemoryClient(project="batchtest") as client:
+                client.socket_path = sock_path
+                results = client.batch([
+                    ("remember", {"content": "batched note"}),
+                    ("recall", {"query": "batched"}),
+                    ("health", None),
+                ])
+        self.assertEqual(results[0], {"id": "1"})
+        self.assertEqual(results[1], [{"content": "batched note"}])
+        self.assertIsInstance(results[2], DaemonError)
+
+
+class TestRecallCache(unittest.TestCase):
+    """Recall cache keyed on query params, invalidated by writes."""
+
+    def _daemon(self, **cache_kwargs):
+        from wt_memoryd.server import MemoryDaemon
+        from wt_memoryd.cache import RecallCache
+        daemon = MemoryDaemon(
+            project="cachetest", storage_path="/nonexistent",
+            socket_path="/tmp/unused.sock", pid_path="/tmp/unused.pid",
+            cache=RecallCache(**cache_kwargs),
+        )
+        daemon._memory = _FakeMemory(delay=0)
+        daemon._memory.contents = ["alpha note", "beta note"]
+        daemon._start_time = time.monotonic()
+        return daemon
+
+    def _call(self, daemon, method, **params):
+        resp = asyncio.run(daemon.handle_request(Request(method=method, params=params)))
+        self.assertTrue(resp.ok, resp.error)
+        return resp.result
+
+    def test_repeat_recall_is_cached(self):
+        daemon = self._daemon()
+        first = self._call(daemon, "recall", query="alpha", limit=3)
+        second = self._call(daemon, "recall", query="alpha", limit=3)
+        self.assertEqual(first, second)
+        self.assertEqual(daemon._memory.recall_calls, 1)
+        cache = self._call(daemon, "health")["cache"]
+        self.assertEqual((cache["hits"], cache["misses"]), (1, 1))
+
+    def test_key_includes_limit_mode_and_tags(self):
+        daemon = self._daemon()
+        self._call(daemon, "recall", query="note", limit=1)
+        self._call(daemon, "recall", query="note", limit=2)
+        self._call(daemon, "recall", query="note", limit=1, mode="semantic")
+        self._call(daemon, "recall", query="note", limit=1, tags="a,b")
+        self._call(daemon, "recall", query="note", limit=1, tags="b, a")
+        self.assertEqual(daemon._memory.recall_calls, 4)
+
+    def test_writes_invalidate(self):
+        daemon = self._daemon()
+        self._call(daemon, "recall", query="note")
+        self._call(daemon, "remember", content="gamma note")
+        self.assertEqual(len(self._call(daemon, "recall", query="note")), 3)
+        self._call(daemon, "forget", id="3")
+        self.assertEqual(len(self._call(daemon, "recall", query="note")), 2)
+        self.assertEqual(daemon._memory.recall_calls, 3)
+        self.assertEqual(daemon.cache.stats()["invalidations"], 2)
+
+    def test_stale_generation_not_stored(self):
+        from wt_memoryd.cache import RecallCache
+        cache = RecallCache()
+        gen = cache.generation
+        cache.invalidate()
+        cache.put("k", "old", gen)
+        self.assertEqual(cache.get("k"), (False, None))
+
+    def test_ttl_and_lru_eviction(self):
+        from wt_memoryd.cache import RecallCache
+        cache = RecallCache(max_entries=2, ttl=60)
+        for k in ("a", "b", "c"):
+            cache.put(k, k, cache.generation)
+        self.assertEqual(cache.get("a"), (False, None))
+        self.assertEqual(cache.get("c"), (True, "c"))
+        self.assertEqual(cache.evictions, 1)
+        with patch("wt_memoryd.cache.time.monotonic", return_value=time.monotonic() + 120):
+            self.assertEqual(cache.get("c"), (False, None))
+
+    def test_disabled(self):
+        daemon = self._daemon(max_entries=0)
+        self._call(daemon, "recall", query="alpha")
+        self._call(daemon, "recall", query="alpha")
+        self.assertEqual(daemon._memory.recall_calls, 2)
+
+    def test_stats_method_reports_cache(self):
+        daemon = self._daemon()
+        self._call(daemon, "recall", query="alpha")
+        stats = self._call(daemon, "stats")
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["daemon_cache"]["misses"], 1)
+
+    def test_options_from_env(self):
+        from wt_memoryd.cache import cache_options_from_env
+        with patch.dict(os.environ, {"WT_MEMORYD_CACHE_SIZE": "0", "WT_MEMORYD_CACHE_TTL": "bad"}):
+            self.assertEqual(cache_options_from_env(), {"max_entries": 0})
+
+
+class TestDaemonWarmup(unittest.TestCase):
+    """Eager MemorySystem load and the readiness state in health."""
+
+    def _daemon(self, **kwargs):
+        from wt_memoryd.server import MemoryDaemon
+        from wt_memoryd.cache import RecallCache
+        daemon = MemoryDaemon(
+            project="warmtest", storage_path="/nonexistent",
+            socket_path="/tmp/unused.sock", pid_path="/tmp/unused.pid",
+            cache=RecallCache(max_entries=0), **kwargs,
+        )
+        daemon._start_time = time.monotonic()
+        return daemon
+
+    def _fake_shodh(self, init_delay=0.0, fail=False):
+        import types
+        created = []
+
+        class Memory(_FakeMemory):
+            def __init__(self, storage_path):
+                if fail:
+                    raise RuntimeError("rocksdb locked")
+                time.sleep(init_delay)
+                super().__init__(delay=0)
+                created.append(self)
+
+        module = types.ModuleType("shodh_memory")
+        module.Memory = Memory
+        return patch.dict(sys.modules, {"shodh": None, "shodh_memory": module}), created
+
+    def test_warm_up_loads_memory_and_embeds(self):
+        patcher, created = self._fake_shodh()
+        daemon = self._daemon(warmup=True)
+        with patcher:
+            asyncio.run(daemon._warm_up())
+        self.assertEqual(daemon._state, "ready")
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].recall_calls, 1)  # dummy embedding
+        self.assertIn("total", daemon._warmup_ms)
+
+    def test_requests_wait_for_warm_up(self):
+        patcher, created = self._fake_shodh(init_delay=0.2)
+        daemon = self._daemon(warmup=True)
+
+        async def run():
+            daemon._warmup_task = asyncio.create_task(daemon._warm_up())
+            await asyncio.sleep(0.01)
+            health = await daemon.handle_request(Request(method="health"))
+            recall = await daemon.handle_request(Request(method="recall", params={"query": "x"}))
+            return health, recall
+
+        with patcher:
+            health, recall = asyncio.run(run())
+        self.assertEqual(health.result["state"], "warming")
+        self.assertTrue(recall.ok)
+        self.assertEqual(len(created), 1)  # not initialized twice
+        self.assertTrue(daemon._first_request_logged)
+
+    def test_failed_warm_up(self):
+        patcher, _ = self._fake_shodh(fail=True)
+        daemon = self._daemon(warmup=True)
+        with patcher:
+            asyncio.run(daemon._warm_up())
+            health = asyncio.run(daemon.handle_request(Request(method="health"))).result
+        self.assertEqual(health["state"], "failed")
+        self.assertIn("rocksdb locked", health["error"])
+
+    def test_warmup_env(self):
+        from wt_memoryd.server import warmup_from_env
+        with patch.dict(os.environ, {"WT_MEMORYD_WARMUP": "0"}):
+            self.assertFalse(warmup_from_env())
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("WT_MEMORYD_WARMUP", None)
+            self.assertTrue(warmup_from_env())
+
+    def test_client_wait_ready(self):
+        from wt_memoryd.client import MemoryClient
+        daemon = self._daemon(warmup=True)
+        daemon._state = "warming"
+        sock_path = f"/tmp/wt-memoryd-readytest-{os.getpid()}.sock"
+        with _ThreadedServer(daemon._handle_connection, sock_path):
+            with MemoryClient(project="warmtest") as client:
+                client.socket_path = sock_path
+                self.assertFalse(client.wait_ready(timeout=0.1))
+                threading.Timer(0.1, setattr, (daemon, "_state", "ready")).start()
+                t0 = time.monotonic()
+                self.assertTrue(client.wait_ready(timeout=3))
+                self.assertGreaterEqual(time.monotonic() - t0, 0.05)
+                daemon._state = "failed"
+                self.assertFalse(client.wait_ready(timeout=3))
+
+    def test_wait_ready_unreachable(self):
+        from wt_memoryd.client import MemoryClient
+        client = MemoryClient(project="warmtest")
+        client.socket_path = "/tmp/wt-memoryd-definitely-nonexistent.sock"
+        self.assertFalse(client.wait_ready(timeout=0.1))
+
+
 if __name__ == "__main__":
     unittest.main()
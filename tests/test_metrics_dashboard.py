@@ -164,6 +164,192 @@ def test_flush_replace_same_session(metrics_db):
     assert sess_count == 1  # INSERT OR REPLACE
 
 
+def test_schema_version_fast_path(metrics_db):
+    m = metrics_db
+    m._get_db().close()
+
+    conn = sqlite3.connect(m.METRICS_DB)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == m.SCHEMA_VERSION
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+    calls = []
+    orig = m._init_schema
+    m._init_schema = lambda c: calls.append(c) or orig(c)
+    try:
+        m._get_db().close()
+    finally:
+        m._init_schema = orig
+    assert calls == []
+
+
+def test_old_db_migrated(metrics_db):
+    """A pre-migration DB gets new columns and its rollups backfilled."""
+    m = metrics_db
+    os.makedirs(m.METRICS_DIR, exist_ok=True)
+    conn = sqlite3.connect(m.METRICS_DB)
+    conn.executescript("""
+        CREATE TABLE sessions (id TEXT PRIMARY KEY, project TEXT, started_at TEXT, ended_at TEXT,
+            total_injections INTEGER, total_tokens INTEGER, citation_count INTEGER, layers_json TEXT);
+        CREATE TABLE injections (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT, ts TEXT,
+            layer TEXT, event TEXT, query TEXT, result_count INTEGER, filtered_count INTEGER,
+            avg_relevance REAL, max_relevance REAL, min_relevance REAL, duration_ms INTEGER,
+            token_estimate INTEGER, dedup_hit INTEGER);
+    """)
+    ended = datetime.utcnow().isoformat() + "Z"
+    conn.execute("INSERT INTO sessions VALUES ('old', 'proj', ?, ?, 1, 40, 0, '{}')", (ended, ended))
+    conn.execute("INSERT INTO injections (session_id, layer, filtered_count, avg_relevance, token_estimate, dedup_hit) "
+                 "VALUES ('old', 'L1', 1, 0.9, 40, 0)")
+    conn.commit()
+    conn.close()
+
+    conn = m._get_db()
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(injections)").fetchall()]
+    conn.close()
+    assert "context_ids" in cols
+    data = m.query_report()
+    assert data["session_count"] == 1
+    assert data["relevance"]["strong"] == 1
+
+
+# ============================================================
+# rollups
+# ============================================================
+
+
+def _rollup_snapshot(m):
+    conn = sqlite3.connect(m.METRICS_DB)
+    try:
+        return {
+            t: sorted(tuple(round(v, 6) if isinstance(v, float) else v for v in r)
+                      for r in conn.execute(f"SELECT * FROM {t}").fetchall())
+            for t in ("rollup_injections", "rollup_sessions", "rollup_citations")
+        }
+    finally:
+        conn.close()
+
+
+def test_rollups_match_rebuild(metrics_db):
+    m = metrics_db
+    m.flush_session("r1", "alpha", _make_records(3, layer="L1", avg_rel=0.8),
+                    [{"text": "From memory: a"}], [{"context_id": "c1"}])
+    m.flush_session("r2", "alpha-wt", _make_records(2, layer="L2", avg_rel=0.2) + [
+        dict(_make_records(1)[0], avg_relevance=None, dedup_hit=1, filtered_count=0)])
+    m.flush_session("r3", "beta", _make_records(4, avg_rel=0.5, tok=7))
+    m.flush_session("r1", "alpha", _make_records(1, layer="L3"))  # re-flush replaces
+
+    incremental = _rollup_snapshot(m)
+    assert incremental["rollup_sessions"]
+    assert m.rebuild_rollups() == 3
+    assert _rollup_snapshot(m) == incremental
+
+
+def test_query_report_cutoff_inside_hour(metrics_db):
+    """Sessions around the cutoff are split exactly, not per bucket."""
+    m = metrics_db
+    now = datetime.utcnow()
+    conn = m._get_db()
+    for sid, age in (("in", timedelta(days=7, minutes=-2)), ("out", timedelta(days=7, minutes=2)),
+                     ("recent", timedelta(hours=1))):
+        m._write_session(conn, sid, "proj", _make_records(2),
+                         ended_at=(now - age).isoformat() + "Z")
+    conn.commit()
+    conn.close()
+
+    data = m.query_report(since_days=7)
+    assert data["session_count"] == 2
+    assert data["total_injections"] == 4
+    assert {s["id"] for s in data["sessions"]} == {"in", "recent"}
+    assert sum(d["sessions"] for d in data["daily_sessions"]) == 2
+
+
+def test_query_report_project_filter_uses_rollups(metrics_db):
+    m = metrics_db
+    m.flush_session("p1", "sales", _make_records(2))
+    m.flush_session("p2", "sales-wt-x", _make_records(3))
+    m.flush_session("p3", "other", _make_records(5))
+    data = m.query_report(project="sales")
+    assert data["session_count"] == 2
+    assert data["dedup_total"] == 5
+
+
+# ============================================================
+# queue_flush / drain_spool
+# ============================================================
+
+
+def _session_count(m):
+    conn = sqlite3.connect(m.METRICS_DB)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_queue_flush_spools_without_touching_db(metrics_db, monkeypatch):
+    m = metrics_db
+    spawned = []
+    monkeypatch.setattr(m, "_spawn_drainer", lambda: spawned.append(1))
+    m.queue_flush("q1", "proj", _make_records(3), [{"text": "From memory: x"}],
+                  [{"context_id": "c1", "match_type": "passive"}])
+    m.queue_flush("q2", "proj", _make_records(2))
+
+    assert spawned == [1, 1]
+    assert not os.path.exists(m.METRICS_DB)
+    assert len([n for n in os.listdir(m._spool_dir()) if n.endswith(".json")]) == 2
+
+    assert m.drain_spool() == 2
+    assert _session_count(m) == 2
+    assert os.listdir(m._spool_dir()) == [".lock"]
+
+
+def test_query_report_drains_pending(metrics_db, monkeypatch):
+    m = metrics_db
+    monkeypatch.setattr(m, "_spawn_drainer", lambda: None)
+    m.queue_flush("q1", "proj", _make_records(4))
+    data = m.query_report()
+    assert data is not None
+    assert data["total_injections"] == 4
+
+
+def test_drain_skips_malformed_and_respects_lock(metrics_db, monkeypatch):
+    import fcntl
+
+    m = metrics_db
+    monkeypatch.setattr(m, "_spawn_drainer", lambda: None)
+    m.queue_flush("ok", "proj", _make_records(1))
+    with open(os.path.join(m._spool_dir(), "0-bad.json"), "w") as f:
+        f.write("{not json")
+
+    with open(os.path.join(m._spool_dir(), ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        assert m.drain_spool() == 0  # another drainer is running
+    assert m.drain_spool() == 1
+    assert _session_count(m) == 1
+    assert not os.path.exists(os.path.join(m._spool_dir(), "0-bad.json"))
+
+
+def test_queue_flush_sync_when_disabled(metrics_db, monkeypatch):
+    m = metrics_db
+    monkeypatch.setenv("WT_METRICS_BACKGROUND", "0")
+    monkeypatch.setattr(m, "_spawn_drainer", lambda: pytest.fail("spawned"))
+    m.queue_flush("sync", "proj", _make_records(2))
+    assert _session_count(m) == 1
+
+
+def test_drain_cli(metrics_db, monkeypatch):
+    import subprocess
+    import sys
+
+    m = metrics_db
+    monkeypatch.setattr(m, "_spawn_drainer", lambda: None)
+    m.queue_flush("cli", "proj", _make_records(2))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-m", "lib.metrics", "drain", "--dir", m.METRICS_DIR],
+                   cwd=root, check=True, timeout=30)
+    assert _session_count(m) == 1
+
+
 # ============================================================
 # query_report
 # ============================================================
@@ -320,6 +506,29 @@ def test_scan_transcript_citations(tmp_path):
     assert "From memory:" in citations[0]["text"]
 
 
+def test_scan_transcript_with_preparsed_messages(tmp_path):
+    from lib.metrics import read_assistant_messages, scan_transcript_citations
+
+    transcript = tmp_path / "session.jsonl"
+    import json
+
+    lines = [
+        json.dumps({"type": "user", "message": {"content": "how do we rotate tokens?"}}),
+        json.dumps({"type": "assistant", "message": {"content": [
+            {"type": "text", "text": "From memory: rotation uses the keyring daemon."}
+        ]}}),
+    ]
+    transcript.write_text("\n".join(lines) + "\n")
+    injected = {"ctx1": "token rotation keyring daemon schedule"}
+
+    messages = read_assistant_messages(str(transcript))
+    assert messages == [{"turn": 2, "texts": ["From memory: rotation uses the keyring daemon."]}]
+    from_file = scan_transcript_citations(str(transcript), injected_content=injected)
+    from_messages = scan_transcript_citations("", injected_content=injected, messages=messages)
+    assert from_file == from_messages
+    assert {r["match_type"] for r in from_messages} == {"explicit", "passive"}
+
+
 def test_scan_transcript_missing_file():
     from lib.metrics import scan_transcript_citations
     result = scan_transcript_citations("/nonexistent/path.jsonl")
@@ -121,6 +121,19 @@ class TestReadLog:
         assert "line 3" in second[0]
         assert "line 4" in second[1]
 
+    def test_torn_last_line_held_back(self, tmp_dir):
+        log_path = tmp_dir / "orchestration.log"
+        log_path.write_text("line 1\npartial")
+        reader = StateReader(tmp_dir / "state.json", log_path)
+        assert reader.read_log() == ["line 1\n"]
+
+        with open(log_path, "a") as f:
+            f.write(" line\nline 3")
+        assert reader.read_log() == ["partial line\n"]
+        with open(log_path, "a") as f:
+            f.write("\n")
+        assert reader.read_log() == ["line 3\n"]
+
     def test_no_log_file(self, tmp_dir):
         reader = StateReader(tmp_dir / "state.json", tmp_dir / "nofile.log")
         assert reader.read_log() is None
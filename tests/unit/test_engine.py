@@ -116,6 +116,11 @@ class TestParseDirectives:
         assert d.checkpoint_auto_approve is True
         assert d.max_redispatch == 3
 
+    def test_max_verify_gates(self):
+        assert parse_directives({}).max_verify_gates == 1
+        assert parse_directives({"max_verify_gates": 3}).max_verify_gates == 3
+        assert parse_directives({"max_verify_gates": 0}).max_verify_gates == 1
+
     def test_string_to_int_coercion(self):
         """String values get coerced to int where needed."""
         raw = {"max_parallel": "7", "test_timeout": "120", "token_budget": "5000000"}
@@ -599,3 +604,62 @@ class TestHeartbeatThrottle:
         """Over 100 polls, only 5 heartbeats should emit (not 100)."""
         emit_count = sum(1 for p in range(1, 101) if p % 20 == 0)
         assert emit_count == 5
+
+
+# ─── Parallel change polling ─────────────────────────────────────
+
+
+class TestChangePoller:
+    def _state(self, tmp_path, names):
+        state_file = str(tmp_path / "state.json")
+        save_state(OrchestratorState(changes=[
+            Change(name=n, status="running", worktree_path=str(tmp_path / n)) for n in names
+        ]), state_file)
+        return state_file
+
+    def test_slow_poll_does_not_block_others(self, tmp_path, monkeypatch):
+        """A change stuck in its gate keeps one poll in flight; others proceed."""
+        import threading
+        import wt_orch.verifier as verifier
+        from wt_orch.engine import ChangePoller, Directives, _poll_active_changes
+
+        state_file = self._state(tmp_path, ["slow", "a", "b"])
+        release = threading.Event()
+        calls = []
+
+        def fake_poll(name, sf, **kw):
+            calls.append(name)
+            assert kw["verify_slots"] is not None
+            if name == "slow":
+                release.wait(10)
+            return "running"
+
+        monkeypatch.setattr(verifier, "poll_change", fake_poll)
+        poller = ChangePoller(max_verify_gates=1)
+        d = Directives()
+        try:
+            for tick in range(1, 4):
+                _poll_active_changes(state_file, d, "", None, poller=poller)
+                deadline = time.monotonic() + 5
+                while calls.count("b") < tick and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                time.sleep(0.05)
+            assert calls.count("slow") == 1
+            assert calls.count("a") == 3
+            assert poller.busy("slow")
+        finally:
+            release.set()
+            poller.shutdown()
+        assert sorted(c.name for c, _, _ in poller.reap()) == ["a", "b", "slow"]
+
+    def test_verify_gate_cap_defers(self, tmp_path, monkeypatch):
+        import threading
+        import wt_orch.verifier as verifier
+
+        gates = []
+        monkeypatch.setattr(verifier, "handle_change_done", lambda name, sf, **kw: gates.append(name))
+        slots = threading.BoundedSemaphore(1)
+        assert verifier._run_verify_gate("a", "state.json", slots) is True
+        with slots:
+            assert verifier._run_verify_gate("b", "state.json", slots) is False
+        assert gates == ["a"]
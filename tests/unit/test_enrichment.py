@@ -0,0 +1,118 @@
+"""Tests for wt_orch.enrichment: mtime-keyed directory listings."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_orch.enrichment import (
+    DirIndex,
+    claude_sessions_dir,
+    enrich_changes,
+    invalidate_moved,
+)
+
+
+def _age(path, secs=60):
+    """Backdate a directory's mtime so its listing is cacheable."""
+    t = time.time() - secs
+    os.utime(path, (t, t))
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    h = tmp_path / "home"
+    h.mkdir()
+    monkeypatch.setenv("HOME", str(h))
+    return h
+
+
+class TestDirIndex:
+    def test_cached_until_directory_changes(self, tmp_path):
+        idx = DirIndex()
+        (tmp_path / "b.log").write_text("")
+        (tmp_path / "a.log").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+        (tmp_path / "dir.log").mkdir()
+        _age(tmp_path)
+        assert idx.names(tmp_path, ".log") == ["a.log", "b.log"]
+        assert idx.names(tmp_path, ".log") == ["a.log", "b.log"]
+        assert idx.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+        (tmp_path / "c.log").write_text("")
+        _age(tmp_path, 30)
+        assert idx.names(tmp_path, ".log") == ["a.log", "b.log", "c.log"]
+        assert idx.misses == 2
+
+    def test_recently_modified_dir_not_cached(self, tmp_path):
+        idx = DirIndex()
+        (tmp_path / "a.jsonl").write_text("")
+        assert idx.count(tmp_path, ".jsonl") == 1
+        assert idx.count(tmp_path, ".jsonl") == 1
+        assert idx.stats() == {"entries": 0, "hits": 0, "misses": 2}
+
+    def test_missing_or_file(self, tmp_path):
+        idx = DirIndex()
+        assert idx.names(tmp_path / "nope", ".log") is None
+        (tmp_path / "f").write_text("")
+        assert idx.names(tmp_path / "f", ".log") is None
+
+    def test_invalidate_prefix_and_lru(self, tmp_path):
+        idx = DirIndex(max_entries=2)
+        dirs = []
+        for name in ("wt/.claude/logs", "wt2/.claude/logs", "other"):
+            d = tmp_path / name
+            d.mkdir(parents=True)
+            _age(d)
+            dirs.append(d)
+            idx.names(d, ".log")
+        # Oldest listing evicted
+        assert idx.stats()["entries"] == 2
+        idx.invalidate(tmp_path / "wt2")
+        assert idx.stats()["entries"] == 1
+        idx.invalidate()
+        assert idx.stats()["entries"] == 0
+
+
+def test_enrich_changes(tmp_path, home):
+    project = tmp_path / "proj"
+    wt = tmp_path / "proj-wt-a"
+    logs = wt / ".claude" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "iter-1.log").write_text("")
+    sessions = claude_sessions_dir(wt)
+    sessions.mkdir(parents=True)
+    for i in range(3):
+        (sessions / f"s{i}.jsonl").write_text("")
+    proj_sessions = claude_sessions_dir(project)
+    proj_sessions.mkdir(parents=True)
+    (proj_sessions / "p.jsonl").write_text("")
+
+    changes = [
+        {"name": "a", "status": "running", "worktree_path": str(wt)},
+        {"name": "b", "status": "merged", "worktree_path": str(tmp_path / "gone")},
+        {"name": "c", "status": "running", "worktree_path": str(tmp_path / "gone")},
+        {"name": "d", "status": "pending"},
+    ]
+    enrich_changes(changes, project, DirIndex())
+    assert changes[0]["logs"] == ["iter-1.log"]
+    assert changes[0]["session_count"] == 3
+    assert changes[1]["session_count"] == 1  # finished: project sessions
+    assert "session_count" not in changes[2]
+    assert "logs" not in changes[3] and "session_count" not in changes[3]
+
+
+def test_invalidate_moved(tmp_path, home):
+    idx = DirIndex()
+    logs = tmp_path / "wt" / ".claude" / "logs"
+    logs.mkdir(parents=True)
+    _age(logs)
+    idx.names(logs, ".log")
+    old = [{"name": "a", "status": "running", "worktree_path": str(tmp_path / "wt")}]
+    invalidate_moved(old, [dict(old[0])], idx)
+    assert idx.stats()["entries"] == 1
+    invalidate_moved(old, [dict(old[0], status="merged")], idx)
+    assert idx.stats()["entries"] == 0
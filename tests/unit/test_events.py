@@ -1,11 +1,14 @@
 """Tests for wt_orch.events."""
 
 import json
+import os
+import signal
 import time
 from pathlib import Path
 
 import pytest
 
+import wt_orch.events as events_mod
 from wt_orch.events import EventBus, _resolve_log_path
 
 
@@ -96,6 +99,129 @@ class TestEmit:
         assert len(log.read_text().splitlines()) == 1
 
 
+class TestBufferedEmit:
+    def test_events_queued_until_batch_full(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log, buffered=True, flush_batch=3, flush_interval=60)
+        bus.emit("A")
+        bus.emit("B")
+        assert bus.pending == 2
+        assert not log.exists() or log.read_text() == ""
+
+        bus.emit("C")
+        assert bus.pending == 0
+        assert [json.loads(l)["type"] for l in log.read_text().splitlines()] == ["A", "B", "C"]
+        bus.close()
+
+    def test_flush_interval(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log, buffered=True, flush_interval=0.05)
+        bus.emit("A")
+        deadline = time.time() + 2
+        while bus.pending and time.time() < deadline:
+            time.sleep(0.01)
+        assert log.read_text().count("\n") == 1
+        bus.close()
+
+    def test_subscribers_notified_immediately(self, tmp_path):
+        bus = EventBus(log_path=tmp_path / "events.jsonl", buffered=True, flush_interval=60)
+        received = []
+        bus.subscribe("A", received.append)
+        bus.emit("A")
+        assert len(received) == 1
+        bus.close()
+
+    def test_query_sees_pending_events(self, tmp_path):
+        bus = EventBus(log_path=tmp_path / "events.jsonl", buffered=True, flush_interval=60)
+        bus.emit("A", change="ch1")
+        assert [e["type"] for e in bus.query(change="ch1")] == ["A"]
+        bus.close()
+
+    def test_close_flushes_and_falls_back_to_direct_writes(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log, buffered=True, flush_interval=60)
+        bus.emit("A")
+        bus.close()
+        bus.emit("B")
+        assert log.read_text().count("\n") == 2
+        assert bus.pending == 0
+
+    def test_flush_all_covers_live_buses(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log, buffered=True, flush_interval=60)
+        bus.emit("A")
+        events_mod.flush_all()
+        assert log.read_text().count("\n") == 1
+        bus.close()
+
+    def _sigterm_child(self, tmp_path, hold_lock):
+        import subprocess
+        import sys
+        log = tmp_path / "events.jsonl"
+        lib = os.path.join(os.path.dirname(__file__), "..", "..", "lib")
+        script = (
+            "import os, signal\n"
+            "from wt_orch.events import EventBus\n"
+            f"bus = EventBus(log_path={str(log)!r}, buffered=True, flush_interval=60)\n"
+            "bus.emit('A')\n"
+            + ("with bus._write_lock:\n    os.kill(os.getpid(), signal.SIGTERM)\n" if hold_lock
+               else "os.kill(os.getpid(), signal.SIGTERM)\n")
+            + "import time; time.sleep(30)\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", script], env=dict(os.environ, PYTHONPATH=lib),
+            capture_output=True, timeout=20,
+        )
+        return proc.returncode, log.read_text().count("\n") if log.exists() else 0
+
+    def test_sigterm_flushes_and_dies_by_signal(self, tmp_path):
+        assert self._sigterm_child(tmp_path, hold_lock=False) == (-signal.SIGTERM, 1)
+
+    def test_sigterm_during_flush_does_not_deadlock(self, tmp_path):
+        # Lock held by the interrupted frame: unwind, atexit flushes
+        assert self._sigterm_child(tmp_path, hold_lock=True) == (128 + signal.SIGTERM, 1)
+
+    def test_failed_write_keeps_bounded_backlog(self, tmp_path):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        bus = EventBus(log_path=blocker / "events.jsonl", buffered=True,
+                       flush_batch=2, max_pending=3, flush_interval=60)
+        for i in range(6):
+            bus.emit("T", data={"i": i})
+        assert bus.pending == 3
+        bus.close()
+
+    def test_buffered_rotation(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log, max_size=100, buffered=True, flush_batch=10)
+        for i in range(10):
+            bus.emit("TICK", data={"i": i})
+        assert len(list(tmp_path.glob("events-*.jsonl"))) == 1
+        bus.close()
+
+    def test_invalid_fsync_policy(self, tmp_path):
+        with pytest.raises(ValueError, match="fsync"):
+            EventBus(log_path=tmp_path / "e.jsonl", fsync="sometimes")
+
+    def test_fsync_commit(self, tmp_path, monkeypatch):
+        calls = []
+        monkeypatch.setattr(events_mod.os, "fsync", lambda fd: calls.append(fd))
+        bus = EventBus(log_path=tmp_path / "e.jsonl", buffered=True, flush_batch=5,
+                       flush_interval=60, fsync="commit")
+        for _ in range(10):
+            bus.emit("T")
+        assert len(calls) == 2
+        bus.close()
+
+    def test_buffer_options_from_env(self, monkeypatch):
+        monkeypatch.setenv("WT_EVENTS_BUFFERED", "1")
+        monkeypatch.setenv("WT_EVENTS_FSYNC", "interval")
+        assert events_mod.buffer_options_from_env() == {"buffered": True, "fsync": "interval"}
+        monkeypatch.delenv("WT_EVENTS_BUFFERED")
+        monkeypatch.setenv("WT_EVENTS_FSYNC", "bogus")
+        assert events_mod.buffer_options_from_env() == {}
+
+
 # ─── EventBus.rotate_log ────────────────────────────────────────────
 
 
@@ -246,6 +372,102 @@ class TestQuery:
         assert len(results) == 2
 
 
+class TestQueryIndex:
+    def _fresh_process(self):
+        """Drop in-memory indexes, as if a new process opened the log."""
+        events_mod._indexes.clear()
+
+    def test_query_persists_sidecar(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log)
+        bus.emit("A", change="ch1")
+        bus.emit("B")
+        bus.query(event_type="A")
+
+        lines = (tmp_path / "events.jsonl.idx").read_text().splitlines()
+        assert json.loads(lines[0]) == {"ino": log.stat().st_ino}
+        entries = [json.loads(l) for l in lines[1:]]
+        assert [e[2:4] for e in entries] == [["A", "ch1"], ["B", ""]]
+        assert entries[1][0] == entries[0][0] + entries[0][1]
+
+    def test_query_from_persisted_index(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log)
+        for i in range(10):
+            bus.emit("A" if i % 2 else "B", change=f"ch{i % 3}", data={"i": i})
+        self._fresh_process()
+
+        results = bus.query(event_type="A", change="ch1")
+        assert [e["data"]["i"] for e in results] == [1, 7]
+
+    def test_indexes_foreign_appends(self, tmp_path):
+        """Lines written by bash emit_event are picked up on the next query."""
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log)
+        bus.emit("A")
+        with open(log, "a") as f:
+            f.write('{"ts":"2026-01-01T00:00:00+00:00","type":"B","change":"x","data":{}}\n')
+        assert [e["type"] for e in bus.query(change="x")] == ["B"]
+
+    def test_rebuilds_after_external_rotation(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log)
+        bus.emit("OLD")
+        log.rename(tmp_path / "events-20250101000000.jsonl")
+        log.write_text('{"type":"NEW","data":{}}\n')
+
+        assert [e["type"] for e in bus.query()] == ["NEW"]
+        self._fresh_process()
+        assert [e["type"] for e in bus.query()] == ["NEW"]
+
+    def test_limit_returns_newest_matches(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log)
+        for i in range(20):
+            bus.emit("T", data={"i": i})
+        results = bus.query(event_type="T", limit=3)
+        assert [e["data"]["i"] for e in results] == [17, 18, 19]
+
+    def test_since_with_checkpoints(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(events_mod, "TS_CHECKPOINT_EVERY", 4)
+        log = tmp_path / "events.jsonl"
+        log.write_text("".join(
+            json.dumps({"ts": f"2026-01-01T00:00:{i:02d}", "type": "T", "data": {"i": i}},
+                       separators=(",", ":")) + "\n"
+            for i in range(30)
+        ))
+        bus = EventBus(log_path=log)
+        results = bus.query(since="2026-01-01T00:00:13")
+        assert [e["data"]["i"] for e in results] == list(range(13, 30))
+
+    def test_last_n_reads_tail(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(events_mod, "_get_index", None)  # must not touch the index
+        log = tmp_path / "events.jsonl"
+        log.write_text("".join(f'{{"type":"T{i}","data":{{}}}}\n' for i in range(5000)))
+        bus = EventBus(log_path=log)
+        results = bus.query(last_n=3)
+        assert [e["type"] for e in results] == ["T4997", "T4998", "T4999"]
+
+    def test_include_archives(self, tmp_path):
+        log = tmp_path / "events.jsonl"
+        bus = EventBus(log_path=log, max_size=100)
+        for i in range(5):
+            bus.emit("T", data={"i": i, "pad": "x" * 40})
+        bus.query(event_type="T")
+        bus.rotate_log()
+        archive = next(tmp_path.glob("events-*.jsonl"))
+        assert (tmp_path / (archive.name + ".idx")).exists()
+        bus.emit("T", data={"i": 5})
+
+        assert [e["data"]["i"] for e in bus.query(event_type="T")] == [5]
+        results = bus.query(event_type="T", include_archives=True)
+        assert [e["data"]["i"] for e in results] == [0, 1, 2, 3, 4, 5]
+        results = bus.query(last_n=3, include_archives=True)
+        assert [e["data"]["i"] for e in results] == [3, 4, 5]
+        results = bus.query(event_type="T", limit=2, include_archives=True)
+        assert [e["data"]["i"] for e in results] == [4, 5]
+
+
 # ─── EventBus.format_table ───────────────────────────────────────────
 
 
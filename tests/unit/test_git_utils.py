@@ -93,3 +93,114 @@ class TestGitHasUncommittedWork:
         has_work, summary = git_has_uncommitted_work("/nonexistent")
         assert has_work is False
         assert summary == ""
+
+
+# ─── Ref queries ─────────────────────────────────────────────────────
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", "-C", str(cwd), *args], capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo_with_worktrees(git_wt, tmp_path_factory):
+    """git_wt on branch main plus two change worktrees."""
+    _git(git_wt, "branch", "-M", "main")
+    wts = {}
+    base = tmp_path_factory.mktemp("wts")
+    for name in ("a", "b"):
+        path = str(base / name)
+        _git(git_wt, "worktree", "add", "-q", "-b", f"change/{name}", path)
+        _git(path, "config", "user.email", "test@test.com")
+        _git(path, "config", "user.name", "Test")
+        wts[name] = path
+    return git_wt, wts
+
+
+def _commit(cwd, filename, msg):
+    with open(os.path.join(cwd, filename), "w") as f:
+        f.write(msg + "\n")
+    _git(cwd, "add", filename)
+    _git(cwd, "commit", "-q", "-m", msg)
+    return _git(cwd, "rev-parse", "HEAD")
+
+
+@pytest.fixture(autouse=True)
+def _clear_graph_caches():
+    # Identical commits made within the same second share ids across tests
+    import wt_orch.git_utils as git_utils
+    for cache in (git_utils._behind_ahead_cache, git_utils._merge_base_cache, git_utils._ancestor_cache):
+        cache.clear()
+
+
+class TestRefQueries:
+    def test_snapshot_reads_branches_and_worktree_heads(self, repo_with_worktrees):
+        from wt_orch.git_utils import RefSnapshot
+
+        repo, wts = repo_with_worktrees
+        sha = _commit(wts["a"], "a.txt", "work on a")
+        snap = RefSnapshot.read(repo)
+        assert snap.main_branch() == ("main", _git(repo, "rev-parse", "main"))
+        assert snap.branches["change/a"] == sha
+        assert snap.worktree_head(wts["a"]) == (sha, "change/a")
+        assert snap.worktree_head(wts["b"])[1] == "change/b"
+        assert snap.worktree_head("/nonexistent") is None
+
+    def test_snapshot_detached_head(self, repo_with_worktrees):
+        from wt_orch.git_utils import RefSnapshot
+
+        repo, wts = repo_with_worktrees
+        _git(wts["b"], "checkout", "-q", "--detach")
+        assert RefSnapshot.read(repo).worktree_head(wts["b"])[1] == "HEAD"
+
+    def test_resolve_refs(self, repo_with_worktrees):
+        from wt_orch.git_utils import resolve_refs
+
+        repo, _ = repo_with_worktrees
+        resolved = resolve_refs(["HEAD", "refs/heads/change/a", "refs/heads/nope"], cwd=repo)
+        assert resolved["HEAD"] == _git(repo, "rev-parse", "HEAD")
+        assert resolved["refs/heads/change/a"] == resolved["HEAD"]
+        assert resolved["refs/heads/nope"] == ""
+
+    def test_behind_ahead_cached_by_commit_ids(self, repo_with_worktrees, monkeypatch):
+        import wt_orch.git_utils as git_utils
+
+        repo, wts = repo_with_worktrees
+        main = _commit(repo, "m.txt", "main moves")
+        head = _commit(wts["a"], "a.txt", "work on a")
+        assert git_utils.behind_ahead(main, head, cwd=repo) == (1, 1)
+        monkeypatch.setattr(git_utils, "run_command", lambda *a, **kw: pytest.fail("forked git"))
+        assert git_utils.behind_ahead(main, head, cwd=repo) == (1, 1)
+
+    def test_post_merge_fan_out_forks(self, repo_with_worktrees, monkeypatch):
+        """Syncing N worktrees shares one snapshot; unchanged pairs are cached."""
+        import wt_orch.dispatcher as dispatcher
+        import wt_orch.git_utils as git_utils
+
+        repo, wts = repo_with_worktrees
+        for name, path in wts.items():
+            _commit(path, f"{name}.txt", f"work on {name}")
+        _commit(repo, "m.txt", "main moves")
+        real = git_utils.run_command
+        forks = []
+        monkeypatch.setattr(git_utils, "run_command", lambda cmd, **kw: forks.append(cmd[1]) or real(cmd, **kw))
+
+        refs = git_utils.RefSnapshot.read(repo)
+        results = [dispatcher.sync_worktree_with_main(p, n, refs=refs) for n, p in wts.items()]
+        assert [r.message for r in results] == ["merged", "merged"]
+        assert [r.behind_count for r in results] == [1, 1]
+        assert forks == ["for-each-ref", "worktree", "rev-list", "rev-list"]
+
+        forks.clear()
+        refs = git_utils.RefSnapshot.read(repo)
+        results = [dispatcher.sync_worktree_with_main(p, n, refs=refs) for n, p in wts.items()]
+        assert [r.message for r in results] == ["already up to date"] * 2
+        assert forks == ["for-each-ref", "worktree", "rev-list", "rev-list"]
+
+        forks.clear()
+        refs = git_utils.RefSnapshot.read(repo)
+        for n, p in wts.items():
+            dispatcher.sync_worktree_with_main(p, n, refs=refs)
+        assert forks == ["for-each-ref", "worktree"]
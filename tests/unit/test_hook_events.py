@@ -25,6 +25,7 @@ from wt_hooks.events import (
     _commit_save,
     _extract_agent_summary,
 )
+from wt_hooks.transcript import analyze_for_stop
 from wt_hooks.util import read_cache, write_cache
 
 
@@ -333,3 +334,30 @@ class TestHandleUserPrompt:
         assert result is not None
         parsed = json.loads(result)
         assert "PROJECT MEMORY" in parsed["hookSpecificOutput"]["additionalContext"]
+
+
+# ─── handle_stop ──────────────────────────────────────────────
+
+
+class TestHandleStop:
+    @patch("wt_hooks.events.save_commit_memories", return_value=0)
+    @patch("wt_hooks.events.extract_insights", return_value=0)
+    @patch("wt_hooks.events.flush_metrics")
+    def test_transcript_analyzed_once_and_shared(
+        self, mock_flush, mock_extract, mock_commits, cache_file, tmp_dir
+    ):
+        transcript = os.path.join(tmp_dir, "transcript.jsonl")
+        with open(transcript, "w") as f:
+            f.write(json.dumps({"type": "assistant", "message": {"content": [
+                {"type": "tool_use", "name": "Skill",
+                 "input": {"skill": "opsx:apply", "args": "my-change"}},
+            ]}}) + "\n")
+
+        with patch("wt_hooks.events.analyze_for_stop", wraps=analyze_for_stop) as mock_an:
+            handle_stop({"session_id": "s1", "transcript_path": transcript}, cache_file)
+        mock_an.assert_called_once_with(transcript, cache_file)
+
+        analysis = mock_flush.call_args.kwargs["analysis"]
+        assert mock_extract.call_args.args == (transcript, "my-change")
+        assert mock_extract.call_args.kwargs["entries"] is analysis.insights.entries
+        assert "_transcript" in read_cache(cache_file)
@@ -0,0 +1,43 @@
+"""Tests for wt_hooks.matcher — compiled multi-keyword matching."""
+
+import os
+import random
+import string
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_hooks import matcher as matcher_mod
+from wt_hooks.matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    def test_substring_semantics(self):
+        m = KeywordMatcher(["cache", "Redis", "che", "rollback", "unused"])
+        assert m.find("The caches use REDIS-backed storage") == {"cache", "redis", "che"}
+
+    def test_keywords_with_spaces_and_punctuation(self):
+        m = KeywordMatcher(["merge conflict", "c++", "api"])
+        assert m.find("A Merge Conflict in the C++ API layer") == {"merge conflict", "c++", "api"}
+        assert m.find("merge-conflict") == set()
+
+    def test_empty(self):
+        m = KeywordMatcher([""])
+        assert len(m) == 0
+        assert m.find("anything at all") == set()
+
+    def test_agrees_with_naive_scan(self):
+        rng = random.Random(7)
+        alphabet = string.ascii_lowercase[:6] + "_-"
+        vocab = ["".join(rng.choices(alphabet, k=rng.randint(2, 8))) for _ in range(300)]
+        keywords = rng.sample(vocab, 60) + ["ab cd", "x.y"]
+        m = KeywordMatcher(keywords)
+        for _ in range(50):
+            text = " ".join(rng.choices(vocab + ["AB CD", "X.Y", "!!"], k=40))
+            assert m.find(text) == {k for k in keywords if k in text.lower()}
+
+    def test_memo_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(matcher_mod, "MAX_MEMO_RUNS", 3)
+        m = KeywordMatcher(["abc"])
+        assert m.find("abcd xabc zz yy ww vv") == {"abc"}
+        assert len(m._memo) <= 3
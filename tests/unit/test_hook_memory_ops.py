@@ -14,6 +14,8 @@ from wt_hooks.memory_ops import (
     recall_memories,
     proactive_context,
     load_matching_rules,
+    resolve_project_root,
+    rules_index_path,
     extract_query,
     output_hook_context,
     output_top_context,
@@ -222,3 +224,55 @@ class TestLoadMatchingRules:
         result = load_matching_rules("run the test suite", os.path.dirname(rules_dir))
         assert "Rule one" in result
         assert "Rule two" in result
+
+    def test_rules_recompiled_when_file_changes(self, rules_dir):
+        if not self._write_rules(rules_dir, [
+            {"id": "r1", "topics": ["Deploy", "release notes"], "content": "Tag first"},
+        ]):
+            pytest.skip("yaml not available")
+        root = os.path.dirname(rules_dir)
+        assert "Tag first" in load_matching_rules("Writing the RELEASE NOTES now", root)
+        self._write_rules(rules_dir, [
+            {"id": "r2", "topics": ["migration"], "content": "Back up the DB"},
+            {"id": "r3", "topics": ["deploy"], "content": "Use staging"},
+        ])
+        result = load_matching_rules("deploy the migration", root)
+        assert "Tag first" not in result
+        assert result.index("[r2]") < result.index("[r3]")  # file order kept
+
+    def test_persisted_index_skips_yaml(self, rules_dir, cache_file, monkeypatch):
+        from wt_hooks import memory_ops
+
+        if not self._write_rules(rules_dir, [
+            {"id": "r1", "topics": ["testing"], "content": "Always run tests"}
+        ]):
+            pytest.skip("yaml not available")
+        root = os.path.dirname(rules_dir)
+        assert "Always run tests" in load_matching_rules("testing", root, cache_file)
+        assert os.path.isfile(rules_index_path(cache_file))
+
+        # A fresh process: no in-memory copy, YAML must not be parsed again
+        memory_ops._compiled_rules_cache.clear()
+        monkeypatch.setattr(memory_ops, "_parse_rules", lambda f: pytest.fail("re-parsed"))
+        assert "Always run tests" in load_matching_rules("more testing", root, cache_file)
+
+    def test_rules_index_path(self):
+        assert rules_index_path("/tmp/wt-memory-session-abc.json") == "/tmp/wt-memory-session-abc-rules.json"
+
+
+class TestResolveProjectRoot:
+    def test_resolved_once_per_session(self, cache_file, tmp_dir, monkeypatch):
+        from unittest.mock import patch, MagicMock
+
+        monkeypatch.chdir(tmp_dir)
+        done = MagicMock(returncode=0, stdout="/repo\n")
+        with patch("wt_hooks.memory_ops.subprocess.run", return_value=done) as mock_run:
+            assert resolve_project_root(cache_file) == "/repo"
+            assert resolve_project_root(cache_file) == "/repo"
+        assert mock_run.call_count == 1
+
+    def test_cwd_change_re_resolves(self, cache_file, tmp_dir, monkeypatch):
+        write_cache(cache_file, {"_project_root": {"cwd": "/elsewhere", "root": "/other"}})
+        monkeypatch.chdir(tmp_dir)
+        assert resolve_project_root(cache_file) != "/other"
+        assert read_cache(cache_file)["_project_root"]["cwd"] == os.getcwd()
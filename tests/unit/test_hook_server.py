@@ -0,0 +1,283 @@
+"""Tests for wt_hooks.server (resident hook server) and wt_hooks.shim."""
+
+import io
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_hooks import shim
+from wt_hooks.server import HookServer, serve
+from wt_hooks.util import read_cache
+
+LIB = os.path.join(os.path.dirname(__file__), "..", "..", "lib")
+
+
+@pytest.fixture
+def tmp_dir():
+    # Short path: AF_UNIX socket paths are limited to ~108 bytes
+    d = tempfile.mkdtemp(prefix="wths-", dir="/tmp")
+    yield d
+    shutil.rmtree(d, ignore_errors=True)
+
+
+@pytest.fixture
+def hook_env(tmp_dir):
+    """PATH with a stub wt-memory (healthy, empty recall) and no wt-memoryd."""
+    bin_dir = os.path.join(tmp_dir, "bin")
+    home = os.path.join(tmp_dir, "home")
+    os.makedirs(bin_dir)
+    os.makedirs(home)
+    stub = os.path.join(bin_dir, "wt-memory")
+    with open(stub, "w") as f:
+        f.write('#!/usr/bin/env bash\n[[ "$1" == health ]] && exit 0\necho "[]"\n')
+    os.chmod(stub, 0o755)
+    return {"PATH": bin_dir + ":/usr/local/bin:/usr/bin:/bin", "HOME": home}
+
+
+@pytest.fixture
+def server(tmp_dir):
+    sock = os.path.join(tmp_dir, "hs.sock")
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(LIB))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "wt_hooks.server", "--socket", sock, "--idle-timeout", "30"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while not os.path.exists(sock) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    yield sock
+    proc.send_signal(signal.SIGTERM)
+    proc.wait(timeout=10)
+
+
+def _params(event, payload, cache_file, env, cwd):
+    return {
+        "event": event, "input": payload, "cache_file": cache_file,
+        "cwd": cwd, "env": env, "wt_tools_root": "",
+    }
+
+
+class TestHookServer:
+    def test_runs_event_in_caller_context(self, server, hook_env, tmp_dir):
+        cache_file = os.path.join(tmp_dir, "session.json")
+        for _ in range(2):
+            resp = shim.call_server(server, _params(
+                "UserPromptSubmit", {"prompt": "how does the merge step work?"},
+                cache_file, hook_env, tmp_dir,
+            ))
+            assert resp.get("error") is None
+        assert read_cache(cache_file)["turn_count"] == 2
+
+    def test_gate_blocks_without_memory(self, server, hook_env, tmp_dir):
+        cache_file = os.path.join(tmp_dir, "session.json")
+        env = dict(hook_env, PATH="/usr/bin:/bin")  # no wt-memory at all
+        resp = shim.call_server(server, _params(
+            "UserPromptSubmit", {"prompt": "anything"}, cache_file, env, tmp_dir,
+        ))
+        assert resp["result"] == {"output": None}
+        assert not os.path.exists(cache_file)
+
+    def test_unknown_method(self, server):
+        import socket
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.connect(server)
+        s.sendall(b'{"id": "x", "method": "nope", "params": {}}\n')
+        resp = json.loads(s.makefile().readline())
+        s.close()
+        assert "unknown method" in resp["error"]
+
+    def test_refuses_when_sources_changed(self, tmp_dir):
+        import socket
+        srv = HookServer(os.path.join(tmp_dir, "hs.sock"))
+        a, b = socket.socketpair(socket.AF_UNIX)
+        try:
+            assert srv.verify_request(a, None) is True
+            srv.fingerprint = ()
+            assert srv.verify_request(a, None) is False
+            assert srv._stop is True
+        finally:
+            a.close()
+            b.close()
+            srv.server_close()
+        assert not os.path.exists(os.path.join(tmp_dir, "hs.sock"))
+
+    def test_does_not_remove_replacement_socket(self, tmp_dir):
+        sock = os.path.join(tmp_dir, "hs.sock")
+        old = HookServer(sock)
+        new = HookServer(sock)  # replaces the socket file
+        old.server_close()
+        assert os.path.exists(sock)
+        new.server_close()
+        assert not os.path.exists(sock)
+
+    def test_refuses_foreign_peer(self, tmp_dir, monkeypatch):
+        import socket
+
+        from wt_hooks import server as server_mod
+        srv = HookServer(os.path.join(tmp_dir, "hs.sock"))
+        a, b = socket.socketpair(socket.AF_UNIX)
+        monkeypatch.setattr(server_mod, "peer_uid", lambda conn: os.getuid() + 1)
+        try:
+            assert srv.verify_request(a, None) is False
+            assert srv.events_served == 0
+        finally:
+            a.close()
+            b.close()
+            srv.server_close()
+
+    def test_socket_is_private_and_not_hijackable(self, tmp_dir):
+        import stat as st
+        sock = os.path.join(tmp_dir, "hs.sock")
+        srv = HookServer(sock)
+        try:
+            assert st.S_IMODE(os.lstat(sock).st_mode) == 0o600
+        finally:
+            srv.server_close()
+        # A non-socket squatting on the path is left alone, not unlinked
+        with open(sock, "w") as f:
+            f.write("x")
+        with pytest.raises(PermissionError):
+            HookServer(sock)
+        assert os.path.exists(sock)
+
+    def test_default_dir_created_private(self, tmp_dir, monkeypatch):
+        from wt_hooks import server as server_mod
+        monkeypatch.delenv("WT_HOOK_SERVER_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", tmp_dir)
+        sock = server_mod.socket_path()
+        assert sock == os.path.join(tmp_dir, "wt-hook-server", "server.sock")
+        assert shim.socket_path() == sock
+        server_mod.ensure_private_dir(sock)
+        assert os.stat(os.path.dirname(sock)).st_mode & 0o777 == 0o700
+        os.chmod(os.path.dirname(sock), 0o755)
+        with pytest.raises(PermissionError):
+            server_mod.ensure_private_dir(sock)
+        assert serve(sock, idle_timeout=1) == 1
+
+    def test_second_server_exits_while_locked(self, tmp_dir):
+        import fcntl
+        sock = os.path.join(tmp_dir, "hs.sock")
+        with open(sock + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            assert serve(sock, idle_timeout=1) == 0
+        assert not os.path.exists(sock)
+
+
+class TestShim:
+    def _run(self, monkeypatch, payload, argv=("shim", "PostToolUse")):
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(json.dumps(payload).encode())))
+        out = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", out)
+        rc = shim.main(list(argv))
+        return rc, out.getvalue()
+
+    def test_forwards_to_server(self, monkeypatch, tmp_dir):
+        calls = []
+
+        def fake_call(sock, params):
+            calls.append(params)
+            return {"id": "1", "result": {"output": '{"ok": true}'}}
+
+        monkeypatch.setattr(shim, "call_server", fake_call)
+        monkeypatch.setenv("WT_HOOK_SERVER_SOCKET", os.path.join(tmp_dir, "hs.sock"))
+        rc, out = self._run(monkeypatch, {"session_id": "abc", "tool_name": "Read"})
+        assert rc == 0
+        assert out.strip() == '{"ok": true}'
+        assert calls[0]["cache_file"] == "/tmp/wt-memory-session-abc.json"
+        assert calls[0]["cwd"] == os.getcwd()
+        assert calls[0]["env"]["WT_HOOK_SERVER_SOCKET"].endswith("hs.sock")
+
+    def test_forwards_env_without_secrets(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-secret")
+        monkeypatch.setenv("GITHUB_TOKEN", "ghp-secret")
+        monkeypatch.setenv("WT_API_TOKEN", "secret")
+        monkeypatch.setenv("WT_HOOK_DEBUG", "1")
+        monkeypatch.setenv("CLAUDE_PROJECT_DIR", "/proj")
+        monkeypatch.setenv("CLAUDE_CODE_ENTRYPOINT", "cli")
+        monkeypatch.setenv("PYENV_VERSION", "3.12.1")
+        monkeypatch.setenv("CONDA_PREFIX", "/opt/conda")
+        monkeypatch.setenv("GIT_AUTHOR_NAME", "dev")
+        env = shim.forwarded_env()
+        for name in ("WT_HOOK_DEBUG", "CLAUDE_PROJECT_DIR", "CLAUDE_CODE_ENTRYPOINT",
+                     "PYENV_VERSION", "CONDA_PREFIX", "GIT_AUTHOR_NAME", "PATH"):
+            assert env[name] == os.environ[name]
+        for secret in ("ANTHROPIC_API_KEY", "GITHUB_TOKEN", "WT_API_TOKEN"):
+            assert secret not in env
+
+    def test_untrusted_socket_not_contacted(self, monkeypatch, tmp_dir):
+        # A plain file (or another user's socket) at the path is refused
+        sock = os.path.join(tmp_dir, "hs.sock")
+        with open(sock, "w") as f:
+            f.write("")
+        with pytest.raises(PermissionError):
+            shim.call_server(sock, {})
+        monkeypatch.delenv("WT_HOOK_SERVER_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", tmp_dir)
+        shared = os.path.join(tmp_dir, "wt-hook-server")
+        os.mkdir(shared, 0o777)
+        os.chmod(shared, 0o777)
+        srv = HookServer(os.path.join(shared, "server.sock"))
+        try:
+            with pytest.raises(PermissionError):
+                shim.call_server(shim.socket_path(), {})
+        finally:
+            srv.server_close()
+
+    def test_falls_back_in_process_without_server(self, monkeypatch, tmp_dir):
+        local = []
+        monkeypatch.setenv("WT_HOOK_SERVER_SOCKET", os.path.join(tmp_dir, "missing.sock"))
+        monkeypatch.setattr(shim, "run_local", lambda *a: local.append(a) or "local-out")
+        rc, out = self._run(monkeypatch, {})
+        assert rc == 0
+        assert out.strip() == "local-out"
+        assert local[0][0] == "PostToolUse"
+        assert local[0][2] == "/tmp/wt-memory-session-unknown.json"
+
+    def test_server_and_fallback_see_same_env(self, server, hook_env, tmp_dir):
+        # The stub wt-memory records the environment the event runs in
+        dump = os.path.join(tmp_dir, "env.json")
+        with open(os.path.join(tmp_dir, "bin", "wt-memory"), "w") as f:
+            f.write(f'#!/usr/bin/env bash\n"{sys.executable}" -c '
+                    f'"import json, os; json.dump(dict(os.environ), open(\'{dump}\', \'w\'))"\n'
+                    f'[[ "$1" == health ]] && exit 0\necho "[]"\n')
+        caller = dict(
+            hook_env, PYTHONPATH=os.path.abspath(LIB), PYENV_VERSION="3.12.1",
+            CONDA_PREFIX="/opt/conda", GIT_AUTHOR_NAME="dev",
+            CLAUDE_CODE_ENTRYPOINT="cli", ANTHROPIC_API_KEY="sk-secret",
+        )
+        # Never start a real server from the fallback path
+        code = ("import sys; from wt_hooks import server, shim; "
+                "server.spawn = lambda *a: None; sys.exit(shim.main(['shim', 'PostToolUse']))")
+
+        def event_env(sock):
+            subprocess.run(
+                [sys.executable, "-c", code], input=b"{}", cwd=tmp_dir, timeout=30, check=True,
+                env=dict(caller, WT_HOOK_SERVER_SOCKET=sock),
+            )
+            with open(dump) as f:
+                env = json.load(f)
+            os.unlink(dump)
+            del env["WT_HOOK_SERVER_SOCKET"]
+            return env
+
+        via_server = event_env(server)
+        via_fallback = event_env(os.path.join(tmp_dir, "missing.sock"))
+        assert via_server == via_fallback
+        assert via_server["PYENV_VERSION"] == "3.12.1"
+        assert via_server["CLAUDE_CODE_ENTRYPOINT"] == "cli"
+        assert "ANTHROPIC_API_KEY" not in via_server
+
+    def test_server_error_is_reported(self, monkeypatch, capsys):
+        monkeypatch.setattr(shim, "call_server", lambda s, p: {"id": "1", "error": "boom"})
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(b"not json")))
+        assert shim.main(["shim", "Stop"]) == 1
+        assert "boom" in capsys.readouterr().err
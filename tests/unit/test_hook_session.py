@@ -1,10 +1,12 @@
 """Tests for wt_hooks.session — dedup cycle, cache round-trip, turn counter."""
 
 import json
+import multiprocessing
 import os
 import sys
 import tempfile
 import shutil
+from unittest.mock import patch
 
 import pytest
 
@@ -21,8 +23,10 @@ from wt_hooks.session import (
     get_turn_count,
     get_last_checkpoint_turn,
     set_last_checkpoint_turn,
+    store_injected_content,
 )
-from wt_hooks.util import read_cache, write_cache
+from wt_hooks import util
+from wt_hooks.util import SessionCache, metrics_append, read_cache, session_cache, write_cache
 
 
 @pytest.fixture
@@ -177,3 +181,113 @@ class TestCacheRoundTrip:
         write_cache(cache_file, {"b": 2})
         loaded = read_cache(cache_file)
         assert loaded == {"b": 2}
+
+
+# ─── session cache (one load, one commit) ─────────────────────
+
+
+def _add_keys(cache_file, prefix, n):
+    for i in range(n):
+        with session_cache(cache_file):
+            dedup_add(cache_file, f"{prefix}-{i}")
+            gen_context_id(cache_file)
+
+
+class TestSessionCache:
+    def test_one_load_one_write(self, cache_file):
+        write_cache(cache_file, {"turn_count": 1})
+        with patch("wt_hooks.util._load_cache", wraps=util._load_cache) as load, \
+                patch("wt_hooks.util._store_cache", wraps=util._store_cache) as store, \
+                patch.object(util, "METRICS_ENABLED", True):
+            with session_cache(cache_file):
+                key = make_dedup_key("PostToolUse", "Read", "x.py")
+                assert not dedup_check(cache_file, key)
+                dedup_add(cache_file, key)
+                cid = gen_context_id(cache_file)
+                store_injected_content(cache_file, cid, "content", metrics_enabled=True)
+                increment_turn(cache_file)
+                metrics_append(cache_file, "L2", "PostToolUse", "x.py")
+                assert not os.path.exists(cache_file + ".lock")  # nothing written yet
+            # initial load + re-read under the lock at commit
+            assert load.call_count == 2
+            assert store.call_count == 1
+        cache = read_cache(cache_file)
+        assert cache[key] == 1
+        assert cache["turn_count"] == 2
+        assert cache["_injected_content"] == {cid: "content"}
+        assert len(cache["_metrics"]) == 1
+
+    def test_no_write_when_unchanged(self, cache_file):
+        write_cache(cache_file, {"turn_count": 3})
+        with patch("wt_hooks.util._store_cache") as store:
+            with session_cache(cache_file):
+                assert get_turn_count(cache_file) == 3
+        store.assert_not_called()
+
+    def test_nested_sessions_share_state(self, cache_file):
+        with session_cache(cache_file) as outer:
+            with session_cache(cache_file) as inner:
+                dedup_add(cache_file, "k")
+            assert inner is outer
+            assert not os.path.exists(cache_file)
+        assert read_cache(cache_file)["k"] == 1
+
+    def test_parallel_sessions_merge(self, cache_file):
+        write_cache(cache_file, {"_metrics": [{"n": 0}], "_used_context_ids": ["aaaa"]})
+        a, b = SessionCache(cache_file), SessionCache(cache_file)
+        a.data["key-a"] = 1
+        a.data["_metrics"].append({"n": "a"})
+        a.data["_used_context_ids"].append("bbbb")
+        a.data.setdefault("_injected_content", {})["bbbb"] = "from a"
+        b.data["key-b"] = 1
+        b.data["_metrics"].append({"n": "b"})
+        b.data["_used_context_ids"].append("cccc")
+        b.data.setdefault("_injected_content", {})["cccc"] = "from b"
+        a.commit()
+        b.commit()
+        cache = read_cache(cache_file)
+        assert cache["key-a"] == cache["key-b"] == 1
+        assert cache["_metrics"] == [{"n": 0}, {"n": "a"}, {"n": "b"}]
+        assert cache["_used_context_ids"] == ["aaaa", "bbbb", "cccc"]
+        assert cache["_injected_content"] == {"bbbb": "from a", "cccc": "from b"}
+
+    def test_removal_keeps_concurrent_additions(self, cache_file):
+        write_cache(cache_file, {"old-key": 1, "turn_count": 4, "_metrics": [{"n": 1}]})
+        stop = SessionCache(cache_file)
+        other = SessionCache(cache_file)
+        other.data["new-key"] = 1
+        other.data["_metrics"].append({"n": 2})
+        other.commit()
+        # Stop: drop flushed metrics and clear dedup keys
+        stop.data.pop("_metrics")
+        stop.data.pop("old-key")
+        stop.commit()
+        cache = read_cache(cache_file)
+        assert "old-key" not in cache
+        assert cache["new-key"] == 1
+        assert cache["turn_count"] == 4
+        assert cache["_metrics"] == [{"n": 2}]
+
+    def test_metrics_cap_on_merge(self, cache_file):
+        write_cache(cache_file, {"_metrics": [{"n": i} for i in range(util.METRICS_CAP - 1)]})
+        a, b = SessionCache(cache_file), SessionCache(cache_file)
+        a.data["_metrics"].append({"n": "a"})
+        b.data["_metrics"].append({"n": "b"})
+        a.commit()
+        b.commit()
+        assert len(read_cache(cache_file)["_metrics"]) == util.METRICS_CAP
+
+    def test_concurrent_processes(self, cache_file):
+        procs = [
+            multiprocessing.get_context("fork").Process(target=_add_keys, args=(cache_file, f"p{p}", 15))
+            for p in range(4)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(timeout=30)
+        cache = read_cache(cache_file)
+        for p in range(4):
+            for i in range(15):
+                assert cache.get(f"p{p}-{i}") == 1
+        assert len(cache["_used_context_ids"]) == 60
@@ -0,0 +1,157 @@
+"""Tests for wt_hooks.transcript — single-pass, resumable Stop analysis."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_hooks.session import dedup_clear
+from wt_hooks.transcript import (
+    STATE_KEY,
+    AssistantTextCollector,
+    ChangeNameCollector,
+    InsightCollector,
+    TranscriptVisitor,
+    analyze,
+    analyze_for_stop,
+)
+from wt_hooks.util import read_cache, write_cache
+
+SUMMARY = "## Summary\n\n" + "Implementation complete. " * 20
+
+
+@pytest.fixture
+def tmp_dir():
+    d = tempfile.mkdtemp()
+    yield d
+    shutil.rmtree(d, ignore_errors=True)
+
+
+@pytest.fixture
+def cache_file(tmp_dir):
+    return os.path.join(tmp_dir, "session-cache.json")
+
+
+@pytest.fixture
+def transcript_file(tmp_dir):
+    return os.path.join(tmp_dir, "transcript.jsonl")
+
+
+def _assistant(*blocks):
+    return {"type": "assistant", "message": {"content": list(blocks)}}
+
+
+def _text(text):
+    return {"type": "text", "text": text}
+
+
+def _skill(skill, args):
+    return {"type": "tool_use", "name": "Skill", "input": {"skill": skill, "args": args}}
+
+
+def _append(path, *entries, newline=True):
+    with open(path, "a") as f:
+        for i, e in enumerate(entries):
+            f.write(json.dumps(e))
+            if newline or i < len(entries) - 1:
+                f.write("\n")
+
+
+class TestAnalyze:
+    def test_one_pass_feeds_all_visitors(self, transcript_file):
+        _append(
+            transcript_file,
+            {"type": "user", "message": {"content": "go"}},
+            _assistant(_skill("opsx:apply", "add-cache --fast"), _text(SUMMARY)),
+            {"type": "tool_result", "content": "Traceback: " + "x" * 60},
+            {"type": "progress", "data": "ignored"},
+        )
+        insights, changes, texts = InsightCollector(), ChangeNameCollector(), AssistantTextCollector()
+        offset, turn = analyze(transcript_file, [insights, changes, texts])
+
+        assert offset == os.path.getsize(transcript_file)
+        assert turn == 2
+        assert [e["content"][:7] for e in insights.entries] == ["## Summ", "[Error]"]
+        assert changes.change_name == "add-cache"
+        assert texts.messages == [{"turn": 2, "texts": [SUMMARY]}]
+
+    def test_torn_last_line_held_back(self, transcript_file):
+        _append(transcript_file, _assistant(_text("one")))
+        complete = os.path.getsize(transcript_file)
+        _append(transcript_file, _assistant(_text("two")), newline=False)
+
+        texts = AssistantTextCollector()
+        offset, _ = analyze(transcript_file, [texts])
+        assert offset == complete
+        assert [m["texts"] for m in texts.messages] == [["one"]]
+
+        final = AssistantTextCollector()
+        analyze(transcript_file, [final], final=True)
+        assert len(final.messages) == 2
+
+    def test_missing_file(self):
+        assert analyze("/tmp/nonexistent-transcript.jsonl", [], offset=7, turn=3) == (7, 3)
+
+    def test_visitor_must_implement_visit(self):
+        class NoVisit(TranscriptVisitor):
+            pass
+
+        with pytest.raises(TypeError):
+            NoVisit()
+
+
+class TestAnalyzeForStop:
+    def test_resumes_from_saved_offset(self, transcript_file, cache_file):
+        _append(transcript_file, _assistant(_skill("openspec-archive", "zeta"), _text(SUMMARY)))
+        first = analyze_for_stop(transcript_file, cache_file)
+        assert len(first.insights.entries) == 1
+        assert first.change_name == "zeta"
+
+        _append(transcript_file, {"type": "user", "message": {"content": "more"}},
+                _assistant(_skill("opsx:apply", "alpha"), _text("From memory: short")))
+        second = analyze_for_stop(transcript_file, cache_file)
+        assert second.insights.entries == []  # summary not extracted twice
+        assert [m["turn"] for m in second.messages] == [3]
+        assert second.change_name == "alpha"  # names accumulate across Stops
+
+        state = read_cache(cache_file)[STATE_KEY]
+        assert state["offset"] == os.path.getsize(transcript_file)
+        assert state["changes"] == ["alpha", "zeta"]
+
+    def test_restarts_when_transcript_replaced(self, transcript_file, cache_file):
+        _append(transcript_file, _assistant(_text(SUMMARY)))
+        analyze_for_stop(transcript_file, cache_file)
+        os.unlink(transcript_file)  # the new file may get the same inode
+        _append(transcript_file, _assistant(_text(SUMMARY.replace("Summary", "Decision"))))
+
+        again = analyze_for_stop(transcript_file, cache_file)
+        assert len(again.insights.entries) == 1
+
+    def test_restarts_when_truncated(self, transcript_file, cache_file):
+        write_cache(cache_file, {STATE_KEY: {
+            "path": transcript_file, "ino": None, "offset": 10 ** 6, "head": None,
+            "turn": 50, "changes": ["old"],
+        }})
+        _append(transcript_file, _assistant(_text(SUMMARY)))
+        st = os.stat(transcript_file)
+        cache = read_cache(cache_file)
+        cache[STATE_KEY]["ino"] = st.st_ino
+        write_cache(cache_file, cache)
+
+        analysis = analyze_for_stop(transcript_file, cache_file)
+        assert analysis.messages[0]["turn"] == 1
+        assert analysis.change_name == "unknown"
+
+    def test_missing_transcript(self, cache_file):
+        assert analyze_for_stop("/tmp/nonexistent-transcript.jsonl", cache_file) is None
+
+    def test_state_survives_dedup_clear(self, transcript_file, cache_file):
+        _append(transcript_file, _assistant(_text("hello")))
+        analyze_for_stop(transcript_file, cache_file)
+        dedup_clear(cache_file)
+        assert STATE_KEY in read_cache(cache_file)
@@ -0,0 +1,110 @@
+"""Tests for wt_orch.http_cache: ETags and the stat-validated response cache."""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_orch.http_cache import BrotliMiddleware, ResponseCache, accepts_br, etag_for, etag_matches
+
+
+def test_etag_matching():
+    etag = etag_for(b"{}")
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert etag_for(b"{}") != etag_for(b"[]")
+
+
+def test_response_cache_validates_by_stat(tmp_path):
+    cache = ResponseCache()
+    f = tmp_path / "state.json"
+    f.write_text("{}")
+    old = time.time() - 60
+    os.utime(f, (old, old))
+    etag = cache.store(("k",), [f, tmp_path / "missing"], b"{}", time.time())
+    assert cache.lookup(("k",)).etag == etag
+
+    # Missing dependency appearing invalidates too
+    (tmp_path / "missing").write_text("")
+    assert cache.lookup(("k",)) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_response_cache_skips_racy_inputs(tmp_path):
+    cache = ResponseCache()
+    f = tmp_path / "state.json"
+    f.write_text("{}")
+    cache.store(("k",), [f], b"{}", time.time())
+    assert cache.lookup(("k",)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_response_cache_lru(tmp_path):
+    cache = ResponseCache(max_entries=2)
+    built = time.time()
+    for key in ("a", "b", "c"):
+        cache.store((key,), [], b"x", built)
+    assert cache.lookup(("a",)) is None
+    assert cache.lookup(("c",)) is not None
+
+
+def test_accepts_br():
+    assert accepts_br("gzip, deflate, br")
+    assert accepts_br("br;q=0.5, gzip")
+    assert not accepts_br("br;q=0, gzip")
+    assert not accepts_br("gzip, deflate")
+    assert not accepts_br("")
+
+
+def test_brotli_middleware_negotiates_and_streams():
+    brotli = pytest.importorskip("brotli")
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.middleware.gzip import GZipMiddleware
+    from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+
+    big = {"lines": ["state line"] * 500}
+
+    async def stream():
+        for i in range(3):
+            yield f"chunk {i}\n" * 300
+
+    app = Starlette(
+        routes=[
+            Route("/big", lambda r: JSONResponse(big)),
+            Route("/small", lambda r: PlainTextResponse("ok")),
+            Route("/stream", lambda r: StreamingResponse(stream(), media_type="text/plain")),
+        ],
+        middleware=[
+            Middleware(BrotliMiddleware, minimum_size=100),
+            Middleware(GZipMiddleware, minimum_size=100),
+        ],
+    )
+    client = TestClient(app)
+
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["content-encoding"] == "br"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    assert resp.json() == big
+    with client.stream("GET", "/big", headers={"Accept-Encoding": "br"}) as raw:
+        body = b"".join(raw.iter_raw())
+    assert int(raw.headers["content-length"]) == len(body)
+    assert json.loads(brotli.decompress(body)) == big
+
+    assert client.get("/big", headers={"Accept-Encoding": "gzip, br;q=0"}).headers[
+        "content-encoding"] == "gzip"
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "br"}).headers
+
+    resp = client.get("/stream", headers={"Accept-Encoding": "br"})
+    assert resp.headers["content-encoding"] == "br"
+    assert resp.text == "".join(f"chunk {i}\n" * 300 for i in range(3))
@@ -0,0 +1,93 @@
+"""Tests for wt_orch.io_pool: bounded blocking pool and loop-lag monitor."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_orch.io_pool import BlockingPool, LoopLagMonitor
+
+
+def _run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+class TestBlockingPool:
+    def test_runs_off_the_loop_thread(self):
+        pool = BlockingPool(workers=2, per_project=1)
+        loop_thread = threading.get_ident()
+        worker = _run(pool.run("p", threading.get_ident))
+        assert worker != loop_thread
+        pool.shutdown()
+
+    def test_per_project_limit(self):
+        pool = BlockingPool(workers=8, per_project=2)
+        lock = threading.Lock()
+        running = {"a": 0, "b": 0}
+        peak = {"a": 0, "b": 0}
+
+        def work(project):
+            with lock:
+                running[project] += 1
+                peak[project] = max(peak[project], running[project])
+            time.sleep(0.05)
+            with lock:
+                running[project] -= 1
+            return project
+
+        async def scenario():
+            calls = [pool.run(p, work, p) for p in ["a"] * 6 + ["b"] * 3]
+            return await asyncio.gather(*calls)
+
+        assert _run(scenario()) == ["a"] * 6 + ["b"] * 3
+        assert peak == {"a": 2, "b": 2}
+        stats = pool.stats()["projects"]
+        assert stats["a"]["calls"] == 6
+        assert stats["a"]["running"] == 0 and stats["a"]["waiting"] == 0
+        assert stats["a"]["wait_max_ms"] > 0
+        pool.shutdown()
+
+    def test_exception_propagates_and_frees_slot(self):
+        pool = BlockingPool(workers=1, per_project=1)
+
+        def boom():
+            raise ValueError("nope")
+
+        with pytest.raises(ValueError):
+            _run(pool.run("p", boom))
+        # Works again on another loop after the failure
+        assert _run(pool.run("p", lambda: 42)) == 42
+        pool.shutdown()
+        assert _run(pool.run("p", lambda: 7)) == 7
+        pool.shutdown()
+
+
+class TestLoopLagMonitor:
+    def test_record_counts_stalls(self):
+        mon = LoopLagMonitor(interval=0.1, warn_secs=0.2)
+        mon.record(0.01)
+        mon.record(0.5)
+        d = mon.as_dict()
+        assert d["samples"] == 2
+        assert d["stalls"] == 1
+        assert d["max_ms"] == 500.0
+        assert d["last_stall"] is not None
+
+    def test_detects_blocking_call(self):
+        mon = LoopLagMonitor(interval=0.02, warn_secs=0.1)
+
+        async def scenario():
+            mon.start()
+            await asyncio.sleep(0.05)
+            time.sleep(0.2)  # blocks the loop
+            await asyncio.sleep(0.05)
+            await mon.stop()
+
+        _run(scenario())
+        assert mon.stalls >= 1
+        assert mon.max_ms >= 100
@@ -0,0 +1,103 @@
+"""Tests for wt_orch.json_patch — state diffing for WebSocket streaming."""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_orch.json_patch import PatchError, apply_patch, make_patch
+
+
+def _state(n_changes: int) -> dict:
+    return {
+        "status": "running",
+        "merge_queue": [],
+        "changes": [
+            {"name": f"c{i}", "status": "pending", "tokens_used": 0, "logs": []}
+            for i in range(n_changes)
+        ],
+    }
+
+
+class TestMakePatch:
+    def test_identical_is_empty(self):
+        assert make_patch(_state(3), _state(3)) == []
+
+    def test_single_field_change(self):
+        old, new = _state(100), _state(100)
+        new["changes"][42]["status"] = "running"
+        assert make_patch(old, new) == [
+            {"op": "replace", "path": "/changes/42/status", "value": "running"},
+        ]
+
+    def test_list_append_and_truncate(self):
+        old, new = _state(2), _state(2)
+        new["merge_queue"] = ["c0", "c1"]
+        assert make_patch(old, new) == [
+            {"op": "add", "path": "/merge_queue/0", "value": "c0"},
+            {"op": "add", "path": "/merge_queue/1", "value": "c1"},
+        ]
+        assert make_patch(new, old) == [
+            {"op": "remove", "path": "/merge_queue/1"},
+            {"op": "remove", "path": "/merge_queue/0"},
+        ]
+
+    def test_keys_are_escaped(self):
+        ops = make_patch({}, {"a/b": 1, "m~n": 2})
+        assert [op["path"] for op in ops] == ["/a~1b", "/m~0n"]
+        assert apply_patch({}, ops) == {"a/b": 1, "m~n": 2}
+
+    def test_bool_vs_int_is_a_change(self):
+        assert make_patch({"x": [1]}, {"x": [True]}) == [{"op": "replace", "path": "/x/0", "value": True}]
+
+    def test_random_round_trip(self):
+        rng = random.Random(7)
+
+        def mutate(doc):
+            doc = json.loads(json.dumps(doc))
+            for _ in range(rng.randint(1, 6)):
+                choice = rng.random()
+                if choice < 0.4 and doc["changes"]:
+                    c = rng.choice(doc["changes"])
+                    c["status"] = rng.choice(["running", "done", "merged"])
+                    c["tokens_used"] = c.get("tokens_used", 0) + rng.randint(1, 1000)
+                elif choice < 0.6:
+                    doc["changes"].append({"name": f"n{rng.random()}", "status": "pending"})
+                elif choice < 0.7 and doc["changes"]:
+                    del doc["changes"][rng.randrange(len(doc["changes"]))]
+                elif choice < 0.85:
+                    doc["merge_queue"] = [c["name"] for c in doc["changes"][: rng.randint(0, 3)]]
+                elif doc["changes"]:
+                    c = rng.choice(doc["changes"])
+                    c.pop("logs", None) if "logs" in c else c.setdefault("logs", ["a.log"])
+            return doc
+
+        doc = _state(10)
+        for _ in range(200):
+            new = mutate(doc)
+            assert apply_patch(doc, make_patch(doc, new)) == new
+            doc = new
+
+
+class TestApplyPatch:
+    def test_does_not_modify_input(self):
+        doc = _state(1)
+        apply_patch(doc, [{"op": "replace", "path": "/status", "value": "done"}])
+        assert doc["status"] == "running"
+
+    def test_append_with_dash(self):
+        assert apply_patch({"q": [1]}, [{"op": "add", "path": "/q/-", "value": 2}]) == {"q": [1, 2]}
+
+    @pytest.mark.parametrize("op", [
+        {"op": "replace", "path": "/missing", "value": 1},
+        {"op": "remove", "path": "/changes/5"},
+        {"op": "add", "path": "/changes/x/status", "value": 1},
+        {"op": "remove", "path": ""},
+    ])
+    def test_mismatched_patch_raises(self, op):
+        with pytest.raises(PatchError):
+            apply_patch(_state(1), [op])
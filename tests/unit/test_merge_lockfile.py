@@ -14,6 +14,7 @@ from unittest.mock import MagicMock, patch
 
 from wt_orch.merger import _post_merge_deps_install
 from wt_orch.dispatcher import SyncResult
+from wt_orch.git_utils import RefSnapshot
 from wt_orch.profile_loader import reset_cache as reset_profile_cache
 
 
@@ -138,19 +139,18 @@ class TestSyncWorktreeLockfileRegen:
 
         wt_path = "/fake/worktree"
 
-        # Setup mock responses for the sync flow:
-        # 1. show-ref main -> success
-        # 2. show-ref master -> not needed (main found)
-        # 3. rev-parse HEAD -> wt branch
-        # 4. rev-parse main -> main sha
-        # 5. merge-base -> merge_base sha
-        # 6. rev-list --count -> behind count
-        # 7. merge main -> conflict (exit 1)
-        # 8. diff --name-only --diff-filter=U -> conflicted files
-        # 9-10. checkout --ours + add for each file
-        # 11. install command
-        # 12. add regenerated file
-        # 13. commit
+        # Refs come from a RefSnapshot (main tip + worktree HEAD) and the
+        # behind count from behind_ahead(); mock git responses for the rest:
+        # 1. merge main -> conflict (exit 1)
+        # 2. diff --name-only --diff-filter=U -> conflicted files
+        # 3-4. checkout --ours + add for each file
+        # 5. install command
+        # 6. add regenerated file
+        # 7. commit
+        refs = RefSnapshot(
+            branches={"main": "abc123"},
+            worktrees={os.path.realpath(wt_path): ("def456", "change/test-feature")},
+        )
 
         call_count = {"n": 0}
 
@@ -163,19 +163,7 @@ class TestSyncWorktreeLockfileRegen:
             result.stdout = ""
 
             # Map based on first git arg
-            if cmd == "show-ref":
-                # First call for "main" branch
-                result.exit_code = 0
-            elif cmd == "rev-parse":
-                if "--abbrev-ref" in args:
-                    result.stdout = "change/test-feature"
-                else:
-                    result.stdout = "abc123"
-            elif cmd == "merge-base":
-                result.stdout = "base123"
-            elif cmd == "rev-list":
-                result.stdout = "3"
-            elif cmd == "merge":
+            if cmd == "merge":
                 if "--abort" not in args:
                     result.exit_code = 1  # merge conflict
             elif cmd == "diff":
@@ -194,12 +182,14 @@ class TestSyncWorktreeLockfileRegen:
         # Mock install command
         mock_run_cmd.return_value = MagicMock(exit_code=0)
 
-        with patch("wt_orch.profile_loader.load_profile", return_value=NullProfile()):
-            result = sync_worktree_with_main(wt_path, "test-feature")
+        with patch("wt_orch.profile_loader.load_profile", return_value=NullProfile()), \
+                patch("wt_orch.dispatcher.behind_ahead", return_value=(3, 1)):
+            result = sync_worktree_with_main(wt_path, "test-feature", refs=refs)
 
         assert result.ok is True
         assert result.auto_resolved is True
         assert result.lockfile_regenerated is True
+        assert result.behind_count == 3
 
         # Verify install was called
         install_calls = [
@@ -216,6 +206,10 @@ class TestSyncWorktreeLockfileRegen:
         from wt_orch.profile_loader import NullProfile
 
         wt_path = "/fake/worktree"
+        refs = RefSnapshot(
+            branches={"main": "abc123"},
+            worktrees={os.path.realpath(wt_path): ("def456", "change/test-feature")},
+        )
 
         def git_side_effect(*args, **kwargs):
             result = MagicMock()
@@ -223,16 +217,7 @@ class TestSyncWorktreeLockfileRegen:
             result.stdout = ""
 
             cmd = args[0] if args else ""
-            if cmd == "rev-parse":
-                if "--abbrev-ref" in args:
-                    result.stdout = "change/test-feature"
-                else:
-                    result.stdout = "abc123"
-            elif cmd == "merge-base":
-                result.stdout = "base123"
-            elif cmd == "rev-list":
-                result.stdout = "2"
-            elif cmd == "merge":
+            if cmd == "merge":
                 if "--abort" not in args:
                     result.exit_code = 1
             elif cmd == "diff":
@@ -242,8 +227,9 @@ class TestSyncWorktreeLockfileRegen:
 
         mock_run_git.side_effect = git_side_effect
 
-        with patch("wt_orch.profile_loader.load_profile", return_value=NullProfile()):
-            result = sync_worktree_with_main(wt_path, "test-feature")
+        with patch("wt_orch.profile_loader.load_profile", return_value=NullProfile()), \
+                patch("wt_orch.dispatcher.behind_ahead", return_value=(2, 0)):
+            result = sync_worktree_with_main(wt_path, "test-feature", refs=refs)
 
         assert result.ok is True
         assert result.auto_resolved is True
@@ -18,6 +18,7 @@ from wt_orch.planner import (
     build_decomposition_context,
     check_scope_overlap,
     check_triage_gate,
+    collect_replan_context,
     detect_test_infra,
     enrich_plan_metadata,
     estimate_tokens,
@@ -505,6 +506,36 @@ class TestEnrichPlanMetadata:
         assert "feature-b" in feature_a["depends_on"]
 
 
+# ─── collect_replan_context ─────────────────────────────────────────
+
+
+class TestCollectReplanContext:
+    def test_sees_journaled_updates(self, tmp_dir, monkeypatch):
+        from wt_orch.state import update_change_field, update_state_field
+
+        monkeypatch.setenv("WT_STATE_JOURNAL", "1")
+        state_path = os.path.join(tmp_dir, "state.json")
+        with open(state_path, "w") as f:
+            json.dump({"changes": [
+                {"name": "add-auth", "status": "done", "roadmap_item": "Auth"},
+                {"name": "fix-login", "status": "running", "roadmap_item": "Login"},
+            ]}, f)
+        update_change_field(state_path, "fix-login", "status", "done")
+        update_state_field(state_path, "phase_e2e_failure_context", "login spec failed")
+        # The updates live only in the journal
+        with open(state_path) as f:
+            assert json.load(f)["changes"][1]["status"] == "running"
+
+        ctx = collect_replan_context(state_path)
+        assert ctx["completed_names"] == "add-auth, fix-login"
+        assert ctx["completed_roadmap"] == "Auth; Login"
+        assert "login spec failed" in ctx["e2e_failures"]
+
+    def test_unreadable_state(self, tmp_dir):
+        ctx = collect_replan_context(os.path.join(tmp_dir, "missing.json"))
+        assert ctx["completed_names"] == ""
+
+
 # ─── build_decomposition_context ────────────────────────────────────
 
 
@@ -23,6 +23,7 @@ from wt_orch.state import (
     all_phase_changes_terminal,
     apply_phase_overrides,
     cascade_failed_deps,
+    compact_state,
     count_changes_by_status,
     deps_failed,
     deps_satisfied,
@@ -33,9 +34,13 @@ from wt_orch.state import (
     load_state,
     locked_state,
     query_changes,
+    read_state_data,
     reconstruct_state_from_events,
     run_hook,
     save_state,
+    state_io_counters,
+    state_transaction,
+    StateTransaction,
     topological_sort,
     update_change_field,
     update_state_field,
@@ -795,6 +800,198 @@ class TestReconstructState:
         assert result is False
 
 
+# ─── State Journal ───────────────────────────────────────────────────
+
+
+@pytest.fixture
+def journal_mode(monkeypatch):
+    monkeypatch.setenv("WT_STATE_JOURNAL", "1")
+
+
+class TestStateJournal:
+    def test_update_appends_instead_of_rewriting(self, state_file, journal_mode):
+        before = os.stat(state_file)
+        update_change_field(state_file, "add-auth", "status", "running")
+        update_state_field(state_file, "status", "checkpoint")
+
+        after = os.stat(state_file)
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+        with open(state_file + ".journal") as f:
+            lines = [json.loads(l) for l in f]
+        assert "base" in lines[0]
+        assert lines[1:] == [
+            {"c": "add-auth", "f": "status", "v": "running"},
+            {"f": "status", "v": "checkpoint"},
+        ]
+
+    def test_load_state_replays_journal(self, state_file, journal_mode):
+        update_change_field(state_file, "add-auth", "status", "running")
+        update_change_field(state_file, "add-auth", "failure_reason", "x")
+        update_state_field(state_file, "custom_key", {"a": 1})
+
+        state = load_state(state_file)
+        assert state.changes[0].status == "running"
+        assert state.changes[0].extras["failure_reason"] == "x"
+        assert state.extras["custom_key"] == {"a": 1}
+        assert read_state_data(state_file)["changes"][0]["status"] == "running"
+
+    def test_change_not_found(self, state_file, journal_mode):
+        with pytest.raises(ValueError, match="Change not found"):
+            update_change_field(state_file, "nonexistent", "status", "running")
+
+    def test_status_change_emits_event(self, state_file, tmp_dir, journal_mode):
+        bus = EventBus(log_path=os.path.join(tmp_dir, "events.jsonl"))
+        update_change_field(state_file, "add-auth", "status", "running", event_bus=bus)
+        update_change_field(state_file, "add-auth", "status", "running", event_bus=bus)
+        events = bus.query(event_type="STATE_CHANGE")
+        assert len(events) == 1
+        assert events[0]["data"] == {"from": "pending", "to": "running"}
+
+    def test_compact_folds_journal(self, state_file, journal_mode):
+        update_change_field(state_file, "fix-login", "tokens_used", 1234)
+        assert compact_state(state_file) is True
+        assert not os.path.exists(state_file + ".journal")
+        with open(state_file) as f:
+            raw = json.load(f)
+        assert raw["changes"][1]["tokens_used"] == 1234
+        assert compact_state(state_file) is False
+
+    def test_auto_compaction_at_entry_limit(self, state_file, journal_mode, monkeypatch):
+        import wt_orch.state as state_mod
+        monkeypatch.setattr(state_mod, "JOURNAL_MAX_ENTRIES", 3)
+        for i in range(3):
+            update_change_field(state_file, "add-auth", "tokens_used", i + 1)
+        assert not os.path.exists(state_file + ".journal")
+        update_change_field(state_file, "add-auth", "tokens_used", 10)
+        assert load_state(state_file).changes[0].tokens_used == 10
+
+    def test_full_save_discards_journal(self, state_file, journal_mode):
+        update_change_field(state_file, "add-auth", "status", "running")
+        with locked_state(state_file) as state:
+            assert state.changes[0].status == "running"
+            state.changes[1].status = "merged"
+        assert not os.path.exists(state_file + ".journal")
+        state = load_state(state_file)
+        assert [c.status for c in state.changes] == ["running", "merged"]
+
+    def test_foreign_rewrite_wins_over_stale_journal(self, state_file, journal_mode):
+        update_change_field(state_file, "add-auth", "status", "running")
+        # Simulate jq rewriting the base file without compacting first
+        with open(state_file) as f:
+            raw = json.load(f)
+        raw["status"] = "stopped"
+        with open(state_file + ".new", "w") as f:
+            json.dump(raw, f)
+        os.rename(state_file + ".new", state_file)
+
+        state = load_state(state_file)
+        assert state.status == "stopped"
+        assert state.changes[0].status == "pending"
+        update_change_field(state_file, "fix-login", "status", "running")
+        state = load_state(state_file)
+        assert state.changes[0].status == "pending"
+        assert state.changes[1].status == "running"
+
+    def test_picks_up_other_writers_appends(self, state_file, journal_mode):
+        import wt_orch.state as state_mod
+        update_change_field(state_file, "add-auth", "status", "running")
+        # Another process appended after our cursor — simulate by appending directly
+        with open(state_file + ".journal", "a") as f:
+            f.write(json.dumps({"c": "fix-login", "f": "status", "v": "dispatched"}) + "\n")
+        update_change_field(state_file, "add-auth", "tokens_used", 7)
+        cursor = state_mod._journal_cursors[os.path.abspath(state_file)]
+        assert cursor.data["changes"][1]["status"] == "dispatched"
+        assert load_state(state_file).changes[1].status == "dispatched"
+
+
+# ─── Poll Transactions ───────────────────────────────────────────────
+
+
+class TestStateTransaction:
+    def test_reads_served_from_snapshot(self, state_file):
+        txn = StateTransaction(state_file)
+        assert txn.state.status == "running"
+        loads = state_io_counters()["loads"]
+        for _ in range(5):
+            assert len(txn.state.changes) == 2
+        assert state_io_counters()["loads"] == loads
+
+    def test_snapshot_reloaded_after_external_write(self, state_file):
+        txn = StateTransaction(state_file)
+        assert txn.state.changes[0].status == "pending"
+        update_change_field(state_file, "add-auth", "status", "running")
+        assert txn.state.changes[0].status == "running"
+
+    def test_commit_is_single_write(self, state_file):
+        txn = StateTransaction(state_file)
+        txn.set_field("active_seconds", 30)
+        txn.set_field("status", "checkpoint")
+        txn.set_change_field("add-auth", "tokens_used", 500)
+        assert txn.state.extras["active_seconds"] == 30
+        assert txn.pending == 3
+        assert load_state(state_file).status == "running"
+
+        txn.commit()
+        assert txn.pending == 0
+        assert txn.io_counts()["saves"] == 1
+        state = load_state(state_file)
+        assert state.status == "checkpoint"
+        assert state.extras["active_seconds"] == 30
+        assert state.changes[0].tokens_used == 500
+
+    def test_commit_does_not_clobber_concurrent_writes(self, state_file):
+        txn = StateTransaction(state_file)
+        txn.set_field("active_seconds", 15)
+        # Another writer lands between snapshot and commit
+        update_change_field(state_file, "fix-login", "status", "merged")
+        txn.commit()
+        state = load_state(state_file)
+        assert state.extras["active_seconds"] == 15
+        assert state.changes[1].status == "merged"
+
+    def test_change_not_found(self, state_file):
+        txn = StateTransaction(state_file)
+        with pytest.raises(ValueError, match="Change not found"):
+            txn.set_change_field("nonexistent", "status", "running")
+
+    def test_status_change_emits_event(self, state_file, tmp_dir):
+        bus = EventBus(log_path=os.path.join(tmp_dir, "events.jsonl"))
+        with state_transaction(state_file, event_bus=bus) as txn:
+            txn.set_change_field("add-auth", "status", "running")
+        events = bus.query(event_type="STATE_CHANGE")
+        assert len(events) == 1
+        assert events[0]["data"] == {"from": "pending", "to": "running"}
+
+    def test_journal_mode_appends_patches(self, state_file, journal_mode):
+        with state_transaction(state_file) as txn:
+            txn.set_field("active_seconds", 45)
+            txn.set_change_field("add-auth", "status", "running")
+        assert txn.io_counts()["saves"] == 0
+        assert txn.io_counts()["appends"] == 2
+        state = load_state(state_file)
+        assert state.extras["active_seconds"] == 45
+        assert state.changes[0].status == "running"
+
+    def test_journal_commit_crossing_compaction(self, state_file, journal_mode, monkeypatch):
+        import wt_orch.state as state_mod
+        monkeypatch.setattr(state_mod, "JOURNAL_MAX_ENTRIES", 10)
+        for i in range(8):
+            update_change_field(state_file, "add-auth", "tokens_used", i)
+        with state_transaction(state_file) as txn:
+            for i in range(30):
+                txn.set_change_field("fix-login", "tokens_used", 100 + i)
+        # Compacts at entries 10, 20 and 30 — not once per entry after the first
+        assert txn.io_counts()["saves"] == 3
+        assert txn.io_counts()["appends"] == 30
+        update_change_field(state_file, "add-auth", "status", "running")
+        with open(state_file + ".journal") as f:
+            assert "base" in json.loads(f.readline())
+        state = load_state(state_file)
+        assert state.changes[0].tokens_used == 7
+        assert state.changes[0].status == "running"
+        assert state.changes[1].tokens_used == 129
+
+
 # ─── Phase 2: Hook Runner ────────────────────────────────────────────
 
 
@@ -0,0 +1,215 @@
+"""Tests for wt_orch.tail and the LogTailer built on it."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "lib"))
+
+from wt_orch.tail import read_tail, tail_lines
+from wt_orch.watcher import LogTailer
+
+
+def _write_lines(path, lines, newline_at_end=True):
+    text = "\n".join(lines) + ("\n" if newline_at_end else "")
+    path.write_text(text)
+
+
+# ─── read_tail / tail_lines ──────────────────────────────────────────
+
+
+class TestReadTail:
+    @pytest.mark.parametrize("block_size", [1, 3, 7, 64, 65536])
+    def test_last_n_across_block_sizes(self, tmp_path, block_size):
+        log = tmp_path / "a.log"
+        _write_lines(log, [f"line {i}" for i in range(50)])
+        assert tail_lines(log, 5, block_size=block_size) == [
+            f"line {i}" for i in range(45, 50)
+        ]
+
+    def test_fewer_lines_than_requested(self, tmp_path):
+        log = tmp_path / "a.log"
+        _write_lines(log, ["a", "b"])
+        assert tail_lines(log, 10) == ["a", "b"]
+
+    def test_no_trailing_newline(self, tmp_path):
+        log = tmp_path / "a.log"
+        _write_lines(log, ["a", "b", "c"], newline_at_end=False)
+        assert tail_lines(log, 2, block_size=2) == ["b", "c"]
+
+    def test_returns_eof_offset(self, tmp_path):
+        log = tmp_path / "a.log"
+        _write_lines(log, ["a", "b"])
+        lines, end = read_tail(log, 1)
+        assert lines == [b"b"]
+        assert end == log.stat().st_size
+
+    @pytest.mark.parametrize("block_size", [1, 3, 65536])
+    def test_complete_leaves_out_torn_line(self, tmp_path, block_size):
+        log = tmp_path / "a.log"
+        log.write_bytes(b"a\nb\npart")
+        assert read_tail(log, 2, complete=True, block_size=block_size) == ([b"a", b"b"], 4)
+        log.write_bytes(b"no newline yet")
+        assert read_tail(log, 2, complete=True, block_size=block_size) == ([], 0)
+
+    def test_skip_blank(self, tmp_path):
+        log = tmp_path / "a.log"
+        log.write_text("a\n\n\nb\n   \n\nc\n\n")
+        assert tail_lines(log, 2, skip_blank=True, block_size=2) == ["b", "c"]
+        assert tail_lines(log, 2) == ["c", ""]
+
+    def test_keepends_and_crlf(self, tmp_path):
+        log = tmp_path / "a.log"
+        log.write_bytes(b"a\r\nb\r\n")
+        assert tail_lines(log, 2, keepends=True) == ["a\n", "b\n"]
+
+    def test_invalid_utf8_replaced(self, tmp_path):
+        log = tmp_path / "a.log"
+        log.write_bytes(b"ok\n\xff\xfe bad\n")
+        assert tail_lines(log, 1) == ["�� bad"]
+
+    def test_empty_and_missing(self, tmp_path):
+        empty = tmp_path / "empty.log"
+        empty.write_text("")
+        assert read_tail(empty, 5) == ([], 0)
+        assert read_tail(tmp_path / "missing.log", 5) == ([], 0)
+        assert tail_lines(empty, 0) == []
+
+    def test_reads_only_the_tail(self, tmp_path, monkeypatch):
+        """Cost is proportional to the lines requested, not the file size."""
+        log = tmp_path / "big.log"
+        with open(log, "w") as f:
+            for i in range(200_000):
+                f.write(f"[2026-03-01] [INFO] line {i}\n")
+        reads = []
+        real_open = open
+
+        class CountingFile:
+            def __init__(self, f):
+                self._f = f
+
+            def read(self, size=-1):
+                data = self._f.read(size)
+                reads.append(len(data))
+                return data
+
+            def __getattr__(self, name):
+                return getattr(self._f, name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._f.close()
+
+        import wt_orch.tail as tail_mod
+        monkeypatch.setattr(tail_mod, "open", lambda *a, **k: CountingFile(real_open(*a, **k)),
+                            raising=False)
+        lines = tail_lines(log, 10, block_size=4096)
+        assert lines[-1] == "[2026-03-01] [INFO] line 199999"
+        assert sum(reads) <= 4096
+
+
+# ─── LogTailer ───────────────────────────────────────────────────────
+
+
+class TestLogTailer:
+    def test_first_read_returns_tail(self, tmp_path):
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, [f"line {i}" for i in range(300)])
+        tailer = LogTailer(log)
+        lines = tailer.read_new_lines()
+        assert len(lines) == 200
+        assert lines[-1] == "line 299"
+        assert tailer.read_new_lines() == []
+
+    def test_incremental(self, tmp_path):
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, ["a"])
+        tailer = LogTailer(log)
+        tailer.read_new_lines()
+        with open(log, "a") as f:
+            f.write("b\nc\n")
+        assert tailer.read_new_lines() == ["b", "c"]
+
+    def test_torn_line_held_back(self, tmp_path):
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, ["a"])
+        tailer = LogTailer(log)
+        tailer.read_new_lines()
+        with open(log, "a") as f:
+            f.write("partial")
+        assert tailer.read_new_lines() == []
+        with open(log, "a") as f:
+            f.write(" line\n")
+        assert tailer.read_new_lines() == ["partial line"]
+
+    def test_truncated(self, tmp_path):
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, ["old 1", "old 2", "old 3"])
+        tailer = LogTailer(log)
+        tailer.read_new_lines()
+        _write_lines(log, ["new"])
+        assert tailer.read_new_lines() == ["new"]
+
+    def test_rotated_to_larger_file(self, tmp_path):
+        """A replaced file is detected by inode even if it is not smaller."""
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, ["old"])
+        tailer = LogTailer(log)
+        tailer.read_new_lines()
+        replacement = tmp_path / "orchestration.log.new"
+        _write_lines(replacement, ["rotated 1", "rotated 2"])
+        os.rename(log, tmp_path / "orchestration.log.1")
+        os.rename(replacement, log)
+        assert tailer.read_new_lines() == ["rotated 1", "rotated 2"]
+
+    def test_large_backlog_skips_to_tail(self, tmp_path, monkeypatch):
+        import wt_orch.watcher as watcher_mod
+        monkeypatch.setattr(watcher_mod, "MAX_CATCHUP_BYTES", 100)
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, ["start"])
+        tailer = LogTailer(log, initial_lines=3)
+        tailer.read_new_lines()
+        with open(log, "a") as f:
+            for i in range(100):
+                f.write(f"burst {i}\n")
+        assert tailer.read_new_lines() == ["burst 97", "burst 98", "burst 99"]
+
+    def test_torn_line_held_back_on_first_read(self, tmp_path):
+        log = tmp_path / "orchestration.log"
+        log.write_text("a\nb\npartial")
+        tailer = LogTailer(log)
+        assert tailer.read_new_lines() == ["a", "b"]
+        with open(log, "a") as f:
+            f.write(" line\n")
+        assert tailer.read_new_lines() == ["partial line"]
+
+    def test_torn_line_held_back_on_backlog_skip(self, tmp_path, monkeypatch):
+        import wt_orch.watcher as watcher_mod
+        monkeypatch.setattr(watcher_mod, "MAX_CATCHUP_BYTES", 100)
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, ["start"])
+        tailer = LogTailer(log, initial_lines=2)
+        tailer.read_new_lines()
+        with open(log, "a") as f:
+            for i in range(100):
+                f.write(f"burst {i}\n")
+            f.write("burst 1")
+        assert tailer.read_new_lines() == ["burst 98", "burst 99"]
+        with open(log, "a") as f:
+            f.write("00\n")
+        assert tailer.read_new_lines() == ["burst 100"]
+
+    def test_get_tail_does_not_move_offset(self, tmp_path):
+        log = tmp_path / "orchestration.log"
+        _write_lines(log, ["a", "b", "c"])
+        tailer = LogTailer(log)
+        assert tailer.get_tail(2) == ["b", "c"]
+        assert tailer.read_new_lines() == ["a", "b", "c"]
+
+    def test_missing_file(self, tmp_path):
+        tailer = LogTailer(tmp_path / "missing.log")
+        assert tailer.read_new_lines() == []
+        assert tailer.get_tail() == []
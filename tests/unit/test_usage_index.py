@@ -0,0 +1,142 @@
+"""Tests for the incremental usage index behind gui/usage_calculator.py.
+
+usage_calculator is pure Python; it is loaded by path because importing the
+gui package pulls in PySide6.
+"""
+
+import importlib.util
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "usage_calculator",
+    os.path.join(os.path.dirname(__file__), "..", "..", "gui", "usage_calculator.py"),
+)
+usage_calculator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(usage_calculator)
+UsageCalculator = usage_calculator.UsageCalculator
+UsageIndex = usage_calculator.UsageIndex
+
+
+def _usage_line(ts, model="claude-sonnet-4", inp=10, out=20):
+    return json.dumps({
+        "timestamp": ts.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "message": {"model": model, "usage": {
+            "input_tokens": inp, "output_tokens": out,
+            "cache_read_input_tokens": 1, "cache_creation_input_tokens": 2,
+        }},
+    }) + "\n"
+
+
+@pytest.fixture
+def claude_dir(tmp_path):
+    (tmp_path / "projects" / "-proj").mkdir(parents=True)
+    return tmp_path
+
+
+def _calc(claude_dir):
+    return UsageCalculator(claude_dir=claude_dir, index_path=claude_dir / "usage-index.json")
+
+
+def test_window_totals_from_index(claude_dir):
+    now = datetime.now(timezone.utc)
+    with open(claude_dir / "projects" / "-proj" / "s.jsonl", "w") as f:
+        f.write(_usage_line(now - timedelta(hours=1)))
+        f.write(_usage_line(now - timedelta(hours=30), model="claude-opus-4-6"))
+        f.write(json.dumps({"type": "user", "message": {"content": "hi"}}) + "\n")
+        f.write(_usage_line(now - timedelta(days=10)))
+
+    calc = _calc(claude_dir)
+    assert calc.calculate_5h_usage().api_tokens == 30
+    weekly = calc.calculate_weekly_usage()
+    assert weekly.api_tokens == 60
+    assert set(weekly.per_model) == {"claude-sonnet-4", "claude-opus-4-6"}
+    assert calc.calculate_usage().api_tokens == 90
+
+
+def test_only_appended_bytes_are_parsed(claude_dir):
+    session = claude_dir / "projects" / "-proj" / "s.jsonl"
+    now = datetime.now(timezone.utc)
+    session.write_text(_usage_line(now))
+    calc = _calc(claude_dir)
+    assert calc.calculate_5h_usage().api_tokens == 30
+
+    parsed = []
+    original = calc.parse_usage_line
+    calc.parse_usage_line = lambda line: parsed.append(line) or original(line)
+    with open(session, "a") as f:
+        f.write(_usage_line(now, inp=100, out=0))
+    assert calc.calculate_5h_usage().api_tokens == 130
+    assert len(parsed) == 1
+    assert calc.calculate_5h_usage().api_tokens == 130
+    assert len(parsed) == 1  # unchanged file is not reopened
+
+
+def test_index_persists_across_instances(claude_dir):
+    session = claude_dir / "projects" / "-proj" / "s.jsonl"
+    session.write_text(_usage_line(datetime.now(timezone.utc)))
+    _calc(claude_dir).get_usage_summary()
+    assert (claude_dir / "usage-index.json").exists()
+
+    calc = _calc(claude_dir)
+    calc.parse_usage_line = lambda line: pytest.fail("should be served from the index")
+    assert calc.get_usage_summary()["session_tokens"] == 30
+
+
+def test_torn_line_completed_later(claude_dir):
+    session = claude_dir / "projects" / "-proj" / "s.jsonl"
+    line = _usage_line(datetime.now(timezone.utc))
+    session.write_text(line[:25])
+    calc = _calc(claude_dir)
+    assert calc.calculate_5h_usage().api_tokens == 0
+    with open(session, "a") as f:
+        f.write(line[25:])
+    assert calc.calculate_5h_usage().api_tokens == 30
+
+
+def test_rewritten_and_deleted_files(claude_dir):
+    session = claude_dir / "projects" / "-proj" / "s.jsonl"
+    now = datetime.now(timezone.utc)
+    session.write_text(_usage_line(now) * 3)
+    calc = _calc(claude_dir)
+    assert calc.calculate_5h_usage().api_tokens == 90
+
+    replacement = session.with_suffix(".tmp")
+    replacement.write_text(_usage_line(now, inp=1, out=1))
+    os.replace(replacement, session)
+    assert calc.calculate_5h_usage().api_tokens == 2
+
+    session.unlink()
+    assert calc.calculate_5h_usage().api_tokens == 0
+
+
+def test_project_scope_uses_separate_index(claude_dir):
+    other = claude_dir / "projects" / "-other"
+    other.mkdir()
+    (other / "s.jsonl").write_text(_usage_line(datetime.now(timezone.utc)))
+    scoped = UsageCalculator(claude_dir=claude_dir, project_dir="-proj")
+    unscoped = UsageCalculator(claude_dir=claude_dir)
+    assert scoped._default_index_path() != unscoped._default_index_path()
+
+
+def test_old_buckets_folded_on_save(claude_dir):
+    session = claude_dir / "projects" / "-proj" / "s.jsonl"
+    now = datetime.now(timezone.utc)
+    with open(session, "w") as f:
+        f.write(_usage_line(now - timedelta(hours=1)))
+        for days in (9, 10, 30):
+            f.write(_usage_line(now - timedelta(days=days)))
+    calc = _calc(claude_dir)
+    assert calc.calculate_usage().api_tokens == 120
+
+    index = UsageIndex(claude_dir / "usage-index.json")
+    buckets = index.files[str(session)]["buckets"]
+    assert len(buckets) == 2  # the recent bucket plus one folded bucket
+    assert sum(c[0] + c[1] for c in buckets["0"].values()) == 90
+
+    calc = _calc(claude_dir)
+    assert calc.calculate_weekly_usage().api_tokens == 30
+    assert calc.calculate_usage().api_tokens == 120
@@ -446,6 +446,100 @@ class TestPollStatusRouting:
         assert result is None
 
 
+# ─── Change poll tracking ────────────────────────────────────────────
+
+
+def _write_loop_state(wt_path: str, status: str, mtime: float | None = None) -> None:
+    os.makedirs(os.path.join(wt_path, ".claude"), exist_ok=True)
+    path = os.path.join(wt_path, ".claude", "loop-state.json")
+    with open(path, "w") as f:
+        json.dump({"status": status, "total_tokens": 100}, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+class TestChangePollTracker:
+    def _change(self, wt_path, status="running", pid=0):
+        return Change(name="c1", worktree_path=wt_path, status=status, ralph_pid=pid)
+
+    def test_unchanged_running_is_skipped(self, tmp_dir):
+        from wt_orch.verifier import ChangePollTracker
+        _write_loop_state(tmp_dir, "running")
+        tracker = ChangePollTracker()
+        change = self._change(tmp_dir)
+        fp = tracker.fingerprint(change)
+        assert tracker.should_poll(change, fp)
+        tracker.record(change, fp, "running")
+        assert not tracker.should_poll(change, tracker.fingerprint(change))
+
+    def test_loop_state_write_is_polled(self, tmp_dir):
+        from wt_orch.verifier import ChangePollTracker
+        _write_loop_state(tmp_dir, "running", mtime=time.time() - 10)
+        tracker = ChangePollTracker()
+        change = self._change(tmp_dir)
+        tracker.record(change, tracker.fingerprint(change), "running")
+        _write_loop_state(tmp_dir, "done")
+        assert tracker.should_poll(change, tracker.fingerprint(change))
+
+    def test_status_or_pid_change_is_polled(self, tmp_dir):
+        from wt_orch.verifier import ChangePollTracker
+        _write_loop_state(tmp_dir, "waiting:budget")
+        tracker = ChangePollTracker()
+        change = self._change(tmp_dir)
+        tracker.record(change, tracker.fingerprint(change), "waiting:budget")
+        assert not tracker.should_poll(change, tracker.fingerprint(change))
+        moved = self._change(tmp_dir, status="verifying")
+        assert tracker.should_poll(moved, tracker.fingerprint(moved))
+        moved = self._change(tmp_dir, pid=4242)
+        assert tracker.should_poll(moved, tracker.fingerprint(moved))
+
+    def test_stale_running_is_polled(self, tmp_dir):
+        """A running loop past the stale threshold must reach the PID check."""
+        from wt_orch.verifier import LOOP_STALE_SECS, ChangePollTracker
+        _write_loop_state(tmp_dir, "running", mtime=time.time() - LOOP_STALE_SECS - 5)
+        tracker = ChangePollTracker()
+        change = self._change(tmp_dir)
+        tracker.record(change, tracker.fingerprint(change), "running")
+        assert tracker.should_poll(change, tracker.fingerprint(change))
+
+    def test_non_steady_statuses_always_polled(self, tmp_dir):
+        from wt_orch.verifier import ChangePollTracker
+        tracker = ChangePollTracker()
+        change = self._change(tmp_dir)
+        assert tracker.fingerprint(change) is None  # no loop-state yet
+        assert tracker.should_poll(change, None)
+        _write_loop_state(tmp_dir, "done")
+        for status in ("done", "stopped", "stalled", "stuck", "unknown"):
+            tracker.record(change, tracker.fingerprint(change), status)
+            assert tracker.should_poll(change, tracker.fingerprint(change))
+
+    def test_poll_active_changes_counts(self, state_file, tmp_dir, monkeypatch):
+        """Only changes whose loop-state moved reach poll_change."""
+        import wt_orch.verifier as verifier
+        from wt_orch.engine import Directives, _poll_active_changes
+
+        changes = []
+        for name in ("a", "b", "c"):
+            wt = os.path.join(tmp_dir, name)
+            _write_loop_state(wt, "running", mtime=time.time() - 30)
+            changes.append({"name": name, "status": "running", "worktree_path": wt})
+        changes.append({"name": "p", "status": "pending", "worktree_path": None})
+        _write_state(state_file, changes)
+
+        polled = []
+        monkeypatch.setattr(verifier, "poll_change", lambda name, sf, **kw: polled.append(name) or "running")
+        tracker = verifier.ChangePollTracker()
+        d = Directives()
+        _poll_active_changes(state_file, d, "", None, tracker)
+        assert polled == ["a", "b", "c"]
+
+        polled.clear()
+        _write_loop_state(os.path.join(tmp_dir, "b"), "running")
+        _poll_active_changes(state_file, d, "", None, tracker)
+        assert polled == ["b"]
+        assert tracker.counts() == {"processed": 4, "skipped": 2}
+
+
 # ─── Uncommitted work guard in handle_change_done ────────────
 
 
@@ -111,3 +111,93 @@ def test_get_log(client):
 def test_get_log_no_state(client):
     resp = client.get("/api/nonexistent/log")
     assert resp.status_code == 404
+
+
+def _backdate(*paths, secs=60):
+    t = __import__("time").time() - secs
+    for p in paths:
+        os.utime(p, (t, t))
+
+
+def test_state_etag_304(client, tmp_project):
+    """Unchanged state revalidates with 304; a change yields a new ETag."""
+    resp = client.get("/api/test-proj/state")
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+    assert resp.headers["cache-control"] == "no-cache"
+
+    again = client.get("/api/test-proj/state", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    sp = tmp_project / "wt" / "orchestration" / "orchestration-state.json"
+    state = json.loads(sp.read_text())
+    state["status"] = "stopped"
+    sp.write_text(json.dumps(state))
+    changed = client.get("/api/test-proj/state", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["status"] == "stopped"
+
+
+def test_state_served_from_cache_until_file_changes(client, tmp_project):
+    """With settled inputs the body is reused; touching the state file rebuilds it."""
+    from wt_orch.http_cache import response_cache
+
+    orch = tmp_project / "wt" / "orchestration"
+    sp = orch / "orchestration-state.json"
+    _backdate(sp, orch)
+    first = client.get("/api/test-proj/state")
+    hits = response_cache.hits
+    second = client.get("/api/test-proj/state")
+    assert response_cache.hits == hits + 1
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.json() == first.json()
+
+    state = json.loads(sp.read_text())
+    state["changes"].append({"name": "change-c", "status": "pending"})
+    sp.write_text(json.dumps(state))
+    _backdate(sp, secs=30)
+    third = client.get("/api/test-proj/state")
+    assert [c["name"] for c in third.json()["changes"]][-1] == "change-c"
+    assert third.headers["etag"] != first.headers["etag"]
+
+
+def test_events_and_changes_keyed_by_query(client, tmp_project):
+    events = tmp_project / "wt" / "orchestration" / "orchestration-state-events.jsonl"
+    events.write_text(
+        json.dumps({"type": "A", "ts": "1"}) + "\n" + json.dumps({"type": "B", "ts": "2"}) + "\n"
+    )
+    _backdate(events)
+    assert len(client.get("/api/test-proj/events").json()["events"]) == 2
+    assert [e["type"] for e in client.get("/api/test-proj/events?type=B").json()["events"]] == ["B"]
+    running = client.get("/api/test-proj/changes?status=running").json()
+    assert [c["name"] for c in running] == ["change-b"]
+    assert len(client.get("/api/test-proj/changes").json()) == 2
+
+
+def test_large_digest_gzip(client, tmp_project):
+    """Large payloads are compressed when the client accepts gzip."""
+    digest = tmp_project / "wt" / "orchestration" / "digest"
+    (digest / "domains").mkdir(parents=True)
+    (digest / "domains" / "cart.md").write_text("cart requirements\n" * 2000)
+    resp = client.get("/api/test-proj/digest", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.json()["domains"]["cart"].startswith("cart requirements")
+    plain = client.get("/api/test-proj/digest", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == resp.headers["etag"]
+
+
+def test_large_digest_brotli(client, tmp_project):
+    """Clients accepting br get brotli when the module is installed."""
+    pytest.importorskip("brotli")
+    digest = tmp_project / "wt" / "orchestration" / "digest"
+    (digest / "domains").mkdir(parents=True)
+    (digest / "domains" / "cart.md").write_text("cart requirements\n" * 2000)
+    resp = client.get("/api/test-proj/digest", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["content-encoding"] == "br"
+    assert resp.json()["domains"]["cart"].startswith("cart requirements")
+    gz = client.get("/api/test-proj/digest", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.headers["etag"] == resp.headers["etag"]
@@ -43,3 +43,58 @@ def test_spa_serves_index_html(client):
 def test_unknown_project_404(client):
     resp = client.get("/api/unknown/state")
     assert resp.status_code == 404
+
+
+def test_ws_delta_stream_snapshot_and_resync(client, tmp_path):
+    """?delta=1 clients get a sequenced snapshot and can ask for a resync."""
+    from wt_orch.watcher import ProjectWatcher
+
+    state_path = tmp_path / "proj" / "orchestration-state.json"
+    state_path.parent.mkdir()
+    state_path.write_text(json.dumps({
+        "plan_version": 1, "brief_hash": "x", "status": "running",
+        "created_at": "2026-01-01T00:00:00", "changes": [],
+        "merge_queue": [], "checkpoints": [], "changes_since_checkpoint": 0,
+    }))
+    watcher = ProjectWatcher("proj", state_path.parent)
+    watcher.seq = 5
+    client.app.state.watcher_manager._watchers["proj"] = watcher
+
+    with client.websocket_connect("/ws/proj/stream?delta=1") as ws:
+        first = ws.receive_json()
+        assert first["event"] == "state_update"
+        assert first["seq"] == 5
+        assert first["data"]["status"] == "running"
+        ws.send_text(json.dumps({"type": "resync"}))
+        again = ws.receive_json()
+        assert again == first
+
+
+def test_watcher_stats_endpoint(client, tmp_path, monkeypatch):
+    """Per-project watcher counters; inactive when no watcher runs."""
+    from wt_orch.watcher import ProjectWatcher
+
+    proj = tmp_path / "proj"
+    proj.mkdir()
+    pf = tmp_path / "projects.json"
+    pf.write_text(json.dumps([{"name": "proj", "path": str(proj)}]))
+
+    assert client.get("/api/proj/watcher").json() == {"active": False}
+    assert client.get("/api/nope/watcher").status_code == 404
+
+    watcher = ProjectWatcher("proj", proj)
+    watcher.stats.events = 7
+    client.app.state.watcher_manager._watchers["proj"] = watcher
+    data = client.get("/api/proj/watcher").json()
+    assert data["active"] is True
+    assert data["events"] == 7
+    assert data["mode"] == "idle"
+    assert "cpu_seconds" in data
+
+
+def test_runtime_endpoint(client):
+    """Loop-lag and I/O pool counters are served."""
+    data = client.get("/api/runtime").json()
+    assert set(data) == {"loop", "io", "dir_index", "responses"}
+    assert "stalls" in data["loop"]
+    assert data["io"]["per_project"] >= 1
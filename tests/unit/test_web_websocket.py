@@ -35,3 +35,210 @@ def test_manager_disconnect_nonexistent():
         pass
 
     mgr.disconnect("proj", FakeWS())  # should not raise
+
+
+class RecordingWS:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        self.sent.append(payload)
+
+
+def _run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+def test_broadcast_state_patch_vs_full(monkeypatch):
+    """Delta clients get the patch, others the full state; each serialized once."""
+    import wt_orch.websocket as ws_mod
+
+    mgr = ConnectionManager()
+    legacy, delta1, delta2 = RecordingWS(), RecordingWS(), RecordingWS()
+
+    async def scenario():
+        await mgr.connect("proj", legacy)
+        await mgr.connect("proj", delta1, delta=True)
+        await mgr.connect("proj", delta2, delta=True)
+        dumps = []
+        real_dumps = json.dumps
+        monkeypatch.setattr(ws_mod.json, "dumps", lambda obj: dumps.append(obj) or real_dumps(obj))
+        ops = [{"op": "replace", "path": "/status", "value": "done"}]
+        await mgr.broadcast_state("proj", {"status": "done"}, 7, ops)
+        monkeypatch.setattr(ws_mod.json, "dumps", real_dumps)
+        return dumps
+
+    dumps = _run(scenario())
+    assert len(dumps) == 2
+    assert json.loads(legacy.sent[0]) == {"event": "state_update", "seq": 7, "data": {"status": "done"}}
+    patch = json.loads(delta1.sent[0])
+    assert patch["event"] == "state_patch" and patch["seq"] == 7
+    assert delta1.sent == delta2.sent
+
+
+def test_broadcast_state_snapshot_goes_to_everyone():
+    mgr = ConnectionManager()
+    delta = RecordingWS()
+
+    async def scenario():
+        await mgr.connect("proj", delta, delta=True)
+        await mgr.broadcast_state("proj", {"status": "running"}, 100, None)
+
+    _run(scenario())
+    assert json.loads(delta.sent[0])["event"] == "state_update"
+
+
+def _write_state(path, changes, status="running"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "plan_version": 1, "brief_hash": "x", "status": status,
+        "created_at": "2026-01-01T00:00:00", "changes": changes,
+        "merge_queue": [], "checkpoints": [], "changes_since_checkpoint": 0,
+    }))
+
+
+def test_watcher_emits_patches_with_sequence(tmp_path, monkeypatch):
+    """State updates carry patches from the previous state; seq increments."""
+    import wt_orch.watcher as watcher_mod
+    from wt_orch.json_patch import apply_patch
+    from wt_orch.watcher import ProjectWatcher
+
+    monkeypatch.setattr(watcher_mod, "SNAPSHOT_EVERY", 3)
+    state_path = tmp_path / "wt" / "orchestration" / "orchestration-state.json"
+    changes = [{"name": f"c{i}", "status": "pending"} for i in range(5)]
+    _write_state(state_path, changes)
+    watcher = ProjectWatcher("proj", tmp_path)
+    events = []
+
+    async def callback(project, event, data, **extra):
+        events.append((event, data, extra))
+
+    base = watcher.get_initial_state()
+    assert watcher.seq == 0
+
+    async def scenario():
+        for i in range(4):
+            changes[i]["status"] = "running"
+            _write_state(state_path, changes)
+            await watcher._handle_state_change(callback)
+        # No change on disk: nothing is emitted
+        await watcher._handle_state_change(callback)
+
+    _run(scenario())
+    updates = [(d, x) for e, d, x in events if e == "state_update"]
+    assert [x["seq"] for _, x in updates] == [1, 2, 3, 4]
+    assert updates[2][1]["ops"] is None  # periodic snapshot
+    doc = base
+    for data, extra in updates:
+        doc = data if extra["ops"] is None else apply_patch(doc, extra["ops"])
+        assert doc == data
+    assert updates[0][1]["ops"] == [{"op": "replace", "path": "/changes/0/status", "value": "running"}]
+
+
+def test_load_initial_state_keeps_update_landing_during_read(tmp_path):
+    from wt_orch.watcher import ProjectWatcher
+
+    state_path = tmp_path / "wt" / "orchestration" / "orchestration-state.json"
+    _write_state(state_path, [{"name": "c0", "status": "pending"}])
+    watcher = ProjectWatcher("proj", tmp_path)
+    stale = watcher._read_enriched_state()
+    assert watcher._last_state is None
+    newer = {**stale, "status": "checkpoint"}
+
+    def read_while_update_lands():
+        # _handle_state_change emits seq 1 while the initial read is in flight
+        watcher._last_state = newer
+        watcher.seq = 1
+        return stale
+
+    watcher._read_enriched_state = read_while_update_lands
+    assert _run(watcher.load_initial_state()) == (newer, 1)
+    assert watcher._last_state is newer
+
+
+def test_watch_targets_are_specific_dirs(tmp_path):
+    """Only the orchestration dirs are watched; missing ones are awaited."""
+    from wt_orch.watcher import ProjectWatcher
+
+    (tmp_path / "node_modules").mkdir()
+    watcher = ProjectWatcher("proj", tmp_path)
+    targets, pending = watcher._watch_targets()
+    assert targets == {tmp_path}
+    assert pending == {str(tmp_path / "wt")}
+
+    (tmp_path / "wt" / "orchestration").mkdir(parents=True)
+    targets, pending = watcher._watch_targets()
+    assert targets == {tmp_path, tmp_path / "wt" / "orchestration"}
+    assert pending == set()
+
+    watcher._pending_dirs = pending
+    assert watcher._watch_filter(None, str(tmp_path / "wt" / "orchestration" / "orchestration-state.json"))
+    assert watcher._watch_filter(None, str(tmp_path / "orchestration.log"))
+    assert not watcher._watch_filter(None, str(tmp_path / "package.json"))
+    assert watcher.stats.ignored == 1
+
+
+def test_handle_batch_coalesces_handlers(tmp_path):
+    """A burst of writes runs each handler once; awaited dirs force a re-watch."""
+    from wt_orch.watcher import ProjectWatcher
+
+    orch = tmp_path / "wt" / "orchestration"
+    state_path = orch / "orchestration-state.json"
+    _write_state(state_path, [{"name": "a", "status": "pending"}])
+    (orch / "orchestration.log").write_text("one\ntwo\n")
+    watcher = ProjectWatcher("proj", tmp_path)
+    events = []
+
+    async def callback(project, event, data, **extra):
+        events.append(event)
+
+    batch = {(2, str(state_path))} | {(1, str(orch / "orchestration-state.json.journal"))}
+    batch |= {(2, str(orch / "orchestration.log")), (1, str(orch / "orchestration.log"))}
+    assert _run(watcher._handle_batch(batch, callback)) is False
+    assert events == ["state_update", "log_lines"]
+    stats = watcher.stats_snapshot()
+    assert stats["events"] == 4
+    assert stats["coalesced"] == 2
+    assert stats["state_reads"] == 1 and stats["log_reads"] == 1
+    assert stats["state_updates"] == 1 and stats["log_lines"] == 2
+    assert stats["cpu_seconds"] >= 0
+
+    watcher._pending_dirs = {str(tmp_path / "wt")}
+    assert _run(watcher._handle_batch({(1, str(tmp_path / "wt"))}, callback)) is True
+
+
+def test_watch_picks_up_orchestration_dir_created_later(tmp_path):
+    """Non-recursive watch re-targets as wt/orchestration appears."""
+    pytest.importorskip("watchfiles")
+    from wt_orch.watcher import ProjectWatcher
+
+    watcher = ProjectWatcher("proj", tmp_path)
+    got = asyncio.Queue()
+
+    async def callback(project, event, data, **extra):
+        await got.put((event, data))
+
+    async def scenario():
+        task = asyncio.create_task(watcher.watch(callback))
+        try:
+            await asyncio.sleep(0.5)
+            state_path = tmp_path / "wt" / "orchestration" / "orchestration-state.json"
+            _write_state(state_path, [{"name": "a", "status": "running"}])
+            while True:
+                event, data = await asyncio.wait_for(got.get(), timeout=10)
+                if event == "state_update":
+                    return data
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    data = _run(scenario())
+    assert data["changes"][0]["status"] == "running"
+    assert watcher.stats.restarts >= 1
+    assert tmp_path / "wt" / "orchestration" in watcher._targets
@@ -1,8 +1,10 @@
 import { useEffect, useRef, useCallback, useState } from 'react'
+import { applyPatch, type PatchOp } from '../lib/jsonPatch'
 
 export interface WSEvent {
-  event: 'state_update' | 'log_lines' | 'checkpoint_pending' | 'change_complete' | 'error'
+  event: 'state_update' | 'state_patch' | 'log_lines' | 'checkpoint_pending' | 'change_complete' | 'error'
   data: unknown
+  seq?: number
 }
 
 interface UseWebSocketOptions {
@@ -17,13 +19,51 @@ export function useWebSocket({ project, onEvent }: UseWebSocketOptions) {
   const [connected, setConnected] = useState(false)
   const onEventRef = useRef(onEvent)
   onEventRef.current = onEvent
+  // Last full state and its sequence number; state_patch events apply on top
+  const stateRef = useRef<unknown>(null)
+  const seqRef = useRef<number | null>(null)
 
   const connect = useCallback(() => {
     if (!project) return
 
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'
-    const ws = new WebSocket(`${protocol}//${window.location.host}/ws/${project}/stream`)
+    const ws = new WebSocket(`${protocol}//${window.location.host}/ws/${project}/stream?delta=1`)
     wsRef.current = ws
+    stateRef.current = null
+    seqRef.current = null
+
+    const resync = () => {
+      seqRef.current = null
+      if (ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'resync' }))
+    }
+
+    // Patches are turned back into state_update events for consumers
+    const handle = (parsed: WSEvent) => {
+      if (parsed.event === 'state_update') {
+        stateRef.current = parsed.data
+        seqRef.current = parsed.seq ?? null
+        onEventRef.current(parsed)
+        return
+      }
+      if (parsed.event === 'state_patch') {
+        const seq = parsed.seq
+        if (seqRef.current === null || seq === undefined || seq <= seqRef.current) return
+        if (seq !== seqRef.current + 1) {
+          resync()
+          return
+        }
+        try {
+          stateRef.current = applyPatch(stateRef.current, (parsed.data as { ops: PatchOp[] }).ops)
+        } catch {
+          resync()
+          return
+        }
+        seqRef.current = seq
+        onEventRef.current({ event: 'state_update', data: stateRef.current, seq })
+        return
+      }
+      onEventRef.current(parsed)
+    }
 
     ws.onopen = () => {
       setConnected(true)
@@ -32,8 +72,7 @@ export function useWebSocket({ project, onEvent }: UseWebSocketOptions) {
 
     ws.onmessage = (evt) => {
       try {
-        const parsed = JSON.parse(evt.data) as WSEvent
-        onEventRef.current(parsed)
+        handle(JSON.parse(evt.data) as WSEvent)
       } catch {
         // ignore malformed messages
       }
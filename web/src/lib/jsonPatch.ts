@@ -0,0 +1,59 @@
+/** Apply RFC 6902 add/remove/replace operations as sent by the state stream.
+ *
+ * Returns a new document: containers along each patched path are copied, the
+ * rest is shared, so React sees changed references only where data changed.
+ * Throws on a patch that does not fit the document (caller resyncs).
+ */
+
+export interface PatchOp {
+  op: 'add' | 'remove' | 'replace'
+  path: string
+  value?: unknown
+}
+
+type Container = Record<string, unknown> | unknown[]
+
+function unescape(token: string): string {
+  return token.replace(/~1/g, '/').replace(/~0/g, '~')
+}
+
+function shallowCopy(node: unknown): Container {
+  if (Array.isArray(node)) return [...node]
+  if (node !== null && typeof node === 'object') return { ...(node as Record<string, unknown>) }
+  throw new Error('patch path crosses a non-container')
+}
+
+function applyOne(doc: unknown, op: PatchOp): unknown {
+  if (op.path === '') {
+    if (op.op === 'remove') throw new Error('cannot remove the document root')
+    return op.value
+  }
+  const tokens = op.path.split('/').slice(1).map(unescape)
+  const root = shallowCopy(doc)
+  let parent: Container = root
+  for (const token of tokens.slice(0, -1)) {
+    const child = shallowCopy((parent as Record<string, unknown>)[token])
+    ;(parent as Record<string, unknown>)[token] = child
+    parent = child
+  }
+  const last = tokens[tokens.length - 1]
+  if (Array.isArray(parent)) {
+    const index = last === '-' ? parent.length : Number(last)
+    if (!Number.isInteger(index) || index < 0) throw new Error(`bad index in ${op.path}`)
+    if (op.op === 'add' && index <= parent.length) parent.splice(index, 0, op.value)
+    else if (op.op === 'replace' && index < parent.length) parent[index] = op.value
+    else if (op.op === 'remove' && index < parent.length) parent.splice(index, 1)
+    else throw new Error(`${op.op} ${op.path}: index out of range`)
+  } else {
+    if (op.op !== 'add' && !(last in parent)) throw new Error(`${op.op} ${op.path}: no such member`)
+    if (op.op === 'remove') delete parent[last]
+    else parent[last] = op.value
+  }
+  return root
+}
+
+export function applyPatch<T>(doc: T, ops: PatchOp[]): T {
+  let out: unknown = doc
+  for (const op of ops) out = applyOne(out, op)
+  return out as T
+}